@@ -0,0 +1,355 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält Puffer-Klassen für die Audioaufnahme der Wortweber-Anwendung.
+"""
+
+# Standardbibliotheken
+import tempfile
+from typing import Optional
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import RECORDING_SPILL_DIR
+from src.utils.error_handling import logger
+
+
+class AudioRingBuffer:
+    """
+    Vorallokierter Ringpuffer für genau einen Produzenten und einen Konsumenten (SPSC).
+
+    Der Produzent (der PyAudio-Callback) schreibt ausschließlich die Schreibposition,
+    der Konsument (der Aufnahme-Thread) ausschließlich die Leseposition. Beide Positionen
+    wachsen monoton und werden erst nach dem Kopieren der Samples veröffentlicht, sodass
+    keine Sperre benötigt wird und der Callback niemals blockiert.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """
+        Initialisiert den Ringpuffer.
+
+        :param capacity: Kapazität des Puffers in Samples
+        :param dtype: Datentyp der gespeicherten Samples
+        """
+        if capacity <= 0:
+            raise ValueError("Die Kapazität des Ringpuffers muss positiv sein.")
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0  # Wird nur vom Produzenten geschrieben
+        self._read_pos = 0  # Wird nur vom Konsumenten geschrieben
+        self.dropped_samples = 0  # Verworfene Samples bei vollem Puffer (nur Produzent)
+
+    def available(self) -> int:
+        """
+        Gibt die Anzahl der lesbaren Samples zurück.
+
+        :return: Anzahl der geschriebenen, aber noch nicht gelesenen Samples
+        """
+        return self._write_pos - self._read_pos
+
+    def free_space(self) -> int:
+        """
+        Gibt den freien Platz im Puffer zurück.
+
+        :return: Anzahl der Samples, die ohne Verlust geschrieben werden können
+        """
+        return self.capacity - self.available()
+
+    def write(self, data: np.ndarray) -> int:
+        """
+        Schreibt Samples in den Puffer (nur vom Produzenten aufzurufen).
+
+        Passt nicht alles in den Puffer, werden die überzähligen Samples verworfen
+        und in dropped_samples gezählt, statt auf den Konsumenten zu warten.
+
+        :param data: Die zu schreibenden Samples
+        :return: Anzahl der tatsächlich geschriebenen Samples
+        """
+        n = len(data)
+        free = self.capacity - (self._write_pos - self._read_pos)
+        if n > free:
+            self.dropped_samples += n - free
+            data = data[:free]
+            n = free
+        if n == 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        if first < n:
+            self._buffer[:n - first] = data[first:]
+
+        # Veröffentlichung erst nach dem Kopieren, damit der Konsument nur fertige Daten sieht
+        self._write_pos += n
+        return n
+
+    def read(self, max_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Liest verfügbare Samples aus dem Puffer (nur vom Konsumenten aufzurufen).
+
+        :param max_samples: Maximale Anzahl zu lesender Samples (None für alle verfügbaren)
+        :return: Ein zusammenhängendes Array mit den gelesenen Samples
+        """
+        n = self.available()
+        if max_samples is not None:
+            n = min(n, max_samples)
+        out = np.empty(n, dtype=self._buffer.dtype)
+        if n == 0:
+            return out
+
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._buffer[start:start + first]
+        if first < n:
+            out[first:] = self._buffer[:n - first]
+
+        # Freigabe des Platzes erst nach dem Kopieren
+        self._read_pos += n
+        return out
+
+    def drain_into(self, target: "RecordingBuffer") -> int:
+        """
+        Überträgt alle verfügbaren Samples direkt in einen RecordingBuffer.
+
+        Im Gegensatz zu read() wird kein Zwischenarray angelegt; die Samples werden
+        ohne Umweg aus dem Ringpuffer in den Zielpuffer kopiert.
+
+        :param target: Der Zielpuffer
+        :return: Anzahl der übertragenen Samples
+        """
+        n = self.available()
+        if n == 0:
+            return 0
+
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        target.append(self._buffer[start:start + first])
+        if first < n:
+            target.append(self._buffer[:n - first])
+
+        self._read_pos += n
+        return n
+
+    def discard_to(self, keep: int) -> int:
+        """
+        Verwirft die ältesten Samples, sodass höchstens keep Samples lesbar bleiben (nur vom Konsumenten aufzurufen).
+
+        :param keep: Maximale Anzahl der verbleibenden, neuesten Samples
+        :return: Anzahl der verworfenen Samples
+        """
+        excess = self.available() - max(0, int(keep))
+        if excess <= 0:
+            return 0
+        self._read_pos += excess
+        return excess
+
+    def reset(self) -> None:
+        """
+        Setzt den Puffer zurück.
+
+        Darf nur aufgerufen werden, solange kein Produzent aktiv ist.
+        """
+        self._write_pos = 0
+        self._read_pos = 0
+        self.dropped_samples = 0
+
+
+class RecordingBuffer:
+    """
+    Wachsender, zusammenhängender Aufnahmepuffer auf NumPy-Basis.
+
+    Die Samples werden als int16 in einem einzigen Array gespeichert, das bei Bedarf
+    auf die doppelte Größe wächst (amortisiert O(1) pro Sample). reset() behält den
+    reservierten Speicher, sodass derselbe Puffer über viele Aufnahmen hinweg ohne
+    neue Allokationen wiederverwendet wird.
+
+    Mit einer Auslagerungsgrenze wird der Puffer beim Überschreiten dieser Größe in eine
+    temporäre Datei verschoben und als NumPy-memmap weitergeführt.
+    """
+
+    def __init__(self, initial_capacity: int = 65536, dtype=np.int16, spill_bytes: Optional[int] = None):
+        """
+        Initialisiert den Aufnahmepuffer.
+
+        :param initial_capacity: Anfangskapazität in Samples
+        :param dtype: Datentyp der gespeicherten Samples
+        :param spill_bytes: Größe in Bytes, ab der auf eine temporäre Datei ausgelagert wird (None = nie)
+        """
+        self._buffer = np.empty(max(1, int(initial_capacity)), dtype=dtype)
+        self._length = 0
+        self._float_scratch: Optional[np.ndarray] = None
+        self.spill_bytes = spill_bytes
+        self._spill_file = None
+        self._ram_buffer: Optional[np.ndarray] = None  # Arbeitsspeicher-Puffer für die Zeit nach der Auslagerung
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def dtype(self):
+        return self._buffer.dtype
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def spilled(self) -> bool:
+        """True, solange die Samples in einer temporären Datei liegen."""
+        return self._spill_file is not None
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Vergrößert den Puffer durch Verdopplung, bis mindestens required Samples passen."""
+        if required <= len(self._buffer):
+            return
+        new_capacity = max(required, 2 * len(self._buffer))
+        if self.spilled or (self.spill_bytes and new_capacity * self._buffer.itemsize > self.spill_bytes):
+            self._grow_on_disk(new_capacity)
+            return
+        new_buffer = np.empty(new_capacity, dtype=self._buffer.dtype)
+        new_buffer[:self._length] = self._buffer[:self._length]
+        self._buffer = new_buffer
+
+    def _grow_on_disk(self, new_capacity: int) -> None:
+        """
+        Vergrößert den Puffer in einer temporären Datei.
+
+        Die Datei wird nur verlängert (dünn belegt); bereits geschriebene Samples bleiben an
+        ihrer Stelle und müssen beim Wachsen nicht kopiert werden.
+        """
+        first_spill = self._spill_file is None
+        if first_spill:
+            self._spill_file = tempfile.TemporaryFile(prefix="wortweber_", suffix=".raw", dir=RECORDING_SPILL_DIR)
+            logger.info(f"Aufnahme überschreitet {self.spill_bytes // (1024 * 1024)} MB und wird auf den Datenträger ausgelagert")
+        self._spill_file.truncate(new_capacity * self._buffer.itemsize)
+        new_buffer = np.memmap(self._spill_file, dtype=self._buffer.dtype, mode='r+', shape=(new_capacity,))
+        if first_spill:
+            new_buffer[:self._length] = self._buffer[:self._length]
+            self._ram_buffer = self._buffer
+        self._buffer = new_buffer
+
+    def append(self, data) -> None:
+        """
+        Hängt Samples an den Puffer an.
+
+        :param data: Rohdaten als bytes oder Samples als NumPy-Array
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = np.frombuffer(data, dtype=self._buffer.dtype)
+        n = len(data)
+        if n == 0:
+            return
+        self._ensure_capacity(self._length + n)
+        self._buffer[self._length:self._length + n] = data
+        self._length += n
+
+    def view(self) -> np.ndarray:
+        """
+        Gibt eine Sicht auf die gespeicherten Samples zurück (ohne Kopie).
+
+        Die Sicht ist nur bis zum nächsten append() oder reset() gültig. Bei einem
+        ausgelagerten Puffer ist sie eine NumPy-memmap auf die temporäre Datei.
+
+        :return: Die Samples im gespeicherten Datentyp
+        """
+        return self._buffer[:self._length]
+
+    def as_float32(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Konvertiert die Samples in einem einzigen Durchlauf nach float32 im Bereich [-1, 1).
+
+        Ohne out wird ein interner Arbeitspuffer wiederverwendet, der wie der Aufnahmepuffer
+        nur wächst. Das Ergebnis ist dann bis zum nächsten Aufruf gültig; wer es länger
+        benötigt, muss eine Kopie anlegen oder ein eigenes out übergeben.
+
+        :param out: Optionales Zielarray mit mindestens len(self) Elementen
+        :return: Die normalisierten Samples als float32
+        """
+        if self._buffer.dtype == np.float32:
+            return self.view()
+        if out is None:
+            if self._float_scratch is None or len(self._float_scratch) < self._length:
+                self._float_scratch = np.empty(len(self._buffer), dtype=np.float32)
+            out = self._float_scratch
+        out = out[:self._length]
+        np.multiply(self.view(), np.float32(1.0 / 32768.0), out=out, dtype=np.float32)
+        return out
+
+    def tobytes(self) -> bytes:
+        """Gibt die gespeicherten Samples als Rohdaten zurück."""
+        return self.view().tobytes()
+
+    def reset(self) -> None:
+        """
+        Leert den Puffer, behält aber den reservierten Speicher.
+
+        Ein ausgelagerter Puffer kehrt in den Arbeitsspeicher zurück; die temporäre Datei wird
+        freigegeben, sobald keine Sicht mehr auf sie verweist.
+        """
+        self._length = 0
+        if self._spill_file is not None:
+            self._buffer = self._ram_buffer
+            self._ram_buffer = None
+            self._spill_file.close()
+            self._spill_file = None
+
+
+def spill_copy(data: np.ndarray, spill_bytes: Optional[int] = None) -> np.ndarray:
+    """
+    Legt eine eigenständige Kopie von Samples an, bei Überschreiten der Grenze als memmap auf eine temporäre Datei.
+
+    :param data: Die zu kopierenden Samples
+    :param spill_bytes: Größe in Bytes, ab der die Kopie ausgelagert wird (None = nie)
+    :return: Die Kopie als NumPy-Array oder NumPy-memmap
+    """
+    if spill_bytes is None or data.nbytes <= spill_bytes:
+        return np.array(data)
+    with tempfile.TemporaryFile(prefix="wortweber_", suffix=".raw", dir=RECORDING_SPILL_DIR) as f:
+        copy = np.memmap(f, dtype=data.dtype, mode='w+', shape=data.shape)
+    # Die Abbildung bleibt nach dem Schließen der Datei gültig, die Datei verschwindet mit der letzten Sicht
+    copy[:] = data
+    return copy
+
+# Zusätzliche Erklärungen:
+
+# 1. SPSC-Prinzip:
+#    Der Ringpuffer ist für genau einen schreibenden und einen lesenden Thread ausgelegt.
+#    Da jede Position nur von einer Seite verändert wird, genügen einfache Zuweisungen
+#    ohne Sperren. Der PyAudio-Callback kann dadurch nie auf den Aufnahme-Thread warten.
+
+# 2. Vorallokation:
+#    Der Speicher wird einmalig bei der Initialisierung angelegt. Während der Aufnahme
+#    finden im Callback keine Allokationen statt, nur ein bis zwei Slice-Kopien.
+
+# 3. Überlauf:
+#    Ist der Puffer voll, weil der Konsument zu lange blockiert war, werden neue Samples
+#    verworfen und gezählt, anstatt den Callback aufzuhalten.
+
+# 4. RecordingBuffer:
+#    Statt einer Liste von Byte-Chunks, die am Ende mit b''.join, np.frombuffer, astype und
+#    einer Division in drei vollständigen Kopien umgewandelt wird, liegt die Aufnahme direkt
+#    als zusammenhängendes int16-Array vor. as_float32 erzeugt die normalisierte Fassung in
+#    einem einzigen Durchlauf in einen wiederverwendeten Arbeitspuffer.
+
+# 5. Auslagerung langer Aufnahmen:
+#    Überschreitet ein RecordingBuffer seine Auslagerungsgrenze, wird er als memmap auf einer anonymen
+#    temporären Datei weitergeführt. Der Arbeitsspeicher bleibt damit auf die Grenze beschränkt; das
+#    Betriebssystem lädt nur die Seiten, die Resampling, VAD und Transkription gerade lesen. spill_copy
+#    verwendet dasselbe Verfahren für wartende Aufnahmen, die bis zum Laden des Modells aufbewahrt werden.
@@ -0,0 +1,396 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält das Einlesen von Audiodateien für die Wortweber-Anwendung.
+
+Der AudioFileReader liest WAV-, FLAC- und Roh-PCM-Dateien blockweise und liefert float32-Mono-Blöcke.
+Dateien auf dem Datenträger werden, wo möglich, per memmap gelesen; Dateiobjekte und Pipes werden
+blockweise gelesen. read_audio führt die Blöcke durch denselben StreamingResampler wie die
+Mikrofonaufnahme, sodass auch lange Archive nie vollständig im Rohformat im Speicher liegen.
+"""
+
+# Standardbibliotheken
+import os
+import struct
+import subprocess
+import threading
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, DEFAULT_RESAMPLER_ENGINE, AUDIO_FILE_FORMATS, AUDIO_FILE_READ_FRAMES, RAW_SAMPLE_FORMATS,
+    FFMPEG_BINARY
+)
+from src.backend.audio_buffer import RecordingBuffer
+from src.backend.resampler import StreamingResampler
+from src.utils.error_handling import logger
+
+AudioInput = Union[str, os.PathLike, BinaryIO]  # Pfad oder binäres Dateiobjekt einer Audiodatei
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Sampleformat -> (NumPy-Datentyp, Bytes je Sample); int24 hat keinen NumPy-Datentyp
+_SAMPLE_FORMATS = {
+    "uint8": ("u1", 1),
+    "int16": ("<i2", 2),
+    "int24": (None, 3),
+    "int32": ("<i4", 4),
+    "float32": ("<f4", 4),
+    "float64": ("<f8", 8),
+}
+
+_RAW_EXTENSIONS = (".raw", ".pcm")
+
+
+class AudioFileInfo(NamedTuple):
+    """Eigenschaften einer Audiodatei."""
+    file_format: str  # "wav", "flac" oder "raw"
+    sample_rate: int
+    channels: int
+    sample_format: str  # Schlüssel aus _SAMPLE_FORMATS
+    frames: Optional[int]  # None, wenn die Länge vorab nicht bekannt ist
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Liest bis zu size Bytes; Pipes liefern ggf. in mehreren Teilen."""
+    parts = []
+    while size > 0:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b"".join(parts)
+
+
+def _to_float32_mono(data: Union[bytes, np.ndarray], sample_format: str, channels: int) -> np.ndarray:
+    """
+    Wandelt Rohsamples in float32-Mono im Bereich [-1, 1] um.
+
+    :param data: Rohdaten als bytes oder Samples im Dateiformat (z.B. eine memmap-Sicht)
+    :param sample_format: Sampleformat der Daten
+    :param channels: Anzahl der verschachtelten Kanäle
+    :return: Mono-Samples als float32
+    """
+    dtype, width = _SAMPLE_FORMATS[sample_format]
+    if sample_format == "int24":
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        # Das oberste Byte trägt das Vorzeichen; der arithmetische Shift stellt den 24-Bit-Wert her
+        samples = (padded.view("<i4").reshape(-1) >> 8).astype(np.float32) / np.float32(2 ** 23)
+    else:
+        samples = np.frombuffer(data, dtype=dtype) if isinstance(data, (bytes, bytearray)) else data.reshape(-1)
+        if sample_format == "uint8":
+            samples = (samples.astype(np.float32) - 128.0) / 128.0
+        elif sample_format == "int16":
+            samples = samples.astype(np.float32) / np.float32(32768.0)
+        elif sample_format == "int32":
+            samples = (samples / 2.0 ** 31).astype(np.float32)
+        else:
+            samples = samples.astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def _parse_wav_header(stream: BinaryIO) -> Tuple[int, int, str, int, Optional[int]]:
+    """
+    Liest den RIFF-Kopf bis zum Beginn der Samples.
+
+    :param stream: Dateiobjekt, positioniert am Dateianfang
+    :return: Abtastrate, Kanäle, Sampleformat, Offset und Länge des Datenblocks in Bytes (None = bis Dateiende)
+    """
+    header = _read_exact(stream, 12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Keine gültige WAV-Datei (RIFF/WAVE-Kopf fehlt).")
+    offset = 12
+    fmt = None
+    while True:
+        chunk_header = _read_exact(stream, 8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV-Datei enthält keinen Datenblock.")
+        chunk_id, chunk_size = chunk_header[:4], struct.unpack("<I", chunk_header[4:])[0]
+        offset += 8
+        if chunk_id == b"data":
+            break
+        body = _read_exact(stream, chunk_size + (chunk_size & 1))  # Blöcke sind auf gerade Längen aufgefüllt
+        offset += len(body)
+        if chunk_id == b"fmt ":
+            fmt = body
+    if fmt is None or len(fmt) < 16:
+        raise ValueError("WAV-Datei enthält keinen gültigen fmt-Block.")
+
+    format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]  # Die ersten zwei Bytes der SubFormat-GUID
+    if format_tag == _WAVE_FORMAT_PCM and bits in (8, 16, 24, 32):
+        sample_format = {8: "uint8", 16: "int16", 24: "int24", 32: "int32"}[bits]
+    elif format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        sample_format = f"float{bits}"
+    else:
+        raise ValueError(f"Nicht unterstütztes WAV-Format: Typ {format_tag:#x}, {bits} Bit")
+    # 0 und 0xFFFFFFFF kennzeichnen Dateien, deren Länge beim Schreiben nicht bekannt war
+    data_bytes = None if chunk_size in (0, 0xFFFFFFFF) else chunk_size
+    return sample_rate, channels, sample_format, offset, data_bytes
+
+
+def _parse_flac_streaminfo(header: bytes) -> Tuple[int, int, Optional[int]]:
+    """
+    Liest Abtastrate, Kanäle und Länge aus dem STREAMINFO-Block einer FLAC-Datei.
+
+    :param header: Die ersten 42 Bytes der Datei
+    :return: Abtastrate, Kanäle und Anzahl der Frames (None, wenn unbekannt)
+    """
+    if len(header) < 42 or header[:4] != b"fLaC" or header[4] & 0x7F != 0:
+        raise ValueError("Keine gültige FLAC-Datei (STREAMINFO fehlt).")
+    # Ab Byte 10 des STREAMINFO-Blocks: 20 Bit Rate, 3 Bit Kanäle-1, 5 Bit Bits-1, 36 Bit Samples
+    packed = int.from_bytes(header[18:26], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total = packed & ((1 << 36) - 1)
+    return sample_rate, channels, total or None
+
+
+class AudioFileReader:
+    """
+    Liest eine Audiodatei blockweise als float32-Mono.
+
+    WAV- und Roh-PCM-Dateien auf dem Datenträger werden per memmap gelesen; das Betriebssystem
+    lädt nur die Seiten, die gerade umgewandelt werden. Dateiobjekte werden blockweise gelesen.
+    FLAC wird von ffmpeg als 16-Bit-Mono-PCM über eine Pipe dekodiert.
+    """
+
+    def __init__(self, source: AudioInput, file_format: Optional[str] = None, sample_rate: Optional[int] = None,
+                 channels: int = 1, sample_format: str = "int16"):
+        """
+        Öffnet die Audiodatei und liest ihren Kopf.
+
+        :param source: Pfad oder binäres Dateiobjekt
+        :param file_format: "wav", "flac" oder "raw"; ohne Angabe wird das Format am Dateikopf erkannt
+        :param sample_rate: Abtastrate von Roh-PCM in Hz (nur für "raw")
+        :param channels: Anzahl der verschachtelten Kanäle von Roh-PCM (nur für "raw")
+        :param sample_format: Sampleformat von Roh-PCM, siehe RAW_SAMPLE_FORMATS (nur für "raw")
+        """
+        self._path = os.fspath(source) if isinstance(source, (str, os.PathLike)) else None
+        self._stream: Optional[BinaryIO] = open(self._path, "rb") if self._path else source
+        self._owns_stream = self._path is not None
+        self._memmap: Optional[np.memmap] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._prefix = b""  # Bereits gelesene Kopfdaten eines nicht spulbaren Dateiobjekts
+        self._data_bytes: Optional[int] = None
+        try:
+            file_format = file_format or self._detect_format(sample_rate)
+            if file_format not in AUDIO_FILE_FORMATS:
+                raise ValueError(f"Nicht unterstütztes Audioformat: {file_format}")
+            if file_format == "wav":
+                self._open_wav()
+            elif file_format == "flac":
+                self._open_flac()
+            else:
+                self._open_raw(sample_rate, channels, sample_format)
+        except Exception:
+            self.close()
+            raise
+        logger.debug(f"Audiodatei geöffnet: {self.info}")
+
+    def _detect_format(self, sample_rate: Optional[int]) -> str:
+        """Erkennt das Format an den ersten vier Bytes, Roh-PCM an der Endung oder einer angegebenen Rate."""
+        seekable = self._stream.seekable() if hasattr(self._stream, "seekable") else False
+        if not seekable:
+            if sample_rate:
+                return "raw"
+            raise ValueError("Für nicht spulbare Datenströme muss das Format angegeben werden.")
+        start = self._stream.tell()
+        magic = self._stream.read(4)
+        self._stream.seek(start)
+        if magic == b"RIFF":
+            return "wav"
+        if magic == b"fLaC":
+            return "flac"
+        if sample_rate or (self._path and self._path.lower().endswith(_RAW_EXTENSIONS)):
+            return "raw"
+        raise ValueError("Unbekanntes Audioformat. Unterstützt werden WAV, FLAC und Roh-PCM mit Angabe der Abtastrate.")
+
+    def _open_wav(self) -> None:
+        sample_rate, channels, sample_format, offset, data_bytes = _parse_wav_header(self._stream)
+        frame_bytes = channels * _SAMPLE_FORMATS[sample_format][1]
+        if self._path:
+            available = os.path.getsize(self._path) - offset
+            data_bytes = available if data_bytes is None else min(data_bytes, available)
+        frames = None if data_bytes is None else data_bytes // frame_bytes
+        self.info = AudioFileInfo("wav", sample_rate, channels, sample_format, frames)
+        self._data_bytes = data_bytes
+        self._map_samples(offset)
+
+    def _open_raw(self, sample_rate: Optional[int], channels: int, sample_format: str) -> None:
+        if not sample_rate:
+            raise ValueError("Für Roh-PCM muss die Abtastrate angegeben werden.")
+        if sample_format not in RAW_SAMPLE_FORMATS:
+            raise ValueError(f"Nicht unterstütztes Sampleformat für Roh-PCM: {sample_format}")
+        frames = None
+        if self._path:
+            self._data_bytes = os.path.getsize(self._path)
+            frames = self._data_bytes // (channels * _SAMPLE_FORMATS[sample_format][1])
+        self.info = AudioFileInfo("raw", int(sample_rate), channels, sample_format, frames)
+        self._map_samples(0)
+
+    def _map_samples(self, offset: int) -> None:
+        """Bildet die Samples einer Datei auf dem Datenträger per memmap ab, sofern ihr Format das erlaubt."""
+        dtype = _SAMPLE_FORMATS[self.info.sample_format][0]
+        if self._path is None or dtype is None or not self.info.frames:
+            return
+        self._memmap = np.memmap(self._path, dtype=dtype, mode="r", offset=offset,
+                                 shape=(self.info.frames * self.info.channels,))
+
+    def _open_flac(self) -> None:
+        header = _read_exact(self._stream, 42)
+        sample_rate, channels, frames = _parse_flac_streaminfo(header)
+        self.info = AudioFileInfo("flac", sample_rate, channels, "int16", frames)
+        command = [FFMPEG_BINARY, "-loglevel", "error", "-i", self._path or "pipe:0", "-f", "s16le", "-ac", "1", "-"]
+        try:
+            self._process = subprocess.Popen(command, stdin=None if self._path else subprocess.PIPE,
+                                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            raise RuntimeError(f"Für FLAC-Dateien wird '{FFMPEG_BINARY}' benötigt, wurde aber nicht gefunden.")
+        if not self._path:
+            self._prefix = header
+            threading.Thread(target=self._feed_decoder, daemon=True).start()
+
+    def _feed_decoder(self) -> None:
+        """Übergibt ein Dateiobjekt blockweise an die Standardeingabe von ffmpeg."""
+        try:
+            self._process.stdin.write(self._prefix)
+            while True:
+                data = self._stream.read(1 << 16)
+                if not data:
+                    break
+                self._process.stdin.write(data)
+        except (BrokenPipeError, ValueError, OSError):
+            pass  # ffmpeg wurde beendet oder der Leser geschlossen
+        finally:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+
+    def blocks(self, frames_per_block: int = AUDIO_FILE_READ_FRAMES) -> Iterator[np.ndarray]:
+        """
+        Liefert die Samples der Datei blockweise.
+
+        :param frames_per_block: Frames je Block
+        :return: Iterator über float32-Mono-Blöcke im Bereich [-1, 1]
+        """
+        channels = self.info.channels
+        if self._memmap is not None:
+            step = frames_per_block * channels
+            for start in range(0, len(self._memmap), step):
+                yield _to_float32_mono(self._memmap[start:start + step], self.info.sample_format, channels)
+            return
+
+        if self._process is not None:
+            stream, sample_format, channels, remaining = self._process.stdout, "int16", 1, None
+        else:
+            stream, sample_format, remaining = self._stream, self.info.sample_format, self._data_bytes
+        frame_bytes = channels * _SAMPLE_FORMATS[sample_format][1]
+        pending = b""  # Unvollständiger Frame am Ende eines Reads
+        while remaining is None or remaining > 0:
+            size = frames_per_block * frame_bytes
+            if remaining is not None:
+                size = min(size, remaining)
+            data = _read_exact(stream, size)
+            if not data:
+                break
+            if remaining is not None:
+                remaining -= len(data)
+            data = pending + data
+            usable = len(data) - len(data) % frame_bytes
+            pending = data[usable:]
+            if usable:
+                yield _to_float32_mono(data[:usable], sample_format, channels)
+
+    def close(self) -> None:
+        """Gibt Datei, memmap und Decoder frei."""
+        self._memmap = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> "AudioFileReader":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+def read_audio(source: AudioInput, output_rate: int = TARGET_RATE, engine: str = DEFAULT_RESAMPLER_ENGINE,
+               conditioner=None, spill_bytes: Optional[int] = None, **reader_options) -> np.ndarray:
+    """
+    Liest eine Audiodatei und resampelt sie blockweise auf die Ziel-Abtastrate.
+
+    :param source: Pfad oder binäres Dateiobjekt
+    :param output_rate: Ziel-Abtastrate in Hz
+    :param engine: Resampling-Verfahren ("polyphase", "linear" oder "fft")
+    :param conditioner: Optionaler AudioConditioner, der auf jeden resampelten Block angewendet wird
+    :param spill_bytes: Größe in Bytes, ab der das Ergebnis in eine temporäre Datei ausgelagert wird
+    :param reader_options: Weitere Argumente für AudioFileReader (file_format, sample_rate, channels, sample_format)
+    :return: Die Samples als float32 (bei langen Dateien eine memmap)
+    """
+    with AudioFileReader(source, **reader_options) as reader:
+        resampler = StreamingResampler(reader.info.sample_rate, output_rate, engine)
+        expected = AUDIO_FILE_READ_FRAMES
+        if reader.info.frames:
+            expected = int(reader.info.frames * output_rate / reader.info.sample_rate) + 1
+        output = RecordingBuffer(initial_capacity=expected, dtype=np.float32, spill_bytes=spill_bytes)
+        for block in reader.blocks():
+            resampled = resampler.process(block)
+            output.append(conditioner.process(resampled) if conditioner else resampled)
+        tail = resampler.flush()
+        output.append(conditioner.process(tail) if conditioner else tail)
+    return output.view()
+
+# Zusätzliche Erklärungen:
+
+# 1. Formaterkennung:
+#    WAV ("RIFF") und FLAC ("fLaC") werden an den ersten vier Bytes erkannt. Roh-PCM hat keinen Kopf und
+#    benötigt daher Abtastrate, Kanalzahl und Sampleformat; Dateien mit der Endung .raw oder .pcm bzw.
+#    Aufrufe mit sample_rate werden als Roh-PCM gelesen.
+
+# 2. memmap:
+#    Für WAV und Roh-PCM auf dem Datenträger wird der Datenblock direkt per np.memmap abgebildet. Die
+#    Umwandlung nach float32 erfolgt je Block; die Datei wird nie vollständig eingelesen. 24-Bit-WAV hat
+#    keinen passenden NumPy-Datentyp und wird blockweise gelesen.
+
+# 3. FLAC:
+#    FLAC wird mit ffmpeg dekodiert, das für Whisper ohnehin installiert sein muss. ffmpeg mischt auf Mono
+#    herunter, behält aber die Abtastrate aus dem STREAMINFO-Block bei, damit dasselbe Resampling wie bei
+#    der Mikrofonaufnahme verwendet wird.
+
+# 4. Ergebnis:
+#    read_audio sammelt die resampelten Blöcke in einem RecordingBuffer. Mit spill_bytes werden lange
+#    Dateien wie lange Aufnahmen in eine temporäre Datei ausgelagert.
@@ -15,29 +15,90 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from src.utils.error_handling import handle_exceptions, logger
-from src.config import AUDIO_FORMAT, AUDIO_CHANNELS, AUDIO_RATE, AUDIO_CHUNK, TARGET_RATE, DEFAULT_AUDIO_DEVICE_INDEX, DEFAULT_INCOGNITO_MODE
+from src.config import (
+    AUDIO_FORMAT, AUDIO_CHANNELS, AUDIO_RATE, AUDIO_CHUNK, TARGET_RATE, DEFAULT_AUDIO_DEVICE_INDEX, DEFAULT_INCOGNITO_MODE,
+    CAPTURE_MODES, DEFAULT_CAPTURE_MODE, AUDIO_RING_BUFFER_SECONDS, RESAMPLER_ENGINES, DEFAULT_RESAMPLER_ENGINE,
+    CAPTURE_RATE_CANDIDATES, DEFAULT_NEGOTIATE_CAPTURE_RATE, DEFAULT_WARM_STREAM, DEFAULT_PREROLL_MS,
+    PREROLL_TRIM_INTERVAL, RECORDER_JOIN_TIMEOUT, DEFAULT_DEVICE_MONITORING, TEST_RECORDING_PATH,
+    DEFAULT_HIGHPASS_ENABLED, DEFAULT_AGC_ENABLED, DEFAULT_AGC_TARGET_DB, CHANNEL_MODES, DEFAULT_CHANNEL_MODE,
+    DEFAULT_CAPTURE_CHANNEL, CAPTURE_MAX_CHANNELS
+)
+from src.backend.audio_buffer import AudioRingBuffer
+from src.backend.device_registry import AudioDeviceRegistry
+from src.backend.recording_sink import WavRecordingSink
+from src.backend.level_meter import LevelMeter
+from src.backend.capture_metrics import CaptureMetrics
+from src.backend.resampler import StreamingResampler, resample
+from src.backend.conditioning import AudioConditioner
+from src.backend.channel_mixer import ChannelMixer
+from src.backend.capture_process import CaptureProcess
+from src.backend.audio_source import PyAudioSource
 import pyaudio
 import numpy as np
-from scipy import signal
+import math
+import threading
 import time
 import warnings
-import os
-import wave
 import contextlib
 
 # Unterdrücke RuntimeWarnings, die oft bei Audiooperationen auftreten können
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
+def _conversion_cost(rate, target_rate):
+    """
+    Bewertet den Aufwand, eine Aufnahmerate in die Ziel-Abtastrate umzurechnen.
+
+    :return: Ein vergleichbares Tupel; kleinere Werte bedeuten weniger Aufwand
+    """
+    if rate == target_rate:
+        return (0, 0)
+    if rate % target_rate == 0:
+        return (1, rate // target_rate)
+    divisor = math.gcd(rate, target_rate)
+    return (2, rate // divisor + target_rate // divisor)
+
 class AudioProcessor:
     @handle_exceptions
-    def __init__(self, settings_manager):
+    def __init__(self, settings_manager, audio_source_factory=None):
+        """
+        Initialisiert den AudioProcessor.
+
+        :param settings_manager: Der SettingsManager für die Verwaltung von Einstellungen
+        :param audio_source_factory: Erzeugt die Audioquelle (AudioSource), z.B. eine VirtualAudioSource für
+                                     Tests ohne Hardware; standardmäßig PyAudioSource
+        """
         self.settings_manager = settings_manager
+        self._audio_source_factory = audio_source_factory or PyAudioSource
         self.RATE = AUDIO_RATE
         self.TARGET_RATE = TARGET_RATE
-        self.last_recording = None
-        self.p = pyaudio.PyAudio()
+        self.capture_metrics = CaptureMetrics(self.RATE, AUDIO_CHUNK)  # Zähler der laufenden bzw. letzten Aufnahme
+        self._dropped_baseline = 0  # Stand von ring_buffer.dropped_samples zu Beginn der Aufnahme
+        self.level_meter = LevelMeter()  # Pegel der laufenden Aufnahme, von der Oberfläche abgefragt
+        self.recording_sink = None  # Schreibt die laufende Aufnahme bei aktivem "save_test_recording" mit
+        self.p = self._audio_source_factory()
+        self.device_registry = AudioDeviceRegistry()
+        self.device_registry.refresh(self.p)
+        self.on_devices_changed = None  # Callback mit einer Statusmeldung nach einer Geräteänderung
+        self._device_lock = threading.RLock()  # Schützt den Neuaufbau von PyAudio gegen einen Aufnahmestart
+        self._recording = False
+        self._devices_changed_pending = False
         self.current_device_index = self.get_device_index()
         self.stream = None
+        self.ring_buffer = AudioRingBuffer(int(self.RATE * AUDIO_RING_BUFFER_SECONDS))
+        self.stream_resampler = None
+        self.channel_mixer = ChannelMixer(AUDIO_CHANNELS)  # Wird beim Öffnen des Streams für dessen Kanalzahl erzeugt
+        self._mono_unsupported = set()  # Geräte, die das Öffnen mit einem Kanal abgelehnt haben
+        self.conditioner = AudioConditioner(self.TARGET_RATE)  # Hochpass und AGC; die Verstärkung bleibt zwischen Aufnahmen erhalten
+        self._supported_rates = {}  # Zwischenspeicher der unterstützten Raten je Geräteindex und Kanalzahl
+        self._apply_capture_rate(self.select_capture_rate())
+        self.warm_stream_active = False
+        self._capturing = False  # True, solange eine Aufnahme den Ringpuffer des offenen Streams liest
+        self._consumer_lock = threading.Lock()  # Schützt den Wechsel des Konsumenten zwischen Vorlauf und Aufnahme
+        self._preroll_thread = None
+        if self.keeps_stream_open():
+            self.start_warm_stream()
+        if self.settings_manager.get_setting("device_monitoring", DEFAULT_DEVICE_MONITORING):
+            self.device_registry.start_monitoring(self._on_hardware_change)
         logger.debug(f"AudioProcessor initialisiert mit Geräteindex: {self.current_device_index}")
 
     def __del__(self):
@@ -45,33 +106,93 @@ class AudioProcessor:
 
     @handle_exceptions
     def cleanup(self):
+        self.device_registry.stop_monitoring()
+        self._release_audio()
+        logger.debug("AudioProcessor Ressourcen bereinigt")
+
+    def _release_audio(self):
+        """Schließt den Stream und beendet PyAudio, ohne die Geräteüberwachung anzuhalten."""
+        self.stop_warm_stream()
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
         if self.p:
             self.p.terminate()
-        logger.debug("AudioProcessor Ressourcen bereinigt")
 
     @handle_exceptions
     def reinitialize(self):
-        self.cleanup()
-        self.p = pyaudio.PyAudio()
-        self.current_device_index = self.get_device_index()
+        with self._device_lock:
+            self._release_audio()
+            self.p = self._audio_source_factory()
+            self.device_registry.refresh(self.p)
+            self.current_device_index = self.get_device_index()
+            self._supported_rates.clear()
+            self._apply_capture_rate(self.select_capture_rate())
+            if self.keeps_stream_open():
+                self.start_warm_stream()
         logger.debug("AudioProcessor reinitialisiert")
 
+    def _on_hardware_change(self):
+        """
+        Wird vom Überwachungs-Thread des Geräteverzeichnisses bei einer Hardwareänderung aufgerufen.
+
+        Während einer Aufnahme wird der Neuaufbau nur vorgemerkt und nach deren Ende nachgeholt,
+        damit der laufende Stream nicht geschlossen wird.
+        """
+        with self._device_lock:
+            if self._recording:
+                self._devices_changed_pending = True
+                logger.info("Geräteänderung während der Aufnahme erkannt, Aktualisierung folgt nach der Aufnahme")
+                return
+            self._devices_changed_pending = False
+            previous_index = self.current_device_index
+            self.reinitialize()
+            message = self._describe_device_change(previous_index)
+        logger.info(message)
+        if self.on_devices_changed:
+            self.on_devices_changed(message)
+
+    def _describe_device_change(self, previous_index):
+        """Erstellt die Statusmeldung nach einer Geräteänderung."""
+        preferred = self.settings_manager.get_setting("audio_device_name", "")
+        current = self.get_current_device_info()
+        name = current['name'] if current else "kein Eingabegerät"
+        if preferred and current and current['name'] != preferred:
+            return f"Audiogerät '{preferred}' nicht verfügbar, verwende {name}"
+        if self.current_device_index != previous_index:
+            return f"Audiogeräte geändert, verwende {name} (Index: {self.current_device_index})"
+        return f"Audiogeräte geändert: {self.device_registry.device_count()} Geräte"
+
+    @handle_exceptions
+    def refresh_devices(self):
+        """Liest die Audiogeräte neu ein, sofern keine Aufnahme läuft."""
+        self._on_hardware_change()
+
     @handle_exceptions
     def get_device_index(self):
-        try:
-            index = int(self.settings_manager.get_setting("audio_device_index", DEFAULT_AUDIO_DEVICE_INDEX))
-            if 0 <= index < self.p.get_device_count():
-                logger.debug(f"Verwende gespeicherten Audiogeräteindex: {index}")
+        # Der Name bleibt auch dann stabil, wenn PortAudio die Indizes nach einer Hardwareänderung neu vergibt
+        preferred_name = self.settings_manager.get_setting("audio_device_name", "")
+        if isinstance(preferred_name, str) and preferred_name:
+            index = self.device_registry.find_input_by_name(preferred_name)
+            if index is not None:
+                logger.debug(f"Verwende gespeichertes Audiogerät '{preferred_name}' (Index: {index})")
+                self.settings_manager.set_setting("audio_device_index", index)
                 return index
-            else:
-                logger.warning(f"Gespeicherter Index {index} ungültig. Verwende Standardgerät.")
-        except (ValueError, TypeError):
-            logger.warning("Ungültiger Audiogeräteindex in den Einstellungen.")
-
-        default_index = self.p.get_default_input_device_info()['index']
+            logger.warning(f"Gespeichertes Audiogerät '{preferred_name}' nicht gefunden. Verwende Standardgerät.")
+        else:
+            try:
+                index = int(self.settings_manager.get_setting("audio_device_index", DEFAULT_AUDIO_DEVICE_INDEX))
+                if self.device_registry.is_input_available(index):
+                    logger.debug(f"Verwende gespeicherten Audiogeräteindex: {index}")
+                    return index
+                else:
+                    logger.warning(f"Gespeicherter Index {index} ungültig. Verwende Standardgerät.")
+            except (ValueError, TypeError):
+                logger.warning("Ungültiger Audiogeräteindex in den Einstellungen.")
+
+        # Der gespeicherte Name bleibt erhalten, damit das Gerät beim Wiedereinstecken erneut gewählt wird
+        default_index = self.device_registry.default_input_index()
         logger.info(f"Verwende Standardgeräteindex: {default_index}")
         self.settings_manager.set_setting("audio_device_index", default_index)
         return default_index
@@ -79,7 +200,9 @@ class AudioProcessor:
     @handle_exceptions
     def get_current_device_info(self):
         try:
-            device_info = self.p.get_device_info_by_index(self.current_device_index)
+            device_info = self.device_registry.get_device(self.current_device_index)
+            if device_info is None:
+                return None
             return {
                 'index': self.current_device_index,
                 'name': device_info.get('name', 'Unbekanntes Gerät')
@@ -91,16 +214,44 @@ class AudioProcessor:
     @handle_exceptions
     def update_device(self, new_index):
         new_index = int(new_index)  # Explizite Konvertierung zu int
-        if 0 <= new_index < self.p.get_device_count():
+        if self.device_registry.get_device(new_index) is not None:
+            was_warm = self.warm_stream_active
+            self.stop_warm_stream()
             self.current_device_index = new_index
             self.settings_manager.set_setting("audio_device_index", new_index)
+            self.settings_manager.set_setting("audio_device_name", self.device_registry.get_device(new_index).get('name', ''))
             self.settings_manager.save_settings()
+            self._apply_capture_rate(self.select_capture_rate())
+            if was_warm:
+                self.start_warm_stream()
             logger.debug(f"Audiogerät aktualisiert auf Index: {new_index}")
             return True
         else:
             logger.error(f"Ungültiger Audiogeräteindex: {new_index}")
             return False
 
+    @handle_exceptions
+    def update_channel_mode(self, mode, channel=DEFAULT_CAPTURE_CHANNEL):
+        """
+        Übernimmt Kanalmodus und Kanal; ein warmer Stream wird mit der neuen Kanalzahl neu geöffnet.
+
+        :param mode: "mono", "mix", "select" oder "delay_and_sum"
+        :param channel: Verwendeter Kanal im Modus "select"
+        :return: True, wenn der Modus übernommen wurde
+        """
+        if mode not in CHANNEL_MODES:
+            logger.error(f"Ungültiger Kanalmodus: {mode}")
+            return False
+        was_warm = self.warm_stream_active
+        self.stop_warm_stream()
+        self.settings_manager.set_setting("channel_mode", mode)
+        self.settings_manager.set_setting("capture_channel", int(channel))
+        self._apply_capture_rate(self.select_capture_rate())
+        if was_warm:
+            self.start_warm_stream()
+        logger.info(f"Kanalmodus geändert auf: {mode} (Kanal {channel})")
+        return True
+
     @contextlib.contextmanager
     def get_pyaudio(self):
         try:
@@ -111,8 +262,7 @@ class AudioProcessor:
     @handle_exceptions
     def check_device_availability(self):
         try:
-            device_info = self.p.get_device_info_by_index(self.current_device_index)
-            if device_info and device_info.get('maxInputChannels', 0) > 0:
+            if self.device_registry.is_input_available(self.current_device_index):
                 return True
             else:
                 logger.warning(f"Ausgewähltes Audiogerät (Index: {self.current_device_index}) ist nicht verfügbar oder hat keine Eingabekanäle.")
@@ -122,14 +272,166 @@ class AudioProcessor:
             return False
 
     @handle_exceptions
-    def open_audio_stream(self):
+    def get_supported_rates(self, device_index=None):
+        """
+        Ermittelt, welche Raten aus CAPTURE_RATE_CANDIDATES das Gerät für die Aufnahme unterstützt.
+
+        Das Ergebnis wird je Gerät zwischengespeichert, da die Abfrage bei manchen Treibern
+        das Gerät kurz öffnet.
+
+        :param device_index: Index des Geräts, standardmäßig das aktuelle Gerät
+        :return: Liste der unterstützten Raten in Hz
+        """
+        if device_index is None:
+            device_index = self.current_device_index
+        channels = self.select_capture_channels(device_index)
+        if (device_index, channels) in self._supported_rates:
+            return self._supported_rates[(device_index, channels)]
+
+        supported = []
+        for rate in CAPTURE_RATE_CANDIDATES:
+            try:
+                if self.p.is_format_supported(rate, input_device=device_index,
+                                              input_channels=channels, input_format=AUDIO_FORMAT):
+                    supported.append(rate)
+            except ValueError:
+                continue
+        self._supported_rates[(device_index, channels)] = supported
+        logger.debug(f"Unterstützte Aufnahmeraten für Gerät {device_index}: {supported}")
+        return supported
+
+    @handle_exceptions
+    def select_capture_rate(self):
+        """
+        Wählt die Aufnahmerate mit der günstigsten Umrechnung auf die Ziel-Abtastrate.
+
+        Bevorzugt werden die Ziel-Abtastrate selbst, dann ganzzahlige Dezimierung (kleinerer
+        Faktor zuerst) und zuletzt rationale Verhältnisse. Ohne unterstützte Kandidaten
+        bleibt AUDIO_RATE.
+
+        :return: Die gewählte Aufnahmerate in Hz
+        """
+        if not self.settings_manager.get_setting("negotiate_capture_rate", DEFAULT_NEGOTIATE_CAPTURE_RATE):
+            return AUDIO_RATE
+        supported = self.get_supported_rates()
+        if not supported:
+            logger.warning(f"Keine der geprüften Aufnahmeraten wird unterstützt. Verwende {AUDIO_RATE} Hz.")
+            return AUDIO_RATE
+        return min(supported, key=lambda rate: _conversion_cost(rate, self.TARGET_RATE))
+
+    @handle_exceptions
+    def get_channel_mode(self):
+        """
+        Gibt den konfigurierten Kanalmodus zurück.
+
+        :return: "mono", "mix", "select" oder "delay_and_sum"
+        """
+        mode = self.settings_manager.get_setting("channel_mode", DEFAULT_CHANNEL_MODE)
+        if mode not in CHANNEL_MODES:
+            logger.warning(f"Unbekannter Kanalmodus '{mode}'. Verwende {DEFAULT_CHANNEL_MODE}.")
+            return DEFAULT_CHANNEL_MODE
+        return mode
+
+    @handle_exceptions
+    def select_capture_channels(self, device_index=None):
+        """
+        Bestimmt, mit wie vielen Kanälen das Gerät geöffnet wird.
+
+        Im Modus "mono" wird einkanalig geöffnet, solange das Gerät das nicht abgelehnt hat. Die übrigen
+        Modi öffnen alle Eingangskanäle des Geräts (höchstens CAPTURE_MAX_CHANNELS).
+
+        :param device_index: Index des Geräts, standardmäßig das aktuelle Gerät
+        :return: Anzahl der zu öffnenden Kanäle
+        """
+        if device_index is None:
+            device_index = self.current_device_index
+        if self.get_channel_mode() == "mono" and device_index not in self._mono_unsupported:
+            return AUDIO_CHANNELS
+        device_info = self.device_registry.get_device(device_index) or {}
+        return max(1, min(int(device_info.get('maxInputChannels', 1)), CAPTURE_MAX_CHANNELS))
+
+    def _create_channel_mixer(self, channels):
+        """Erzeugt den ChannelMixer für einen Stream mit der angegebenen Kanalzahl."""
+        mode = self.get_channel_mode()
+        channel = int(self.settings_manager.get_setting("capture_channel", DEFAULT_CAPTURE_CHANNEL))
+        if channels > 1:
+            logger.info(f"Aufnahme mit {channels} Kanälen, Kanalmodus: {mode}")
+        return ChannelMixer(channels, mode, channel, self.RATE, AUDIO_CHUNK)
+
+    def _apply_capture_rate(self, rate):
+        """Übernimmt eine neue Aufnahmerate und passt den Ringpuffer an."""
+        if rate is None or rate == self.RATE:
+            return
+        self.RATE = rate
+        self.ring_buffer = AudioRingBuffer(int(self.RATE * AUDIO_RING_BUFFER_SECONDS))
+        logger.info(f"Aufnahmerate: {self.RATE} Hz")
+
+    @handle_exceptions
+    def get_capture_mode(self):
+        """
+        Gibt den konfigurierten Aufnahmemodus zurück.
+
+        :return: "callback" für die Callback-Aufnahme mit Ringpuffer, "blocking" für blockierende Reads,
+                 "process" für die Aufnahme in einem eigenen Prozess mit Ringpuffer im gemeinsamen Speicher
+        """
+        mode = self.settings_manager.get_setting("capture_mode", DEFAULT_CAPTURE_MODE)
+        if mode not in CAPTURE_MODES:
+            logger.warning(f"Unbekannter Aufnahmemodus '{mode}'. Verwende {DEFAULT_CAPTURE_MODE}.")
+            return DEFAULT_CAPTURE_MODE
+        return mode
+
+    @handle_exceptions
+    def get_resampler_engine(self):
+        """
+        Gibt das konfigurierte Resampling-Verfahren zurück.
+
+        :return: "polyphase", "linear" oder "fft"
+        """
+        engine = self.settings_manager.get_setting("resampler_engine", DEFAULT_RESAMPLER_ENGINE)
+        if engine not in RESAMPLER_ENGINES:
+            logger.warning(f"Unbekanntes Resampling-Verfahren '{engine}'. Verwende {DEFAULT_RESAMPLER_ENGINE}.")
+            return DEFAULT_RESAMPLER_ENGINE
+        return engine
+
+    @handle_exceptions
+    def open_audio_stream(self, stream_callback=None):
+        """
+        Öffnet den Eingabestream des ausgewählten Audiogeräts.
+
+        Im Aufnahmemodus "process" tritt an die Stelle eines Callback-Streams ein CaptureProcess,
+        dessen Ringpuffer im gemeinsamen Speicher den bisherigen Ringpuffer ersetzt.
+
+        :param stream_callback: Optionaler PyAudio-Callback; ohne Callback wird ein blockierender Stream geöffnet
+        :return: Der geöffnete Stream
+        """
+        channels = self.select_capture_channels()
+        # Vor dem Öffnen ersetzt, damit schon der erste Callback mit der passenden Kanalzahl arbeitet
+        self.channel_mixer = self._create_channel_mixer(channels)
         try:
-            self.stream = self.p.open(format=AUDIO_FORMAT, channels=AUDIO_CHANNELS, rate=self.RATE, input=True,
-                            frames_per_buffer=AUDIO_CHUNK, input_device_index=self.current_device_index)
+            # Der Aufnahmeprozess öffnet PortAudio selbst; andere Audioquellen bleiben im eigenen Prozess
+            if stream_callback is not None and self.get_capture_mode() == "process" and isinstance(self.p, PyAudioSource):
+                self.stream = CaptureProcess(self.current_device_index, self.RATE, channels, self.channel_mixer.mode,
+                                             self.channel_mixer.channel, self.ring_buffer.capacity)
+                self.ring_buffer = self.stream.ring_buffer
+                return self.stream
+            self.stream = self.p.open(format=AUDIO_FORMAT, channels=channels, rate=self.RATE, input=True,
+                            frames_per_buffer=AUDIO_CHUNK, input_device_index=self.current_device_index,
+                            stream_callback=stream_callback)
             return self.stream
         except IOError as e:
+            if e.errno == -9998 and channels == 1:  # Invalid number of channels: Gerät bietet kein Mono an
+                logger.warning(f"Das Audiogerät (Index: {self.current_device_index}) unterstützt keine Mono-Aufnahme. "
+                               f"Alle Kanäle werden gemischt.")
+                self._mono_unsupported.add(self.current_device_index)
+                self._apply_capture_rate(self.select_capture_rate())
+                return self.open_audio_stream(stream_callback)
             if e.errno == -9996:  # Device unavailable
                 logger.error(f"Das ausgewählte Audiogerät (Index: {self.current_device_index}) ist nicht verfügbar.")
+            elif e.errno == -9997 and self.RATE != AUDIO_RATE:  # Invalid sample rate trotz positiver Abfrage
+                logger.warning(f"Die Abtastrate {self.RATE} wird vom Gerät nicht unterstützt. Verwende {AUDIO_RATE} Hz.")
+                self._supported_rates[(self.current_device_index, channels)] = [AUDIO_RATE]
+                self._apply_capture_rate(AUDIO_RATE)
+                return self.open_audio_stream(stream_callback)
             elif e.errno == -9997:  # Invalid sample rate
                 logger.error(f"Die Abtastrate {self.RATE} wird vom Gerät nicht unterstützt.")
             else:
@@ -146,86 +448,323 @@ class AudioProcessor:
             self.stream.close()
         self.stream = None
 
+    def _audio_callback(self, in_data, frame_count, time_info, status_flags):
+        """
+        PyAudio-Callback, der im Audio-Thread von PortAudio ausgeführt wird.
+
+        Kopiert die Samples lediglich in den vorallokierten Ringpuffer. Hier darf weder
+        blockiert noch geloggt werden, damit der Callback nie hinter dem Gerät zurückfällt.
+        """
+        if in_data:
+            self.ring_buffer.write(self.channel_mixer.process(in_data))
+        self.capture_metrics.record_chunk(frame_count, bool(status_flags & pyaudio.paInputOverflow))
+        return (None, pyaudio.paContinue)
+
+    def _drain_ring_buffer(self, state):
+        """
+        Überträgt alle im Ringpuffer verfügbaren Samples in die Aufnahmedaten.
+
+        :param state: Der Zustand mit den Aufnahmedaten
+        """
+        self.capture_metrics.record_read(self.ring_buffer.available())
+        count = self.ring_buffer.drain_into(state.audio_data)
+        if count:
+            self._process_new_samples(state, count)
+
+    @handle_exceptions
+    def start_warm_stream(self):
+        """
+        Öffnet den Audiostream dauerhaft ("warmer Stream").
+
+        Der Callback schreibt fortlaufend in den Ringpuffer; außerhalb einer Aufnahme werden nur
+        die letzten DEFAULT_PREROLL_MS Millisekunden vorgehalten und nichts gespeichert. Ein
+        Tastendruck muss das Gerät dadurch nicht mehr öffnen, und der Vorlauf verhindert, dass
+        die erste Silbe abgeschnitten wird.
+
+        :return: True, wenn der Stream geöffnet ist
+        """
+        if self.warm_stream_active:
+            return True
+        if self.get_capture_mode() == "blocking":
+            logger.warning("Der offene Stream erfordert den Aufnahmemodus 'callback' oder 'process'.")
+            return False
+        self.reset_stream()
+        self.ring_buffer.reset()
+        try:
+            self.stream = self.open_audio_stream(stream_callback=self._audio_callback)
+        except Exception as e:
+            # Ohne offenen Stream wird wie bisher bei jeder Aufnahme geöffnet
+            logger.warning(f"Audiostream konnte nicht dauerhaft geöffnet werden: {e}")
+            return False
+        self.warm_stream_active = True
+        self._preroll_thread = threading.Thread(target=self._trim_preroll_loop, daemon=True)
+        self._preroll_thread.start()
+        logger.info("Audiostream dauerhaft geöffnet (Vorlauf aktiv)")
+        return True
+
+    @handle_exceptions
+    def stop_warm_stream(self):
+        """Schließt den dauerhaft geöffneten Audiostream."""
+        if not self.warm_stream_active:
+            return
+        self.warm_stream_active = False
+        if self._preroll_thread and self._preroll_thread is not threading.current_thread():
+            self._preroll_thread.join(timeout=RECORDER_JOIN_TIMEOUT)
+        self._preroll_thread = None
+        self.reset_stream()
+        logger.info("Dauerhaft geöffneter Audiostream geschlossen")
+
+    @handle_exceptions
+    def keeps_stream_open(self):
+        """
+        Gibt zurück, ob der Audiostream dauerhaft geöffnet bleibt.
+
+        Im Aufnahmemodus "process" gilt das unabhängig von "warm_stream": sonst müsste jeder Tastendruck
+        erst einen Python-Prozess samt numpy und PortAudio starten, und die ersten Worte gingen verloren.
+
+        :return: True, wenn "warm_stream" aktiv ist oder im Aufnahmemodus "process" aufgenommen wird
+        """
+        return (self.get_capture_mode() == "process"
+                or bool(self.settings_manager.get_setting("warm_stream", DEFAULT_WARM_STREAM)))
+
+    @handle_exceptions
+    def set_warm_stream(self, enabled):
+        """
+        Aktiviert oder deaktiviert den dauerhaft geöffneten Audiostream und speichert die Einstellung.
+
+        :param enabled: True, um den Stream offen zu halten
+        """
+        self.settings_manager.set_setting("warm_stream", bool(enabled))
+        if self.keeps_stream_open():
+            if not enabled:
+                logger.info("Im Aufnahmemodus 'process' bleibt der Aufnahmeprozess dauerhaft geöffnet.")
+            self.start_warm_stream()
+        else:
+            self.stop_warm_stream()
+
+    def _preroll_samples(self):
+        """Gibt die Länge des Vorlaufs in Samples zurück."""
+        preroll_ms = int(self.settings_manager.get_setting("preroll_ms", DEFAULT_PREROLL_MS))
+        return int(self.RATE * preroll_ms / 1000)
+
+    def _trim_preroll_loop(self):
+        """Hält außerhalb von Aufnahmen nur den Vorlauf im Ringpuffer."""
+        keep = self._preroll_samples()
+        while self.warm_stream_active:
+            with self._consumer_lock:
+                if not self._capturing:
+                    self.ring_buffer.discard_to(keep)
+            time.sleep(PREROLL_TRIM_INTERVAL)
+
+    def _record_warm(self, state):
+        """
+        Nimmt aus dem bereits geöffneten Stream auf, bis state.recording zurückgesetzt wird.
+
+        Der Start markiert lediglich die Leseposition im Ringpuffer: die Aufnahme beginnt mit
+        dem vorgehaltenen Vorlauf, ohne dass das Gerät neu geöffnet wird.
+        """
+        with self._consumer_lock:
+            self._capturing = True
+            self.ring_buffer.discard_to(self._preroll_samples())
+        try:
+            self._start_stream_processing(state)
+            poll_interval = AUDIO_CHUNK / self.RATE / 2
+            while state.recording:
+                self._drain_ring_buffer(state)
+                time.sleep(poll_interval)
+            self._drain_ring_buffer(state)
+        finally:
+            with self._consumer_lock:
+                self._capturing = False
+
+    def _start_stream_processing(self, state):
+        """Bereitet die chunkweise Verarbeitung für eine neue Aufnahme vor."""
+        self.stream_resampler = StreamingResampler(self.RATE, self.TARGET_RATE, self.get_resampler_engine())
+        state.resampled_audio.reset()
+        self.configure_conditioner(self.conditioner)
+        self.level_meter.reset()
+        if self.settings_manager.get_setting("save_test_recording", False):
+            self._open_recording_sink()
+
+    def _process_new_samples(self, state, count):
+        """
+        Resampelt die zuletzt angehängten Samples, während die Aufnahme noch läuft.
+
+        :param state: Der Zustand mit den Aufnahmedaten
+        :param count: Anzahl der neu angehängten Samples
+        """
+        new_samples = state.audio_data.view()[-count:]
+        if self.recording_sink:
+            self.recording_sink.write(new_samples)
+        chunk = new_samples.astype(np.float32) / 32768.0
+        self.level_meter.update(chunk)
+        self._deliver_resampled(state, self.conditioner.process(self.stream_resampler.process(chunk)))
+        if state.segmenter is not None:
+            # Im Dauerdiktat hält der Segmentierer die Äußerungen, der Aufnahmepuffer muss nicht wachsen
+            state.audio_data.reset()
+
+    def _deliver_resampled(self, state, samples):
+        """Übergibt resampelte Samples an den Segmentierer (Dauerdiktat) oder den Aufnahmepuffer."""
+        if state.segmenter is not None:
+            state.segmenter.process(samples)
+        else:
+            state.resampled_audio.append(samples)
+
+    def _finish_stream_processing(self, state):
+        """Berechnet nach Aufnahmeende die letzten resampelten Samples."""
+        self._deliver_resampled(state, self.conditioner.process(self.stream_resampler.flush()))
+        if state.segmenter is not None:
+            state.segmenter.flush()
+
+    def configure_conditioner(self, conditioner):
+        """
+        Übernimmt die Einstellungen der Signalaufbereitung für eine neue Aufnahme oder Datei.
+
+        :param conditioner: Der einzustellende AudioConditioner
+        """
+        conditioner.highpass = bool(self.settings_manager.get_setting("highpass_enabled", DEFAULT_HIGHPASS_ENABLED))
+        conditioner.agc = bool(self.settings_manager.get_setting("agc_enabled", DEFAULT_AGC_ENABLED))
+        conditioner.target_db = float(self.settings_manager.get_setting("agc_target_db", DEFAULT_AGC_TARGET_DB))
+        conditioner.reset()
+
+    def _record_blocking(self, state):
+        """Nimmt mit blockierenden Reads auf, bis state.recording zurückgesetzt wird."""
+        self.stream = self.open_audio_stream()
+        self._start_stream_processing(state)
+        while state.recording:
+            try:
+                self.capture_metrics.record_read(self.stream.get_read_available())
+                data = self.stream.read(AUDIO_CHUNK, exception_on_overflow=False)
+                samples = self.channel_mixer.process(data)
+                self.capture_metrics.record_chunk(len(samples))
+                state.audio_data.append(samples)
+                self._process_new_samples(state, len(samples))
+            except IOError as e:
+                logger.error(f"IOError während der Aufnahme: {e}")
+                break
+
+    def _record_callback(self, state):
+        """
+        Nimmt im Callback-Modus auf, bis state.recording zurückgesetzt wird.
+
+        Der PyAudio-Callback füllt den Ringpuffer unabhängig vom Scheduling dieses Threads.
+        Der Thread leert den Puffer nur periodisch; Verzögerungen durch GIL-Konkurrenz
+        werden vom Ringpuffer aufgefangen, statt Frames zu verlieren.
+        """
+        self.ring_buffer.reset()
+        self._dropped_baseline = 0
+        self.stream = self.open_audio_stream(stream_callback=self._audio_callback)
+        self._start_stream_processing(state)
+        poll_interval = AUDIO_CHUNK / self.RATE / 2
+        while state.recording:
+            self._drain_ring_buffer(state)
+            time.sleep(poll_interval)
+
+        # Nach stop_stream ruft PortAudio den Callback nicht mehr auf, der Rest kann vollständig abgeholt werden
+        self.stream.stop_stream()
+        self._drain_ring_buffer(state)
+
     @handle_exceptions
     def record_audio(self, state):
         logger.info("Audioaufnahme gestartet.")
+        with self._device_lock:
+            self._recording = True
         try:
-            self.reset_stream()
-            self.stream = self.open_audio_stream()
-
             start_time = time.time()
-            state.audio_data = []
-            while state.recording:
-                try:
-                    data = self.stream.read(AUDIO_CHUNK, exception_on_overflow=False)
-                    state.audio_data.append(data)
-                except IOError as e:
-                    logger.error(f"IOError während der Aufnahme: {e}")
-                    break
+            # Vor dem Öffnen ersetzt, damit schon der erste Callback in die neuen Zähler schreibt
+            self.capture_metrics = CaptureMetrics(self.RATE, AUDIO_CHUNK)
+            self._dropped_baseline = self.ring_buffer.dropped_samples
+            if isinstance(self.stream, CaptureProcess):
+                self.ring_buffer.reset_metrics()  # Die Chunk-Zähler führt der Aufnahmeprozess
+            state.audio_data.reset()
+            if self.warm_stream_active:
+                self._record_warm(state)
+            elif self.get_capture_mode() in ("callback", "process"):
+                self.reset_stream()
+                self._record_callback(state)
+            else:
+                self.reset_stream()
+                self._record_blocking(state)
+            self._finish_stream_processing(state)
 
             duration = time.time() - start_time
             logger.info(f"Audioaufnahme beendet. Dauer: {duration:.2f} Sekunden")
+            self._finish_capture_metrics(state)
 
-            if len(state.audio_data) > 0:
-                self.last_recording = state.audio_data
-            else:
+            if len(state.audio_data) == 0 and state.segmenter is None:
                 logger.warning("Keine Audiodaten aufgenommen")
 
             return duration
         except Exception as e:
             logger.error(f"Fehler bei der Audioaufnahme: {e}")
             logger.error(f"Fehlertyp: {type(e).__name__}")
-            logger.error(f"Geräteinformationen: {self.p.get_device_info_by_index(self.current_device_index)}")
+            logger.error(f"Geräteinformationen: {self.device_registry.get_device(self.current_device_index)}")
             logger.debug("Detaillierter Traceback:", exc_info=True)
             raise
         finally:
-            if self.stream:
+            if self.stream and not self.warm_stream_active:
                 self.stream.stop_stream()
+            if self.recording_sink:
+                # Nicht blockierend: den Rest und den Dateikopf schreibt der Thread der Senke
+                self.recording_sink.close()
+            with self._device_lock:
+                self._recording = False
+                pending = self._devices_changed_pending
+            if pending:
+                # Der Neuaufbau läuft getrennt, damit die Transkription nicht auf PortAudio wartet
+                threading.Thread(target=self._on_hardware_change, daemon=True).start()
+
+    def _finish_capture_metrics(self, state):
+        """Schließt die Metriken der Aufnahme ab, legt sie im Zustand ab und protokolliert sie."""
+        metrics = self.capture_metrics
+        if isinstance(self.stream, CaptureProcess):
+            self.ring_buffer.collect_metrics(metrics)
+        metrics.finish(self.ring_buffer.dropped_samples - self._dropped_baseline)
+        state.capture_metrics = metrics.as_dict()
+        if metrics.healthy:
+            logger.info(metrics.summary())
+        else:
+            logger.warning(metrics.summary())
+
+    @handle_exceptions
+    def get_capture_metrics(self):
+        """
+        Gibt die Aufnahme-Metriken der laufenden bzw. letzten Aufnahme zurück.
+
+        :return: Dictionary mit Überläufen, verworfenen Samples, verspäteten/kurzen Reads und Jitter
+        """
+        return self.capture_metrics.as_dict()
 
     @handle_exceptions
-    def resample_audio(self, audio_np):
+    def resample_audio(self, audio_np, source_rate=None):
         if len(audio_np) == 0:
             logger.warning("Leeres Audio-Array zum Resampling übergeben")
             return audio_np
-        target_length = int(len(audio_np) * self.TARGET_RATE / self.RATE)
-        resampled = signal.resample(audio_np, target_length)
+        source_rate = source_rate or self.RATE
+        resampled = resample(audio_np, source_rate, self.TARGET_RATE, self.get_resampler_engine())
         logger.debug(f"Audio resampled von {len(audio_np)} auf {len(resampled)} Samples")
         return resampled
 
-    @handle_exceptions
-    def save_last_recording(self, filename="tests/test_data/speech_sample.wav"):
-        if not self.last_recording:
-            logger.warning("Keine Aufnahme verfügbar zum Speichern")
-            return False
-
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-        with wave.open(filename, 'wb') as wf:
-            wf.setnchannels(AUDIO_CHANNELS)
-            wf.setsampwidth(pyaudio.get_sample_size(AUDIO_FORMAT))
-            wf.setframerate(self.RATE)
-            wf.writeframes(b''.join(self.last_recording))
-
+    def _open_recording_sink(self):
+        """Öffnet die Testaufnahme, in die die laufende Aufnahme fortlaufend geschrieben wird."""
+        if self.recording_sink:
+            # Dieselbe Datei darf erst nach Abschluss der vorherigen Aufnahme neu geöffnet werden
+            self.recording_sink.wait_closed()
+        self.recording_sink = WavRecordingSink(TEST_RECORDING_PATH, self.RATE, AUDIO_CHANNELS,
+                                               pyaudio.get_sample_size(AUDIO_FORMAT))
         incognito_mode = self.settings_manager.get_setting("incognito_mode", DEFAULT_INCOGNITO_MODE)
         if not incognito_mode:
-            logger.info(f"Letzte Aufnahme gespeichert als {filename}")
+            logger.info(f"Aufnahme wird als {TEST_RECORDING_PATH} gespeichert")
         else:
-            logger.info("Letzte Aufnahme gespeichert (Incognito-Modus aktiv)")
-        return True
+            logger.info("Aufnahme wird gespeichert (Incognito-Modus aktiv)")
 
     @handle_exceptions
     def list_audio_devices(self):
         """Listet alle verfügbaren Audioeingangsgeräte auf."""
         logger.info("Auflistung der Audiogeräte gestartet")
-        info = self.p.get_host_api_info_by_index(0)
-        numdevices = info.get('deviceCount')
-        if numdevices is not None:
-            for i in range(int(numdevices)):
-                device_info = self.p.get_device_info_by_host_api_device_index(0, i)
-                max_channels = device_info.get('maxInputChannels')
-                if max_channels is not None and int(max_channels) > 0:
-                    print(f"Input Device id {i} - {device_info.get('name')}")
-                    logger.debug(f"Input Device id {i} - {device_info.get('name')}")
+        for i, name in self.device_registry.input_devices().items():
+            print(f"Input Device id {i} - {name}")
+            logger.debug(f"Input Device id {i} - {name}")
         logger.info("Auflistung der Audiogeräte abgeschlossen")
 
 # Zusätzliche Erklärungen:
@@ -236,7 +775,9 @@ class AudioProcessor:
 
 # 2. Resampling:
 #    Das Resampling ist notwendig, da das Whisper-Modell eine bestimmte Eingabeabtastrate erwartet (16000 Hz).
-#    Die Funktion `signal.resample` aus scipy wird verwendet, um die Abtastrate anzupassen, ohne die Audiodauer zu ändern.
+#    Der StreamingResampler (src/backend/resampler.py) wandelt jeden Chunk bereits während der Aufnahme um,
+#    sodass nach dem Loslassen der Taste nur noch der letzte Chunk resampelt werden muss. `resample_audio`
+#    verwendet dasselbe Verfahren für vollständige Aufnahmen.
 
 # 3. Fehlerbehandlung:
 #    Die ausführliche Fehlerprotokollierung in `record_audio` hilft bei der Diagnose von Problemen,
@@ -247,9 +788,10 @@ class AudioProcessor:
 #    und eine einfache Integration mit der Benutzeroberfläche.
 
 # 5. Testaufnahme-Speicherung:
-#    Die Methode `save_last_recording` ermöglicht es, die zuletzt aufgenommene Audiodatei
-#    für Testzwecke zu speichern. Dies ist nützlich für die Entwicklung und das Debugging
-#    der Audioaufnahme- und Verarbeitungsfunktionen.
+#    Ist "save_test_recording" aktiv, schreibt eine WavRecordingSink jede Aufnahme bereits während
+#    der Aufnahme nach TEST_RECORDING_PATH. Beim Beenden muss nichts mehr gespeichert werden, und die
+#    letzte Aufnahme muss dafür nicht im Speicher gehalten werden. Dies ist nützlich für die
+#    Entwicklung und das Debugging der Audioaufnahme- und Verarbeitungsfunktionen.
 
 # 6. Ressourcenmanagement:
 #    Die Verwendung des Kontextmanagers `get_pyaudio` stellt sicher, dass die PyAudio-Ressourcen
@@ -258,3 +800,63 @@ class AudioProcessor:
 # 7. Geräteauswahl:
 #    Die Methode `get_device_index` ermöglicht es, das vom Benutzer ausgewählte Audiogerät
 #    zu verwenden, was die Flexibilität und Benutzerfreundlichkeit der Anwendung erhöht.
+
+# 8. Callback-Aufnahme:
+#    Im Standardmodus "callback" liefert PortAudio die Samples über `_audio_callback` in einen
+#    vorallokierten SPSC-Ringpuffer. Der Aufnahme-Thread leert ihn nur noch periodisch, sodass
+#    verspätete Python-Threads (z.B. während Whisper oder Tk den GIL halten) keine Frames mehr kosten.
+#    Der frühere Modus mit blockierenden Reads bleibt als "blocking" verfügbar.
+
+# 9. Aushandlung der Aufnahmerate:
+#    `select_capture_rate` fragt die Raten aus CAPTURE_RATE_CANDIDATES per `is_format_supported` ab
+#    (zwischengespeichert je Gerät) und wählt die Rate mit der günstigsten Umrechnung auf 16 kHz.
+#    48 kHz wird z.B. ganzzahlig um den Faktor 3 dezimiert, während 44,1 kHz das ungünstige Verhältnis
+#    160/441 erfordert. Lehnt das Gerät die Rate beim Öffnen dennoch ab, wird auf AUDIO_RATE zurückgefallen.
+
+# 10. Offener Stream mit Vorlauf:
+#    Mit "warm_stream" bleibt der Callback-Stream dauerhaft geöffnet. Ein Hilfsthread kürzt den Ringpuffer
+#    außerhalb von Aufnahmen auf den Vorlauf (DEFAULT_PREROLL_MS). Beim Tastendruck übernimmt der
+#    Aufnahme-Thread die Leserolle unter `_consumer_lock`, sodass der Ringpuffer weiterhin genau einen
+#    Konsumenten hat. Die Aufnahme beginnt ohne Geräteöffnung und enthält die Zeit vor dem Tastendruck.
+
+# 11. Geräteverzeichnis und Hotplug:
+#    Geräteabfragen im Aufnahmepfad beantwortet das AudioDeviceRegistry aus dem Zwischenspeicher. Meldet
+#    dessen Überwachung eine Hardwareänderung, baut `_on_hardware_change` PyAudio neu auf; während einer
+#    Aufnahme wird das bis zu deren Ende verschoben. Das gewählte Gerät wird über "audio_device_name"
+#    wiedergefunden; fehlt es, wird vorübergehend das Standardgerät verwendet.
+
+# 12. Pegelmessung:
+#    `_process_new_samples` übergibt jeden Chunk an den LevelMeter, der RMS, Spitzenwert und Übersteuerung
+#    ohne Zwischenarrays berechnet. Die Statusleiste fragt `level_meter.latest()` in ihrem eigenen Takt ab.
+
+# 13. Aufnahme-Metriken:
+#    Jede Aufnahme erhält ein neues CaptureMetrics-Objekt. Der Callback zählt Überläufe und Chunk-Jitter,
+#    der Aufnahme-Thread verspätete Reads und den Rückstand. Am Ende stehen die Werte in
+#    `state.capture_metrics`, über `get_capture_metrics` und als Zusammenfassung im Log.
+
+# 14. Signalaufbereitung:
+#    Nach dem Resampling durchläuft jeder Chunk den AudioConditioner (src/backend/conditioning.py) mit
+#    Hochpass und automatischer Pegelanpassung. Beide tragen ihren Zustand über die Chunks, sodass die
+#    Aufbereitung beim Tastenende bereits abgeschlossen ist. "highpass_enabled", "agc_enabled" und
+#    "agc_target_db" werden zu Beginn jeder Aufnahme übernommen.
+
+# 15. Mehrkanalige Geräte:
+#    Im Modus "mono" wird wie bisher einkanalig geöffnet; lehnt ein Gerät das ab (z.B. USB-Interfaces oder
+#    Mikrofonarrays, die nur Stereo bzw. mehrere Kanäle anbieten), wird es mit allen Kanälen geöffnet und
+#    gemischt. "mix", "select" und "delay_and_sum" öffnen immer alle Kanäle. Der ChannelMixer
+#    (src/backend/channel_mixer.py) wandelt jeden Chunk bereits im Callback in Mono um, sodass Ringpuffer,
+#    Vorlauf und die gesamte weitere Verarbeitung unverändert einkanalig bleiben.
+
+# 16. Aufnahme in einem eigenen Prozess:
+#    Im Aufnahmemodus "process" öffnet ein Kindprozess (src/backend/capture_process.py) das Gerät und
+#    schreibt in einen Ringpuffer im gemeinsamen Speicher, der für die Dauer des Streams self.ring_buffer
+#    ersetzt. Aufnahme, Vorlauf und Metriken laufen dadurch unverändert wie im Callback-Modus; nur der
+#    Callback selbst ist vom GIL der Anwendung unabhängig. Da der Start eines Prozesses (Interpreter, numpy,
+#    PortAudio) deutlich länger dauert als ein Tastendruck, hält der Modus den Stream immer offen
+#    (keeps_stream_open): der Kindprozess läuft über alle Aufnahmen hinweg, "warm_stream" wird ignoriert.
+
+# 17. Audioquellen:
+#    self.p ist eine AudioSource (src/backend/audio_source.py) mit der Schnittstelle von PyAudio. Über
+#    audio_source_factory lässt sich statt PortAudio eine VirtualAudioSource einsetzen, die Dateien oder
+#    erzeugte Signale mit einstellbarem Tempo, Jitter und Überläufen liefert; so laufen Aufnahme- und
+#    Lasttests ohne Mikrofon.
@@ -0,0 +1,432 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Audioquellen der Wortweber-Anwendung.
+
+AudioSource beschreibt den Teil der PyAudio-Schnittstelle, den der AudioProcessor verwendet.
+PyAudioSource reicht ihn an PortAudio weiter; VirtualAudioSource spielt WAV-Dateien oder
+erzeugte Signale als virtuelles Mikrofon ab, in Echtzeit oder beschleunigt und auf Wunsch mit
+künstlichem Jitter und Überläufen. Damit lassen sich Aufnahme und Transkription ohne Hardware
+testen und unter Last messen.
+"""
+
+# Standardbibliotheken
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Drittanbieterbibliotheken
+import numpy as np
+import pyaudio
+
+# Projektspezifische Module
+from src.config import AUDIO_RATE, AUDIO_CHUNK, VIRTUAL_DEVICE_NAME
+from src.backend.audio_file import read_audio
+
+# PortAudio-Fehlercodes, mit denen auch PyAudio IOError auslöst
+_INVALID_CHANNEL_COUNT = -9998
+_INVALID_SAMPLE_RATE = -9997
+_INVALID_DEVICE = -9996
+_INPUT_OVERFLOWED = -9981
+
+
+class AudioSource(ABC):
+    """
+    Schnittstelle einer Audioquelle für den AudioProcessor.
+
+    Die Methoden entsprechen in Namen und Parametern denen von pyaudio.PyAudio, sodass
+    Geräteverzeichnis, Ratenabfrage und Stream-Verwaltung unverändert bleiben.
+    """
+
+    @abstractmethod
+    def get_device_count(self) -> int:
+        """Gibt die Anzahl der Geräte zurück."""
+
+    @abstractmethod
+    def get_device_info_by_index(self, index: int) -> Dict[str, Any]:
+        """Gibt die Informationen eines Geräts zurück (mindestens 'index', 'name', 'maxInputChannels')."""
+
+    @abstractmethod
+    def get_default_input_device_info(self) -> Dict[str, Any]:
+        """Gibt die Informationen des Standard-Eingabegeräts zurück."""
+
+    @abstractmethod
+    def is_format_supported(self, rate, input_device=None, input_channels=None, input_format=None, **kwargs) -> bool:
+        """Gibt True zurück, wenn das Format unterstützt wird; sonst wird wie bei PyAudio ValueError ausgelöst."""
+
+    @abstractmethod
+    def open(self, *args, **kwargs):
+        """
+        Öffnet einen Eingabestream mit den Parametern von pyaudio.PyAudio.open.
+
+        Der Stream bietet read, get_read_available, stop_stream, close und is_active; mit
+        stream_callback wird der Callback wie bei PortAudio aus einem eigenen Thread aufgerufen.
+        """
+
+    @abstractmethod
+    def terminate(self) -> None:
+        """Gibt alle Ressourcen der Quelle frei."""
+
+    def get_sample_size(self, sample_format) -> int:
+        """Gibt die Größe eines Samples in Bytes zurück."""
+        return pyaudio.get_sample_size(sample_format)
+
+
+class PyAudioSource(AudioSource):
+    """Audioquelle für die echten Geräte über PyAudio bzw. PortAudio."""
+
+    def __init__(self):
+        self._pa = pyaudio.PyAudio()
+
+    def get_device_count(self) -> int:
+        return self._pa.get_device_count()
+
+    def get_device_info_by_index(self, index: int) -> Dict[str, Any]:
+        return self._pa.get_device_info_by_index(index)
+
+    def get_default_input_device_info(self) -> Dict[str, Any]:
+        return self._pa.get_default_input_device_info()
+
+    def is_format_supported(self, rate, input_device=None, input_channels=None, input_format=None, **kwargs) -> bool:
+        return self._pa.is_format_supported(rate, input_device=input_device, input_channels=input_channels,
+                                            input_format=input_format, **kwargs)
+
+    def open(self, *args, **kwargs):
+        return self._pa.open(*args, **kwargs)
+
+    def terminate(self) -> None:
+        self._pa.terminate()
+
+
+class VirtualAudioSource(AudioSource):
+    """
+    Virtuelles Mikrofon mit genau einem Gerät (Index 0), das ein vorgegebenes Signal liefert.
+
+    Die Chunks werden zu festen Zeitpunkten bereitgestellt (Chunk-Dauer geteilt durch speed);
+    Jitter verzögert einzelne Chunks, ohne dass sich die Verzögerung aufsummiert. Ein injizierter
+    Überlauf verwirft einen Chunk des Signals und kennzeichnet den folgenden mit paInputOverflow,
+    wie es PortAudio nach verlorenen Eingangsdaten tut. Nach dem Ende des Signals folgt Stille.
+    """
+
+    def __init__(self, signal: Optional[Any] = None, sample_rate: int = AUDIO_RATE, speed: float = 1.0,
+                 loop: bool = False, jitter_ms: float = 0.0, overflow_every: int = 0, seed: int = 0,
+                 name: str = VIRTUAL_DEVICE_NAME):
+        """
+        Initialisiert das virtuelle Mikrofon.
+
+        :param signal: Samples als float (-1..1) oder int16 mit der Form (Frames,) oder (Frames, Kanäle), eine
+                       WAV-/FLAC-Datei (Pfad oder Dateiobjekt, wird auf sample_rate umgerechnet) oder None für Stille
+        :param sample_rate: Einzige unterstützte Abtastrate des Geräts in Hz
+        :param speed: Abspieltempo; 1.0 = Echtzeit, 10.0 = zehnfach beschleunigt, 0 = so schnell wie möglich
+        :param loop: Signal endlos wiederholen
+        :param jitter_ms: Größte zusätzliche Verzögerung eines Chunks in Millisekunden (gleichverteilt)
+        :param overflow_every: Jeden n-ten Chunk als Überlauf verlieren (0 = nie)
+        :param seed: Startwert für den Jitter
+        :param name: Gerätename
+        """
+        if signal is None:
+            samples = np.zeros((0, 1), dtype=np.int16)
+        elif isinstance(signal, np.ndarray):
+            samples = signal if signal.ndim == 2 else signal.reshape(-1, 1)
+            if samples.dtype != np.int16:
+                samples = np.round(np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        else:
+            samples = np.round(read_audio(signal, sample_rate) * 32767).astype(np.int16).reshape(-1, 1)
+        self.samples = np.ascontiguousarray(samples)
+        self.channels = self.samples.shape[1]
+        self.sample_rate = int(sample_rate)
+        self.speed = float(speed)
+        self.loop = loop
+        self.jitter = jitter_ms / 1000
+        self.overflow_every = int(overflow_every)
+        self.seed = seed
+        self.name = name
+        self.played = threading.Event()  # Gesetzt, sobald das Signal vollständig geliefert wurde
+        self._streams: List["VirtualInputStream"] = []
+
+    @classmethod
+    def sine(cls, frequency: float = 440.0, seconds: float = 1.0, amplitude: float = 0.5,
+             sample_rate: int = AUDIO_RATE, **options) -> "VirtualAudioSource":
+        """
+        Erzeugt ein virtuelles Mikrofon, das einen Sinuston liefert.
+
+        :param frequency: Frequenz in Hz
+        :param seconds: Dauer in Sekunden
+        :param amplitude: Amplitude (1.0 = Vollaussteuerung)
+        :param sample_rate: Abtastrate in Hz
+        :param options: Weitere Parameter von VirtualAudioSource
+        """
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        return cls(amplitude * np.sin(2 * np.pi * frequency * t), sample_rate=sample_rate, **options)
+
+    def wait_played(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet, bis das Signal vollständig geliefert wurde.
+
+        :param timeout: Maximale Wartezeit in Sekunden
+        :return: True, wenn das Signal vollständig geliefert wurde
+        """
+        return self.played.wait(timeout)
+
+    def _device_info(self) -> Dict[str, Any]:
+        return {'index': 0, 'name': self.name, 'hostApi': 0, 'maxInputChannels': self.channels,
+                'maxOutputChannels': 0, 'defaultSampleRate': float(self.sample_rate)}
+
+    def get_device_count(self) -> int:
+        return 1
+
+    def get_device_info_by_index(self, index: int) -> Dict[str, Any]:
+        if index != 0:
+            raise IOError(_INVALID_DEVICE, "Invalid device")
+        return self._device_info()
+
+    def get_default_input_device_info(self) -> Dict[str, Any]:
+        return self._device_info()
+
+    def is_format_supported(self, rate, input_device=None, input_channels=None, input_format=None, **kwargs) -> bool:
+        if input_device not in (None, 0):
+            raise ValueError("Invalid input device")
+        if input_channels is not None and input_channels > self.channels:
+            raise ValueError("Invalid number of channels")
+        if int(rate) != self.sample_rate:
+            raise ValueError("Invalid sample rate")
+        return True
+
+    def open(self, rate=None, channels=1, format=None, input=True, output=False, input_device_index=None,
+             frames_per_buffer=AUDIO_CHUNK, start=True, stream_callback=None, **kwargs) -> "VirtualInputStream":
+        if input_device_index not in (None, 0):
+            raise IOError(_INVALID_DEVICE, "Invalid input device")
+        if channels > self.channels:
+            raise IOError(_INVALID_CHANNEL_COUNT, "Invalid number of channels")
+        if int(rate) != self.sample_rate:
+            raise IOError(_INVALID_SAMPLE_RATE, "Invalid sample rate")
+        stream = VirtualInputStream(self, channels, frames_per_buffer, stream_callback)
+        self._streams.append(stream)
+        return stream
+
+    def terminate(self) -> None:
+        for stream in self._streams:
+            stream.close()
+        self._streams.clear()
+
+
+class VirtualInputStream:
+    """Eingabestream eines VirtualAudioSource mit der Schnittstelle eines PyAudio-Streams."""
+
+    def __init__(self, source: VirtualAudioSource, channels: int, frames_per_buffer: int,
+                 stream_callback: Optional[Callable] = None):
+        self._source = source
+        self._channels = channels
+        self._chunk = int(frames_per_buffer)
+        self._callback = stream_callback
+        self._rng = np.random.default_rng(source.seed)
+        self._position = 0  # Nächster Frame des Signals
+        self._delivered = 0  # Gelieferte Frames ohne verworfene Überläufe
+        self._chunk_index = 0
+        self._active = True
+        self._started = time.perf_counter()
+        self._thread: Optional[threading.Thread] = None
+        if stream_callback is not None:
+            self._thread = threading.Thread(target=self._callback_loop, daemon=True)
+            self._thread.start()
+
+    def _due(self, frames: int) -> float:
+        """Zeitpunkt (perf_counter), ab dem die nächsten frames Frames verfügbar sind."""
+        if self._source.speed <= 0:
+            return self._started
+        return self._started + (self._position + frames) / self._source.sample_rate / self._source.speed
+
+    def _take(self, frames: int) -> np.ndarray:
+        """Entnimmt frames Frames des Signals; danach folgt Stille bzw. bei loop der Anfang."""
+        samples = self._source.samples
+        total = len(samples)
+        out = np.zeros((frames, self._channels), dtype=np.int16)
+        filled = 0
+        while filled < frames and total:
+            start = self._position % total if self._source.loop else self._position
+            if start >= total:
+                break
+            take = min(frames - filled, total - start)
+            out[filled:filled + take] = samples[start:start + take, :self._channels]
+            filled += take
+            self._position += take
+        self._position += frames - filled
+        if not self._source.loop and self._position >= total:
+            self._source.played.set()
+        return out
+
+    def _next_chunk(self, frames: int) -> Tuple[np.ndarray, bool]:
+        """Liefert den nächsten Chunk und ob davor ein Überlauf injiziert wurde."""
+        self._chunk_index += 1
+        overflow = self._source.overflow_every > 0 and self._chunk_index % self._source.overflow_every == 0
+        if overflow:
+            self._take(frames)  # Dieser Chunk geht verloren
+        return self._take(frames), overflow
+
+    def _wait_until(self, deadline: float) -> bool:
+        """Wartet bis deadline; gibt False zurück, wenn der Stream vorher gestoppt wurde."""
+        while self._active:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.01))
+        return False
+
+    def _deadline(self, frames: int) -> float:
+        """Termin der nächsten frames Frames einschließlich des zufälligen Jitters."""
+        deadline = self._due(frames)
+        if self._source.jitter:
+            deadline += self._rng.uniform(0, self._source.jitter)
+        return deadline
+
+    def _callback_loop(self) -> None:
+        while self._active:
+            if not self._wait_until(self._deadline(self._chunk)):
+                break
+            data, overflow = self._next_chunk(self._chunk)
+            self._delivered += self._chunk
+            flags = pyaudio.paInputOverflow if overflow else 0
+            result = self._callback(data.tobytes(), self._chunk, {}, flags)
+            if result and result[1] != pyaudio.paContinue:
+                break
+            if self._source.speed <= 0:
+                time.sleep(0)  # Anderen Threads Gelegenheit geben, den GIL zu übernehmen
+
+    def read(self, num_frames: int, exception_on_overflow: bool = True) -> bytes:
+        """Liest num_frames Frames und wartet dafür wie ein Gerät, bis sie verfügbar sind."""
+        self._wait_until(self._deadline(num_frames))
+        data, overflow = self._next_chunk(num_frames)
+        self._delivered += num_frames
+        if overflow and exception_on_overflow:
+            raise IOError(_INPUT_OVERFLOWED, "Input overflowed")
+        return data.tobytes()
+
+    def get_read_available(self) -> int:
+        """Gibt die Anzahl der Frames zurück, die ohne Warten gelesen werden können."""
+        if self._source.speed <= 0:
+            return self._chunk
+        elapsed = time.perf_counter() - self._started
+        return max(0, int(elapsed * self._source.sample_rate * self._source.speed) - self._position)
+
+    def is_active(self) -> bool:
+        return self._active
+
+    def stop_stream(self) -> None:
+        self._active = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop_stream()
+
+
+def benchmark(signal: Optional[Any] = None, seconds: float = 30.0, speed: float = 0.0,
+              settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Misst die Aufnahmekette (Ringpuffer, Resampling, Signalaufbereitung) mit einem virtuellen Mikrofon.
+
+    :param signal: Abzuspielendes Signal oder Datei; ohne Angabe seconds Sekunden Sinuston mit Rauschen
+    :param seconds: Länge des erzeugten Signals in Sekunden
+    :param speed: Abspieltempo der VirtualAudioSource (0 = so schnell wie möglich)
+    :param settings: Einstellungen für den AudioProcessor; ohne Angabe blockierend, damit bei unbegrenztem Tempo
+                     der Verbrauch das Tempo bestimmt und nichts im Ringpuffer verworfen wird
+    :return: Dictionary mit Echtzeitfaktor und den Aufnahme-Metriken
+    """
+    from types import SimpleNamespace
+    from src.backend.audio_processor import AudioProcessor
+    from src.backend.audio_buffer import RecordingBuffer
+
+    class _Settings:
+        def __init__(self, values):
+            self.values = {"device_monitoring": False, "warm_stream": False, "negotiate_capture_rate": True,
+                           "capture_mode": "blocking", "audio_device_index": 0}
+            self.values.update(values or {})
+
+        def get_setting(self, key, default=None):
+            return self.values.get(key, default)
+
+        def set_setting(self, key, value):
+            self.values[key] = value
+
+        def save_settings(self):
+            pass
+
+    if signal is None:
+        rng = np.random.default_rng(0)
+        t = np.arange(int(seconds * 48000)) / 48000
+        signal = (0.3 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+    source = VirtualAudioSource(signal, sample_rate=48000, speed=speed)
+    processor = AudioProcessor(_Settings(settings), audio_source_factory=lambda: source)
+    state = SimpleNamespace(recording=True, audio_data=RecordingBuffer(),
+                            resampled_audio=RecordingBuffer(dtype=np.float32), segmenter=None)
+    recorder = threading.Thread(target=processor.record_audio, args=(state,))
+    start = time.perf_counter()
+    recorder.start()
+    source.wait_played()
+    state.recording = False
+    recorder.join()
+    elapsed = time.perf_counter() - start
+    processor.cleanup()
+    audio_seconds = len(source.samples) / source.sample_rate
+    return {
+        "audio_seconds": audio_seconds,
+        "total_seconds": elapsed,
+        "realtime_factor": audio_seconds / elapsed,
+        "metrics": state.capture_metrics,
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m src.backend.audio_source [Datei] [Tempo]
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    tempo = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    result = benchmark(path, speed=tempo)
+    print(f"Aufnahmekette: {result['audio_seconds']:.1f} s Audio in {result['total_seconds']:.2f} s "
+          f"({result['realtime_factor']:.0f}-fache Echtzeit)")
+    print(result["metrics"])
+
+# Zusätzliche Erklärungen:
+
+# 1. Schnittstelle:
+#    AudioSource übernimmt Namen und Parameter von pyaudio.PyAudio. Der AudioProcessor erhält eine Fabrik
+#    (audio_source_factory), die bei jedem Neuaufbau eine frische Quelle erzeugt; ohne Angabe ist das
+#    PyAudioSource. Geräteverzeichnis, Ratenverhandlung, Kanalmodi, Ringpuffer und Metriken arbeiten mit
+#    einer virtuellen Quelle genauso wie mit einem echten Gerät.
+
+# 2. Zeitverhalten:
+#    Chunk k wird zum Zeitpunkt Start + (k+1) * Chunk-Dauer / speed geliefert, im Callback-Modus aus einem
+#    eigenen Thread wie bei PortAudio, im blockierenden Modus durch Warten in read(). Jitter verzögert nur
+#    den einzelnen Chunk; der nächste Termin bleibt unverändert. Mit speed=0 werden die Chunks ohne Pause
+#    geliefert, um die Verarbeitung unter Volllast zu messen.
+
+# 3. Überläufe:
+#    Mit overflow_every=n geht jeder n-te Chunk verloren und der folgende trägt paInputOverflow bzw. löst im
+#    blockierenden Modus mit exception_on_overflow=True einen IOError aus. Die Aufnahme-Metriken zählen sie
+#    wie echte Überläufe des Geräts.
+
+# 4. Fehler beim Öffnen:
+#    Falsche Abtastrate, zu viele Kanäle oder ein unbekanntes Gerät lösen IOError mit den Fehlercodes von
+#    PortAudio aus, sodass auch die Ausweichlösungen des AudioProcessors ohne Hardware geprüft werden können.
+
+# 5. Benchmark:
+#    `python -m src.backend.audio_source [Datei] [Tempo]` spielt eine Datei oder ein erzeugtes Signal durch
+#    die Aufnahmekette und gibt den Echtzeitfaktor und die Aufnahme-Metriken aus. Für einen Lasttest bis zur
+#    Transkription erhält WordweberBackend dieselbe audio_source_factory.
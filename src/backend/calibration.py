@@ -0,0 +1,343 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Kalibrierung der Transkription für den jeweiligen Rechner.
+
+Der Calibrator misst die verfügbaren Modelle und Genauigkeiten mit mehreren Thread-Zahlen und
+Beam-Größen auf der Testaufnahme und wählt das genaueste Modell, das ein Latenzziel einhält
+(z.B. 3 s Sprache in unter 1 s). Das Ergebnis wird als Profil gespeichert und beim Start angewendet:
+Thread-Zahl von PyTorch, Beam-Größe je Modell und das gewählte Modell.
+"""
+
+# Standardbibliotheken
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Drittanbieterbibliotheken
+import numpy as np
+import torch
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, CALIBRATION_MODELS, CALIBRATION_BEAM_SIZES, CALIBRATION_RUNS, CALIBRATION_MAX_WER,
+    DEFAULT_LATENCY_TARGET_SECONDS, DEFAULT_LATENCY_TARGET_AUDIO_SECONDS
+)
+from src.backend.model_pool import model_key
+from src.backend.quantization import word_error_rate
+from src.backend.wortweber_transcriber import Transcriber
+from src.utils.error_handling import handle_exceptions, logger
+
+PROFILE_VERSION = 1
+_SKIP_FACTOR = 3.0  # Liegt schon der schnellste Durchlauf so weit über dem Ziel, werden keine Beam-Größen mehr versucht
+
+
+def thread_candidates(cpu_count: Optional[int] = None) -> List[int]:
+    """
+    Liefert die zu messenden Thread-Zahlen: Zweierpotenzen, die halbe (meist physische) und die volle Kernzahl.
+
+    :param cpu_count: Anzahl logischer Kerne (Standard: os.cpu_count())
+    :return: Aufsteigende Liste von Thread-Zahlen
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    candidates = {cpu_count, max(1, cpu_count // 2)}
+    threads = 1
+    while threads < cpu_count:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def calibration_audio(sample: np.ndarray, seconds: float, sample_rate: int = TARGET_RATE) -> np.ndarray:
+    """
+    Wiederholt die Testaufnahme mit kurzen Pausen, bis sie die Ziellänge erreicht.
+
+    :param sample: Die Testaufnahme (16 kHz, float32)
+    :param seconds: Gewünschte Länge in Sekunden
+    :param sample_rate: Abtastrate in Hz
+    :return: Aufnahme der gewünschten Länge
+    """
+    target = int(seconds * sample_rate)
+    pause = np.zeros(int(0.3 * sample_rate), dtype=np.float32)
+    pieces, length = [], 0
+    while length < target:
+        pieces.extend((sample, pause))
+        length += len(sample) + len(pause)
+    return np.concatenate(pieces)[:target].astype(np.float32)
+
+
+def set_threads(threads: int) -> None:
+    """
+    Setzt die Anzahl der Intra-Op-Threads von PyTorch.
+
+    :param threads: Anzahl der Threads
+    """
+    torch.set_num_threads(int(threads))
+
+
+def load_profile(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Lädt ein gespeichertes Kalibrierungsprofil.
+
+    :param path: Pfad der Profildatei
+    :return: Das Profil oder None, wenn keines existiert oder es nicht lesbar ist
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Kalibrierungsprofil {path} nicht lesbar: {e}")
+        return None
+    if profile.get("version") != PROFILE_VERSION:
+        return None
+    return profile
+
+
+@handle_exceptions
+def save_profile(profile: Dict[str, Any], path: str) -> None:
+    """
+    Speichert ein Kalibrierungsprofil.
+
+    :param profile: Das Profil aus Calibrator.run
+    :param path: Pfad der Profildatei
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def profile_entry(profile: Optional[Dict[str, Any]], key: str) -> Optional[Dict[str, Any]]:
+    """
+    Liefert die kalibrierten Einstellungen für ein Modell.
+
+    :param profile: Das Kalibrierungsprofil (oder None)
+    :param key: Pool-Schlüssel aus Modellname und Genauigkeit (siehe model_key)
+    :return: Dictionary mit threads, beam_size, latency, wer und meets_target oder None
+    """
+    if not profile:
+        return None
+    return profile.get("models", {}).get(key)
+
+
+class Calibrator:
+    """
+    Misst Modelle, Genauigkeiten, Thread-Zahlen und Beam-Größen und wählt die beste Kombination für ein Latenzziel.
+
+    Die Modelle werden vom genauesten zum schnellsten geprüft; die erste Kombination, die das Ziel mit
+    ausreichender Genauigkeit einhält, wird gewählt. Je Modell wird zuerst die schnellste Thread-Zahl mit der
+    größten Beam-Größe bestimmt und danach die Beam-Größe verkleinert, bis das Ziel erreicht ist.
+    """
+
+    def __init__(self, transcriber_factory: Callable[[str, str], Transcriber],
+                 thread_setter: Callable[[int], None] = set_threads,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialisiert den Calibrator.
+
+        :param transcriber_factory: Erzeugt einen Transcriber mit geladenem Modell aus Modellname und Genauigkeit
+        :param thread_setter: Setzt die Thread-Zahl für die folgenden Messungen
+        :param clock: Zeitquelle in Sekunden
+        """
+        self.transcriber_factory = transcriber_factory
+        self.thread_setter = thread_setter
+        self.clock = clock
+
+    def _measure(self, transcriber: Transcriber, audio: np.ndarray, language: str, reference: str,
+                 threads: int, beam_size: Optional[int], runs: int) -> Dict[str, Any]:
+        """Misst die Median-Latenz und die Wortfehlerrate einer Kombination."""
+        self.thread_setter(threads)
+        transcriber.decode_overrides = {"beam_size": beam_size}
+        latencies, text = [], ""
+        for _ in range(runs):
+            start_time = self.clock()
+            text = transcriber.transcribe(audio, language)
+            latencies.append(self.clock() - start_time)
+        return {
+            "threads": threads,
+            "beam_size": beam_size,
+            "latency": float(np.median(latencies)),
+            "wer": word_error_rate(reference, text),
+        }
+
+    @handle_exceptions
+    def run(self, sample: np.ndarray, reference: str, language: str = "de",
+            target_latency: float = DEFAULT_LATENCY_TARGET_SECONDS,
+            audio_seconds: float = DEFAULT_LATENCY_TARGET_AUDIO_SECONDS,
+            models: Sequence[str] = CALIBRATION_MODELS, precisions: Sequence[str] = ("fp32", "int8"),
+            threads: Optional[Sequence[int]] = None, beam_sizes: Sequence[Optional[int]] = CALIBRATION_BEAM_SIZES,
+            runs: int = CALIBRATION_RUNS, max_wer: float = CALIBRATION_MAX_WER,
+            progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Führt die Kalibrierung durch.
+
+        :param sample: Die Testaufnahme (16 kHz, float32)
+        :param reference: Der gesprochene Text der Testaufnahme
+        :param language: Sprache der Testaufnahme
+        :param target_latency: Höchste zulässige Transkriptionszeit in Sekunden ...
+        :param audio_seconds: ... für so viele Sekunden Sprache
+        :param models: Modelle, vom genauesten zum schnellsten
+        :param precisions: Genauigkeiten je Modell, bevorzugte zuerst
+        :param threads: Zu messende Thread-Zahlen (Standard: thread_candidates())
+        :param beam_sizes: Beam-Größen, von der genauesten zur schnellsten (None = greedy)
+        :param runs: Gemessene Durchläufe je Kombination
+        :param max_wer: Höchste zulässige Wortfehlerrate auf der Testaufnahme
+        :param progress: Optionaler Rückruf mit einer Statusmeldung je Messung
+        :return: Das Profil (siehe Zusätzliche Erklärungen)
+        """
+        audio = calibration_audio(sample, audio_seconds)
+        threads = list(threads or thread_candidates())
+        original_threads = torch.get_num_threads()
+        measurements: List[Dict[str, Any]] = []
+        entries: Dict[str, Dict[str, Any]] = {}
+        selected = None
+        try:
+            for model_name in models:
+                for precision in precisions:
+                    key = model_key(model_name, precision)
+                    entry = self._calibrate_model(key, model_name, precision, audio, reference, language,
+                                                  target_latency, threads, beam_sizes, runs, max_wer,
+                                                  measurements, progress)
+                    if entry is None:
+                        continue
+                    entries[key] = entry
+                    if entry["meets_target"]:
+                        selected = key
+                        break
+                if selected:
+                    break
+        finally:
+            self.thread_setter(original_threads)
+
+        if selected is None and entries:
+            # Kein Modell erreicht das Ziel: das schnellste ausreichend genaue wählen
+            selected = min(entries, key=lambda k: entries[k]["latency"])
+            logger.warning(f"Kein Modell erreicht das Latenzziel; gewählt wird das schnellste: {selected}")
+        return {
+            "version": PROFILE_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "machine": {"platform": platform.platform(), "processor": platform.processor(),
+                        "cpu_count": os.cpu_count(), "torch": torch.__version__},
+            "target": {"latency_seconds": target_latency, "audio_seconds": audio_seconds},
+            "selected": selected,
+            "threads": entries[selected]["threads"] if selected else original_threads,
+            "models": entries,
+            "measurements": measurements,
+        }
+
+    def _calibrate_model(self, key: str, model_name: str, precision: str, audio: np.ndarray, reference: str,
+                         language: str, target_latency: float, threads: List[int],
+                         beam_sizes: Sequence[Optional[int]], runs: int, max_wer: float,
+                         measurements: List[Dict[str, Any]],
+                         progress: Optional[Callable[[str], None]]) -> Optional[Dict[str, Any]]:
+        """
+        Kalibriert ein Modell in einer Genauigkeit.
+
+        :return: Die beste Kombination für dieses Modell (mit meets_target) oder None, wenn es nicht geladen
+                 werden konnte oder keine Kombination genau genug war
+        """
+        try:
+            transcriber = self.transcriber_factory(model_name, precision)
+        except Exception as e:
+            logger.warning(f"Kalibrierung: {key} konnte nicht geladen werden: {e}")
+            return None
+
+        def measure(thread_count: int, beam_size: Optional[int]) -> Dict[str, Any]:
+            if progress:
+                progress(f"Kalibrierung: {key}, {thread_count} Threads, Beam {beam_size or 'greedy'}")
+            result = self._measure(transcriber, audio, language, reference, thread_count, beam_size, runs)
+            result["model"] = key
+            measurements.append(result)
+            logger.info(f"Kalibrierung {key}: {thread_count} Threads, Beam {beam_size}: "
+                        f"{result['latency']:.2f} s, WER {result['wer']:.2f}")
+            return result
+
+        try:
+            by_threads = [measure(thread_count, beam_sizes[0]) for thread_count in threads]
+            best_threads = min(by_threads, key=lambda r: r["latency"])["threads"]
+            candidates = [r for r in by_threads if r["threads"] == best_threads]
+            if candidates[0]["latency"] <= _SKIP_FACTOR * target_latency:
+                for beam_size in beam_sizes[1:]:
+                    if candidates[-1]["latency"] <= target_latency:
+                        break
+                    candidates.append(measure(best_threads, beam_size))
+        finally:
+            transcriber.release_resources()
+
+        accurate = [r for r in candidates if r["wer"] <= max_wer]
+        if not accurate:
+            logger.info(f"Kalibrierung: {key} erkennt die Testaufnahme nicht genau genug")
+            return None
+        meeting = [r for r in accurate if r["latency"] <= target_latency]
+        best = meeting[0] if meeting else min(accurate, key=lambda r: r["latency"])
+        return {"threads": best["threads"], "beam_size": best["beam_size"], "latency": best["latency"],
+                "wer": best["wer"], "meets_target": bool(meeting)}
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.backend.audio_file import read_audio
+    from src.config import CALIBRATION_PROFILE_FILE, CALIBRATION_SAMPLE_FILE, CALIBRATION_SAMPLE_TEXT
+
+    parser = argparse.ArgumentParser(description="Kalibriert Modell, Threads und Beam-Größe für ein Latenzziel")
+    parser.add_argument("--target-latency", type=float, default=DEFAULT_LATENCY_TARGET_SECONDS)
+    parser.add_argument("--audio-seconds", type=float, default=DEFAULT_LATENCY_TARGET_AUDIO_SECONDS)
+    parser.add_argument("--models", nargs="+", default=CALIBRATION_MODELS)
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--output", default=CALIBRATION_PROFILE_FILE)
+    args = parser.parse_args()
+
+    def create(model_name: str, precision: str) -> Transcriber:
+        transcriber = Transcriber(model_name, precision)
+        transcriber.load_model()
+        transcriber.warm_up("de")
+        return transcriber
+
+    sample_audio = np.asarray(read_audio(CALIBRATION_SAMPLE_FILE, TARGET_RATE), dtype=np.float32)
+    result = Calibrator(create).run(sample_audio, CALIBRATION_SAMPLE_TEXT, "de", args.target_latency,
+                                    args.audio_seconds, args.models, args.precisions, progress=print)
+    save_profile(result, args.output)
+    print(f"Gewählt: {result['selected']} mit {result['threads']} Threads -> {args.output}")
+
+# Zusätzliche Erklärungen:
+
+# 1. Profil:
+#    Das Profil ist eine JSON-Datei mit dem Ziel, dem gewählten Modell ("selected", Pool-Schlüssel wie
+#    "medium/int8"), der Thread-Zahl, den besten Einstellungen je gemessenem Modell ("models") und allen
+#    Einzelmessungen. Die Rechnerdaten werden nur zur Information gespeichert; ein auf anderer Hardware
+#    erstelltes Profil sollte neu kalibriert werden.
+
+# 2. Messung:
+#    Die Testaufnahme wird auf die Ziellänge (z.B. 3 s) wiederholt, damit die Latenz der vorgegebenen
+#    Sprechdauer entspricht. Gemessen wird der Median mehrerer Durchläufe nach dem Aufwärmen des Modells.
+#    Kombinationen, deren Wortfehlerrate über CALIBRATION_MAX_WER liegt, kommen nicht in Frage, auch wenn sie
+#    schnell genug sind.
+
+# 3. Suchreihenfolge:
+#    Die Thread-Zahl wird je Modell mit der größten Beam-Größe bestimmt, da sie sich auf alle Beam-Größen
+#    ähnlich auswirkt; danach werden nur noch kleinere Beam-Größen gemessen. Liegt ein Modell auch mit der
+#    besten Thread-Zahl weit über dem Ziel, entfallen die übrigen Messungen. So bleibt die Kalibrierung bei
+#    vier Modellen und zwei Genauigkeiten im Bereich weniger Minuten.
+
+# 4. Anwendung:
+#    Das Backend setzt beim Laden eines Modells die Thread-Zahl und die Beam-Größe aus dem Profil (siehe
+#    WordweberBackend.run_calibration und _create_transcriber).
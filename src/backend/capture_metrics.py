@@ -0,0 +1,173 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Aufnahme-Metriken der Wortweber-Anwendung.
+
+CaptureMetrics zählt je Aufnahme Überläufe, verworfene Samples, verspätete und kurze Reads
+sowie die Schwankung der Chunk-Ankunftszeiten. Damit lässt sich unterscheiden, ob schlechte
+Transkripte vom Modell oder von verlorenem Audio stammen.
+"""
+
+# Standardbibliotheken
+import time
+from typing import Any, Dict, Optional
+
+# Projektspezifische Module
+from src.config import CAPTURE_LATE_READ_FACTOR
+
+
+class CaptureMetrics:
+    """
+    Zähler für die Gesundheit einer Aufnahme.
+
+    Die Chunk-Zähler (record_chunk) werden nur vom Produzenten geschrieben, also vom
+    PyAudio-Callback bzw. vom lesenden Thread im blockierenden Modus; die Read-Zähler
+    (record_read) nur vom Aufnahme-Thread. Es genügen daher einfache Zuweisungen.
+    """
+
+    def __init__(self, sample_rate: int, chunk_size: int):
+        """
+        Initialisiert die Zähler für eine neue Aufnahme.
+
+        :param sample_rate: Aufnahmerate in Hz
+        :param chunk_size: Erwartete Samples je Chunk
+        """
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.chunk_seconds = chunk_size / sample_rate
+        self.started = time.perf_counter()
+        # Produzent
+        self.chunks = 0
+        self.overflows = 0
+        self.short_chunks = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self._last_chunk: Optional[float] = None
+        self._last_frames = chunk_size
+        # Konsument
+        self.reads = 0
+        self.late_reads = 0
+        self.max_read_gap = 0.0
+        self.max_backlog = 0
+        self._last_read: Optional[float] = None
+        # Am Ende der Aufnahme gesetzt
+        self.dropped_samples = 0
+        self.duration = 0.0
+
+    def record_chunk(self, frame_count: int, overflow: bool = False, now: Optional[float] = None) -> None:
+        """
+        Erfasst die Ankunft eines Chunks (nur vom Produzenten aufzurufen).
+
+        :param frame_count: Anzahl der gelieferten Samples
+        :param overflow: True, wenn PortAudio einen Eingangsüberlauf gemeldet hat
+        :param now: Zeitpunkt der Ankunft (perf_counter), standardmäßig jetzt
+        """
+        now = time.perf_counter() if now is None else now
+        self.chunks += 1
+        if overflow:
+            self.overflows += 1
+        if frame_count < self.chunk_size:
+            self.short_chunks += 1
+        if self._last_chunk is not None:
+            # Abweichung des Abstands von der Dauer des vorherigen Chunks
+            jitter = abs((now - self._last_chunk) - self._last_frames / self.sample_rate)
+            self.jitter_sum += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+        self._last_chunk = now
+        self._last_frames = frame_count
+
+    def record_read(self, backlog: int, now: Optional[float] = None) -> None:
+        """
+        Erfasst einen Lesevorgang des Aufnahme-Threads (nur vom Konsumenten aufzurufen).
+
+        :param backlog: Anzahl der beim Lesen bereits wartenden Samples
+        :param now: Zeitpunkt des Lesens (perf_counter), standardmäßig jetzt
+        """
+        now = time.perf_counter() if now is None else now
+        self.reads += 1
+        self.max_backlog = max(self.max_backlog, backlog)
+        if self._last_read is not None:
+            # Der erste Read folgt auf das Öffnen des Geräts und wird nicht bewertet
+            gap = now - self._last_read
+            self.max_read_gap = max(self.max_read_gap, gap)
+            if gap > CAPTURE_LATE_READ_FACTOR * self.chunk_seconds:
+                self.late_reads += 1
+        self._last_read = now
+
+    def finish(self, dropped_samples: int = 0) -> None:
+        """
+        Schließt die Erfassung am Ende der Aufnahme ab.
+
+        :param dropped_samples: Während der Aufnahme verworfene Samples
+        """
+        self.dropped_samples = dropped_samples
+        self.duration = time.perf_counter() - self.started
+
+    @property
+    def healthy(self) -> bool:
+        """True, wenn kein Audio verloren gegangen ist."""
+        return self.overflows == 0 and self.dropped_samples == 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Gibt die Metriken als Dictionary zurück (Zeiten in Millisekunden).
+
+        :return: Die Metriken der Aufnahme
+        """
+        intervals = max(1, self.chunks - 1)
+        duration = self.duration or time.perf_counter() - self.started  # Während der Aufnahme: bisherige Dauer
+        return {
+            "sample_rate": self.sample_rate,
+            "duration_s": round(duration, 3),
+            "chunks": self.chunks,
+            "overflows": self.overflows,
+            "dropped_samples": self.dropped_samples,
+            "dropped_ms": round(1000 * self.dropped_samples / self.sample_rate, 1),
+            "short_chunks": self.short_chunks,
+            "reads": self.reads,
+            "late_reads": self.late_reads,
+            "max_read_gap_ms": round(1000 * self.max_read_gap, 1),
+            "max_backlog_ms": round(1000 * self.max_backlog / self.sample_rate, 1),
+            "jitter_mean_ms": round(1000 * self.jitter_sum / intervals, 2),
+            "jitter_max_ms": round(1000 * self.jitter_max, 2),
+            "healthy": self.healthy,
+        }
+
+    def summary(self) -> str:
+        """Gibt eine einzeilige Zusammenfassung für das Log zurück."""
+        m = self.as_dict()
+        return (f"Aufnahme-Metriken: {m['overflows']} Überläufe, {m['dropped_samples']} verworfene Samples "
+                f"({m['dropped_ms']} ms), {m['late_reads']}/{m['reads']} verspätete Reads "
+                f"(max. {m['max_read_gap_ms']} ms), {m['short_chunks']}/{m['chunks']} kurze Chunks, "
+                f"Jitter {m['jitter_mean_ms']} ms (max. {m['jitter_max_ms']} ms)")
+
+# Zusätzliche Erklärungen:
+
+# 1. Überläufe und verworfene Samples:
+#    Im Callback-Modus meldet PortAudio Überläufe des Geräts über status_flags; zusätzlich zählt der
+#    Ringpuffer Samples, die er mangels Platz verwerfen musste. Im blockierenden Modus verschweigt
+#    PyAudio Überläufe bei exception_on_overflow=False; dort zeigen verspätete Reads und der Rückstand
+#    (max_backlog_ms), dass das Gerät nicht rechtzeitig gelesen wurde.
+
+# 2. Verspätete Reads:
+#    Ein Read gilt als verspätet, wenn seit dem vorherigen mehr als CAPTURE_LATE_READ_FACTOR
+#    Chunk-Dauern vergangen sind, typischerweise weil Whisper oder Tk den GIL gehalten haben.
+
+# 3. Jitter:
+#    Für jeden Chunk wird die Abweichung seines Ankunftsabstands von der Dauer des vorherigen Chunks
+#    erfasst. Hoher Jitter bei fehlenden Überläufen deutet auf Scheduling-Probleme hin, die der
+#    Ringpuffer noch auffängt.
@@ -0,0 +1,314 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Aufnahme in einem eigenen Prozess (Aufnahmemodus "process").
+
+Ein kleiner Kindprozess besitzt den PyAudio-Stream und schreibt die Samples in einen Ringpuffer
+im gemeinsamen Speicher (multiprocessing.shared_memory). Der Aufnahme-Thread der Anwendung liest
+denselben Speicher ohne Kopie über Prozessgrenzen. Der Callback des Kindprozesses konkurriert
+dadurch nicht mit Tk, pynput und PyTorch um den GIL der Anwendung.
+
+Der Kindprozess wird mit "python -m src.backend.capture_process" gestartet und importiert nur
+NumPy, PyAudio und die Kanalverarbeitung.
+"""
+
+# Standardbibliotheken
+import os
+import queue
+import subprocess
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+# Drittanbieterbibliotheken
+import numpy as np
+import pyaudio
+
+# Projektspezifische Module
+from src.config import (
+    PROJECT_ROOT, AUDIO_FORMAT, AUDIO_CHUNK, AUDIO_RING_BUFFER_SECONDS, CAPTURE_PROCESS_START_TIMEOUT, RECORDER_JOIN_TIMEOUT
+)
+from src.backend.audio_buffer import AudioRingBuffer
+from src.backend.capture_metrics import CaptureMetrics
+from src.backend.channel_mixer import ChannelMixer
+from src.utils.error_handling import logger
+
+# Aufbau des Kopfbereichs: int64-Felder, danach zwei float64-Felder für den Jitter
+_WRITE, _READ, _DROPPED, _CHUNKS, _OVERFLOWS, _SHORT_CHUNKS, _GENERATION, _SEEN_GENERATION = range(8)
+_HEADER_FIELDS = 8
+_TIMING_OFFSET = _HEADER_FIELDS * 8
+_DATA_OFFSET = _TIMING_OFFSET + 2 * 8
+
+
+class SharedAudioRingBuffer(AudioRingBuffer):
+    """
+    AudioRingBuffer im gemeinsamen Speicher zweier Prozesse.
+
+    Samples und Positionen liegen in einem SharedMemory-Block; Schreib- und Lesezugriff
+    sind unverändert von AudioRingBuffer geerbt. Der Kindprozess ist der einzige Produzent,
+    der Aufnahme-Thread der einzige Konsument. Zusätzlich veröffentlicht der Produzent die
+    Chunk-Zähler seiner CaptureMetrics, damit die Aufnahme-Metriken vollständig bleiben.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        """
+        Legt den gemeinsamen Speicher an oder öffnet einen bestehenden.
+
+        :param capacity: Kapazität des Puffers in Samples
+        :param name: Name eines bestehenden Blocks (Kindprozess); None legt einen neuen an
+        """
+        if capacity <= 0:
+            raise ValueError("Die Kapazität des Ringpuffers muss positiv sein.")
+        self.capacity = int(capacity)
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=_DATA_OFFSET + self.capacity * 2)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                # Auch das bloße Öffnen meldet den Block beim resource_tracker an, der ihn sonst beim
+                # Ende des Kindprozesses löschen würde; freigegeben wird er allein vom Elternprozess
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=self._shm.buf)
+        self._timing = np.ndarray((2,), dtype=np.float64, buffer=self._shm.buf, offset=_TIMING_OFFSET)
+        self._buffer = np.ndarray((self.capacity,), dtype=np.int16, buffer=self._shm.buf, offset=_DATA_OFFSET)
+        if self._owner:
+            self._header[:] = 0
+            self._timing[:] = 0
+
+    @property
+    def name(self) -> Optional[str]:
+        """Name des gemeinsamen Speichers, None nach close()."""
+        return self._shm.name if self._shm is not None else None
+
+    # Die Positionen liegen im gemeinsamen Speicher; jede wird nur von einer Seite geschrieben
+    _write_pos = property(lambda self: int(self._header[_WRITE]),
+                          lambda self, value: self._header.__setitem__(_WRITE, value))
+    _read_pos = property(lambda self: int(self._header[_READ]),
+                         lambda self, value: self._header.__setitem__(_READ, value))
+    dropped_samples = property(lambda self: int(self._header[_DROPPED]),
+                               lambda self, value: self._header.__setitem__(_DROPPED, value))
+
+    def reset_metrics(self) -> None:
+        """Fordert den Produzenten auf, seine Chunk-Zähler für eine neue Aufnahme zurückzusetzen (Konsument)."""
+        self._header[_GENERATION] += 1
+
+    def metrics_requested(self) -> bool:
+        """True, wenn der Konsument seit der letzten Veröffentlichung neue Zähler angefordert hat (Produzent)."""
+        return self._header[_GENERATION] != self._header[_SEEN_GENERATION]
+
+    def publish_metrics(self, metrics: CaptureMetrics) -> None:
+        """
+        Veröffentlicht die Chunk-Zähler des Produzenten.
+
+        :param metrics: Die seit der letzten Anforderung geführten Metriken des Kindprozesses
+        """
+        self._timing[0] = metrics.jitter_sum
+        self._timing[1] = metrics.jitter_max
+        self._header[_CHUNKS] = metrics.chunks
+        self._header[_OVERFLOWS] = metrics.overflows
+        self._header[_SHORT_CHUNKS] = metrics.short_chunks
+        self._header[_SEEN_GENERATION] = self._header[_GENERATION]
+
+    def collect_metrics(self, metrics: CaptureMetrics) -> None:
+        """
+        Übernimmt die Chunk-Zähler des Produzenten in die Metriken der laufenden Aufnahme.
+
+        :param metrics: Die Metriken des Aufnahme-Threads
+        """
+        if self.metrics_requested():
+            return  # Seit der Anforderung ist noch kein Chunk eingetroffen
+        metrics.chunks = int(self._header[_CHUNKS])
+        metrics.overflows = int(self._header[_OVERFLOWS])
+        metrics.short_chunks = int(self._header[_SHORT_CHUNKS])
+        metrics.jitter_sum = float(self._timing[0])
+        metrics.jitter_max = float(self._timing[1])
+
+    def close(self) -> None:
+        """
+        Löst den Puffer vom gemeinsamen Speicher, der Elternprozess gibt ihn zudem frei.
+
+        Inhalt, Positionen und Zähler werden vorher lokal kopiert, sodass noch nicht gelesene
+        Samples und die Metriken der letzten Aufnahme erhalten bleiben.
+        """
+        if self._shm is None:
+            return
+        self._header = self._header.copy()
+        self._timing = self._timing.copy()
+        self._buffer = self._buffer.copy()
+        shm, self._shm = self._shm, None
+        shm.close()
+        if self._owner:
+            shm.unlink()
+
+
+class CaptureProcess:
+    """
+    Startet und beendet den Aufnahmeprozess.
+
+    Die Klasse bietet stop_stream() und close() wie ein PyAudio-Stream, sodass der
+    AudioProcessor sie an dessen Stelle verwenden kann. Der Kindprozess liest seine
+    Standardeingabe bis zum Ende; das Schließen der Pipe beendet ihn, auch wenn die
+    Anwendung abstürzt.
+    """
+
+    def __init__(self, device_index: int, rate: int, channels: int = 1, mode: str = "mono", channel: int = 0,
+                 capacity: Optional[int] = None):
+        """
+        Startet den Aufnahmeprozess und wartet, bis er das Gerät geöffnet hat.
+
+        :param device_index: Index des Eingabegeräts
+        :param rate: Aufnahmerate in Hz
+        :param channels: Anzahl der zu öffnenden Kanäle
+        :param mode: Kanalmodus des ChannelMixers im Kindprozess
+        :param channel: Verwendeter Kanal im Modus "select"
+        :param capacity: Kapazität des Ringpuffers in Samples, standardmäßig AUDIO_RING_BUFFER_SECONDS
+        :raises IOError: Wenn das Gerät nicht geöffnet werden konnte; errno entspricht dem PortAudio-Fehler
+        """
+        self.ring_buffer = SharedAudioRingBuffer(capacity or int(rate * AUDIO_RING_BUFFER_SECONDS))
+        command = [sys.executable, "-m", "src.backend.capture_process", self.ring_buffer.name,
+                   str(self.ring_buffer.capacity), str(device_index), str(rate), str(channels), mode, str(channel)]
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+        try:
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             cwd=PROJECT_ROOT, env=env)
+        except OSError:
+            self.ring_buffer.close()
+            raise
+        status = self._wait_for_status()
+        if status != "ready":
+            self.close()
+            errno, _, message = (status or "").partition(" ")
+            if errno.lstrip("-").isdigit() and int(errno) != 0:
+                raise IOError(int(errno), message)
+            raise IOError(f"Aufnahmeprozess nicht gestartet: {message or status or 'keine Rückmeldung'}")
+        logger.info(f"Aufnahmeprozess gestartet (PID {self._process.pid})")
+
+    def _wait_for_status(self) -> Optional[str]:
+        """Liest die erste Zeile des Kindprozesses, höchstens CAPTURE_PROCESS_START_TIMEOUT Sekunden lang."""
+        lines: "queue.Queue" = queue.Queue()
+        reader = threading.Thread(target=lambda: lines.put(self._process.stdout.readline()), daemon=True)
+        reader.start()
+        try:
+            return lines.get(timeout=CAPTURE_PROCESS_START_TIMEOUT).decode("utf-8", "replace").strip()
+        except queue.Empty:
+            return None
+
+    @property
+    def alive(self) -> bool:
+        """True, solange der Kindprozess läuft."""
+        return self._process is not None and self._process.poll() is None
+
+    def stop_stream(self) -> None:
+        """Beendet den Kindprozess; die Samples im Ringpuffer bleiben lesbar."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=RECORDER_JOIN_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            logger.warning("Aufnahmeprozess reagiert nicht und wird beendet")
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+    def close(self) -> None:
+        """Beendet den Kindprozess und gibt den gemeinsamen Speicher frei."""
+        self.stop_stream()
+        self.ring_buffer.close()
+
+
+def _run_capture(shm_name: str, capacity: int, device_index: int, rate: int, channels: int, mode: str,
+                 channel: int) -> int:
+    """
+    Hauptfunktion des Kindprozesses: öffnet das Gerät und schreibt bis zum Ende der Standardeingabe.
+
+    :return: Rückgabewert des Prozesses
+    """
+    ring = SharedAudioRingBuffer(capacity, name=shm_name)
+    mixer = ChannelMixer(channels, mode, channel, rate, AUDIO_CHUNK)
+    metrics = CaptureMetrics(rate, AUDIO_CHUNK)
+
+    def callback(in_data, frame_count, time_info, status_flags):
+        nonlocal metrics
+        if ring.metrics_requested():
+            metrics = CaptureMetrics(rate, AUDIO_CHUNK)
+        if in_data:
+            ring.write(mixer.process(in_data))
+        metrics.record_chunk(frame_count, bool(status_flags & pyaudio.paInputOverflow))
+        ring.publish_metrics(metrics)
+        return (None, pyaudio.paContinue)
+
+    p = pyaudio.PyAudio()
+    try:
+        stream = p.open(format=AUDIO_FORMAT, channels=channels, rate=rate, input=True, frames_per_buffer=AUDIO_CHUNK,
+                        input_device_index=device_index, stream_callback=callback)
+    except (IOError, ValueError) as e:
+        _report(f"{getattr(e, 'errno', None) or 0} {e}")
+        p.terminate()
+        ring.close()
+        return 1
+
+    _report("ready")
+    try:
+        sys.stdin.buffer.read()  # Blockiert, bis der Elternprozess die Pipe schließt oder endet
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+        ring.close()
+    return 0
+
+
+def _report(status: str) -> None:
+    """Meldet dem Elternprozess den Startzustand in einer Zeile."""
+    sys.stdout.write(status.replace("\n", " ") + "\n")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    name, capacity, device, rate, channels, mode, channel = sys.argv[1:8]
+    sys.exit(_run_capture(name, int(capacity), int(device), int(rate), int(channels), mode, int(channel)))
+
+# Zusätzliche Erklärungen:
+
+# 1. Warum ein eigener Prozess:
+#    Im Callback-Modus läuft der PyAudio-Callback im selben Interpreter wie Tk, pynput und PyTorch und
+#    benötigt für jeden Chunk den GIL. Hält die Transkription oder die Oberfläche den GIL lange, verspätet
+#    sich der Callback und PortAudio meldet Überläufe. Im Aufnahmemodus "process" hat der Kindprozess einen
+#    eigenen Interpreter, der außer dem Callback nichts zu tun hat.
+
+# 2. Gemeinsamer Speicher:
+#    SharedAudioRingBuffer legt Positionen, Zähler und Samples in einem SharedMemory-Block ab und erbt
+#    Schreib- und Leselogik unverändert von AudioRingBuffer. Wie zwischen zwei Threads schreibt jede Seite
+#    nur ihre eigene Position, und zwar erst nach dem Kopieren der Samples. Der Aufnahme-Thread kopiert mit
+#    drain_into direkt aus dem gemeinsamen Speicher in den Aufnahmepuffer, ohne Pipe und ohne Pickle.
+
+# 3. Lebensdauer:
+#    Der Kindprozess meldet über seine Standardausgabe "ready" oder den PortAudio-Fehlercode; Fehler werden
+#    im Elternprozess als IOError mit demselben errno ausgelöst, sodass die Ausweichlösungen beim Öffnen
+#    (Mono, Abtastrate) unverändert greifen. Er endet, sobald seine Standardeingabe geschlossen wird, also
+#    auch beim Absturz der Anwendung. Der gemeinsame Speicher gehört dem Elternprozess, der ihn in close()
+#    freigibt, nachdem der Inhalt für noch ausstehende Leser lokal kopiert wurde.
+
+# 4. Metriken:
+#    Der Kindprozess führt die Chunk-Zähler (Überläufe, kurze Chunks, Jitter) in einer eigenen CaptureMetrics
+#    und veröffentlicht sie nach jedem Chunk im Kopfbereich. Zu Beginn einer Aufnahme fordert der
+#    Aufnahme-Thread über einen Generationszähler frische Zähler an.
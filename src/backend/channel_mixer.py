@@ -0,0 +1,184 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Kanalverarbeitung der Wortweber-Anwendung.
+
+Der ChannelMixer wandelt die verschachtelten Samples eines mehrkanaligen Geräts chunkweise in
+Mono um: durch Mischen aller Kanäle, Auswahl eines Kanals oder Delay-and-Sum für Mikrofonarrays.
+Er läuft im PyAudio-Callback und arbeitet daher ausschließlich mit vorallokierten Puffern.
+"""
+
+# Standardbibliotheken
+import math
+from typing import Union
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import (
+    AUDIO_CHUNK, CHANNEL_MODES, DEFAULT_CHANNEL_MODE, DAS_MAX_DELAY_MS, DAS_ANALYSIS_FRAMES, DAS_MIN_LEVEL_DB
+)
+
+
+class ChannelMixer:
+    """
+    Wandelt mehrkanalige int16-Chunks in Mono um.
+
+    Das Ergebnis von process() zeigt auf wiederverwendeten Speicher und ist nur bis zum nächsten
+    Aufruf gültig; Ringpuffer und Aufnahmepuffer kopieren es ohnehin sofort.
+    """
+
+    def __init__(self, channels: int, mode: str = DEFAULT_CHANNEL_MODE, channel: int = 0,
+                 sample_rate: int = 48000, chunk_size: int = AUDIO_CHUNK):
+        """
+        Initialisiert den ChannelMixer.
+
+        :param channels: Anzahl der verschachtelten Eingangskanäle
+        :param mode: "mono"/"mix" (Mittelwert aller Kanäle), "select" (ein Kanal) oder "delay_and_sum"
+        :param channel: Verwendeter Kanal im Modus "select"
+        :param sample_rate: Aufnahmerate in Hz, bestimmt den größten Laufzeitunterschied für "delay_and_sum"
+        :param chunk_size: Erwartete Frames je Chunk; größere Chunks vergrößern die Puffer einmalig
+        """
+        if mode not in CHANNEL_MODES:
+            raise ValueError(f"Unbekannter Kanalmodus: {mode}")
+        self.channels = max(1, int(channels))
+        self.mode = mode
+        self.channel = min(max(0, int(channel)), self.channels - 1)
+        self.max_delay = max(1, math.ceil(DAS_MAX_DELAY_MS * sample_rate / 1000))
+        self._history = 2 * self.max_delay  # Größte Verschiebung zwischen zwei Kanälen
+        self.offsets = np.zeros(self.channels, dtype=np.int64)  # Verspätung je Kanal gegenüber Kanal 0 in Samples
+        self._shifts = np.zeros(self.channels, dtype=np.int64)
+        self._analysis = np.zeros((DAS_ANALYSIS_FRAMES, self.channels), dtype=np.float32)
+        self._analysis_fill = 0
+        self._allocate(chunk_size)
+
+    def _allocate(self, frames: int) -> None:
+        """Legt die Arbeitspuffer für Chunks mit bis zu frames Frames an."""
+        self._capacity = frames
+        self._acc = np.zeros(frames, dtype=np.int32)
+        self._out = np.zeros(frames, dtype=np.int16)
+        self._ext = np.zeros((self._history + frames, self.channels), dtype=np.int16)
+
+    def reset(self) -> None:
+        """Verwirft die Vorgeschichte der Kanäle; die geschätzten Laufzeitunterschiede bleiben erhalten."""
+        self._ext[:self._history] = 0
+        self._analysis_fill = 0
+
+    def process(self, data: Union[bytes, np.ndarray]) -> np.ndarray:
+        """
+        Wandelt einen Chunk verschachtelter Samples in Mono um.
+
+        :param data: Rohdaten oder int16-Samples mit channels verschachtelten Kanälen
+        :return: Mono-Samples als int16
+        """
+        samples = np.frombuffer(data, dtype=np.int16) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        if self.channels == 1:
+            return samples
+        frames = samples.reshape(-1, self.channels)
+        if self.mode == "select":
+            # Eine Sicht mit Schrittweite; kopiert wird erst beim Schreiben in den Puffer
+            return frames[:, self.channel]
+
+        n = len(frames)
+        if n > self._capacity:
+            history = self._ext[:self._history].copy()
+            self._allocate(n)
+            self._ext[:self._history] = history
+        acc = self._acc[:n]
+        if self.mode == "delay_and_sum":
+            self._delay_and_sum(frames, acc)
+        else:
+            np.sum(frames, axis=1, dtype=np.int32, out=acc)
+        out = self._out[:n]
+        np.floor_divide(acc, self.channels, out=out, casting='unsafe')
+        return out
+
+    def _delay_and_sum(self, frames: np.ndarray, acc: np.ndarray) -> None:
+        """Summiert die um ihre Laufzeitunterschiede verschobenen Kanäle."""
+        n = len(frames)
+        h = self._history
+        ext = self._ext
+        ext[h:h + n] = frames
+        for c in range(self.channels):
+            start = h - int(self._shifts[c])
+            segment = ext[start:start + n, c]
+            if c == 0:
+                np.copyto(acc, segment, casting='unsafe')
+            else:
+                np.add(acc, segment, out=acc, casting='unsafe')
+        # Die letzten h Frames werden zur Vorgeschichte des nächsten Chunks
+        ext[:h] = ext[n:n + h]
+        # Neue Schätzungen gelten ab dem nächsten Chunk, damit die Ausgabe nicht mitten im Chunk springt
+        self._collect(frames)
+
+    def _collect(self, frames: np.ndarray) -> None:
+        """Sammelt Frames für die nächste Schätzung der Laufzeitunterschiede."""
+        pos = 0
+        while pos < len(frames):
+            take = min(len(frames) - pos, DAS_ANALYSIS_FRAMES - self._analysis_fill)
+            self._analysis[self._analysis_fill:self._analysis_fill + take] = frames[pos:pos + take]
+            self._analysis_fill += take
+            pos += take
+            if self._analysis_fill == DAS_ANALYSIS_FRAMES:
+                self._analysis_fill = 0
+                self._update_shifts()
+
+    def _update_shifts(self) -> None:
+        """Schätzt die Laufzeitunterschiede aus dem gesammelten Abschnitt, sofern er laut genug ist."""
+        block = self._analysis / np.float32(32768.0)
+        level = float(np.sqrt(np.mean(block[:, 0] ** 2)))
+        if level <= 0 or 20 * math.log10(level) < DAS_MIN_LEVEL_DB:
+            return
+        self.offsets = estimate_offsets(block, self.max_delay)
+        self._shifts = self.offsets.max() - self.offsets
+
+
+def estimate_offsets(block: np.ndarray, max_delay: int) -> np.ndarray:
+    """
+    Schätzt per GCC-PHAT, um wie viele Samples jeder Kanal gegenüber Kanal 0 verspätet ist.
+
+    :param block: Frames als float32 mit der Form (Frames, Kanäle)
+    :param max_delay: Größter berücksichtigter Laufzeitunterschied in Samples
+    :return: Verspätung je Kanal in Samples (Kanal 0 hat immer 0)
+    """
+    n = 2 * len(block)
+    spectra = np.fft.rfft(block, n=n, axis=0)
+    cross = spectra * np.conj(spectra[:, :1])
+    # PHAT-Gewichtung: nur die Phase zählt, sodass tiefe, energiereiche Frequenzen nicht dominieren
+    cross /= np.abs(cross) + 1e-12
+    correlation = np.fft.irfft(cross, n=n, axis=0)
+    window = np.concatenate((correlation[-max_delay:], correlation[:max_delay + 1]), axis=0)  # Verzögerungen -max..max
+    return np.argmax(window, axis=0).astype(np.int64) - max_delay
+
+# Zusätzliche Erklärungen:
+
+# 1. Mischen und Auswahl:
+#    "mix" summiert die Kanäle in einem einzigen np.sum-Aufruf in einen vorallokierten int32-Puffer und
+#    teilt direkt in den int16-Ausgabepuffer. "select" gibt eine Sicht auf einen Kanal zurück, ganz ohne
+#    Kopie. "mono" verhält sich bei mehrkanalig geöffneten Geräten wie "mix".
+
+# 2. Delay-and-Sum:
+#    Bei einem Mikrofonarray erreicht die Stimme jedes Mikrofon zu einem etwas anderen Zeitpunkt. Alle
+#    DAS_ANALYSIS_FRAMES Frames wird der Laufzeitunterschied jedes Kanals zu Kanal 0 per GCC-PHAT geschätzt,
+#    sofern der Abschnitt laut genug ist. Die Kanäle werden um diese Unterschiede verschoben und summiert:
+#    die Sprache addiert sich phasengleich, unkorreliertes Rauschen nicht. Bei N Mikrofonen verbessert das
+#    den Signal-Rausch-Abstand um bis zu 10*log10(N) dB.
+
+# 3. Zustand:
+#    Für die Verschiebung werden die letzten 2*max_delay Frames des vorherigen Chunks aufbewahrt. Die
+#    Ausgabe ist dadurch um höchstens 2 ms verzögert.
@@ -0,0 +1,157 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Signalaufbereitung der Wortweber-Anwendung.
+
+Der AudioConditioner bereitet die resampelten Chunks bereits während der Aufnahme auf:
+ein Biquad-Hochpass entfernt Gleichanteil und tieffrequentes Brummen, die automatische
+Pegelanpassung (AGC) bringt Sprache auf einen einheitlichen Pegel. Beide Stufen tragen
+ihren Zustand von Chunk zu Chunk, sodass nach dem Tastenende keine Arbeit mehr anfällt.
+"""
+
+# Standardbibliotheken
+import math
+
+# Drittanbieterbibliotheken
+import numpy as np
+from scipy import signal
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, HIGHPASS_CUTOFF_HZ, HIGHPASS_ORDER, DEFAULT_AGC_TARGET_DB, AGC_MAX_GAIN_DB, AGC_MIN_GAIN_DB,
+    AGC_GATE_DB, AGC_BLOCK_MS, AGC_ATTACK_SECONDS, AGC_RELEASE_SECONDS, AGC_PEAK_LIMIT
+)
+
+
+class AudioConditioner:
+    """
+    Zustandsbehaftete Aufbereitungskette aus Hochpass und automatischer Pegelanpassung.
+
+    Die Ausgabe hängt nicht von der Chunk-Aufteilung ab, solange die Chunks ein Vielfaches
+    der Regelblocklänge sind; andernfalls unterscheiden sich nur die Zeitpunkte, zu denen die
+    Verstärkung nachgeführt wird.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_RATE, highpass: bool = True, agc: bool = True,
+                 target_db: float = DEFAULT_AGC_TARGET_DB, cutoff_hz: float = HIGHPASS_CUTOFF_HZ):
+        """
+        Initialisiert die Aufbereitungskette.
+
+        :param sample_rate: Abtastrate der Chunks in Hz
+        :param highpass: True, um den Hochpass anzuwenden
+        :param agc: True, um die automatische Pegelanpassung anzuwenden
+        :param target_db: Ziel-RMS-Pegel der AGC in dBFS
+        :param cutoff_hz: Grenzfrequenz des Hochpasses in Hz
+        """
+        self.sample_rate = sample_rate
+        self.highpass = highpass
+        self.agc = agc
+        self.target_db = target_db
+        self._sos = signal.butter(HIGHPASS_ORDER, cutoff_hz, btype='highpass', fs=sample_rate, output='sos')
+        self._zi_step = signal.sosfilt_zi(self._sos)  # Eingeschwungener Zustand für ein konstantes Signal von 1
+        self._block = max(1, int(sample_rate * AGC_BLOCK_MS / 1000))
+        self.gain_db = 0.0
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        """True, wenn mindestens eine Stufe aktiv ist."""
+        return self.highpass or self.agc
+
+    def reset(self, keep_gain: bool = True) -> None:
+        """
+        Setzt den Zustand für eine neue Aufnahme zurück.
+
+        :param keep_gain: True, um die zuletzt eingeregelte Verstärkung beizubehalten. Die nächste
+                          Aufnahme beginnt dann bereits mit dem passenden Pegel für dieses Mikrofon.
+        """
+        self._zi = None
+        if not keep_gain:
+            self.gain_db = 0.0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Bereitet einen Chunk auf.
+
+        :param chunk: Samples als float32 im Bereich [-1, 1]
+        :return: Die aufbereiteten Samples als float32 mit gleicher Länge
+        """
+        samples = np.asarray(chunk, dtype=np.float32)
+        if len(samples) == 0 or not self.enabled:
+            return samples
+        if self.highpass:
+            samples = self._apply_highpass(samples)
+        if self.agc:
+            samples = self._apply_agc(samples)
+        return samples
+
+    def _apply_highpass(self, samples: np.ndarray) -> np.ndarray:
+        """Filtert den Chunk mit dem Hochpass und übernimmt den Filterzustand für den nächsten Chunk."""
+        if self._zi is None:
+            # Start im eingeschwungenen Zustand: ein Gleichanteil erzeugt keinen Einschwingimpuls
+            self._zi = self._zi_step * float(samples[0])
+        filtered, self._zi = signal.sosfilt(self._sos, samples, zi=self._zi)
+        return filtered.astype(np.float32)
+
+    def _apply_agc(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Führt die Verstärkung blockweise nach und wendet sie mit Rampen an.
+
+        Blöcke unter AGC_GATE_DB (Pausen, Grundrauschen) halten die Verstärkung, damit Stille
+        nicht bis zum Zielpegel angehoben wird.
+        """
+        output = np.empty_like(samples)
+        gain = 10 ** (self.gain_db / 20)
+        for start in range(0, len(samples), self._block):
+            block = samples[start:start + self._block]
+            n = len(block)
+            rms = math.sqrt(float(np.dot(block, block)) / n)
+            rms_db = 20 * math.log10(rms) if rms > 0 else -120.0
+            if rms_db > AGC_GATE_DB:
+                desired_db = min(max(self.target_db - rms_db, AGC_MIN_GAIN_DB), AGC_MAX_GAIN_DB)
+                time_constant = AGC_ATTACK_SECONDS if desired_db < self.gain_db else AGC_RELEASE_SECONDS
+                coef = math.exp(-n / (time_constant * self.sample_rate))
+                self.gain_db = desired_db + (self.gain_db - desired_db) * coef
+            peak = max(float(block.max()), -float(block.min()))
+            if peak > 0:
+                # Begrenzer: Die Verstärkung darf den Block nicht über AGC_PEAK_LIMIT heben
+                self.gain_db = min(self.gain_db, 20 * math.log10(AGC_PEAK_LIMIT / peak))
+            new_gain = 10 ** (self.gain_db / 20)
+            # Lineare Rampe von der bisherigen zur neuen Verstärkung verhindert hörbare Sprünge
+            ramp = gain + (new_gain - gain) * (np.arange(1, n + 1, dtype=np.float32) / n)
+            np.multiply(block, ramp, out=output[start:start + n])
+            gain = new_gain
+        return np.clip(output, -1.0, 1.0, out=output)
+
+# Zusätzliche Erklärungen:
+
+# 1. Hochpass:
+#    Ein Butterworth-Hochpass zweiter Ordnung (ein Biquad) bei HIGHPASS_CUTOFF_HZ entfernt Gleichanteile
+#    billiger Soundkarten sowie Brummen und Trittschall. Der Filterzustand (zi) wird über die Chunks
+#    hinweg übertragen; das Ergebnis ist identisch mit einer Filterung der gesamten Aufnahme.
+
+# 2. Automatische Pegelanpassung:
+#    Die AGC misst den RMS-Pegel je AGC_BLOCK_MS und führt die Verstärkung in Richtung DEFAULT_AGC_TARGET_DB
+#    nach: schnell beim Absenken (AGC_ATTACK_SECONDS), langsam beim Anheben (AGC_RELEASE_SECONDS). Pausen
+#    unter AGC_GATE_DB halten die Verstärkung; ein Spitzenbegrenzer verhindert Übersteuerung. Leise
+#    Mikrofone erreichen Whisper so mit Sprachpegel, was Fehlentscheidungen der Stille-Erkennung
+#    (no_speech_threshold) verringert.
+
+# 3. Position in der Verarbeitung:
+#    Die Kette läuft nach dem StreamingResampler auf 16 kHz, also mit der geringsten Samplezahl. Der
+#    LevelMeter misst weiterhin das unbearbeitete Eingangssignal, damit die Pegelanzeige Probleme
+#    des Mikrofons zeigt. Die Verstärkung bleibt zwischen Aufnahmen erhalten.
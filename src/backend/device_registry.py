@@ -0,0 +1,208 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält das Geräteverzeichnis der Wortweber-Anwendung.
+
+Das AudioDeviceRegistry fragt die Audiogeräte einmalig bei PortAudio ab und hält die
+Informationen zwischengespeichert. Ein Hintergrund-Thread erkennt das Hinzufügen und
+Entfernen von Geräten über einen günstigen Vergleich der Kernel-Geräteliste.
+"""
+
+# Standardbibliotheken
+import threading
+from typing import Callable, Dict, Optional
+
+# Projektspezifische Module
+from src.config import DEVICE_MONITOR_INTERVAL, ASOUND_CARDS_PATH
+from src.utils.error_handling import logger
+
+
+class AudioDeviceRegistry:
+    """
+    Zwischenspeicher für die Audiogeräte-Informationen von PortAudio.
+
+    Alle Abfragen (Geräteliste, Verfügbarkeit, Name) werden aus dem Zwischenspeicher
+    beantwortet. Neu eingelesen wird nur über refresh(), also beim Start und nach einer
+    erkannten Hardwareänderung.
+    """
+
+    def __init__(self):
+        """Initialisiert ein leeres Geräteverzeichnis."""
+        self._lock = threading.RLock()
+        self._devices: Dict[int, dict] = {}
+        self._default_input_index: Optional[int] = None
+        self._signature: Optional[str] = None
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._interval = DEVICE_MONITOR_INTERVAL
+
+    def refresh(self, pa) -> None:
+        """
+        Liest alle Geräte von einer PyAudio-Instanz ein.
+
+        :param pa: Die PyAudio-Instanz
+        """
+        devices = {}
+        for index in range(pa.get_device_count()):
+            try:
+                devices[index] = dict(pa.get_device_info_by_index(index))
+            except Exception as e:
+                logger.warning(f"Geräteinformationen für Index {index} nicht lesbar: {e}")
+        try:
+            default_index = int(pa.get_default_input_device_info()['index'])
+        except Exception:
+            default_index = next((i for i, info in devices.items() if info.get('maxInputChannels', 0) > 0), None)
+        with self._lock:
+            self._devices = devices
+            self._default_input_index = default_index
+            self._signature = self.hardware_signature()
+        logger.debug(f"Geräteverzeichnis aktualisiert: {len(devices)} Geräte")
+
+    def device_count(self) -> int:
+        """Gibt die Anzahl der bekannten Geräte zurück."""
+        with self._lock:
+            return len(self._devices)
+
+    def get_device(self, index: int) -> Optional[dict]:
+        """
+        Gibt die zwischengespeicherten Informationen eines Geräts zurück.
+
+        :param index: Der Geräteindex
+        :return: Die Geräteinformationen oder None, wenn das Gerät unbekannt ist
+        """
+        with self._lock:
+            return self._devices.get(index)
+
+    def is_input_available(self, index: int) -> bool:
+        """
+        Prüft anhand des Zwischenspeichers, ob ein Gerät Eingabekanäle besitzt.
+
+        :param index: Der Geräteindex
+        :return: True, wenn das Gerät bekannt ist und Eingabekanäle hat
+        """
+        info = self.get_device(index)
+        return bool(info) and info.get('maxInputChannels', 0) > 0
+
+    def input_devices(self) -> Dict[int, str]:
+        """
+        Gibt alle Eingabegeräte zurück.
+
+        :return: Ein Dictionary Geräteindex -> Gerätename
+        """
+        with self._lock:
+            return {index: info.get('name', 'Unbekanntes Gerät')
+                    for index, info in self._devices.items() if info.get('maxInputChannels', 0) > 0}
+
+    def default_input_index(self) -> Optional[int]:
+        """Gibt den Index des Standard-Eingabegeräts zurück."""
+        with self._lock:
+            return self._default_input_index
+
+    def find_input_by_name(self, name: str) -> Optional[int]:
+        """
+        Sucht ein Eingabegerät anhand seines Namens.
+
+        PortAudio vergibt die Indizes nach einer Hardwareänderung neu; der Name bleibt stabil.
+
+        :param name: Der Gerätename
+        :return: Der aktuelle Index oder None, wenn das Gerät nicht vorhanden ist
+        """
+        for index, device_name in self.input_devices().items():
+            if device_name == name:
+                return index
+        return None
+
+    @staticmethod
+    def hardware_signature() -> Optional[str]:
+        """
+        Liefert eine günstig zu ermittelnde Kennung der angeschlossenen Audiohardware.
+
+        Unter Linux ist das die Kernel-Liste der Soundkarten; auf anderen Systemen steht
+        keine vergleichbare Quelle zur Verfügung.
+
+        :return: Die Kennung oder None, wenn sie nicht ermittelt werden kann
+        """
+        try:
+            with open(ASOUND_CARDS_PATH, 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def start_monitoring(self, on_change: Callable[[], None], interval: float = DEVICE_MONITOR_INTERVAL) -> bool:
+        """
+        Startet die Hintergrundüberwachung auf hinzugefügte oder entfernte Geräte.
+
+        :param on_change: Wird im Überwachungs-Thread aufgerufen, wenn sich die Hardware geändert hat
+        :param interval: Abfrageintervall in Sekunden
+        :return: True, wenn die Überwachung läuft
+        """
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return True
+        if self.hardware_signature() is None:
+            logger.debug("Keine Geräteüberwachung verfügbar (Kernel-Geräteliste nicht lesbar)")
+            return False
+        self._stop_event.clear()
+        self._interval = interval
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, args=(on_change, interval), daemon=True)
+        self._monitor_thread.start()
+        return True
+
+    def stop_monitoring(self) -> None:
+        """Beendet die Hintergrundüberwachung."""
+        self._stop_event.set()
+        if self._monitor_thread and self._monitor_thread is not threading.current_thread():
+            self._monitor_thread.join(timeout=self._interval + 1.0)
+        self._monitor_thread = None
+
+    def _monitor_loop(self, on_change: Callable[[], None], interval: float) -> None:
+        """
+        Vergleicht die Hardwarekennung periodisch mit dem Stand des letzten Einlesens.
+
+        Jeder neue Stand wird nur einmal gemeldet, auch wenn das Einlesen aufgeschoben wird (laufende
+        Aufnahme) oder fehlschlägt; das Nachholen übernimmt der AudioProcessor.
+        """
+        reported = None  # Zuletzt gemeldete, noch nicht eingelesene Kennung
+        while not self._stop_event.wait(interval):
+            signature = self.hardware_signature()
+            with self._lock:
+                changed = signature != self._signature
+            if not changed:
+                reported = None
+            elif signature != reported:
+                reported = signature
+                logger.info("Änderung der Audiogeräte erkannt")
+                try:
+                    on_change()
+                except Exception as e:
+                    logger.error(f"Fehler bei der Verarbeitung der Geräteänderung: {e}")
+
+# Zusätzliche Erklärungen:
+
+# 1. Zwischenspeicher:
+#    PortAudio liefert Geräteinformationen ohnehin nur für den Stand beim Initialisieren. Alle Abfragen
+#    aus Aufnahmepfad und Oberfläche werden daher aus dem Zwischenspeicher beantwortet, statt PortAudio
+#    bei jeder Aufnahme erneut zu befragen.
+
+# 2. Hotplug-Erkennung:
+#    Der Überwachungs-Thread liest nur /proc/asound/cards und vergleicht den Inhalt mit dem Stand beim
+#    letzten Einlesen. Erst bei einer Änderung muss PortAudio neu initialisiert werden, um die neuen
+#    Geräte zu sehen; das übernimmt der AudioProcessor, sobald keine Aufnahme läuft. Jeder neue Stand wird
+#    nur einmal gemeldet, damit ein langes Dauerdiktat das Protokoll nicht alle paar Sekunden füllt.
+
+# 3. Stabile Zuordnung:
+#    Nach einer Änderung können sich die Indizes verschieben. find_input_by_name erlaubt es, das
+#    ausgewählte Gerät anhand seines Namens wiederzufinden.
@@ -0,0 +1,531 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Aktivierung per Schlüsselwort für das Dauerdiktat.
+
+Der KeywordSpotter vergleicht den laufenden Audiostream über MFCC-Merkmale und Dynamic Time
+Warping mit eingelernten Aufnahmen eines Schlüsselworts. Das KeywordGate lässt erst nach einer
+Erkennung Audio zum StreamingSegmenter und damit zu Whisper durch. Die Rechenzeit des Spotters
+wird gemessen und auf einen festen Anteil eines CPU-Kerns begrenzt.
+"""
+
+# Standardbibliotheken
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Drittanbieterbibliotheken
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, VAD_ENERGY_THRESHOLD_DB, VAD_NOISE_MARGIN_DB, DEFAULT_KEYWORD_THRESHOLD, DEFAULT_KEYWORD_CPU_BUDGET,
+    DEFAULT_KEYWORD_LISTEN_SECONDS, KEYWORD_FRAME_MS, KEYWORD_HOP_MS, KEYWORD_MEL_BANDS, KEYWORD_MFCC_COEFFS,
+    KEYWORD_EVAL_INTERVAL_MS, KEYWORD_CPU_BURST_SECONDS, KEYWORD_TEMPLATE_MIN_MS, KEYWORD_TEMPLATE_MAX_SECONDS
+)
+from src.backend.vad import VoiceActivityDetector, StreamingSegmenter
+from src.utils.error_handling import logger
+
+_PRE_EMPHASIS = 0.97  # Anhebung hoher Frequenzen vor der Spektralanalyse
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """
+    Erzeugt eine Bank dreieckiger Mel-Filter.
+
+    :param sample_rate: Abtastrate in Hz
+    :param n_fft: FFT-Länge
+    :param n_mels: Anzahl der Filter
+    :return: Matrix (n_mels, n_fft // 2 + 1)
+    """
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+class MfccExtractor:
+    """
+    Berechnet MFCC-Merkmale blockweise aus einem fortlaufenden Stream.
+
+    Überlappende Frames werden über Blockgrenzen hinweg gebildet; ein Block liefert dieselben
+    Merkmale wie die Analyse des gesamten Signals.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_RATE, frame_ms: int = KEYWORD_FRAME_MS, hop_ms: int = KEYWORD_HOP_MS,
+                 n_mels: int = KEYWORD_MEL_BANDS, n_mfcc: int = KEYWORD_MFCC_COEFFS):
+        """
+        Initialisiert den MfccExtractor.
+
+        :param sample_rate: Abtastrate des Streams in Hz
+        :param frame_ms: Fensterlänge in Millisekunden
+        :param hop_ms: Vorschub in Millisekunden
+        :param n_mels: Anzahl der Mel-Filter
+        :param n_mfcc: Anzahl der Cepstralkoeffizienten einschließlich c0
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.hop_length = int(sample_rate * hop_ms / 1000)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self._window = np.hamming(self.frame_length).astype(np.float32)
+        self._filterbank = mel_filterbank(sample_rate, self.n_fft, n_mels)
+        n = np.arange(n_mels)
+        dct = np.cos(np.pi / n_mels * (n + 0.5)[None, :] * np.arange(n_mfcc)[:, None]) * np.sqrt(2.0 / n_mels)
+        dct[0] /= np.sqrt(2.0)
+        self._dct = dct.astype(np.float32)
+        self.n_features = n_mfcc - 1
+        self._remainder = np.empty(0, dtype=np.float32)
+
+    def reset(self) -> None:
+        """Verwirft angefangene Frames."""
+        self._remainder = np.empty(0, dtype=np.float32)
+
+    @property
+    def pending_samples(self) -> int:
+        """Anzahl der Samples seit dem Beginn des nächsten, noch unvollständigen Frames."""
+        return len(self._remainder)
+
+    def process(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Berechnet die Merkmale aller Frames, die mit den neuen Samples vollständig sind.
+
+        :param samples: Neue Samples als float32
+        :return: Tupel aus MFCC-Matrix (Frames, n_mfcc - 1) ohne c0 und Frame-Energie in dBFS
+        """
+        data = np.concatenate((self._remainder, np.asarray(samples, dtype=np.float32)))
+        if len(data) < self.frame_length:
+            self._remainder = data
+            return np.empty((0, self.n_features), dtype=np.float32), np.empty(0, dtype=np.float32)
+        frames = sliding_window_view(data, self.frame_length)[::self.hop_length]
+        self._remainder = data[len(frames) * self.hop_length:].copy()
+
+        energy_db = 10 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+        emphasized = np.empty_like(frames)
+        emphasized[:, 0] = frames[:, 0]
+        emphasized[:, 1:] = frames[:, 1:] - _PRE_EMPHASIS * frames[:, :-1]
+        power = np.abs(np.fft.rfft(emphasized * self._window, n=self.n_fft)) ** 2
+        log_mel = np.log(power @ self._filterbank.T + 1e-10)
+        mfcc = log_mel @ self._dct.T
+        return mfcc[:, 1:].astype(np.float32), energy_db.astype(np.float32)
+
+
+def subsequence_dtw(template: np.ndarray, window: np.ndarray) -> np.ndarray:
+    """
+    Vergleicht eine Vorlage mit allen Abschnitten eines Fensters per Dynamic Time Warping.
+
+    Die Vorlage darf an jeder Stelle des Fensters beginnen. Erlaubt sind die Schritte (1,1), (1,2) und
+    (2,1), sodass das Tempo zwischen halber und doppelter Geschwindigkeit der Vorlage liegen darf und
+    jede Zeile der Kostenmatrix über das Fenster vektorisiert berechnet wird.
+
+    :param template: Normierte Merkmale der Vorlage (T, d)
+    :param window: Normierte Merkmale des Fensters (W, d)
+    :return: Mittlerer Kosinusabstand des besten Pfades, der im jeweiligen Fenster-Frame endet (W,)
+    """
+    cost = 1.0 - template @ window.T
+    rows, width = cost.shape
+    previous2 = None
+    previous = cost[0].copy()
+    for i in range(1, rows):
+        candidates = np.full(width, np.inf, dtype=cost.dtype)
+        candidates[1:] = previous[:-1]
+        if width > 2:
+            np.minimum(candidates[2:], previous[:-2], out=candidates[2:])
+        if previous2 is not None:
+            np.minimum(candidates[1:], previous2[:-1] + cost[i - 1, 1:], out=candidates[1:])
+        previous2, previous = previous, cost[i] + candidates
+    return previous / rows
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    """Normiert jeden Merkmalsvektor auf Länge 1 für den Kosinusabstand."""
+    return features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-8)
+
+
+class KeywordDetection(NamedTuple):
+    """Eine Erkennung des Schlüsselworts."""
+    score: float  # Mittlerer Kosinusabstand zur ähnlichsten Vorlage
+    tail: np.ndarray  # Samples nach dem Ende des Schlüsselworts aus dem zuletzt verarbeiteten Block
+
+
+class KeywordSpotter:
+    """
+    Erkennt ein eingelerntes Schlüsselwort in einem fortlaufenden 16-kHz-Stream.
+
+    Die Merkmale werden für jeden Block berechnet; der Vergleich mit den Vorlagen läuft alle
+    KEYWORD_EVAL_INTERVAL_MS, sofern kürzlich Sprache erkannt wurde und das Rechenzeitbudget es
+    zulässt. process() wird nur vom Aufnahme-Thread aufgerufen.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_KEYWORD_THRESHOLD, cpu_budget: float = DEFAULT_KEYWORD_CPU_BUDGET,
+                 sample_rate: int = TARGET_RATE):
+        """
+        Initialisiert den KeywordSpotter.
+
+        :param threshold: Größter mittlerer Kosinusabstand für eine Erkennung
+        :param cpu_budget: Höchster Anteil eines CPU-Kerns, den der Spotter im Mittel verbrauchen darf
+        :param sample_rate: Abtastrate des Streams in Hz
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.cpu_budget = cpu_budget
+        self.features = MfccExtractor(sample_rate)
+        self.templates: List[np.ndarray] = []  # MFCC-Merkmale je Vorlage (Frames, n_features)
+        self._eval_interval = max(1, int(round(KEYWORD_EVAL_INTERVAL_MS / KEYWORD_HOP_MS)))
+        self._budget_warned = False
+        self._set_templates([])
+        self.reset_stats()
+
+    def reset(self) -> None:
+        """Verwirft den bisherigen Stream, z.B. nach einer Erkennung."""
+        self.features.reset()
+        self._window = np.empty((0, self.features.n_features), dtype=np.float32)
+        self._speech = np.empty(0, dtype=bool)
+        self._history = np.empty(0, dtype=np.float32)
+        self._frames_since_eval = 0
+        self._frame_total = 0
+        self._sample_total = 0
+        self._candidate: Optional[Tuple[float, int]] = None  # Bester Abstand unter der Schwelle und dessen End-Frame
+        self._noise_floor_db = VAD_ENERGY_THRESHOLD_DB - VAD_NOISE_MARGIN_DB
+
+    def reset_stats(self) -> None:
+        """Setzt die Messwerte für Rechenzeit und Vergleiche zurück."""
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.feature_seconds = 0.0
+        self.evaluations = 0
+        self.skipped_evaluations = 0
+        self.detections = 0
+        self._credit = self.cpu_budget * KEYWORD_CPU_BURST_SECONDS
+
+    def add_template(self, audio: np.ndarray) -> bool:
+        """
+        Lernt eine Aufnahme des Schlüsselworts als Vorlage ein.
+
+        Stille am Anfang und Ende wird entfernt; gespeichert werden nur die Merkmale.
+
+        :param audio: Aufnahme des Schlüsselworts als float32 mit der Abtastrate des Spotters
+        :return: True, wenn die Vorlage übernommen wurde
+        """
+        speech = VoiceActivityDetector(sample_rate=self.sample_rate, padding_ms=0).trim(np.asarray(audio, dtype=np.float32))
+        if speech is None:
+            logger.warning("Keine Sprache in der Aufnahme für das Schlüsselwort gefunden")
+            return False
+        duration = len(speech) / self.sample_rate
+        if duration * 1000 < KEYWORD_TEMPLATE_MIN_MS or duration > KEYWORD_TEMPLATE_MAX_SECONDS:
+            logger.warning(f"Schlüsselwort-Aufnahme mit {duration:.2f} s ist zu kurz oder zu lang")
+            return False
+        mfcc, _ = MfccExtractor(self.sample_rate).process(speech)
+        self._set_templates(self.templates + [mfcc])
+        logger.info(f"Schlüsselwort-Vorlage {len(self.templates)} eingelernt ({duration:.2f} s)")
+        return True
+
+    def clear_templates(self) -> None:
+        """Entfernt alle Vorlagen."""
+        self._set_templates([])
+
+    def _set_templates(self, templates: List[np.ndarray]) -> None:
+        """Übernimmt die Vorlagen und passt die Länge des Vergleichsfensters an."""
+        self.templates = templates
+        # Mittelwert aller Vorlagen-Frames: entfernt den gemeinsamen Anteil (Mikrofon, Raum) vor dem Kosinusvergleich
+        self._mean = np.concatenate(templates).mean(axis=0) if templates else np.zeros(self.features.n_features, np.float32)
+        self._normalized = [_normalize(t - self._mean) for t in templates]
+        longest = max((len(t) for t in templates), default=0)
+        # Beim halben Tempo ist das gesprochene Wort doppelt so lang wie die Vorlage
+        self._window_frames = 2 * longest + self._eval_interval
+        self._history_samples = self._window_frames * self.features.hop_length + self.features.frame_length
+        self.reset()
+
+    def save(self, path: str) -> None:
+        """
+        Speichert die Vorlagen als .npz-Datei.
+
+        :param path: Zielpfad
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, sample_rate=self.sample_rate, **{f"template_{i}": t for i, t in enumerate(self.templates)})
+
+    def load(self, path: str) -> bool:
+        """
+        Lädt gespeicherte Vorlagen.
+
+        :param path: Pfad der .npz-Datei
+        :return: True, wenn Vorlagen geladen wurden
+        """
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            if int(data["sample_rate"]) != self.sample_rate:
+                logger.warning(f"Schlüsselwort-Vorlagen in {path} haben eine andere Abtastrate und werden ignoriert")
+                return False
+            count = sum(1 for key in data.files if key.startswith("template_"))
+            self._set_templates([data[f"template_{i}"].astype(np.float32) for i in range(count)])
+        return bool(self.templates)
+
+    @property
+    def load_fraction(self) -> float:
+        """Gemessener CPU-Anteil des Spotters bezogen auf die Dauer des verarbeiteten Audios."""
+        return self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Liefert die Messwerte des Spotters.
+
+        :return: Dictionary mit Audiodauer, CPU-Anteilen, Vergleichen und Erkennungen
+        """
+        return {
+            "audio_seconds": round(self.audio_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "load": round(self.load_fraction, 4),
+            "feature_load": round(self.feature_seconds / self.audio_seconds, 4) if self.audio_seconds else 0.0,
+            "cpu_budget": self.cpu_budget,
+            "evaluations": self.evaluations,
+            "skipped_evaluations": self.skipped_evaluations,
+            "detections": self.detections,
+        }
+
+    def process(self, samples: np.ndarray) -> Optional[KeywordDetection]:
+        """
+        Verarbeitet neue Samples des Streams.
+
+        :param samples: Neue Samples als float32 mit der Abtastrate des Spotters
+        :return: Die Erkennung oder None
+        """
+        start = time.thread_time()
+        samples = np.asarray(samples, dtype=np.float32)
+        duration = len(samples) / self.sample_rate
+        self._history = np.concatenate((self._history, samples))[-self._history_samples:]
+        self._sample_total += len(samples)
+        mfcc, energy_db = self.features.process(samples)
+        if len(mfcc):
+            self._window = np.concatenate((self._window, mfcc))[-self._window_frames:]
+            self._speech = np.concatenate((self._speech, self._classify(energy_db)))[-self._window_frames:]
+            self._frames_since_eval += len(mfcc)
+            self._frame_total += len(mfcc)
+        feature_time = time.thread_time() - start
+        self.feature_seconds += feature_time
+
+        # Rechenzeitkonto: jede Sekunde Audio schreibt cpu_budget Sekunden gut, alle Arbeit wird abgebucht
+        self._credit = min(self._credit + duration * self.cpu_budget,
+                           self.cpu_budget * KEYWORD_CPU_BURST_SECONDS) - feature_time
+        detection = None
+        due = self._frames_since_eval >= self._eval_interval
+        if self.templates and due and (self._speech_recent() or self._candidate is not None):
+            self._frames_since_eval = 0
+            if self._credit > 0:
+                detection = self._evaluate()
+            else:
+                self.skipped_evaluations += 1
+
+        elapsed = time.thread_time() - start
+        self._credit -= elapsed - feature_time
+        self.cpu_seconds += elapsed
+        self.audio_seconds += duration
+        self._check_budget()
+        return detection
+
+    def _classify(self, energy_db: np.ndarray) -> np.ndarray:
+        """Markiert Frames mit Sprache anhand der Energie und führt das Grundrauschen nach."""
+        speech = np.empty(len(energy_db), dtype=bool)
+        for i, level in enumerate(energy_db):
+            threshold = max(VAD_ENERGY_THRESHOLD_DB, self._noise_floor_db + VAD_NOISE_MARGIN_DB)
+            speech[i] = level > threshold
+            if not speech[i]:
+                # Minimum-Verfolgung wie im StreamingSegmenter
+                self._noise_floor_db = min(float(level), 0.95 * self._noise_floor_db + 0.05 * float(level))
+        return speech
+
+    def _speech_recent(self) -> bool:
+        """True, wenn seit dem letzten Vergleich Sprache im Fenster hinzugekommen ist."""
+        return bool(self._speech[-self._eval_interval:].any())
+
+    def _evaluate(self) -> Optional[KeywordDetection]:
+        """
+        Vergleicht das Fenster mit allen Vorlagen.
+
+        Eine Übereinstimmung unter der Schwelle wird erst gemeldet, wenn der nächste Vergleich keinen
+        kleineren Abstand liefert; so endet die Erkennung am Ende des Worts und nicht schon bei einem Teil davon.
+        """
+        self.evaluations += 1
+        best_score, best_end = np.inf, 0
+        window = _normalize(self._window - self._mean)
+        for template in self._normalized:
+            if len(window) < (len(template) + 1) // 2:
+                continue
+            scores = subsequence_dtw(template, window)
+            end = int(np.argmin(scores))
+            if scores[end] < best_score:
+                best_score, best_end = float(scores[end]), end
+        if best_score < self.threshold and (self._candidate is None or best_score < self._candidate[0]):
+            # Solange der Abstand sinkt, ist das Wort noch nicht zu Ende gesprochen
+            self._candidate = (best_score, self._frame_total - len(window) + best_end)
+            return None
+        if self._candidate is None:
+            return None
+
+        # Samples nach dem letzten Frame des Schlüsselworts gehören zur folgenden Äußerung
+        score, end_frame = self._candidate
+        end_sample = end_frame * self.features.hop_length + self.features.frame_length
+        tail_length = min(len(self._history), max(0, self._sample_total - end_sample))
+        tail = self._history[len(self._history) - tail_length:].copy()
+        self.detections += 1
+        logger.info(f"Schlüsselwort erkannt (Abstand {score:.3f})")
+        self.reset()
+        return KeywordDetection(score, tail)
+
+    def _check_budget(self) -> None:
+        """Warnt einmalig, wenn schon die Merkmalsberechnung das Budget übersteigt."""
+        if not self._budget_warned and self.audio_seconds > 5.0 and self.feature_seconds > self.cpu_budget * self.audio_seconds:
+            self._budget_warned = True
+            logger.warning(f"Merkmalsberechnung des Keyword-Spotters übersteigt das CPU-Budget von "
+                           f"{self.cpu_budget:.0%}; es werden keine Vergleiche mehr durchgeführt")
+
+
+class KeywordGate:
+    """
+    Lässt Audio erst nach erkanntem Schlüsselwort zum StreamingSegmenter durch.
+
+    Bietet dieselbe Schnittstelle wie der StreamingSegmenter (process, flush) und ersetzt ihn im
+    Aufnahmezustand. Nach einer Erkennung bleibt das Gate offen, bis listen_seconds lang keine
+    Äußerung mehr begonnen hat; mehrere Sätze nach einem Schlüsselwort werden also vollständig diktiert.
+    """
+
+    def __init__(self, spotter: KeywordSpotter, segmenter: StreamingSegmenter,
+                 listen_seconds: float = DEFAULT_KEYWORD_LISTEN_SECONDS,
+                 on_activation: Optional[Callable[[float], None]] = None):
+        """
+        Initialisiert das KeywordGate.
+
+        :param spotter: Der KeywordSpotter mit eingelernten Vorlagen
+        :param segmenter: Der StreamingSegmenter, der nach der Aktivierung die Äußerungen bildet
+        :param listen_seconds: Stille in Sekunden, nach der das Gate wieder schließt
+        :param on_activation: Wird bei jeder Erkennung mit dem Abstand zur Vorlage aufgerufen
+        """
+        self.spotter = spotter
+        self.segmenter = segmenter
+        self.listen_samples = int(listen_seconds * spotter.sample_rate)
+        self.on_activation = on_activation
+        self.active = False
+        self.activations = 0
+        self._silent_samples = 0
+
+    def process(self, samples: np.ndarray) -> None:
+        """
+        Verarbeitet neue Samples des Streams.
+
+        :param samples: Neue Samples als float32 mit 16 kHz
+        """
+        if not self.active:
+            detection = self.spotter.process(samples)
+            if detection is None:
+                return
+            self.active = True
+            self.activations += 1
+            self._silent_samples = 0
+            if self.on_activation:
+                self.on_activation(detection.score)
+            samples = detection.tail
+
+        self.segmenter.process(samples)
+        if self.segmenter.in_speech:
+            self._silent_samples = 0
+            return
+        self._silent_samples += len(samples)
+        if self._silent_samples >= self.listen_samples:
+            self.active = False
+            self.segmenter.flush()  # Verwirft Vorlauf und Reste, damit die nächste Aktivierung sauber beginnt
+            self.spotter.reset()
+            logger.info("Keine Äußerung mehr, warte auf das Schlüsselwort")
+
+    def flush(self) -> None:
+        """Schließt ein laufendes Segment am Ende des Streams ab."""
+        if self.active:
+            self.segmenter.flush()
+
+
+def benchmark(seconds: float = 60.0, cpu_budget: float = DEFAULT_KEYWORD_CPU_BUDGET,
+              chunk_size: int = 341) -> Dict[str, float]:
+    """
+    Misst den Rechenzeitbedarf des Spotters mit dauerhaftem sprachähnlichem Signal (ungünstigster Fall).
+
+    :param seconds: Länge des Signals in Sekunden
+    :param cpu_budget: CPU-Budget des Spotters
+    :param chunk_size: Blockgröße in Samples (341 entspricht einem 1024er-Chunk bei 48 kHz)
+    :return: Messwerte des Spotters (siehe KeywordSpotter.stats)
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(TARGET_RATE * 0.6)) / TARGET_RATE
+    word = (0.3 * np.sin(2 * np.pi * (300 + 400 * t) * t) * np.hanning(len(t))).astype(np.float32)
+    spotter = KeywordSpotter(threshold=-1.0, cpu_budget=cpu_budget)  # Schwelle unerreichbar: jeder Vergleich läuft vollständig
+    for _ in range(3):
+        spotter.add_template(np.concatenate((np.zeros(1600, np.float32), word, np.zeros(1600, np.float32))))
+    t = np.arange(int(seconds * TARGET_RATE)) / TARGET_RATE
+    stream = (0.2 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+              + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+    for offset in range(0, len(stream), chunk_size):
+        spotter.process(stream[offset:offset + chunk_size])
+    return spotter.stats()
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m src.backend.keyword_spotter [CPU-Budget]
+    import sys
+
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_KEYWORD_CPU_BUDGET
+    for label, value in (("unbegrenzt", 1.0), (f"Budget {budget:.0%}", budget)):
+        result = benchmark(cpu_budget=value)
+        print(f"{label}: CPU-Anteil {result['load']:.2%} (Merkmale {result['feature_load']:.2%}), "
+              f"{result['evaluations']} Vergleiche, {result['skipped_evaluations']} übersprungen")
+
+# Zusätzliche Erklärungen:
+
+# 1. Merkmale:
+#    Je 25-ms-Frame (10 ms Vorschub) werden 26 Mel-Bänder logarithmiert und per DCT in 13 Cepstral-
+#    koeffizienten umgerechnet. c0 (Gesamtenergie) wird verworfen, der Mittelwert aller Vorlagen-Frames
+#    abgezogen und jeder Vektor auf Länge 1 normiert. Der Vergleich ist so unabhängig vom Pegel, und der allen
+#    Frames gemeinsame Anteil von Mikrofon und Raum verdeckt die Unterschiede zwischen den Lauten nicht.
+
+# 2. Vergleich:
+#    Jede Vorlage wird per Subsequenz-DTW an beliebiger Stelle des Fensters angelegt. Der Abstand ist der
+#    mittlere Kosinusabstand entlang des besten Pfades; liegt er für eine Vorlage unter "keyword_threshold",
+#    gilt das Schlüsselwort als erkannt, sobald der Abstand nicht weiter sinkt. Mehrere Aufnahmen desselben
+#    Worts decken Betonung und Tempo ab.
+
+# 3. CPU-Budget:
+#    Der Spotter misst seine Rechenzeit mit time.thread_time() und führt ein Konto: jede Sekunde Audio
+#    schreibt cpu_budget Sekunden gut (höchstens KEYWORD_CPU_BURST_SECONDS Sekunden Audio angespart), jede
+#    Berechnung wird abgebucht. Ist das Konto leer, entfallen Vergleiche, bis wieder Guthaben vorhanden ist.
+#    Damit bleibt der mittlere CPU-Anteil beim Budget, auch auf langsamen Rechnern; die Merkmalsberechnung
+#    ist die nicht unterschreitbare Grundlast. Ohne Sprache im Fenster finden keine Vergleiche statt.
+
+# 4. Übergang zum Diktat:
+#    Bei einer Erkennung liefert der Spotter die Samples nach dem Ende des Schlüsselworts mit; das Gate
+#    übergibt sie zuerst an den StreamingSegmenter. Das Schlüsselwort selbst wird nicht transkribiert.
+
+# 5. Benchmark:
+#    `python -m src.backend.keyword_spotter [Budget]` misst den CPU-Anteil bei ununterbrochener Sprache mit
+#    und ohne Budget.
@@ -0,0 +1,119 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Pegelmessung der Wortweber-Anwendung.
+
+Der LevelMeter berechnet für jeden aufgenommenen Chunk RMS, Spitzenwert und Übersteuerung
+und stellt den jeweils letzten Messwert bereit, den die Oberfläche in festen Abständen abfragt.
+"""
+
+# Standardbibliotheken
+import math
+from typing import NamedTuple
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import LEVEL_CLIP_THRESHOLD, LEVEL_SILENCE_DB
+
+_MIN_DB = -120.0  # Untergrenze der Anzeige für digitale Stille
+
+
+class LevelReading(NamedTuple):
+    """Ein Pegelmesswert; Pegel in dBFS."""
+    rms_db: float
+    peak_db: float
+    clipped: bool  # Der Chunk enthält übersteuerte Samples
+    session_peak_db: float  # Höchster Spitzenwert seit Beginn der Aufnahme
+    clipped_samples: int  # Übersteuerte Samples seit Beginn der Aufnahme
+    samples: int  # Gemessene Samples seit Beginn der Aufnahme
+
+
+def _to_db(value: float) -> float:
+    """Rechnet einen linearen Pegel in dBFS um."""
+    return 20 * math.log10(value) if value > 0 else _MIN_DB
+
+
+class LevelMeter:
+    """
+    Misst den Eingangspegel chunkweise im Aufnahmepfad.
+
+    update() wird nur vom Aufnahme-Thread aufgerufen. Der Messwert wird als unveränderliches
+    Tupel in einer einzigen Zuweisung veröffentlicht; Leser erhalten mit latest() immer einen
+    vollständigen Messwert, ohne Sperre und ohne den Aufnahme-Thread aufzuhalten.
+    """
+
+    def __init__(self):
+        """Initialisiert den LevelMeter ohne Messwert."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Setzt die Messung zu Beginn einer Aufnahme zurück."""
+        self._session_peak = 0.0
+        self._clipped_samples = 0
+        self._samples = 0
+        self._latest = LevelReading(_MIN_DB, _MIN_DB, False, _MIN_DB, 0, 0)
+
+    def update(self, chunk: np.ndarray) -> LevelReading:
+        """
+        Misst einen Chunk und veröffentlicht den Messwert.
+
+        :param chunk: Samples als float32 im Bereich [-1, 1]
+        :return: Der neue Messwert
+        """
+        if len(chunk) == 0:
+            return self._latest
+        # Skalarprodukt und Extremwerte statt np.abs: keine Zwischenarrays in Chunkgröße
+        rms = math.sqrt(float(np.dot(chunk, chunk)) / len(chunk))
+        peak = max(float(chunk.max()), -float(chunk.min()))
+        clipped = 0
+        if peak >= LEVEL_CLIP_THRESHOLD:
+            clipped = int(np.count_nonzero((chunk >= LEVEL_CLIP_THRESHOLD) | (chunk <= -LEVEL_CLIP_THRESHOLD)))
+        self._session_peak = max(self._session_peak, peak)
+        self._clipped_samples += clipped
+        self._samples += len(chunk)
+        self._latest = LevelReading(_to_db(rms), _to_db(peak), clipped > 0, _to_db(self._session_peak),
+                                    self._clipped_samples, self._samples)
+        return self._latest
+
+    def latest(self) -> LevelReading:
+        """Gibt den zuletzt veröffentlichten Messwert zurück."""
+        return self._latest
+
+    def is_silent(self) -> bool:
+        """
+        Prüft, ob die bisherige Aufnahme kein verwertbares Eingangssignal enthält.
+
+        :return: True, wenn gemessen wurde und der höchste Spitzenwert unter LEVEL_SILENCE_DB liegt
+        """
+        reading = self._latest
+        return reading.samples > 0 and reading.session_peak_db < LEVEL_SILENCE_DB
+
+# Zusätzliche Erklärungen:
+
+# 1. Berechnung:
+#    RMS ergibt sich aus einem einzigen Skalarprodukt, der Spitzenwert aus Maximum und Minimum des
+#    Chunks. Übersteuerte Samples werden nur gezählt, wenn der Spitzenwert die Schwelle erreicht.
+
+# 2. Veröffentlichung:
+#    Statt einer Warteschlange gibt es nur den letzten Messwert. Die Oberfläche fragt ihn in ihrem
+#    eigenen Takt ab (LEVEL_METER_UI_INTERVAL_MS); ältere Messwerte werden nie benötigt.
+
+# 3. Stille und Übersteuerung:
+#    Bleibt der Spitzenwert einer Aufnahme unter LEVEL_SILENCE_DB, ist vermutlich das falsche oder
+#    ein stummgeschaltetes Gerät ausgewählt. Solche Aufnahmen werden nicht transkribiert.
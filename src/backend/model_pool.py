@@ -0,0 +1,263 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält den Modell-Pool der Wortweber-Anwendung.
+
+Der ModelPool hält mehrere geladene Whisper-Modelle im Speicher, solange ihr gemeinsamer
+Speicherbedarf ein einstellbares Budget nicht überschreitet. Reicht das Budget nicht, wird das am
+längsten nicht verwendete Modell freigegeben (LRU). Ein Wechsel zu einem bereits geladenen Modell
+ist damit sofort möglich.
+"""
+
+# Standardbibliotheken
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Projektspezifische Module
+from src.config import WHISPER_MODEL_SIZES_MB, DEFAULT_MODEL_POOL_MB, MODEL_PRECISION_SIZE_FACTORS
+from src.backend.wortweber_transcriber import Transcriber
+from src.utils.error_handling import logger
+
+_MB = 1024 * 1024
+
+
+def model_key(model_name: str, precision: str = "fp32") -> str:
+    """
+    Bildet den Pool-Schlüssel eines Modells in einer Rechengenauigkeit.
+
+    :param model_name: Name des Whisper-Modells
+    :param precision: Rechengenauigkeit ("fp32", "int8", "bf16")
+    :return: Der Modellname, bei abweichender Genauigkeit mit angehängter Genauigkeit (z.B. "medium/int8")
+    """
+    return model_name if precision == "fp32" else f"{model_name}/{precision}"
+
+
+def split_model_key(key: str) -> Tuple[str, str]:
+    """
+    Zerlegt einen Pool-Schlüssel in Modellname und Rechengenauigkeit.
+
+    :param key: Schlüssel aus model_key
+    :return: (Modellname, Genauigkeit)
+    """
+    model_name, _, precision = key.partition("/")
+    return model_name, precision or "fp32"
+
+
+def _estimated_bytes(key: str) -> int:
+    """Geschätzter Speicherbedarf eines noch nicht geladenen Modells."""
+    model_name, precision = split_model_key(key)
+    return int(WHISPER_MODEL_SIZES_MB.get(model_name, 0) * MODEL_PRECISION_SIZE_FACTORS.get(precision, 1.0) * _MB)
+
+
+class ModelPool:
+    """
+    Verwaltet geladene Transcriber mit LRU-Verdrängung unter einem Speicherbudget.
+
+    get() darf aus mehreren Threads aufgerufen werden. Geladen wird außerhalb der Pool-Sperre,
+    damit Abfragen bereits geladener Modelle während eines Ladevorgangs nicht warten; dasselbe
+    Modell wird dabei nie doppelt geladen.
+    """
+
+    def __init__(self, loader: Callable[[str], Transcriber], budget_mb: int = DEFAULT_MODEL_POOL_MB):
+        """
+        Initialisiert den ModelPool.
+
+        :param loader: Erzeugt einen Transcriber mit geladenem Modell für einen Modellnamen
+        :param budget_mb: Speicherbudget in MB (0 = nur das zuletzt verwendete Modell behalten)
+        """
+        self.loader = loader
+        self.budget_bytes = int(budget_mb) * _MB
+        self._models: "OrderedDict[str, Transcriber]" = OrderedDict()  # Zuletzt verwendetes Modell am Ende
+        self._sizes: Dict[str, int] = {}
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def resident_models(self) -> List[str]:
+        """
+        Liefert die geladenen Modelle.
+
+        :return: Modellnamen, vom am längsten nicht verwendeten zum zuletzt verwendeten
+        """
+        with self._lock:
+            return list(self._models)
+
+    def memory_bytes(self) -> int:
+        """
+        Liefert den Speicherbedarf aller geladenen Modelle.
+
+        :return: Summe der gemessenen Modellgrößen in Bytes
+        """
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def is_resident(self, model_name: str) -> bool:
+        """
+        Prüft, ob ein Modell geladen ist.
+
+        :param model_name: Der Modellname
+        :return: True, wenn ein Wechsel zu diesem Modell ohne Laden möglich ist
+        """
+        with self._lock:
+            return model_name in self._models
+
+    def get(self, model_name: str, keep: Optional[str] = None, trim: bool = True) -> Transcriber:
+        """
+        Liefert den Transcriber für ein Modell und lädt es bei Bedarf.
+
+        Vor dem Laden werden so viele Modelle verdrängt, dass der geschätzte Bedarf des neuen Modells
+        ins Budget passt; nach dem Laden wird mit der gemessenen Größe nachgeprüft.
+
+        :param model_name: Der Modellname bzw. Schlüssel aus model_key
+        :param keep: Modell, das während des Ladens nicht verdrängt wird (z.B. das noch aktive)
+        :param trim: False, um die Verdrängung nach dem Laden dem Aufrufer zu überlassen (siehe trim())
+        :return: Der Transcriber mit geladenem Modell
+        """
+        while True:
+            with self._lock:
+                if model_name in self._models:
+                    self._models.move_to_end(model_name)
+                    return self._models[model_name]
+                pending = self._loading.get(model_name)
+                if pending is None:
+                    self._loading[model_name] = threading.Event()
+                    released = self._evict_for(_estimated_bytes(model_name), keep=keep)
+                    break
+            pending.wait()  # Ein anderer Thread lädt dieses Modell bereits
+
+        self._release(released)
+        try:
+            transcriber = self.loader(model_name)
+        except Exception:
+            with self._lock:
+                self._loading.pop(model_name).set()
+            raise
+        size = transcriber.memory_bytes()
+        with self._lock:
+            self._models[model_name] = transcriber
+            self._sizes[model_name] = size
+            self.loads += 1
+            released = self._evict_for(0, keep=model_name) if trim else []
+            self._loading.pop(model_name).set()
+        self._release(released)
+        logger.info(f"Modell '{model_name}' im Pool ({size / _MB:.0f} MB); geladen: {', '.join(self.resident_models())}, "
+                    f"{self.memory_bytes() / _MB:.0f} von {self.budget_bytes / _MB:.0f} MB")
+        return transcriber
+
+    def set_budget(self, budget_mb: int, keep: Optional[str] = None) -> None:
+        """
+        Ändert das Speicherbudget und verdrängt Modelle, die nicht mehr hineinpassen.
+
+        :param budget_mb: Neues Speicherbudget in MB
+        :param keep: Modell, das nicht verdrängt wird (Standard: das zuletzt verwendete)
+        """
+        with self._lock:
+            self.budget_bytes = int(budget_mb) * _MB
+        self.trim(keep)
+
+    def trim(self, keep: Optional[str] = None) -> None:
+        """
+        Verdrängt Modelle, bis das Budget eingehalten wird.
+
+        :param keep: Modell, das nicht verdrängt wird (Standard: das zuletzt verwendete)
+        """
+        with self._lock:
+            if keep is None:
+                keep = next(reversed(self._models), None)
+            released = self._evict_for(0, keep=keep)
+        self._release(released)
+
+    def evict(self, model_name: str) -> bool:
+        """
+        Gibt ein Modell frei.
+
+        :param model_name: Der Modellname
+        :return: True, wenn das Modell geladen war
+        """
+        with self._lock:
+            transcriber = self._models.pop(model_name, None)
+            self._sizes.pop(model_name, None)
+        if transcriber is None:
+            return False
+        self._release([(model_name, transcriber)])
+        return True
+
+    def clear(self) -> None:
+        """Gibt alle Modelle frei, z.B. beim Beenden der Anwendung."""
+        with self._lock:
+            released = list(self._models.items())
+            self._models.clear()
+            self._sizes.clear()
+        self._release(released)
+
+    def _evict_for(self, required_bytes: int, keep) -> list:
+        """
+        Entfernt die am längsten nicht verwendeten Modelle, bis required_bytes zusätzlich ins Budget passen.
+
+        Muss unter der Pool-Sperre aufgerufen werden; freigegeben werden die Modelle danach mit _release.
+
+        :param required_bytes: Zusätzlich benötigter Speicher in Bytes
+        :param keep: Modell, das nie verdrängt wird (das gerade angeforderte oder aktive)
+        :return: Liste der entfernten (Name, Transcriber)
+        """
+        released = []
+        for name in list(self._models):
+            if sum(self._sizes.values()) + required_bytes <= self.budget_bytes:
+                break
+            if name == keep:
+                continue
+            released.append((name, self._models.pop(name)))
+            self._sizes.pop(name)
+        if keep is not None and sum(self._sizes.values()) > self.budget_bytes:
+            logger.warning(f"Modell '{keep}' allein überschreitet das Speicherbudget von {self.budget_bytes / _MB:.0f} MB")
+        return released
+
+    def _release(self, released: list) -> None:
+        """Gibt verdrängte Modelle außerhalb der Pool-Sperre frei."""
+        for name, transcriber in released:
+            self.evictions += 1
+            transcriber.release_resources()
+            logger.info(f"Modell '{name}' aus dem Pool verdrängt")
+
+# Zusätzliche Erklärungen:
+
+# 1. Speicherbedarf:
+#    Gemessen wird die Größe aller Parameter und Puffer des geladenen Modells (Transcriber.memory_bytes).
+#    Vor dem Laden ist sie noch unbekannt; dann dient WHISPER_MODEL_SIZES_MB (skaliert mit
+#    MODEL_PRECISION_SIZE_FACTORS) als Schätzung, damit das verdrängte Modell freigegeben ist, bevor das neue
+#    Speicher belegt, und der Spitzenbedarf im Budget bleibt.
+
+# 2. Verdrängung:
+#    Jeder Zugriff mit get() macht ein Modell zum zuletzt verwendeten. Verdrängt wird stets vom Anfang der
+#    Reihenfolge; das gerade angeforderte Modell bleibt auch dann geladen, wenn es allein das Budget
+#    überschreitet. Mit "model_pool_mb" = 0 verhält sich der Pool wie das frühere Neuladen bei jedem Wechsel.
+
+# 3. Nebenläufigkeit:
+#    Die Sperre schützt nur die Verwaltungsdaten. Laden und Freigeben laufen außerhalb, sodass ein
+#    Wechsel zu einem geladenen Modell nicht auf einen parallelen Ladevorgang wartet.
+
+# 4. Wechsel im Hintergrund:
+#    Beim Modellwechsel lädt das Backend mit get(..., keep=aktives Modell, trim=False): das aktive Modell
+#    bleibt während des Ladens verfügbar, auch wenn das Budget dadurch kurzzeitig überschritten wird. Erst nach
+#    der Umschaltung verdrängt trim() überzählige Modelle; Transcriber.release_resources wartet dabei auf
+#    laufende Transkriptionen.
+
+# 5. Rechengenauigkeit:
+#    Dasselbe Modell in fp32 und int8 sind verschiedene Pool-Einträge ("medium" und "medium/int8"). Ein
+#    Wechsel der Genauigkeit ist damit ein gewöhnlicher Modellwechsel im Hintergrund.
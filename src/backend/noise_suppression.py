@@ -0,0 +1,227 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Rauschunterdrückung der Wortweber-Anwendung.
+
+Das SpectralGate dämpft im Kurzzeitspektrum (STFT) alle Frequenzanteile, die nicht deutlich
+über dem Rauschprofil liegen. Das Rauschprofil wird aus der Stille vor dem ersten Wort
+(bzw. dem Vorlauf) geschätzt. Gleichmäßige Geräusche wie Lüfter oder Klimaanlagen werden
+so vor der Transkription entfernt.
+"""
+
+# Standardbibliotheken
+import time
+from typing import NamedTuple, Optional
+
+# Drittanbieterbibliotheken
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import ndimage
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, NOISE_FFT_SIZE, NOISE_HOP_SIZE, NOISE_THRESHOLD_STD, DEFAULT_NOISE_REDUCTION_DB,
+    NOISE_MIN_PROFILE_MS, NOISE_PROFILE_SEARCH_SECONDS, NOISE_BLOCK_FRAMES
+)
+from src.backend.vad import VoiceActivityDetector
+
+
+class NoiseProfile(NamedTuple):
+    """Rauschprofil je Frequenzband in dB."""
+    mean_db: np.ndarray
+    std_db: np.ndarray
+
+
+class SpectralGate:
+    """
+    Rauschunterdrückung durch spektrales Gating.
+
+    Die Aufnahme wird blockweise transformiert: je Block werden alle Frames in einem einzigen
+    rfft-Aufruf berechnet, maskiert und per Overlap-Add zurückgewandelt. Der Speicherbedarf
+    hängt daher nur von NOISE_BLOCK_FRAMES ab, nicht von der Länge der Aufnahme.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_RATE, n_fft: int = NOISE_FFT_SIZE, hop: int = NOISE_HOP_SIZE,
+                 threshold_std: float = NOISE_THRESHOLD_STD, reduction_db: float = DEFAULT_NOISE_REDUCTION_DB):
+        """
+        Initialisiert das SpectralGate.
+
+        :param sample_rate: Abtastrate der Aufnahme in Hz
+        :param n_fft: Fensterlänge der STFT in Samples
+        :param hop: Vorschub zwischen zwei Frames in Samples (n_fft muss ein Vielfaches sein)
+        :param threshold_std: Abstand der Schwelle vom Rauschmittel in Standardabweichungen
+        :param reduction_db: Dämpfung der als Rauschen erkannten Anteile in dB
+        """
+        if n_fft % hop:
+            raise ValueError("Die Fensterlänge muss ein Vielfaches des Vorschubs sein.")
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = hop
+        self.threshold_std = threshold_std
+        self.reduction_db = reduction_db
+        self._window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        # Summe der quadrierten Fenster im eingeschwungenen Bereich, für die exakte Rekonstruktion
+        self._window_sum = (self._window ** 2).reshape(-1, hop).sum(axis=0)
+
+    def _frames(self, padded: np.ndarray) -> np.ndarray:
+        """Gibt die Frames der STFT als Sicht ohne Kopie zurück."""
+        return sliding_window_view(padded, self.n_fft)[::self.hop]
+
+    def _magnitude_db(self, spectrum: np.ndarray) -> np.ndarray:
+        return 20 * np.log10(np.abs(spectrum) + 1e-10)
+
+    def estimate_profile(self, noise: np.ndarray) -> Optional[NoiseProfile]:
+        """
+        Schätzt das Rauschprofil aus einem Abschnitt ohne Sprache.
+
+        :param noise: Samples ohne Sprache als float32
+        :return: Das Rauschprofil oder None, wenn der Abschnitt zu kurz ist
+        """
+        if len(noise) < self.n_fft:
+            return None
+        frames = self._frames(np.asarray(noise, dtype=np.float32))
+        magnitude_db = self._magnitude_db(np.fft.rfft(frames * self._window, axis=1))
+        return NoiseProfile(magnitude_db.mean(axis=0), magnitude_db.std(axis=0))
+
+    def estimate_leading_profile(self, audio: np.ndarray, detector: Optional[VoiceActivityDetector] = None) -> Optional[NoiseProfile]:
+        """
+        Schätzt das Rauschprofil aus der Stille vor dem ersten Wort.
+
+        Beginnt die Aufnahme ohne ausreichende Stille, werden stattdessen die leisesten Frames
+        des Suchbereichs verwendet.
+
+        :param audio: Die Aufnahme als float32
+        :param detector: VAD für die Suche nach dem ersten Wort
+        :return: Das Rauschprofil oder None, wenn keine geeigneten Samples vorliegen
+        """
+        detector = detector or VoiceActivityDetector(sample_rate=self.sample_rate)
+        search = np.asarray(audio[:int(NOISE_PROFILE_SEARCH_SECONDS * self.sample_rate)], dtype=np.float32)
+        decisions = detector.frame_decisions(search)
+        if len(decisions) == 0:
+            return None
+        speech = np.flatnonzero(decisions)
+        # Ein Frame Abstand zum ersten Sprach-Frame, damit dessen Anlaut nicht ins Profil gerät
+        leading_frames = (speech[0] - 1) if len(speech) else len(decisions)
+        min_frames = max(1, int(NOISE_MIN_PROFILE_MS / 1000 * self.sample_rate / detector.frame_length))
+        if leading_frames >= min_frames:
+            return self.estimate_profile(search[:leading_frames * detector.frame_length])
+
+        frames = detector._frames(search)
+        energy_db = detector.frame_energy_db(frames)
+        quiet = frames[energy_db <= np.percentile(energy_db, 10)]
+        return self.estimate_profile(quiet.reshape(-1))
+
+    def process(self, audio: np.ndarray, profile: NoiseProfile, reduction_db: Optional[float] = None) -> np.ndarray:
+        """
+        Dämpft alle Anteile der Aufnahme, die nicht deutlich über dem Rauschprofil liegen.
+
+        :param audio: Die Aufnahme als float32
+        :param profile: Das Rauschprofil
+        :param reduction_db: Dämpfung in dB, standardmäßig die des SpectralGate
+        :return: Die entrauschte Aufnahme als float32 mit gleicher Länge
+        """
+        n_samples = len(audio)
+        if n_samples == 0:
+            return np.asarray(audio, dtype=np.float32)
+        reduction_db = self.reduction_db if reduction_db is None else reduction_db
+        floor = np.float32(10 ** (-reduction_db / 20))
+        threshold_db = profile.mean_db + self.threshold_std * profile.std_db
+        ratio = self.n_fft // self.hop
+
+        padded = np.pad(np.asarray(audio, dtype=np.float32), (self.n_fft, self.n_fft))
+        frames = self._frames(padded)
+        n_frames = len(frames)
+        output = np.zeros((n_frames + ratio, self.hop), dtype=np.float32)
+        margin = 1  # Frames Überlappung, damit die Glättung der Maske an Blockgrenzen stetig bleibt
+
+        for start in range(0, n_frames, NOISE_BLOCK_FRAMES):
+            stop = min(start + NOISE_BLOCK_FRAMES, n_frames)
+            lo, hi = max(0, start - margin), min(n_frames, stop + margin)
+            spectrum = np.fft.rfft(frames[lo:hi] * self._window, axis=1)
+            mask = (self._magnitude_db(spectrum) > threshold_db).astype(np.float32)
+            # Glättung über Zeit und Frequenz dämpft vereinzelte Bins ("musikalisches Rauschen"),
+            # zusammenhängende Sprachanteile behalten dagegen die volle Verstärkung
+            mask = np.minimum(1.0, 2 * ndimage.uniform_filter(mask, size=(3, 3), mode='nearest'))
+            gain = floor + (1 - floor) * mask[start - lo:stop - lo]
+            block = np.fft.irfft(spectrum[start - lo:stop - lo] * gain, n=self.n_fft, axis=1).astype(np.float32)
+            block *= self._window
+            # Overlap-Add: Teilblock j eines Frames f landet an Position f + j
+            for j in range(ratio):
+                output[start + j:stop + j] += block[:, j * self.hop:(j + 1) * self.hop]
+
+        output /= self._window_sum
+        return output.reshape(-1)[self.n_fft:self.n_fft + n_samples]
+
+
+def benchmark(seconds: float = 10.0, sample_rate: int = TARGET_RATE) -> dict:
+    """
+    Misst die Kosten der Rauschunterdrückung je Sekunde Audio.
+
+    :param seconds: Länge des synthetischen Testsignals in Sekunden
+    :param sample_rate: Abtastrate in Hz
+    :return: Dictionary mit ms_per_second, Gesamtzeit und der Rauschminderung in dB
+    """
+    rng = np.random.default_rng(0)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    noise = (0.02 * rng.standard_normal(n)).astype(np.float32)
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t) * (t > 1.0)).astype(np.float32)
+    audio = tone + noise
+
+    gate = SpectralGate(sample_rate)
+    start = time.perf_counter()
+    profile = gate.estimate_leading_profile(audio)
+    cleaned = gate.process(audio, profile)
+    elapsed = time.perf_counter() - start
+
+    lead = slice(0, int(0.9 * sample_rate))
+    reduction = 10 * np.log10(np.mean(audio[lead] ** 2) / (np.mean(cleaned[lead] ** 2) + 1e-20))
+    return {
+        "total_seconds": elapsed,
+        "ms_per_second": 1000 * elapsed / seconds,
+        "noise_reduction_db": float(reduction),
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m src.backend.noise_suppression [Sekunden]
+    import sys
+
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    result = benchmark(duration)
+    print(f"Rauschunterdrückung: {result['ms_per_second']:.2f} ms je Sekunde Audio "
+          f"({result['total_seconds'] * 1000:.1f} ms für {duration:.0f} s), "
+          f"Rauschminderung {result['noise_reduction_db']:.1f} dB")
+
+# Zusätzliche Erklärungen:
+
+# 1. Spektrales Gating:
+#    Für jedes Frequenzband wird aus dem Rauschprofil eine Schwelle (Mittelwert plus
+#    NOISE_THRESHOLD_STD Standardabweichungen) gebildet. Anteile darunter werden um die eingestellte
+#    Dämpfung abgesenkt, statt sie ganz zu entfernen; so bleiben leise Sprachanteile hörbar.
+
+# 2. Rauschprofil:
+#    Das Profil stammt aus der Stille vor dem ersten Wort, die der VoiceActivityDetector findet. Mit
+#    offenem Stream (warm_stream) ist das der Vorlauf vor dem Tastendruck. Ohne ausreichende Stille
+#    werden die leisesten 10 % der Frames verwendet.
+
+# 3. Position in der Verarbeitung:
+#    Die Rauschunterdrückung läuft nach dem Resampling und vor der VAD-Kürzung, da die Stille am
+#    Anfang sonst bereits entfernt wäre. Die entrauschte Aufnahme geht an Transcriber.transcribe.
+
+# 4. Benchmark:
+#    `python -m src.backend.noise_suppression [Sekunden]` misst die Rechenzeit je Sekunde Audio.
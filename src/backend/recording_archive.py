@@ -0,0 +1,253 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält das Aufnahmearchiv der Wortweber-Anwendung.
+
+Das RecordingArchive speichert jede transkribierte Äußerung verlustfrei komprimiert mit 16 kHz
+und führt einen Index mit Zeitstempel, Modell, Sprache und Transkript. Kodieren, Schreiben und
+das Löschen alter Einträge übernimmt ein Hintergrund-Thread.
+"""
+
+# Standardbibliotheken
+import datetime
+import gzip
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from typing import Any, Dict, List, Optional
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, ARCHIVE_INDEX_FILE, ARCHIVE_FORMATS, DEFAULT_ARCHIVE_FORMAT, DEFAULT_ARCHIVE_MAX_MB,
+    DEFAULT_ARCHIVE_MAX_DAYS, FFMPEG_BINARY, RECORDER_JOIN_TIMEOUT
+)
+from src.utils.error_handling import logger
+
+_CLOSE = None  # Markiert in der Warteschlange das Ende des Archivs
+_PRUNE = "prune"  # Fordert das Anwenden der Aufbewahrungsregeln an
+
+
+class RecordingArchive:
+    """
+    Archiv für Äußerungen mit Index und Aufbewahrungsregeln.
+
+    add() wandelt die Samples nur nach int16 und legt sie in eine Warteschlange; nur der
+    Schreib-Thread greift auf Dateien und Index zu. Der Index ist eine JSON-Lines-Datei, an
+    die neue Einträge angehängt werden; beim Löschen wird sie vollständig neu geschrieben.
+    """
+
+    def __init__(self, directory: str, max_mb: float = DEFAULT_ARCHIVE_MAX_MB, max_days: float = DEFAULT_ARCHIVE_MAX_DAYS,
+                 file_format: str = DEFAULT_ARCHIVE_FORMAT, sample_rate: int = TARGET_RATE):
+        """
+        Öffnet bzw. erstellt das Archiv und startet den Schreib-Thread.
+
+        :param directory: Verzeichnis des Archivs
+        :param max_mb: Größte Gesamtgröße in MB (0 = unbegrenzt)
+        :param max_days: Höchstes Alter eines Eintrags in Tagen (0 = unbegrenzt)
+        :param file_format: "flac" oder "wav.gz"
+        :param sample_rate: Abtastrate der archivierten Samples in Hz
+        """
+        if file_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unbekanntes Archivformat: {file_format}")
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_days * 86400
+        self.file_format = file_format
+        self.sample_rate = sample_rate
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, ARCHIVE_INDEX_FILE)
+        self._entries: List[Dict[str, Any]] = self._load_index()
+        self._lock = threading.Lock()  # Schützt _entries für Leser außerhalb des Schreib-Threads
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        self._queue.put(_PRUNE)  # Aufbewahrungsregeln auch auf Einträge früherer Sitzungen anwenden
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        """Liest den Index; beschädigte Zeilen, z.B. nach einem Absturz, werden übersprungen."""
+        entries = []
+        if not os.path.exists(self._index_path):
+            return entries
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning("Beschädigte Zeile im Archivindex übersprungen")
+        return entries
+
+    def add(self, audio: np.ndarray, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Übergibt eine Äußerung an den Schreib-Thread.
+
+        :param audio: Samples als float32 mit der Abtastrate des Archivs; sie werden kopiert
+        :param metadata: Zusätzliche Angaben für den Index (z.B. Modell, Sprache, Transkript)
+        """
+        if self._closed or len(audio) == 0:
+            return
+        samples = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        self._queue.put((time.time(), samples, dict(metadata or {})))
+
+    def prune(self) -> None:
+        """Fordert das Anwenden der Aufbewahrungsregeln im Schreib-Thread an."""
+        if not self._closed:
+            self._queue.put(_PRUNE)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Gibt eine Kopie der Indexeinträge zurück, die ältesten zuerst."""
+        with self._lock:
+            return list(self._entries)
+
+    def total_bytes(self) -> int:
+        """Gibt die Gesamtgröße der archivierten Dateien zurück."""
+        with self._lock:
+            return sum(entry.get("bytes", 0) for entry in self._entries)
+
+    def close(self) -> None:
+        """Beendet das Archiv; der Schreib-Thread arbeitet die Warteschlange noch ab."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+
+    def wait_closed(self, timeout: float = RECORDER_JOIN_TIMEOUT) -> bool:
+        """
+        Wartet, bis alle übergebenen Äußerungen geschrieben sind.
+
+        :param timeout: Maximale Wartezeit in Sekunden
+        :return: True, wenn der Schreib-Thread beendet ist
+        """
+        self.close()
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
+
+    def _writer_loop(self) -> None:
+        """Schreibt Äußerungen und wendet die Aufbewahrungsregeln an, bis close() aufgerufen wurde."""
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            try:
+                if item == _PRUNE:
+                    self._apply_retention()
+                else:
+                    self._write_entry(*item)
+                    self._apply_retention()
+            except Exception as e:
+                logger.error(f"Fehler im Aufnahmearchiv: {e}")
+
+    def _write_entry(self, timestamp: float, samples: np.ndarray, metadata: Dict[str, Any]) -> None:
+        """Kodiert eine Äußerung, schreibt sie und hängt ihren Eintrag an den Index an."""
+        recorded = datetime.datetime.fromtimestamp(timestamp)
+        entry_id = recorded.strftime("%Y%m%d-%H%M%S-%f")
+        file_format = self.file_format
+        if file_format == "flac" and shutil.which(FFMPEG_BINARY) is None:
+            logger.warning(f"'{FFMPEG_BINARY}' nicht gefunden, Aufnahmen werden als wav.gz archiviert")
+            file_format = self.file_format = "wav.gz"
+        filename = f"{entry_id}.{file_format}"
+        path = os.path.join(self.directory, filename)
+        temporary = path + ".part"
+        if file_format == "flac":
+            self._encode_flac(samples, temporary)
+        else:
+            self._encode_wav_gz(samples, temporary)
+        os.replace(temporary, path)  # Erst die vollständige Datei erhält ihren endgültigen Namen
+
+        entry = {
+            "id": entry_id,
+            "file": filename,
+            "timestamp": timestamp,
+            "recorded_at": recorded.isoformat(timespec="seconds"),
+            "duration_s": round(len(samples) / self.sample_rate, 3),
+            "sample_rate": self.sample_rate,
+            "format": file_format,
+            "bytes": os.path.getsize(path),
+        }
+        entry.update(metadata)
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        with self._lock:
+            self._entries.append(entry)
+
+    def _encode_flac(self, samples: np.ndarray, path: str) -> None:
+        command = [FFMPEG_BINARY, "-loglevel", "error", "-f", "s16le", "-ar", str(self.sample_rate), "-ac", "1",
+                   "-i", "pipe:0", "-c:a", "flac", "-f", "flac", "-y", path]
+        subprocess.run(command, input=samples.tobytes(), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    def _encode_wav_gz(self, samples: np.ndarray, path: str) -> None:
+        with gzip.open(path, "wb") as f:
+            with wave.open(f, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.sample_rate)
+                # Mit vorab gesetzter Länge muss der Kopf nicht nachträglich korrigiert werden (gzip kann nicht spulen)
+                wf.setnframes(len(samples))
+                wf.writeframes(samples.tobytes())
+
+    def _apply_retention(self, now: Optional[float] = None) -> None:
+        """Löscht zu alte Einträge und danach die ältesten, bis die Größengrenze eingehalten ist."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = sorted(self._entries, key=lambda entry: entry.get("timestamp", 0))
+        keep = [entry for entry in entries if not self.max_age or now - entry.get("timestamp", 0) <= self.max_age]
+        if self.max_bytes:
+            total = sum(entry.get("bytes", 0) for entry in keep)
+            while keep and total > self.max_bytes:
+                total -= keep.pop(0).get("bytes", 0)
+        if len(keep) == len(entries):
+            return
+
+        kept_ids = {entry["id"] for entry in keep}
+        removed = [entry for entry in entries if entry["id"] not in kept_ids]
+        for entry in removed:
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+        temporary = self._index_path + ".part"
+        with open(temporary, "w", encoding="utf-8") as f:
+            for entry in keep:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temporary, self._index_path)
+        with self._lock:
+            self._entries = keep
+        logger.info(f"Aufnahmearchiv: {len(removed)} alte Aufnahmen gelöscht")
+
+# Zusätzliche Erklärungen:
+
+# 1. Format:
+#    Äußerungen werden mit 16 kHz als 16-Bit-Mono archiviert, also in der Form, die Whisper erhalten hat.
+#    FLAC (über ffmpeg) benötigt etwa die Hälfte des Platzes von WAV; ohne ffmpeg wird gzip-komprimiertes
+#    WAV geschrieben. Beide Formate sind verlustfrei und lassen sich mit transcribe_file erneut verarbeiten.
+
+# 2. Index:
+#    index.jsonl enthält je Aufnahme eine JSON-Zeile mit Zeitstempel, Dauer, Dateigröße sowie den Angaben
+#    des Backends (Modell, Sprache, Quelle, Transkript). Neue Einträge werden angehängt; eine beim Absturz
+#    abgeschnittene Zeile wird beim nächsten Start übersprungen.
+
+# 3. Aufbewahrung:
+#    Nach jedem Schreiben und beim Öffnen werden Einträge gelöscht, die älter als max_days sind, und
+#    danach die ältesten, bis die Gesamtgröße unter max_mb liegt. Dateien erhalten ihren endgültigen Namen
+#    erst nach dem vollständigen Schreiben, sodass der Index nie auf halbe Dateien verweist.
@@ -0,0 +1,123 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Aufnahmesenke der Wortweber-Anwendung.
+
+Die WavRecordingSink schreibt die Samples einer Aufnahme bereits während der Aufnahme
+in eine WAV-Datei. Das Schreiben übernimmt ein Hintergrund-Thread, sodass der
+Aufnahmepfad nie auf den Datenträger wartet.
+"""
+
+# Standardbibliotheken
+import os
+import queue
+import threading
+import wave
+from typing import Optional
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import RECORDER_JOIN_TIMEOUT
+from src.utils.error_handling import logger
+
+_CLOSE = None  # Markiert in der Warteschlange das Ende der Aufnahme
+
+
+class WavRecordingSink:
+    """
+    Schreibt eine Aufnahme fortlaufend in eine WAV-Datei.
+
+    write() legt die Samples nur in eine Warteschlange; der Schreib-Thread hängt sie an die
+    Datei an. Beim Schließen trägt das wave-Modul die endgültige Länge in den Dateikopf ein.
+    """
+
+    def __init__(self, filename: str, sample_rate: int, channels: int = 1, sample_width: int = 2):
+        """
+        Öffnet die Zieldatei und startet den Schreib-Thread.
+
+        :param filename: Pfad der WAV-Datei
+        :param sample_rate: Abtastrate der Samples in Hz
+        :param channels: Anzahl der Kanäle
+        :param sample_width: Bytes je Sample
+        """
+        self.filename = filename
+        self.frames_written = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._wav = wave.open(filename, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(sample_width)
+        self._wav.setframerate(sample_rate)
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Übergibt Samples an den Schreib-Thread, ohne auf den Datenträger zu warten.
+
+        :param samples: Die Samples; sie werden kopiert und dürfen danach überschrieben werden
+        """
+        if not self._closed and len(samples):
+            self._queue.put(samples.tobytes())
+
+    def close(self) -> None:
+        """Beendet die Aufnahme; der Schreib-Thread schreibt den Rest und schließt die Datei."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+
+    def wait_closed(self, timeout: float = RECORDER_JOIN_TIMEOUT) -> bool:
+        """
+        Wartet, bis die Datei vollständig geschrieben und geschlossen ist.
+
+        :param timeout: Maximale Wartezeit in Sekunden
+        :return: True, wenn die Datei geschlossen ist
+        """
+        self.close()
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
+
+    def _writer_loop(self) -> None:
+        """Hängt die übergebenen Samples an die Datei an, bis close() aufgerufen wurde."""
+        try:
+            while True:
+                data = self._queue.get()
+                if data is _CLOSE:
+                    break
+                self._wav.writeframesraw(data)
+                self.frames_written += len(data) // (self._wav.getsampwidth() * self._wav.getnchannels())
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben der Aufnahme: {e}")
+        finally:
+            # close() korrigiert die Längenangaben im Dateikopf
+            self._wav.close()
+
+# Zusätzliche Erklärungen:
+
+# 1. Schreiben während der Aufnahme:
+#    Bisher wurde die letzte Aufnahme im Speicher gehalten und erst beim Speichern vollständig
+#    geschrieben. Die Senke schreibt jeden Chunk sofort; beim Beenden fällt nur noch der letzte
+#    Chunk und das Korrigieren des Dateikopfs an, das im Schreib-Thread geschieht.
+
+# 2. Dateikopf:
+#    writeframesraw schreibt nur die Samples. Die Längenangaben im WAV-Kopf werden beim Schließen
+#    durch das wave-Modul nachgetragen, sodass die Länge der Aufnahme vorab nicht bekannt sein muss.
@@ -0,0 +1,366 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält den chunkweise arbeitenden Resampler der Wortweber-Anwendung.
+
+Der StreamingResampler wandelt jeden aufgenommenen Chunk bereits während der Aufnahme
+in die Ziel-Abtastrate um. Beim Loslassen der Push-to-Talk-Taste bleibt dadurch nur
+noch der letzte Chunk zu verarbeiten, statt die gesamte Aufnahme am Stück zu resampeln.
+"""
+
+# Standardbibliotheken
+import math
+import time
+from typing import Dict
+
+# Drittanbieterbibliotheken
+import numpy as np
+from scipy import signal
+
+# Projektspezifische Module
+from src.config import AUDIO_CHUNK, RESAMPLER_ENGINES, DEFAULT_RESAMPLER_ENGINE
+from src.backend.audio_buffer import RecordingBuffer
+
+# Maximale Anzahl Eingangssamples, die in einem Schritt gefiltert werden (begrenzt den Speicherbedarf)
+MAX_BLOCK_SIZE = 2 * AUDIO_CHUNK
+
+
+class _PolyphaseEngine:
+    """
+    Polyphasen-FIR-Resampler mit übertragenem Filterzustand.
+
+    Das Filter entspricht dem von scipy.signal.resample_poly (Kaiser-Fenster, Beta 5.0).
+    Zwischen den Chunks werden nur die letzten Eingangssamples aufbewahrt, die für die
+    nächsten Ausgangssamples noch benötigt werden.
+    """
+
+    def __init__(self, up: int, down: int):
+        self.up = up
+        self.down = down
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * up
+        self.delay = half_len  # Gruppenlaufzeit im hochgetasteten Raster
+        self.taps_per_phase = math.ceil(len(taps) / up)
+        padded = np.zeros(self.taps_per_phase * up, dtype=np.float32)
+        padded[:len(taps)] = taps
+        # phases[p, m] = taps[p + m * up]
+        self.phases = np.ascontiguousarray(padded.reshape(self.taps_per_phase, up).T)
+        self._tap_offsets = np.arange(self.taps_per_phase)
+        self.reset()
+
+    def reset(self) -> None:
+        # Die Vorgeschichte vor dem ersten Sample ist Stille
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._history_start = -(self.taps_per_phase - 1)
+        self.n_in = 0
+        self.n_out = 0
+
+    def _compute(self, samples: np.ndarray, k_end: int) -> np.ndarray:
+        """Berechnet die Ausgangssamples n_out bis k_end (exklusiv) aus samples."""
+        if k_end <= self.n_out:
+            return np.empty(0, dtype=np.float32)
+        ks = np.arange(self.n_out, k_end, dtype=np.int64)
+        positions = ks * self.down + self.delay
+        phase = positions % self.up
+        newest = positions // self.up - self._history_start
+        indices = newest[:, None] - self._tap_offsets[None, :]
+        out = np.einsum('ij,ij->i', self.phases[phase], samples[indices]).astype(np.float32)
+        self.n_out = k_end
+        return out
+
+    def _trim(self, samples: np.ndarray) -> None:
+        """Behält nur die Eingangssamples, die für das nächste Ausgangssample benötigt werden."""
+        keep_from = (self.n_out * self.down + self.delay) // self.up - (self.taps_per_phase - 1)
+        keep_from = max(keep_from, self._history_start)
+        self._history = samples[keep_from - self._history_start:].copy()
+        self._history_start = keep_from
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        samples = np.concatenate((self._history, chunk))
+        self.n_in += len(chunk)
+        last = self.n_in - 1
+        k_end = (last * self.up + self.up - 1 - self.delay) // self.down + 1
+        out = self._compute(samples, max(k_end, self.n_out))
+        self._trim(samples)
+        return out
+
+    def flush(self, total_out: int) -> np.ndarray:
+        if total_out <= self.n_out:
+            return np.empty(0, dtype=np.float32)
+        needed = ((total_out - 1) * self.down + self.delay) // self.up + 1
+        padding = max(0, needed - (self._history_start + len(self._history)))
+        samples = np.concatenate((self._history, np.zeros(padding, dtype=np.float32)))
+        return self._compute(samples, total_out)
+
+
+class _LinearEngine:
+    """Lineare Interpolation mit übertragenem Zustand; schnell, aber ohne Anti-Aliasing-Filter."""
+
+    def __init__(self, up: int, down: int):
+        self.up = up
+        self.down = down
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.empty(0, dtype=np.float32)
+        self._history_start = 0
+        self.n_in = 0
+        self.n_out = 0
+
+    def _compute(self, samples: np.ndarray, k_end: int) -> np.ndarray:
+        if k_end <= self.n_out:
+            return np.empty(0, dtype=np.float32)
+        ks = np.arange(self.n_out, k_end, dtype=np.int64)
+        positions = ks * self.down
+        left = positions // self.up - self._history_start
+        frac = ((positions % self.up) / self.up).astype(np.float32)
+        out = samples[left] * (1.0 - frac) + samples[left + 1] * frac
+        self.n_out = k_end
+        return out.astype(np.float32)
+
+    def _trim(self, samples: np.ndarray) -> None:
+        keep_from = max((self.n_out * self.down) // self.up, self._history_start)
+        keep_from = min(keep_from, self._history_start + len(samples))
+        self._history = samples[keep_from - self._history_start:].copy()
+        self._history_start = keep_from
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        samples = np.concatenate((self._history, chunk))
+        self.n_in += len(chunk)
+        # Für Ausgangssample k werden die Eingangssamples floor(k*down/up) und der Nachfolger benötigt
+        k_end = max(((self.n_in - 1) * self.up - 1) // self.down + 1, 0)
+        out = self._compute(samples, max(k_end, self.n_out))
+        self._trim(samples)
+        return out
+
+    def flush(self, total_out: int) -> np.ndarray:
+        if total_out <= self.n_out:
+            return np.empty(0, dtype=np.float32)
+        last_value = self._history[-1:] if len(self._history) else np.zeros(1, dtype=np.float32)
+        samples = np.concatenate((self._history, np.repeat(last_value, 2)))
+        return self._compute(samples, total_out)
+
+
+class _FFTEngine:
+    """
+    Referenzverfahren mit scipy.signal.resample über die gesamte Aufnahme.
+
+    Nicht streamingfähig: process() sammelt nur, die gesamte Arbeit fällt in flush() an.
+    """
+
+    def __init__(self, up: int, down: int):
+        self._collected = RecordingBuffer(dtype=np.float32)
+        self.n_in = 0
+
+    def reset(self) -> None:
+        self._collected.reset()
+        self.n_in = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        self._collected.append(chunk)
+        self.n_in += len(chunk)
+        return np.empty(0, dtype=np.float32)
+
+    def flush(self, total_out: int) -> np.ndarray:
+        if self.n_in == 0 or total_out == 0:
+            return np.empty(0, dtype=np.float32)
+        return np.asarray(signal.resample(self._collected.view(), total_out), dtype=np.float32)
+
+
+class _PassthroughEngine:
+    """Wird verwendet, wenn Eingangs- und Zielrate übereinstimmen."""
+
+    def __init__(self, up: int, down: int):
+        self.n_in = 0
+
+    def reset(self) -> None:
+        self.n_in = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        self.n_in += len(chunk)
+        return np.array(chunk, dtype=np.float32, copy=True)
+
+    def flush(self, total_out: int) -> np.ndarray:
+        return np.empty(0, dtype=np.float32)
+
+
+_ENGINE_CLASSES = {
+    "polyphase": _PolyphaseEngine,
+    "linear": _LinearEngine,
+    "fft": _FFTEngine,
+}
+
+
+class StreamingResampler:
+    """
+    Zustandsbehafteter Resampler, der Audiodaten chunkweise umwandelt.
+
+    Die Gesamtlänge der Ausgabe entspricht nach flush() der bisherigen Berechnung
+    int(len(audio) * output_rate / input_rate), unabhängig von der Chunk-Aufteilung.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, engine: str = DEFAULT_RESAMPLER_ENGINE):
+        """
+        Initialisiert den Resampler.
+
+        :param input_rate: Abtastrate der Eingangsdaten in Hz
+        :param output_rate: Ziel-Abtastrate in Hz
+        :param engine: Verfahren ("polyphase", "linear" oder "fft")
+        """
+        if engine not in RESAMPLER_ENGINES:
+            raise ValueError(f"Unbekanntes Resampling-Verfahren: {engine}")
+        self.input_rate = int(input_rate)
+        self.output_rate = int(output_rate)
+        self.engine_name = engine
+        divisor = math.gcd(self.input_rate, self.output_rate)
+        self.up = self.output_rate // divisor
+        self.down = self.input_rate // divisor
+        engine_class = _PassthroughEngine if self.up == self.down else _ENGINE_CLASSES[engine]
+        self._engine = engine_class(self.up, self.down)
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Wandelt einen Chunk um und gibt alle bereits berechenbaren Ausgangssamples zurück.
+
+        :param chunk: Eingangssamples als float32 im Bereich [-1, 1]
+        :return: Neue Ausgangssamples als float32
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if len(chunk) <= MAX_BLOCK_SIZE:
+            return self._limit(self._engine.process(chunk))
+        parts = [self._engine.process(chunk[i:i + MAX_BLOCK_SIZE]) for i in range(0, len(chunk), MAX_BLOCK_SIZE)]
+        return self._limit(np.concatenate(parts))
+
+    def flush(self) -> np.ndarray:
+        """
+        Gibt die restlichen Ausgangssamples zurück und schließt die Umwandlung ab.
+
+        :return: Die letzten Ausgangssamples als float32
+        """
+        total_out = int(self._engine.n_in * self.up / self.down)
+        return self._limit(self._engine.flush(total_out))
+
+    @staticmethod
+    def _limit(samples: np.ndarray) -> np.ndarray:
+        """Begrenzt Überschwinger des Filters auf den gültigen Wertebereich [-1, 1]."""
+        return np.clip(samples, -1.0, 1.0, out=samples)
+
+    def reset(self) -> None:
+        """Setzt den Zustand für eine neue Aufnahme zurück."""
+        self._engine.reset()
+
+
+def resample(audio: np.ndarray, input_rate: int, output_rate: int, engine: str = DEFAULT_RESAMPLER_ENGINE) -> np.ndarray:
+    """
+    Resampelt eine vollständige Aufnahme in einem Aufruf.
+
+    :param audio: Eingangssamples als float32
+    :param input_rate: Abtastrate der Eingangsdaten in Hz
+    :param output_rate: Ziel-Abtastrate in Hz
+    :param engine: Verfahren ("polyphase", "linear" oder "fft")
+    :return: Die resampelten Samples als neues float32-Array
+    """
+    resampler = StreamingResampler(input_rate, output_rate, engine)
+    head = resampler.process(audio)
+    tail = resampler.flush()
+    return np.concatenate((head, tail))
+
+
+def benchmark_engines(audio: np.ndarray, input_rate: int, output_rate: int,
+                      chunk_size: int = AUDIO_CHUNK) -> Dict[str, Dict[str, float]]:
+    """
+    Vergleicht alle Verfahren mit der bisherigen FFT-Ausgabe.
+
+    Gemessen werden die Gesamtrechenzeit bei chunkweiser Verarbeitung, die Zeit für
+    flush() (also die Arbeit, die nach dem Loslassen der Taste noch anfällt) und der
+    Signal-Rausch-Abstand zur Ausgabe von scipy.signal.resample über die gesamte Aufnahme.
+
+    :param audio: Eingangssamples als float32
+    :param input_rate: Abtastrate der Eingangsdaten in Hz
+    :param output_rate: Ziel-Abtastrate in Hz
+    :param chunk_size: Chunkgröße der simulierten Aufnahme
+    :return: Ein Dictionary je Verfahren mit total_seconds, flush_seconds und snr_db
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    reference = np.asarray(signal.resample(audio, int(len(audio) * output_rate / input_rate)), dtype=np.float32)
+    # Die Ränder werden ausgelassen, da das FFT-Verfahren die Aufnahme als periodisch behandelt
+    margin = len(reference) // 20
+
+    results = {}
+    for engine in RESAMPLER_ENGINES:
+        resampler = StreamingResampler(input_rate, output_rate, engine)
+        parts = []
+        start = time.perf_counter()
+        for i in range(0, len(audio), chunk_size):
+            parts.append(resampler.process(audio[i:i + chunk_size]))
+        flush_start = time.perf_counter()
+        parts.append(resampler.flush())
+        end = time.perf_counter()
+
+        output = np.concatenate(parts)
+        error = output[margin:len(output) - margin] - reference[margin:len(reference) - margin]
+        signal_power = float(np.mean(reference[margin:len(reference) - margin] ** 2))
+        error_power = float(np.mean(error ** 2))
+        snr_db = float('inf') if error_power == 0 else 10 * math.log10(signal_power / error_power)
+        results[engine] = {
+            "total_seconds": end - start,
+            "flush_seconds": end - flush_start,
+            "snr_db": snr_db,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    # Benchmark mit einer Datei (python -m src.backend.resampler datei.wav) oder einem synthetischen Signal
+    import sys
+    import wave
+
+    if len(sys.argv) > 1:
+        with wave.open(sys.argv[1], "rb") as wf:
+            rate = wf.getframerate()
+            test_audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+    else:
+        rate = 44100
+        t = np.arange(10 * rate) / rate
+        test_audio = (0.3 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.sin(2 * np.pi * 3100 * t)).astype(np.float32)
+
+    for name, result in benchmark_engines(test_audio, rate, 16000).items():
+        print(f"{name:10s} gesamt: {result['total_seconds'] * 1000:8.1f} ms  "
+              f"nach Tastenende: {result['flush_seconds'] * 1000:8.1f} ms  SNR: {result['snr_db']:6.1f} dB")
+
+# Zusätzliche Erklärungen:
+
+# 1. Polyphasen-Verfahren:
+#    Das Verhältnis 44100 -> 16000 Hz entspricht 160/441. Statt das Signal 160-fach hochzutasten und
+#    anschließend 441-fach zu dezimieren, wird für jedes Ausgangssample nur die passende Phase des
+#    FIR-Filters (ca. 56 Koeffizienten) mit den zugehörigen Eingangssamples multipliziert.
+
+# 2. Übertragener Zustand:
+#    Zwischen den Chunks bleiben nur die Eingangssamples erhalten, die das Filter für die nächsten
+#    Ausgangssamples noch benötigt. Die Gruppenlaufzeit des Filters wird kompensiert, sodass die
+#    Ausgabe zeitlich mit der Ausgabe von scipy.signal.resample übereinstimmt. Überschwinger des Filters
+#    bei voll ausgesteuerten Signalen werden auf [-1, 1] begrenzt.
+
+# 3. Wahl des Verfahrens:
+#    "polyphase" ist der Standard und liefert nahezu die Qualität des FFT-Verfahrens. "linear" ist
+#    am schnellsten, filtert aber keine Frequenzen oberhalb der neuen Nyquist-Frequenz heraus.
+#    "fft" entspricht dem bisherigen Verhalten und verlagert die gesamte Arbeit auf das Tastenende.
+
+# 4. Benchmark:
+#    `python -m src.backend.resampler [datei.wav]` gibt Rechenzeit, Restarbeit nach dem Tastenende
+#    und den Abstand zur bisherigen FFT-Ausgabe für alle Verfahren aus.
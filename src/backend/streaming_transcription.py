@@ -0,0 +1,212 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Live-Transkription einer laufenden Push-to-Talk-Aufnahme.
+
+Der StreamingTranscriber transkribiert den wachsenden Aufnahmepuffer in regelmäßigen Abständen
+erneut und bestätigt Wörter nach der LocalAgreement-2-Regel: ein Wort gilt als stabil, sobald
+zwei aufeinanderfolgende Hypothesen bis einschließlich dieses Worts übereinstimmen. Beim Loslassen
+der Taste muss nur noch der unbestätigte Rest dekodiert werden.
+"""
+
+# Standardbibliotheken
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import TARGET_RATE, STREAMING_MIN_SECONDS, STREAMING_TRIM_SECONDS, STREAMING_PROMPT_CHARS
+
+# Signatur der Worttranskription: (audio, prompt) -> [(Beginn, Ende, Wort), ...] mit Zeiten relativ zum Audioanfang
+WordTranscriber = Callable[[np.ndarray, Optional[str]], Sequence[Tuple[float, float, str]]]
+
+_OVERLAP_TOLERANCE = 0.1  # Wörter, die bis zu 100 ms vor dem Ende des bestätigten Texts beginnen, gelten als neu
+_MAX_REPEAT_WORDS = 5  # Längste Wortfolge am Fensteranfang, die auf Wiederholung des bestätigten Texts geprüft wird
+
+
+class Word(NamedTuple):
+    """Ein transkribiertes Wort mit absoluten Zeiten in Sekunden seit Aufnahmebeginn."""
+    start: float
+    end: float
+    text: str  # Mit führendem Leerzeichen wie von Whisper geliefert
+
+
+def _normalize(text: str) -> str:
+    """Vergleichsform eines Worts: ohne Leerzeichen, Groß-/Kleinschreibung und Satzzeichen am Rand."""
+    return text.strip().strip(".,;:!?\"'").lower()
+
+
+def _join(words: Sequence[Word]) -> str:
+    """Setzt Wörter wieder zu Text zusammen."""
+    return "".join(word.text for word in words).strip()
+
+
+class LocalAgreement:
+    """
+    Bestätigt Wörter, auf die sich zwei aufeinanderfolgende Hypothesen einigen (LocalAgreement-2).
+
+    Bestätigte Wörter werden nie wieder geändert; die restlichen Wörter der letzten Hypothese
+    bleiben vorläufig und werden mit der nächsten Hypothese verglichen.
+    """
+
+    def __init__(self):
+        """Initialisiert die LocalAgreement-Regel ohne bestätigte Wörter."""
+        self.committed: List[Word] = []
+        self.tentative: List[Word] = []
+        self.last_committed_end = 0.0
+
+    def new_words(self, words: Sequence[Tuple[float, float, str]], offset: float) -> List[Word]:
+        """
+        Rechnet eine Hypothese auf absolute Zeiten um und entfernt bereits bestätigte Wörter.
+
+        :param words: (Beginn, Ende, Wort) relativ zum Fensteranfang
+        :param offset: Beginn des Fensters in Sekunden seit Aufnahmebeginn
+        :return: Die Wörter nach dem bestätigten Text
+        """
+        hypothesis = [Word(start + offset, end + offset, text) for start, end, text in words]
+        hypothesis = [word for word in hypothesis if word.start > self.last_committed_end - _OVERLAP_TOLERANCE]
+        # Whisper wiederholt am Fensteranfang gelegentlich die letzten bestätigten Wörter
+        if hypothesis and self.committed and abs(hypothesis[0].start - self.last_committed_end) < 1.0:
+            for n in range(min(_MAX_REPEAT_WORDS, len(hypothesis), len(self.committed)), 0, -1):
+                if [_normalize(w.text) for w in self.committed[-n:]] == [_normalize(w.text) for w in hypothesis[:n]]:
+                    hypothesis = hypothesis[n:]
+                    break
+        return hypothesis
+
+    def insert(self, words: Sequence[Tuple[float, float, str]], offset: float) -> List[Word]:
+        """
+        Vergleicht eine neue Hypothese mit der vorherigen und bestätigt den gemeinsamen Anfang.
+
+        :param words: (Beginn, Ende, Wort) relativ zum Fensteranfang
+        :param offset: Beginn des Fensters in Sekunden seit Aufnahmebeginn
+        :return: Die neu bestätigten Wörter
+        """
+        hypothesis = self.new_words(words, offset)
+        agreed: List[Word] = []
+        for previous, current in zip(self.tentative, hypothesis):
+            if _normalize(previous.text) != _normalize(current.text):
+                break
+            agreed.append(current)
+        self.committed.extend(agreed)
+        if agreed:
+            self.last_committed_end = agreed[-1].end
+        self.tentative = hypothesis[len(agreed):]
+        return agreed
+
+
+class StreamingTranscriber:
+    """
+    Transkribiert eine wachsende Aufnahme wiederholt und liefert bestätigten und vorläufigen Text.
+
+    update() und finish() werden nacheinander aus demselben Thread aufgerufen und erhalten jeweils
+    die gesamte bisherige Aufnahme. Dekodiert wird nur das Fenster ab window_start; überschreitet es
+    trim_seconds, wird es bis zum Ende des letzten bestätigten Worts gekürzt und der bestätigte Text
+    davor als Kontext (Prompt) übergeben.
+    """
+
+    def __init__(self, transcribe_words: WordTranscriber, sample_rate: int = TARGET_RATE,
+                 min_seconds: float = STREAMING_MIN_SECONDS, trim_seconds: float = STREAMING_TRIM_SECONDS,
+                 prompt_chars: int = STREAMING_PROMPT_CHARS):
+        """
+        Initialisiert den StreamingTranscriber.
+
+        :param transcribe_words: Transkribiert ein Fenster mit Prompt zu Wörtern mit Zeitstempeln
+        :param sample_rate: Abtastrate der Aufnahme in Hz
+        :param min_seconds: Kürzestes Fenster, das während der Aufnahme dekodiert wird
+        :param trim_seconds: Fensterlänge, ab der das Fenster gekürzt wird
+        :param prompt_chars: Höchstlänge des Prompts in Zeichen
+        """
+        self.transcribe_words = transcribe_words
+        self.sample_rate = sample_rate
+        self.min_samples = int(min_seconds * sample_rate)
+        self.trim_samples = int(trim_seconds * sample_rate)
+        self.prompt_chars = prompt_chars
+        self.agreement = LocalAgreement()
+        self.window_start = 0  # Beginn des dekodierten Fensters in Samples
+        self.updates = 0
+        self.decoded_seconds = 0.0  # Summe der dekodierten Fensterlängen
+        self.final_seconds = 0.0  # Länge des beim Loslassen dekodierten Rests
+
+    @property
+    def committed_text(self) -> str:
+        """Der bestätigte Text, der sich nicht mehr ändert."""
+        return _join(self.agreement.committed)
+
+    @property
+    def tentative_text(self) -> str:
+        """Der vorläufige Text nach dem bestätigten Teil."""
+        return _join(self.agreement.tentative)
+
+    def _prompt(self, start_seconds: float) -> Optional[str]:
+        """Bestätigter Text vor dem Fensteranfang als Kontext für Whisper."""
+        text = _join([word for word in self.agreement.committed if word.end <= start_seconds + _OVERLAP_TOLERANCE])
+        return text[-self.prompt_chars:] or None
+
+    def update(self, audio: np.ndarray) -> bool:
+        """
+        Transkribiert das aktuelle Fenster der wachsenden Aufnahme.
+
+        :param audio: Die bisherige Aufnahme (16 kHz, float32)
+        :return: True, wenn dekodiert wurde (das Fenster war lang genug)
+        """
+        window = audio[self.window_start:]
+        if len(window) < self.min_samples:
+            return False
+        offset = self.window_start / self.sample_rate
+        self.agreement.insert(self.transcribe_words(window, self._prompt(offset)), offset)
+        self.updates += 1
+        self.decoded_seconds += len(window) / self.sample_rate
+        if len(window) > self.trim_samples and self.agreement.committed:
+            self.window_start = max(self.window_start, int(self.agreement.last_committed_end * self.sample_rate))
+        return True
+
+    def finish(self, audio: np.ndarray) -> str:
+        """
+        Dekodiert den unbestätigten Rest der abgeschlossenen Aufnahme und liefert den vollständigen Text.
+
+        :param audio: Die vollständige Aufnahme (16 kHz, float32)
+        :return: Bestätigter Text und transkribierter Rest
+        """
+        start = self.window_start
+        if self.agreement.committed:
+            start = max(start, int(self.agreement.last_committed_end * self.sample_rate))
+        tail = audio[start:]
+        words: List[Word] = []
+        if len(tail) > 0:
+            offset = start / self.sample_rate
+            words = self.agreement.new_words(self.transcribe_words(tail, self._prompt(offset)), offset)
+            self.final_seconds = len(tail) / self.sample_rate
+        return _join(self.agreement.committed + words)
+
+# Zusätzliche Erklärungen:
+
+# 1. LocalAgreement-2:
+#    Whisper ändert das Ende einer Hypothese, solange ein Wort noch nicht vollständig gesprochen ist. Ein Wort
+#    wird erst bestätigt, wenn es in zwei aufeinanderfolgenden Durchläufen an derselben Stelle steht; damit
+#    ändert sich bereits angezeigter bestätigter Text nie mehr. Verglichen wird ohne Groß-/Kleinschreibung
+#    und Satzzeichen am Wortrand, übernommen wird die Schreibweise der neueren Hypothese.
+
+# 2. Fenster und Prompt:
+#    Whisper verarbeitet höchstens 30 Sekunden auf einmal. Ab STREAMING_TRIM_SECONDS beginnt das Fenster daher
+#    am Ende des letzten bestätigten Worts; der bestätigte Text davor wird als initial_prompt übergeben, damit
+#    Schreibweise und Kontext erhalten bleiben. Wörter, die vor dem bestätigten Ende beginnen oder dessen
+#    letzte Wörter wiederholen, werden verworfen.
+
+# 3. Abschluss:
+#    finish() dekodiert nur die Aufnahme nach dem letzten bestätigten Wort. Bei einer langen Aufnahme ist das
+#    meist nur die letzte Sekunde, sodass der Text kurz nach dem Loslassen der Taste vollständig ist.
@@ -0,0 +1,293 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Dieses Modul enthält die Sprachaktivitätserkennung (VAD) der Wortweber-Anwendung.
+
+Der VoiceActivityDetector entfernt Stille am Anfang und Ende einer Aufnahme und erkennt
+Aufnahmen ohne Sprache (z.B. versehentliche Tastendrücke), bevor sie an Whisper gehen.
+"""
+
+# Standardbibliotheken
+from collections import deque
+from typing import Callable, Optional, Tuple
+
+# Drittanbieterbibliotheken
+import numpy as np
+
+# Projektspezifische Module
+from src.config import (
+    TARGET_RATE, VAD_FRAME_MS, VAD_ENERGY_THRESHOLD_DB, VAD_NOISE_MARGIN_DB, VAD_FLATNESS_THRESHOLD, VAD_BLOCK_FRAMES,
+    DEFAULT_VAD_PADDING_MS, DEFAULT_VAD_MIN_SPEECH_MS, DEFAULT_SEGMENT_END_SILENCE_MS, SEGMENT_MAX_SECONDS
+)
+from src.backend.audio_buffer import RecordingBuffer
+
+# Signatur eines optionalen Modells: (frames[n, frame_len], sample_rate) -> Sprachwahrscheinlichkeit oder bool je Frame
+SpeechModel = Callable[[np.ndarray, int], np.ndarray]
+
+
+class VoiceActivityDetector:
+    """
+    Erkennt Sprache anhand von Frame-Energie und spektraler Flachheit.
+
+    Ein Frame gilt als Sprache, wenn seine Energie über der Rauschschwelle liegt und sein
+    Spektrum nicht flach (rauschartig) ist. Alle Berechnungen erfolgen vektorisiert über
+    alle Frames einer Aufnahme.
+    """
+
+    def __init__(self, sample_rate: int = TARGET_RATE, frame_ms: int = VAD_FRAME_MS,
+                 padding_ms: int = DEFAULT_VAD_PADDING_MS, min_speech_ms: int = DEFAULT_VAD_MIN_SPEECH_MS,
+                 energy_threshold_db: float = VAD_ENERGY_THRESHOLD_DB,
+                 flatness_threshold: float = VAD_FLATNESS_THRESHOLD,
+                 model: Optional[SpeechModel] = None):
+        """
+        Initialisiert den VoiceActivityDetector.
+
+        :param sample_rate: Abtastrate der zu prüfenden Aufnahmen in Hz
+        :param frame_ms: Länge eines Analyse-Frames in Millisekunden
+        :param padding_ms: Beibehaltene Stille vor und nach der erkannten Sprache in Millisekunden
+        :param min_speech_ms: Mindestdauer erkannter Sprache, damit eine Aufnahme transkribiert wird
+        :param energy_threshold_db: Absolute Energieschwelle in dBFS
+        :param flatness_threshold: Maximale spektrale Flachheit (0 = tonal, 1 = weißes Rauschen) für Sprache
+        :param model: Optionales Modell, das die Frame-Entscheidung anstelle der Heuristik trifft
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.padding_frames = int(round(padding_ms / frame_ms))
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.energy_threshold_db = energy_threshold_db
+        self.flatness_threshold = flatness_threshold
+        self.model = model
+        self._window = np.hanning(self.frame_length).astype(np.float32)
+
+    def _frames(self, audio: np.ndarray) -> np.ndarray:
+        """Teilt die Aufnahme ohne Kopie in nicht überlappende Frames."""
+        n_frames = len(audio) // self.frame_length
+        return np.asarray(audio[:n_frames * self.frame_length], dtype=np.float32).reshape(n_frames, self.frame_length)
+
+    def frame_decisions(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Entscheidet für jeden Frame, ob er Sprache enthält.
+
+        :param audio: Aufnahme als float32 im Bereich [-1, 1]
+        :return: Boolesches Array mit einem Eintrag je Frame
+        """
+        frames = self._frames(audio)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        if self.model is not None:
+            return np.asarray(self.model(frames, self.sample_rate)) > 0.5
+
+        # Blockweise, damit ausgelagerte Aufnahmen nicht vollständig als Zwischenergebnis im Speicher landen
+        blocks = range(0, len(frames), VAD_BLOCK_FRAMES)
+        energy_db = np.concatenate([self.frame_energy_db(frames[i:i + VAD_BLOCK_FRAMES]) for i in blocks])
+        # Die Schwelle folgt dem Grundrauschen, bleibt aber unter den lautesten Frames
+        noise_floor_db = np.percentile(energy_db, 10)
+        adaptive_db = min(noise_floor_db + VAD_NOISE_MARGIN_DB, energy_db.max() - VAD_NOISE_MARGIN_DB)
+        threshold_db = max(self.energy_threshold_db, adaptive_db)
+        return np.concatenate([self.classify_frames(frames[i:i + VAD_BLOCK_FRAMES], energy_db[i:i + VAD_BLOCK_FRAMES], threshold_db)
+                               for i in blocks])
+
+    @staticmethod
+    def frame_energy_db(frames: np.ndarray) -> np.ndarray:
+        """Berechnet die mittlere Energie je Frame in dBFS."""
+        return 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    def classify_frames(self, frames: np.ndarray, energy_db: np.ndarray, threshold_db: float) -> np.ndarray:
+        """
+        Klassifiziert Frames anhand einer gegebenen Energieschwelle und der spektralen Flachheit.
+
+        :param frames: Frames als Matrix [Anzahl, Frame-Länge]
+        :param energy_db: Energie je Frame in dBFS
+        :param threshold_db: Energieschwelle in dBFS
+        :return: Boolesches Array mit einem Eintrag je Frame
+        """
+        loud = energy_db > threshold_db
+        if not loud.any():
+            return loud
+
+        # Spektrale Flachheit nur für Frames berechnen, die die Energieschwelle überschreiten
+        power = np.abs(np.fft.rfft(frames[loud] * self._window, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        decisions = np.zeros(len(frames), dtype=bool)
+        decisions[loud] = flatness < self.flatness_threshold
+        return decisions
+
+    def detect(self, audio: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        Ermittelt den Bereich der Aufnahme, der Sprache enthält.
+
+        :param audio: Aufnahme als float32 im Bereich [-1, 1]
+        :return: (Start, Ende) in Samples einschließlich Padding oder None, wenn keine Sprache erkannt wurde
+        """
+        decisions = self.frame_decisions(audio)
+        if np.count_nonzero(decisions) < self.min_speech_frames:
+            return None
+        speech = np.flatnonzero(decisions)
+        first = max(0, speech[0] - self.padding_frames)
+        last = min(len(decisions), speech[-1] + 1 + self.padding_frames)
+        end = len(audio) if last == len(decisions) else last * self.frame_length
+        return int(first * self.frame_length), int(end)
+
+    def trim(self, audio: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Entfernt Stille am Anfang und Ende der Aufnahme.
+
+        :param audio: Aufnahme als float32 im Bereich [-1, 1]
+        :return: Ein View auf den Sprachbereich oder None, wenn keine Sprache erkannt wurde
+        """
+        bounds = self.detect(audio)
+        if bounds is None:
+            return None
+        start, end = bounds
+        return audio[start:end]
+
+
+class StreamingSegmenter:
+    """
+    Zerlegt einen fortlaufenden Audiostream anhand der Sprachaktivität in einzelne Äußerungen.
+
+    Die Samples werden in beliebig großen Blöcken übergeben. Sobald nach erkannter Sprache
+    lange genug Stille folgt (oder die maximale Segmentlänge erreicht ist), wird das Segment
+    einschließlich Padding an on_segment übergeben. Das Grundrauschen wird laufend nachgeführt,
+    da im Stream keine vollständige Aufnahme für eine adaptive Schwelle vorliegt.
+    """
+
+    def __init__(self, on_segment: Callable[[np.ndarray], None], detector: Optional[VoiceActivityDetector] = None,
+                 end_silence_ms: int = DEFAULT_SEGMENT_END_SILENCE_MS, max_segment_seconds: float = SEGMENT_MAX_SECONDS):
+        """
+        Initialisiert den StreamingSegmenter.
+
+        :param on_segment: Wird mit jedem abgeschlossenen Segment (float32, eigene Kopie) aufgerufen
+        :param detector: Der für die Frame-Entscheidung verwendete VoiceActivityDetector
+        :param end_silence_ms: Stille in Millisekunden, nach der ein Segment abgeschlossen wird
+        :param max_segment_seconds: Maximale Länge eines Segments in Sekunden
+        """
+        self.on_segment = on_segment
+        self.detector = detector or VoiceActivityDetector()
+        frame_length = self.detector.frame_length
+        frame_ms = frame_length * 1000 / self.detector.sample_rate
+        self.end_silence_frames = max(1, int(round(end_silence_ms / frame_ms)))
+        self.max_segment_samples = int(max_segment_seconds * self.detector.sample_rate)
+        self._remainder = np.empty(0, dtype=np.float32)
+        self._preroll = deque(maxlen=max(1, self.detector.padding_frames))
+        self._segment = RecordingBuffer(dtype=np.float32)
+        self._in_speech = False
+        self._speech_frames = 0
+        self._silence_frames = 0
+        # Startwert: ruhige Umgebung, die Schätzung folgt dem tatsächlichen Grundrauschen
+        self.noise_floor_db = self.detector.energy_threshold_db - VAD_NOISE_MARGIN_DB
+        self.segments_emitted = 0
+
+    @property
+    def in_speech(self) -> bool:
+        """True, solange ein Segment aufgenommen wird."""
+        return self._in_speech
+
+    def _decide(self, frames: np.ndarray) -> np.ndarray:
+        """Entscheidet für jeden Frame eines Blocks, ob er Sprache enthält, und führt das Grundrauschen nach."""
+        if self.detector.model is not None:
+            return np.asarray(self.detector.model(frames, self.detector.sample_rate)) > 0.5
+        energy_db = self.detector.frame_energy_db(frames)
+        threshold_db = max(self.detector.energy_threshold_db, self.noise_floor_db + VAD_NOISE_MARGIN_DB)
+        decisions = self.detector.classify_frames(frames, energy_db, threshold_db)
+        quiet = energy_db[~decisions]
+        if len(quiet):
+            # Minimum-Verfolgung: sofort nach unten, nur langsam nach oben
+            rising = 0.95 * self.noise_floor_db + 0.05 * float(quiet.mean())
+            self.noise_floor_db = min(float(quiet.min()), rising)
+        return decisions
+
+    def process(self, samples: np.ndarray) -> None:
+        """
+        Verarbeitet neue Samples des Streams.
+
+        :param samples: Neue Samples als float32 mit der Abtastrate des Detektors
+        """
+        data = np.concatenate((self._remainder, np.asarray(samples, dtype=np.float32)))
+        frames = self.detector._frames(data)
+        self._remainder = data[len(frames) * self.detector.frame_length:].copy()
+        if len(frames) == 0:
+            return
+
+        for frame, is_speech in zip(frames, self._decide(frames)):
+            if not self._in_speech:
+                if is_speech:
+                    self._in_speech = True
+                    self._segment.reset()
+                    for previous in self._preroll:
+                        self._segment.append(previous)
+                    self._preroll.clear()
+                    self._segment.append(frame)
+                    self._speech_frames = 1
+                    self._silence_frames = 0
+                else:
+                    self._preroll.append(frame.copy())
+                continue
+
+            self._segment.append(frame)
+            if is_speech:
+                self._speech_frames += 1
+                self._silence_frames = 0
+            else:
+                self._silence_frames += 1
+            segment_full = len(self._segment) + self.detector.frame_length > self.max_segment_samples
+            if self._silence_frames >= self.end_silence_frames or segment_full:
+                self._emit()
+
+    def flush(self) -> None:
+        """Schließt ein laufendes Segment am Ende des Streams ab."""
+        if self._in_speech:
+            self._segment.append(self._remainder)
+            self._emit()
+        self._remainder = np.empty(0, dtype=np.float32)
+        self._preroll.clear()
+
+    def _emit(self) -> None:
+        """Übergibt das aktuelle Segment ohne überschüssige Stille am Ende."""
+        self._in_speech = False
+        excess = max(0, self._silence_frames - self.detector.padding_frames) * self.detector.frame_length
+        segment = self._segment.view()[:len(self._segment) - excess]
+        if self._speech_frames >= self.detector.min_speech_frames and len(segment) > 0:
+            self.segments_emitted += 1
+            self.on_segment(segment.copy())
+        self._segment.reset()
+
+# Zusätzliche Erklärungen:
+
+# 1. Energie und spektrale Flachheit:
+#    Die Energie trennt Stille von Signal, die spektrale Flachheit (geometrisches durch arithmetisches
+#    Mittel des Leistungsspektrums) trennt Sprache mit ausgeprägten Formanten von breitbandigem Rauschen
+#    wie Lüftern oder Rauschen des Mikrofonvorverstärkers.
+
+# 2. Adaptive Schwelle:
+#    Die Energieschwelle liegt VAD_NOISE_MARGIN_DB über dem leisesten Zehntel der Frames, mindestens aber
+#    bei VAD_ENERGY_THRESHOLD_DB. Damit Aufnahmen, die durchgehend Sprache enthalten, nicht verworfen werden,
+#    liegt sie höchstens VAD_NOISE_MARGIN_DB unter dem lautesten Frame.
+
+# 3. Austauschbares Modell:
+#    Über den Parameter `model` kann ein trainiertes VAD-Modell eingebunden werden. Es erhält alle Frames
+#    als Matrix und liefert je Frame eine Wahrscheinlichkeit oder einen Wahrheitswert.
+
+# 4. Padding:
+#    Um die erkannte Sprache bleibt etwas Stille erhalten, damit Whisper weich einsetzende oder
+#    ausklingende Laute nicht abgeschnitten bekommt.
+
+# 5. Segmentierung im Dauerdiktat:
+#    Der StreamingSegmenter arbeitet auf den bereits resampelten 16-kHz-Chunks der Aufnahme. Ein Segment
+#    endet nach DEFAULT_SEGMENT_END_SILENCE_MS Stille oder spätestens nach SEGMENT_MAX_SECONDS, damit es
+#    in das 30-Sekunden-Fenster von Whisper passt.
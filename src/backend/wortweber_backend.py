@@ -20,8 +20,11 @@ Es koordiniert die Audioaufnahme, Transkription und Datenverwaltung.
 """
 
 # Standardbibliotheken
-from typing import List, Optional, Tuple, Callable
+from typing import Iterator, List, Optional, Tuple, Callable
+import contextlib
+import queue
 import threading
+import time
 
 # Drittanbieterbibliotheken
 import numpy as np
@@ -29,10 +32,27 @@ import numpy as np
 # Projektspezifische Module
 from src.config import (
     AUDIO_RATE, AUDIO_FORMAT, AUDIO_CHANNELS, AUDIO_CHUNK, DEVICE_INDEX,
-    TARGET_RATE, DEFAULT_WHISPER_MODEL, DEFAULT_INCOGNITO_MODE
+    TARGET_RATE, DEFAULT_WHISPER_MODEL, DEFAULT_INCOGNITO_MODE, RECORDER_JOIN_TIMEOUT,
+    DEFAULT_VAD_ENABLED, DEFAULT_VAD_PADDING_MS, DEFAULT_VAD_MIN_SPEECH_MS, DEFAULT_SEGMENT_END_SILENCE_MS,
+    DEFAULT_RECORDING_SPILL_MB, DEFAULT_NOISE_SUPPRESSION, DEFAULT_NOISE_REDUCTION_DB, DEFAULT_ARCHIVE_RECORDINGS,
+    ARCHIVE_DIR, DEFAULT_ARCHIVE_FORMAT, DEFAULT_ARCHIVE_MAX_MB, DEFAULT_ARCHIVE_MAX_DAYS,
+    DEFAULT_KEYWORD_ACTIVATION, KEYWORD_TEMPLATE_FILE, DEFAULT_KEYWORD_THRESHOLD, DEFAULT_KEYWORD_CPU_BUDGET,
+    DEFAULT_KEYWORD_LISTEN_SECONDS, DEFAULT_LIVE_TRANSCRIPTION, DEFAULT_LIVE_INTERVAL_MS, DEFAULT_MODEL_POOL_MB,
+    DEFAULT_MODEL_PRECISION, CALIBRATION_PROFILE_FILE, CALIBRATION_SAMPLE_FILE, CALIBRATION_SAMPLE_TEXT,
+    DEFAULT_APPLY_CALIBRATION, DEFAULT_LATENCY_TARGET_SECONDS, DEFAULT_LATENCY_TARGET_AUDIO_SECONDS
 )
 from src.backend.audio_processor import AudioProcessor
+from src.backend.audio_buffer import RecordingBuffer, spill_copy
 from src.backend.wortweber_transcriber import Transcriber
+from src.backend.model_pool import ModelPool, model_key, split_model_key
+from src.backend.vad import VoiceActivityDetector, StreamingSegmenter, SpeechModel
+from src.backend.noise_suppression import SpectralGate, NoiseProfile
+from src.backend.conditioning import AudioConditioner
+from src.backend.audio_file import AudioInput, read_audio
+from src.backend.recording_archive import RecordingArchive
+from src.backend.keyword_spotter import KeywordSpotter, KeywordGate
+from src.backend.streaming_transcription import StreamingTranscriber
+from src.backend.calibration import Calibrator, load_profile, save_profile, profile_entry, set_threads
 from src.utils.error_handling import handle_exceptions, logger
 
 # Globale Konstante für bedingtes Debug-Logging
@@ -44,7 +64,11 @@ class WordweberState:
     def __init__(self):
         """Initialisiert den Zustand der Wortweber-Anwendung."""
         self.recording: bool = False
-        self.audio_data: List[bytes] = []
+        self.audio_data: RecordingBuffer = RecordingBuffer()
+        self.resampled_audio: RecordingBuffer = RecordingBuffer(dtype=np.float32)  # Während der Aufnahme resampelt
+        self.audio_consumed: bool = True  # True, sobald die aktuelle Aufnahme verarbeitet wurde
+        self.segmenter: Optional[StreamingSegmenter] = None  # Nur im Dauerdiktat gesetzt (ggf. als KeywordGate)
+        self.capture_metrics: Optional[dict] = None  # Aufnahme-Metriken der letzten Aufnahme
         self.start_time: float = 0
         self.transcription_time: float = 0
         self.language: str = "de"
@@ -53,23 +77,91 @@ class WordweberBackend:
     """Hauptklasse für die Backend-Logik der Wortweber-Anwendung."""
 
     @handle_exceptions
-    def __init__(self, settings_manager):
+    def __init__(self, settings_manager, audio_source_factory=None):
         """
         Initialisiert das WordweberBackend.
 
         :param settings_manager: Der SettingsManager für die Verwaltung von Einstellungen
+        :param audio_source_factory: Optionale Fabrik für das Aufnahmegerät des AudioProcessors (audio_source.AudioSource, z.B. VirtualAudioSource)
         """
         self.settings_manager = settings_manager
         self.state = WordweberState()
-        self.audio_processor = AudioProcessor(self.settings_manager)
-        self.transcriber = Transcriber(DEFAULT_WHISPER_MODEL)
+        self.configure_recording_spill()
+        self.audio_processor = AudioProcessor(self.settings_manager, audio_source_factory)
+        self.transcriber = Transcriber(DEFAULT_WHISPER_MODEL)  # Wird durch load_transcriber_model aus dem Pool ersetzt
+        self.model_pool = ModelPool(self._create_transcriber,
+                                    int(self.settings_manager.get_setting("model_pool_mb", DEFAULT_MODEL_POOL_MB)))
+        self._transcriber_lock = threading.Lock()  # Schützt die Umschaltung von self.transcriber
+        self._requested_model: Optional[str] = None  # Pool-Schlüssel des zuletzt angeforderten Modells
         self.model_loaded = threading.Event()
+        self.calibration_profile: Optional[dict] = None
+        self.load_calibration_profile()
         self.on_transcription_complete: Optional[Callable[[str], None]] = None
         self.pending_audio: List[np.ndarray] = []
+        self._record_thread: Optional[threading.Thread] = None
+        self.vad_model: Optional[SpeechModel] = None  # Optionales VAD-Modell anstelle der Heuristik
+        self.noise_gate = SpectralGate(TARGET_RATE)
+        self._noise_profile: Optional[NoiseProfile] = None  # Letztes geschätztes Rauschprofil als Rückfall
+        self.segment_queue: "queue.Queue[np.ndarray]" = queue.Queue()
+        self.on_segment_transcribed: Optional[Callable[[str, float], None]] = None
+        self._segment_worker: Optional[threading.Thread] = None
+        self.keyword_spotter = KeywordSpotter()
+        self.keyword_spotter.load(KEYWORD_TEMPLATE_FILE)
+        self.on_keyword_detected: Optional[Callable[[float], None]] = None
+        self.on_partial_transcription: Optional[Callable[[str, str], None]] = None
+        self._streamer: Optional[StreamingTranscriber] = None  # Nur während einer Aufnahme mit Live-Transkription
+        self._streaming_thread: Optional[threading.Thread] = None
+        self._streaming_wakeup = threading.Event()
+        self.recording_archive: Optional[RecordingArchive] = None
+        self.configure_recording_archive()
         self.gui = None  # Wird später von der GUI gesetzt
         if DEBUG_LOGGING:
             logger.debug("WordweberBackend initialisiert")
 
+    @handle_exceptions
+    def configure_recording_spill(self) -> None:
+        """Übernimmt die Auslagerungsgrenze aus den Einstellungen für die Aufnahmepuffer."""
+        spill_mb = int(self.settings_manager.get_setting("recording_spill_mb", DEFAULT_RECORDING_SPILL_MB))
+        self.spill_bytes = spill_mb * 1024 * 1024 if spill_mb > 0 else None
+        self.state.audio_data.spill_bytes = self.spill_bytes
+        self.state.resampled_audio.spill_bytes = self.spill_bytes
+
+    @handle_exceptions
+    def configure_recording_archive(self) -> None:
+        """Öffnet oder schließt das Aufnahmearchiv entsprechend den Einstellungen."""
+        if self.recording_archive is not None:
+            # Der Schreib-Thread muss fertig sein, bevor ein neues Archiv denselben Index liest und umschreibt
+            if not self.recording_archive.wait_closed():
+                logger.warning("Aufnahmearchiv wurde nicht rechtzeitig geschlossen")
+            self.recording_archive = None
+        if not self.settings_manager.get_setting("archive_recordings", DEFAULT_ARCHIVE_RECORDINGS):
+            return
+        self.recording_archive = RecordingArchive(
+            ARCHIVE_DIR,
+            max_mb=float(self.settings_manager.get_setting("archive_max_mb", DEFAULT_ARCHIVE_MAX_MB)),
+            max_days=float(self.settings_manager.get_setting("archive_max_days", DEFAULT_ARCHIVE_MAX_DAYS)),
+            file_format=self.settings_manager.get_setting("archive_format", DEFAULT_ARCHIVE_FORMAT)
+        )
+        logger.info(f"Aufnahmearchiv aktiv: {ARCHIVE_DIR}")
+
+    def _archive_utterance(self, audio: np.ndarray, text: str, language: str, source: str) -> None:
+        """
+        Übergibt eine transkribierte Äußerung an das Aufnahmearchiv, sofern es aktiv ist.
+
+        Im Incognito-Modus wird nur die Aufnahme ohne Transkript archiviert.
+
+        :param audio: Die transkribierte Aufnahme mit Ziel-Abtastrate
+        :param text: Das Transkript
+        :param language: Die Sprache der Transkription
+        :param source: Herkunft der Aufnahme ("push_to_talk" oder "continuous")
+        """
+        if self.recording_archive is None:
+            return
+        metadata = {"model": self.transcriber.model_name, "language": language, "source": source}
+        if not self.settings_manager.get_setting("incognito_mode", DEFAULT_INCOGNITO_MODE):
+            metadata["transcript"] = text
+        self.recording_archive.add(audio, metadata)
+
     @handle_exceptions
     def set_gui(self, gui):
         """
@@ -80,34 +172,179 @@ class WordweberBackend:
         self.gui = gui
 
     @handle_exceptions
-    def start_recording(self) -> None:
-        """Startet die Audioaufnahme."""
-        if not self.audio_processor.check_device_availability():
+    def start_recording(self, language: Optional[str] = None) -> bool:
+        """
+        Startet die Audioaufnahme.
+
+        :param language: Die Sprache für die Live-Transkription (standardmäßig die aktuelle Sprache)
+        :return: True, wenn die Aufnahme gestartet wurde
+        """
+        # Bei offenem Stream ist das Gerät nachweislich verfügbar, die Abfrage entfällt
+        if not self.audio_processor.warm_stream_active and not self.audio_processor.check_device_availability():
             logger.error("Audiogerät nicht verfügbar. Aufnahme kann nicht gestartet werden.")
             if self.gui:
                 self.gui.main_window.update_status_bar(status="Audiogerät nicht verfügbar", status_color="red")
-            return
+            return False
 
+        if language:
+            self.state.language = language
         self.state.recording = True
-        self.state.audio_data = []
-        threading.Thread(target=self._record_audio, daemon=True).start()
+        self.state.audio_consumed = False
+        self._record_thread = threading.Thread(target=self._record_audio, daemon=True)
+        self._record_thread.start()
+        self._start_streaming()
         if DEBUG_LOGGING:
             logger.debug("Audioaufnahme gestartet")
+        return True
+
+    @handle_exceptions
+    def _wait_for_recorder(self) -> None:
+        """
+        Wartet, bis der Aufnahme-Thread die letzten Samples übernommen hat.
+
+        Ohne diese Übergabe würden die Aufnahmedaten verarbeitet, während der
+        Aufnahme-Thread noch Chunks anhängt.
+        """
+        if self._record_thread and self._record_thread is not threading.current_thread():
+            self._record_thread.join(timeout=RECORDER_JOIN_TIMEOUT)
+            if self._record_thread.is_alive():
+                logger.warning("Aufnahme-Thread wurde nicht rechtzeitig beendet")
+        self._record_thread = None
 
     @handle_exceptions
     def stop_recording(self) -> None:
         """Stoppt die Audioaufnahme und verarbeitet die aufgenommenen Daten."""
         self.state.recording = False
-        if self.model_loaded.is_set():
-            self.process_and_transcribe(self.state.language)
-        else:
-            audio_np = np.frombuffer(b''.join(self.state.audio_data), dtype=np.int16).astype(np.float32) / 32768.0
-            audio_resampled = self.audio_processor.resample_audio(audio_np)
-            self.pending_audio.append(audio_resampled)
+        self._streaming_wakeup.set()
+        self._wait_for_recorder()
+        # Bei geladenem Modell stößt die GUI die Transkription über process_and_transcribe an
+        if not self.model_loaded.is_set():
+            audio_resampled = self._take_current_clip()
+            if audio_resampled is not None:
+                # Kopie, da der Puffer von der nächsten Aufnahme wiederverwendet wird; über der Grenze auf den Datenträger
+                pending_ram = sum(clip.nbytes for clip in self.pending_audio if not isinstance(clip, np.memmap))
+                budget = None if self.spill_bytes is None else max(0, self.spill_bytes - pending_ram)
+                self.pending_audio.append(spill_copy(audio_resampled, budget))
             logger.info("Aufnahme gespeichert. Warte auf Modell-Bereitschaft.")
             if self.gui:
                 self.gui.main_window.update_status_bar(status="Aufnahme gespeichert. Warte auf Modell-Bereitschaft.", status_color="yellow")
 
+    @handle_exceptions
+    def abort_recording(self) -> None:
+        """Bricht die Audioaufnahme ab; die Aufnahme wird verworfen und nicht transkribiert."""
+        self.state.recording = False
+        self._wait_for_recorder()
+        self._stop_streaming()
+        self.state.audio_consumed = True
+        logger.info("Aufnahme abgebrochen")
+
+    @handle_exceptions
+    def start_continuous(self, language: str) -> bool:
+        """
+        Startet das Dauerdiktat.
+
+        Das Mikrofon bleibt geöffnet; der StreamingSegmenter zerlegt die Aufnahme in Äußerungen,
+        die nacheinander von einem Transkriptions-Thread verarbeitet werden, während die
+        Aufnahme weiterläuft.
+
+        :param language: Die Sprache für die Transkription
+        :return: True, wenn die Aufnahme gestartet wurde
+        """
+        if not self.audio_processor.warm_stream_active and not self.audio_processor.check_device_availability():
+            logger.error("Audiogerät nicht verfügbar. Dauerdiktat kann nicht gestartet werden.")
+            return False
+
+        self.state.language = language
+        self._ensure_segment_worker()
+        detector = VoiceActivityDetector(
+            sample_rate=TARGET_RATE,
+            padding_ms=int(self.settings_manager.get_setting("vad_padding_ms", DEFAULT_VAD_PADDING_MS)),
+            min_speech_ms=int(self.settings_manager.get_setting("vad_min_speech_ms", DEFAULT_VAD_MIN_SPEECH_MS)),
+            model=self.vad_model
+        )
+        end_silence_ms = int(self.settings_manager.get_setting("segment_end_silence_ms", DEFAULT_SEGMENT_END_SILENCE_MS))
+        segmenter = StreamingSegmenter(self.segment_queue.put, detector, end_silence_ms=end_silence_ms)
+        if self.settings_manager.get_setting("keyword_activation", DEFAULT_KEYWORD_ACTIVATION):
+            if not self.keyword_spotter.templates:
+                logger.error("Kein Schlüsselwort eingelernt. Dauerdiktat mit Schlüsselwort kann nicht gestartet werden.")
+                return False
+            self.keyword_spotter.threshold = float(self.settings_manager.get_setting("keyword_threshold", DEFAULT_KEYWORD_THRESHOLD))
+            self.keyword_spotter.cpu_budget = float(self.settings_manager.get_setting("keyword_cpu_budget", DEFAULT_KEYWORD_CPU_BUDGET))
+            self.keyword_spotter.reset()
+            self.keyword_spotter.reset_stats()
+            listen_seconds = float(self.settings_manager.get_setting("keyword_listen_seconds", DEFAULT_KEYWORD_LISTEN_SECONDS))
+            segmenter = KeywordGate(self.keyword_spotter, segmenter, listen_seconds, self.on_keyword_detected)
+        self.state.segmenter = segmenter
+        self.state.audio_consumed = True  # Segmente werden über die Warteschlange verarbeitet
+        self.state.recording = True
+        self._record_thread = threading.Thread(target=self._record_audio, daemon=True)
+        self._record_thread.start()
+        logger.info("Dauerdiktat gestartet")
+        return True
+
+    @handle_exceptions
+    def stop_continuous(self) -> None:
+        """Beendet das Dauerdiktat; das letzte Segment wird noch transkribiert."""
+        self.state.recording = False
+        self._wait_for_recorder()
+        if isinstance(self.state.segmenter, KeywordGate):
+            logger.info(f"Keyword-Spotter: {self.keyword_spotter.stats()}")
+        self.state.segmenter = None
+        logger.info("Dauerdiktat beendet")
+
+    @handle_exceptions
+    def enroll_keyword_from_last_recording(self) -> bool:
+        """
+        Lernt die letzte Push-to-Talk-Aufnahme als weitere Vorlage für das Schlüsselwort ein.
+
+        Die Vorlagen werden als Merkmale (ohne Audio) in KEYWORD_TEMPLATE_FILE gespeichert.
+
+        :return: True, wenn die Aufnahme übernommen wurde
+        """
+        if self.state.recording or len(self.state.resampled_audio) == 0:
+            logger.warning("Keine abgeschlossene Aufnahme zum Einlernen des Schlüsselworts vorhanden")
+            return False
+        if not self.keyword_spotter.add_template(self.state.resampled_audio.view()):
+            return False
+        self.keyword_spotter.save(KEYWORD_TEMPLATE_FILE)
+        return True
+
+    @handle_exceptions
+    def clear_keyword_templates(self) -> None:
+        """Löscht alle eingelernten Vorlagen des Schlüsselworts."""
+        self.keyword_spotter.clear_templates()
+        self.keyword_spotter.save(KEYWORD_TEMPLATE_FILE)
+        logger.info("Schlüsselwort-Vorlagen gelöscht")
+
+    def _ensure_segment_worker(self) -> None:
+        """Startet den Transkriptions-Thread für Segmente, falls er noch nicht läuft."""
+        if self._segment_worker is None or not self._segment_worker.is_alive():
+            self._segment_worker = threading.Thread(target=self._segment_worker_loop, daemon=True)
+            self._segment_worker.start()
+
+    def _segment_worker_loop(self) -> None:
+        """
+        Transkribiert Segmente in der Reihenfolge ihrer Aufnahme.
+
+        Ein einzelner Thread stellt sicher, dass die Texte in der richtigen Reihenfolge
+        ausgegeben werden, während die Aufnahme der nächsten Äußerung bereits läuft.
+        """
+        while True:
+            segment = self.segment_queue.get()
+            try:
+                self.model_loaded.wait()
+                start_time = time.time()
+                segment = self._apply_noise_suppression(segment)
+                with self._transcriber_lease() as transcriber:
+                    text = transcriber.transcribe(segment, self.state.language)
+                self._archive_utterance(segment, text, self.state.language, "continuous")
+                if self.on_segment_transcribed:
+                    self.on_segment_transcribed(text, time.time() - start_time)
+            except Exception as e:
+                logger.error(f"Fehler bei der Transkription eines Segments: {e}")
+            finally:
+                self.segment_queue.task_done()
+
     @handle_exceptions
     def _record_audio(self) -> None:
         """
@@ -118,6 +355,143 @@ class WordweberBackend:
         if DEBUG_LOGGING: # eigentlich kein zusätzliches Logging hier, das geschicht schon in audio_processor.record_audio (DRY-Prinzip)
             logger.debug("Audioaufnahme in wortweber_backend.py abgeschlossen")
 
+    @handle_exceptions
+    def _take_current_clip(self) -> Optional[np.ndarray]:
+        """
+        Übernimmt die aktuelle Aufnahme genau einmal und gibt sie mit Ziel-Abtastrate zurück.
+
+        In der Regel wurde die Aufnahme bereits während der Aufnahme chunkweise resampled.
+        Nur wenn keine resampelten Daten vorliegen, wird die gesamte Aufnahme umgewandelt.
+        Das Ergebnis kann auf wiederverwendeten Speicher zeigen und ist nur bis zur
+        nächsten Aufnahme gültig.
+
+        :return: Die resampelte Aufnahme oder None, wenn keine unverarbeitete Aufnahme vorliegt
+        """
+        if self.state.audio_consumed or len(self.state.audio_data) == 0:
+            return None
+        self.state.audio_consumed = True
+        if self.audio_processor.level_meter.is_silent():
+            # Stummes oder falsches Gerät: weder VAD noch Modell müssen die Aufnahme ansehen
+            logger.warning("Kein Eingangssignal in der Aufnahme. Bitte Audiogerät prüfen.")
+            return None
+        if len(self.state.resampled_audio) > 0:
+            audio_resampled = self.state.resampled_audio.view()
+        else:
+            audio_resampled = self.audio_processor.resample_audio(self.state.audio_data.as_float32())
+        return self._apply_vad(self._apply_noise_suppression(audio_resampled))
+
+    def _start_streaming(self) -> None:
+        """Startet die Live-Transkription der laufenden Aufnahme, sofern aktiviert und das Modell geladen ist."""
+        if not self.settings_manager.get_setting("live_transcription", DEFAULT_LIVE_TRANSCRIPTION) or not self.model_loaded.is_set():
+            return
+        language = self.state.language
+        self._streamer = StreamingTranscriber(
+            lambda audio, prompt: self._transcribe_words(audio, language, prompt))
+        self._streaming_wakeup.clear()
+        self._streaming_thread = threading.Thread(target=self._streaming_loop, args=(self._streamer,), daemon=True)
+        self._streaming_thread.start()
+
+    def _streaming_loop(self, streamer: StreamingTranscriber) -> None:
+        """
+        Transkribiert den wachsenden Aufnahmepuffer in regelmäßigen Abständen und meldet Zwischenstände.
+
+        Läuft ein Durchlauf länger als das Intervall, folgt der nächste unmittelbar; das Modell wird nie
+        gleichzeitig von zwei Threads verwendet, da process_and_transcribe auf das Ende dieser Schleife wartet.
+        """
+        interval = int(self.settings_manager.get_setting("live_interval_ms", DEFAULT_LIVE_INTERVAL_MS)) / 1000
+        while self.state.recording:
+            self._streaming_wakeup.wait(interval)
+            if not self.state.recording:
+                break
+            try:
+                if streamer.update(self.state.resampled_audio.view().copy()) and self.on_partial_transcription:
+                    self.on_partial_transcription(streamer.committed_text, streamer.tentative_text)
+            except Exception as e:
+                logger.error(f"Fehler bei der Live-Transkription: {e}")
+                break
+
+    def _stop_streaming(self) -> Optional[StreamingTranscriber]:
+        """
+        Beendet die Live-Transkription und wartet auf einen laufenden Durchlauf.
+
+        :return: Der StreamingTranscriber der letzten Aufnahme oder None, wenn keine Live-Transkription lief
+        """
+        thread, self._streaming_thread = self._streaming_thread, None
+        if thread is not None:
+            self._streaming_wakeup.set()
+            thread.join()
+        streamer, self._streamer = self._streamer, None
+        return streamer
+
+    @handle_exceptions
+    def _finish_streaming(self, streamer: StreamingTranscriber) -> Optional[Tuple[np.ndarray, str]]:
+        """
+        Übernimmt die aktuelle Aufnahme und dekodiert nur den noch nicht bestätigten Rest.
+
+        Die Zeitstempel der bestätigten Wörter beziehen sich auf die ungekürzte Aufnahme; die VAD
+        entscheidet daher nur, ob die Aufnahme überhaupt Sprache enthält.
+
+        :param streamer: Der StreamingTranscriber der Aufnahme
+        :return: Tupel aus Aufnahme und vollständigem Text oder None, wenn nichts zu transkribieren ist
+        """
+        if self.state.audio_consumed or len(self.state.resampled_audio) == 0:
+            return None
+        self.state.audio_consumed = True
+        if self.audio_processor.level_meter.is_silent():
+            logger.warning("Kein Eingangssignal in der Aufnahme. Bitte Audiogerät prüfen.")
+            return None
+        audio_resampled = self.state.resampled_audio.view()
+        if not streamer.agreement.committed and self._apply_vad(audio_resampled) is None:
+            return None
+        text = streamer.finish(audio_resampled)
+        logger.info(f"Live-Transkription: {streamer.updates} Zwischenstände, "
+                    f"beim Loslassen {streamer.final_seconds:.1f} von {len(audio_resampled) / TARGET_RATE:.1f} s dekodiert")
+        return audio_resampled, text
+
+    @handle_exceptions
+    def _apply_noise_suppression(self, audio_resampled: np.ndarray) -> np.ndarray:
+        """
+        Entfernt gleichmäßige Hintergrundgeräusche per spektralem Gating, sofern aktiviert.
+
+        Das Rauschprofil wird aus der Stille vor dem ersten Wort geschätzt; gelingt das nicht,
+        wird das Profil der vorherigen Aufnahme verwendet.
+
+        :param audio_resampled: Die Aufnahme mit Ziel-Abtastrate
+        :return: Die entrauschte Aufnahme oder die unveränderte Aufnahme, wenn die Stufe deaktiviert ist
+        """
+        if not self.settings_manager.get_setting("noise_suppression", DEFAULT_NOISE_SUPPRESSION):
+            return audio_resampled
+        profile = self.noise_gate.estimate_leading_profile(audio_resampled) or self._noise_profile
+        if profile is None:
+            logger.debug("Kein Rauschprofil verfügbar, Rauschunterdrückung übersprungen")
+            return audio_resampled
+        self._noise_profile = profile
+        reduction_db = float(self.settings_manager.get_setting("noise_reduction_db", DEFAULT_NOISE_REDUCTION_DB))
+        return self.noise_gate.process(audio_resampled, profile, reduction_db)
+
+    @handle_exceptions
+    def _apply_vad(self, audio_resampled: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Entfernt Stille am Anfang und Ende einer Aufnahme und verwirft Aufnahmen ohne Sprache.
+
+        :param audio_resampled: Die Aufnahme mit Ziel-Abtastrate
+        :return: Der Sprachbereich der Aufnahme oder None, wenn keine Sprache erkannt wurde
+        """
+        if not self.settings_manager.get_setting("vad_enabled", DEFAULT_VAD_ENABLED):
+            return audio_resampled
+        vad = VoiceActivityDetector(
+            sample_rate=TARGET_RATE,
+            padding_ms=int(self.settings_manager.get_setting("vad_padding_ms", DEFAULT_VAD_PADDING_MS)),
+            min_speech_ms=int(self.settings_manager.get_setting("vad_min_speech_ms", DEFAULT_VAD_MIN_SPEECH_MS)),
+            model=self.vad_model
+        )
+        trimmed = vad.trim(audio_resampled)
+        if trimmed is None:
+            logger.info("Keine Sprache erkannt. Aufnahme wird nicht transkribiert.")
+            return None
+        logger.debug(f"VAD: {len(audio_resampled)} -> {len(trimmed)} Samples")
+        return trimmed
+
     @handle_exceptions
     def process_and_transcribe(self, language: str) -> str:
         """
@@ -132,13 +506,26 @@ class WordweberBackend:
                 self.gui.main_window.update_status_bar(status="Modell nicht geladen", status_color="red")
             raise RuntimeError("Modell nicht geladen. Bitte warten Sie, bis das Modell vollständig geladen ist.")
 
-        audio_to_process = self.pending_audio + [np.frombuffer(b''.join(self.state.audio_data), dtype=np.int16).astype(np.float32) / 32768.0]
+        # Wartende Aufnahmen liegen bereits resampled vor und werden nicht erneut konvertiert
+        streamer = self._stop_streaming()
+        audio_to_process = self.pending_audio
         self.pending_audio = []
+        current_clip = self._take_current_clip() if streamer is None else None
+        if current_clip is not None:
+            audio_to_process.append(current_clip)
 
         transcribed_text = ""
-        for audio_np in audio_to_process:
-            audio_resampled = self.audio_processor.resample_audio(audio_np)
-            transcribed_text += self.transcriber.transcribe(audio_resampled, language)
+        for audio_resampled in audio_to_process:
+            with self._transcriber_lease() as transcriber:
+                text = transcriber.transcribe(audio_resampled, language)
+            self._archive_utterance(audio_resampled, text, language, "push_to_talk")
+            transcribed_text += text
+        if streamer is not None:
+            live_result = self._finish_streaming(streamer)
+            if live_result is not None:
+                audio_resampled, text = live_result
+                self._archive_utterance(audio_resampled, text, language, "push_to_talk")
+                transcribed_text += text
 
         incognito_mode = self.settings_manager.get_setting("incognito_mode", DEFAULT_INCOGNITO_MODE)
         if not incognito_mode:
@@ -149,26 +536,210 @@ class WordweberBackend:
         return transcribed_text
 
     @handle_exceptions
-    def load_transcriber_model(self, model_name: str) -> None:
+    def load_audio_file(self, source: AudioInput, **reader_options) -> np.ndarray:
+        """
+        Liest eine Audiodatei und bereitet sie wie eine Mikrofonaufnahme auf.
+
+        Die Datei wird blockweise gelesen, mit dem eingestellten Verfahren auf die Ziel-Abtastrate
+        resampelt und durch eine eigene Signalaufbereitung geführt; die laufende Aufnahme wird
+        dadurch nicht beeinflusst.
+
+        :param source: Pfad oder binäres Dateiobjekt (WAV, FLAC oder Roh-PCM)
+        :param reader_options: file_format, sample_rate, channels und sample_format für Roh-PCM
+        :return: Die Samples mit Ziel-Abtastrate als float32
+        """
+        conditioner = AudioConditioner(TARGET_RATE)
+        self.audio_processor.configure_conditioner(conditioner)
+        conditioner.reset(keep_gain=False)
+        return read_audio(source, TARGET_RATE, self.audio_processor.get_resampler_engine(),
+                          conditioner=conditioner, spill_bytes=self.spill_bytes, **reader_options)
+
+    @handle_exceptions
+    def transcribe_file(self, source: AudioInput, language: Optional[str] = None, **reader_options) -> str:
+        """
+        Transkribiert eine Audiodatei, ohne das Mikrofon zu verwenden.
+
+        Die Datei durchläuft dieselbe Verarbeitung wie eine Aufnahme: Resampling, Signalaufbereitung,
+        Rauschunterdrückung und VAD.
+
+        :param source: Pfad oder binäres Dateiobjekt (WAV, FLAC oder Roh-PCM)
+        :param language: Die Sprache für die Transkription, standardmäßig die aktuelle Sprache
+        :param reader_options: file_format, sample_rate, channels und sample_format für Roh-PCM
+        :return: Der transkribierte Text (leer, wenn keine Sprache erkannt wurde)
+        """
+        if not self.model_loaded.is_set():
+            raise RuntimeError("Modell nicht geladen. Bitte warten Sie, bis das Modell vollständig geladen ist.")
+        start_time = time.time()
+        audio = self._apply_vad(self._apply_noise_suppression(self.load_audio_file(source, **reader_options)))
+        if audio is None:
+            return ""
+        with self._transcriber_lease() as transcriber:
+            text = transcriber.transcribe(audio, language or self.state.language)
+        logger.info(f"Audiodatei transkribiert ({len(audio) / TARGET_RATE:.1f} s Audio in {time.time() - start_time:.1f} s)")
+        return text
+
+    @contextlib.contextmanager
+    def _transcriber_lease(self) -> Iterator[Transcriber]:
+        """
+        Liefert den aktiven Transcriber und hält sein Modell bis zum Ende des Blocks geladen.
+
+        Ein gleichzeitiger Modellwechsel wirkt erst für die nächste Transkription; das bisherige Modell
+        wird freigegeben, sobald alle laufenden Transkriptionen abgeschlossen sind.
+        """
+        with self._transcriber_lock:
+            transcriber = self.transcriber
+            if not transcriber.acquire():
+                raise RuntimeError("Modell nicht geladen.")
+        try:
+            yield transcriber
+        finally:
+            transcriber.release()
+
+    def _transcribe_words(self, audio: np.ndarray, language: str, prompt: Optional[str]) -> List[Tuple[float, float, str]]:
+        """Worttranskription für die Live-Transkription mit dem jeweils aktiven Modell."""
+        with self._transcriber_lease() as transcriber:
+            return transcriber.transcribe_words(audio, language, prompt)
+
+    def _create_transcriber(self, key: str) -> Transcriber:
+        """
+        Erzeugt einen Transcriber, lädt sein Modell und wärmt es auf (Ladefunktion des Modell-Pools).
+
+        :param key: Pool-Schlüssel aus Modellname und Rechengenauigkeit (siehe model_key)
+        :return: Der Transcriber mit geladenem Modell
+        """
+        transcriber = Transcriber(*split_model_key(key))
+        transcriber.settings_manager = self.settings_manager
+        entry = profile_entry(self.calibration_profile, key)
+        if entry is not None:
+            transcriber.decode_overrides = {"beam_size": entry["beam_size"]}
+        transcriber.load_model()
+        transcriber.warm_up(self.state.language)
+        return transcriber
+
+    @handle_exceptions
+    def load_transcriber_model(self, model_name: str, precision: Optional[str] = None) -> None:
         """
-        Lädt das Transkriptionsmodell.
+        Lädt das Transkriptionsmodell oder wechselt zu einem bereits geladenen Modell aus dem Pool.
+
+        Das bisherige Modell transkribiert weiter, bis das neue geladen und aufgewärmt ist. Danach wird
+        unter einer Sperre umgeschaltet und überzählige Modelle werden aus dem Pool verdrängt; laufende
+        Transkriptionen beenden sie vorher noch.
+
+        Ein Wechsel der Rechengenauigkeit lädt das Modell ebenfalls im Hintergrund neu.
 
         :param model_name: Der Name des zu ladenden Modells
+        :param precision: Die Rechengenauigkeit (fp32, int8, bf16); ohne Angabe gilt "model_precision" aus den Einstellungen
         """
         try:
-            self.transcriber.load_model()
+            if precision is None:
+                precision = self.settings_manager.get_setting("model_precision", DEFAULT_MODEL_PRECISION)
+            key = model_key(model_name, precision)
+            self._requested_model = key
+            active = self._active_model_key() if self.model_loaded.is_set() else None
+            transcriber = self.model_pool.get(key, keep=active, trim=False)
+            with self._transcriber_lock:
+                if self._requested_model != key:
+                    # Während des Ladens wurde ein anderes Modell gewählt; dessen Umschaltung gilt
+                    logger.info(f"Modell '{model_name}' geladen, aktiv bleibt '{self.transcriber.model_name}'")
+                    return
+                self.transcriber = transcriber
             self.model_loaded.set()
-            if self.pending_audio:
-                self.process_and_transcribe(self.state.language)
-            logger.info(f"Transkriptionsmodell '{model_name}' erfolgreich geladen")
+            self._apply_calibrated_threads(key)
+            self.model_pool.trim(keep=key)
+            # Mit GUI übernimmt diese die wartenden Aufnahmen, damit der Text nicht verloren geht
+            if self.pending_audio and self.gui is None:
+                text = self.process_and_transcribe(self.state.language)
+                if self.on_transcription_complete:
+                    self.on_transcription_complete(text)
+            logger.info(f"Transkriptionsmodell '{key}' erfolgreich geladen")
             if self.gui:
                 self.gui.main_window.update_status_bar(model=f"{model_name} - Geladen", status="Modell geladen", status_color="green")
         except Exception as e:
             logger.error(f"Fehler beim Laden des Modells: {e}")
-            self.model_loaded.clear()
+            if self.transcriber.model is None:
+                self.model_loaded.clear()  # Sonst transkribiert das bisherige Modell weiter
             if self.gui:
                 self.gui.main_window.update_status_bar(status=f"Fehler beim Laden des Modells: {e}", status_color="red")
 
+    @handle_exceptions
+    def configure_model_pool(self) -> None:
+        """Übernimmt das Speicherbudget des Modell-Pools aus den Einstellungen."""
+        self.model_pool.set_budget(int(self.settings_manager.get_setting("model_pool_mb", DEFAULT_MODEL_POOL_MB)),
+                                   keep=self._active_model_key())
+
+    @handle_exceptions
+    def load_calibration_profile(self) -> None:
+        """Lädt das Kalibrierungsprofil und übernimmt seine Thread-Zahl, sofern "apply_calibration" aktiv ist."""
+        self.calibration_profile = None
+        if not self.settings_manager.get_setting("apply_calibration", DEFAULT_APPLY_CALIBRATION):
+            return
+        self.calibration_profile = load_profile(CALIBRATION_PROFILE_FILE)
+        if self.calibration_profile is not None:
+            set_threads(self.calibration_profile["threads"])
+            logger.info(f"Kalibrierungsprofil vom {self.calibration_profile['created']} angewendet: "
+                        f"{self.calibration_profile['selected']}, {self.calibration_profile['threads']} Threads")
+
+    def _apply_calibrated_threads(self, key: str) -> None:
+        """Setzt die für ein Modell kalibrierte Thread-Zahl."""
+        entry = profile_entry(self.calibration_profile, key)
+        if entry is not None:
+            set_threads(entry["threads"])
+
+    @handle_exceptions
+    def calibration_selection(self) -> Optional[Tuple[str, str, str]]:
+        """
+        Liefert das im Kalibrierungsprofil gewählte Modell, sofern es noch nicht übernommen wurde.
+
+        Ein neues Profil wird einmalig übernommen; eine spätere manuelle Auswahl bleibt erhalten, bis erneut
+        kalibriert wird. Übernommen wird es von der GUI, die "model", "model_precision" und
+        "calibration_applied" in beide SettingsManager schreibt.
+
+        :return: Modellname, Rechengenauigkeit und Erstellungszeitpunkt des Profils oder None
+        """
+        profile = self.calibration_profile
+        if not profile or not profile.get("selected"):
+            return None
+        if self.settings_manager.get_setting("calibration_applied") == profile["created"]:
+            return None
+        model_name, precision = split_model_key(profile["selected"])
+        return model_name, precision, profile["created"]
+
+    @handle_exceptions
+    def run_calibration(self, target_latency: Optional[float] = None, audio_seconds: Optional[float] = None,
+                        progress: Optional[Callable[[str], None]] = None) -> dict:
+        """
+        Kalibriert Modell, Genauigkeit, Thread-Zahl und Beam-Größe auf der Testaufnahme und speichert das Profil.
+
+        Die Modelle werden nacheinander außerhalb des Modell-Pools geladen; das aktive Modell transkribiert
+        währenddessen weiter. Danach wird das gewählte Modell in die Einstellungen übernommen.
+
+        :param target_latency: Latenzziel in Sekunden (Standard: Einstellung "latency_target_seconds")
+        :param audio_seconds: Sprechdauer, für die das Ziel gilt (Standard: "latency_target_audio_seconds")
+        :param progress: Optionaler Rückruf mit Statusmeldungen
+        :return: Das gespeicherte Profil
+        """
+        if target_latency is None:
+            target_latency = float(self.settings_manager.get_setting("latency_target_seconds", DEFAULT_LATENCY_TARGET_SECONDS))
+        if audio_seconds is None:
+            audio_seconds = float(self.settings_manager.get_setting("latency_target_audio_seconds", DEFAULT_LATENCY_TARGET_AUDIO_SECONDS))
+
+        def create(model_name: str, precision: str) -> Transcriber:
+            transcriber = Transcriber(model_name, precision)
+            transcriber.load_model()
+            transcriber.warm_up(self.state.language)
+            return transcriber
+
+        sample = self.load_audio_file(CALIBRATION_SAMPLE_FILE)
+        profile = Calibrator(create).run(sample, CALIBRATION_SAMPLE_TEXT, "de", target_latency, audio_seconds,
+                                         progress=progress)
+        save_profile(profile, CALIBRATION_PROFILE_FILE)
+        self.calibration_profile = profile
+        return profile
+
+    def _active_model_key(self) -> str:
+        """Pool-Schlüssel des aktiven Transcribers."""
+        return model_key(self.transcriber.model_name, self.transcriber.precision)
+
     @handle_exceptions
     def list_audio_devices(self) -> None:
         """Listet alle verfügbaren Audiogeräte auf."""
@@ -209,6 +780,15 @@ class WordweberBackend:
                 self.gui.main_window.update_status_bar(status="Fehler beim Aktualisieren des Audiogeräts", status_color="red")
             return False
 
+    @handle_exceptions
+    def get_capture_metrics(self) -> dict:
+        """
+        Gibt die Aufnahme-Metriken der laufenden bzw. letzten Aufnahme zurück.
+
+        :return: Dictionary mit Überläufen, verworfenen Samples, verspäteten/kurzen Reads und Jitter
+        """
+        return self.audio_processor.get_capture_metrics()
+
     @handle_exceptions
     def get_current_audio_device(self):
         """
@@ -265,6 +845,67 @@ class WordweberBackend:
 #    Funktionen zum Auflisten, Überprüfen und Aktualisieren von Audiogeräten
 #    bieten Flexibilität bei der Hardwarekonfiguration.
 
+# 9. Dauerdiktat:
+#    Im Dauerdiktat liefert der Aufnahme-Thread die resampelten Chunks an den StreamingSegmenter.
+#    Abgeschlossene Äußerungen landen in `segment_queue` und werden von genau einem Thread
+#    transkribiert, sodass Segment N transkribiert wird, während Segment N+1 aufgenommen wird,
+#    und die Texte dennoch in Aufnahmereihenfolge über `on_segment_transcribed` ausgegeben werden.
+
+# 10. Lange Aufnahmen:
+#    Die Aufnahmepuffer werden ab "recording_spill_mb" auf eine temporäre Datei ausgelagert, wartende
+#    Aufnahmen per `spill_copy`, sobald sie zusammen die Grenze überschreiten. Resampling, VAD und
+#    Transkriber erhalten die Aufnahme als memmap; Whisper lädt sie erst bei der Merkmalsberechnung.
+
+# 11. Rauschunterdrückung:
+#    Mit "noise_suppression" durchläuft jede Aufnahme bzw. jedes Segment vor VAD und Transkription das
+#    SpectralGate. Die Reihenfolge ist wichtig: die Stille am Anfang liefert das Rauschprofil und wäre
+#    nach der VAD-Kürzung nicht mehr vorhanden.
+
+# 12. Audiodateien:
+#    `transcribe_file` nimmt WAV-, FLAC- und Roh-PCM-Dateien oder Dateiobjekte an. Der AudioFileReader liest
+#    sie blockweise (Dateien per memmap), der StreamingResampler und eine eigene Signalaufbereitung wandeln
+#    sie wie eine Aufnahme um. Danach folgen Rauschunterdrückung, VAD und Transkription; das Mikrofon und
+#    der Aufnahmezustand bleiben unberührt.
+
+# 13. Aufnahmearchiv:
+#    Mit "archive_recordings" übergibt das Backend jede transkribierte Äußerung samt Modell, Sprache und
+#    Transkript an das RecordingArchive. Archiviert wird das Audio, das Whisper erhalten hat (16 kHz, nach
+#    Aufbereitung und VAD); Kodierung, Index und Aufbewahrungsregeln laufen im Schreib-Thread des Archivs.
+
+# 14. Aktivierung per Schlüsselwort:
+#    Mit "keyword_activation" ersetzt ein KeywordGate den StreamingSegmenter im Aufnahmezustand. Der
+#    KeywordSpotter vergleicht den resampelten Stream mit den eingelernten Vorlagen; erst nach einer Erkennung
+#    gelangen Segmente in `segment_queue` und damit zu Whisper. Eingelernt wird die letzte Push-to-Talk-
+#    Aufnahme; die Rechenzeit des Spotters ist über "keyword_cpu_budget" begrenzt und wird beim Beenden
+#    protokolliert.
+
+# 15. Live-Transkription:
+#    Mit "live_transcription" transkribiert ein eigener Thread während einer Push-to-Talk-Aufnahme alle
+#    "live_interval_ms" den wachsenden Puffer und meldet bestätigten und vorläufigen Text über
+#    `on_partial_transcription`. process_and_transcribe wartet auf den laufenden Durchlauf und dekodiert nur
+#    noch den Rest nach dem letzten bestätigten Wort (siehe StreamingTranscriber). Rauschunterdrückung und
+#    VAD-Kürzung entfallen in diesem Modus, damit die Zeitstempel zur Aufnahme passen.
+
+# 16. Modell-Pool:
+#    load_transcriber_model verwendet den übergebenen Modellnamen und holt den Transcriber aus dem ModelPool.
+#    Bereits geladene Modelle stehen beim Wechsel sofort bereit; reicht das Budget "model_pool_mb" nicht, wird
+#    das am längsten nicht verwendete Modell freigegeben.
+
+# 17. Modellwechsel im laufenden Betrieb:
+#    Transkriptionen holen den aktiven Transcriber über _transcriber_lease und melden sich bei ihm an
+#    (Transcriber.acquire). load_transcriber_model lädt und wärmt das neue Modell, während das bisherige
+#    weiter transkribiert, und schaltet dann unter _transcriber_lock um. Erst danach verdrängt der Pool das
+#    alte Modell; freigegeben wird es nach Abschluss der letzten angemeldeten Transkription. Ein Wechsel
+#    verzögert oder verliert daher keine Äußerung. Wird während des Ladens erneut gewechselt, gilt die
+#    zuletzt gewählte Einstellung.
+
+# 18. Kalibrierung:
+#    run_calibration (oder python -m src.backend.calibration) misst Modelle, Genauigkeiten, Thread-Zahlen und
+#    Beam-Größen auf der Testaufnahme und speichert das Profil in CALIBRATION_PROFILE_FILE. Beim Start setzt das
+#    Backend die Thread-Zahl des Profils, beim Laden eines Modells dessen kalibrierte Beam-Größe und Thread-Zahl.
+#    Das gewählte Modell übernimmt die GUI einmal je Profil in ihre und die Backend-Einstellungen
+#    (calibration_selection, WordweberGUI.apply_calibration_selection).
+
 # Diese Implementierung bietet eine robuste und erweiterbare Grundlage für die
 # Backend-Funktionalität der Wortweber-Anwendung, mit besonderem Augenmerk auf
 # Fehlertoleranz, Benutzerfreundlichkeit und Datenschutz.
@@ -14,18 +14,22 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextlib
+import threading
+import time
 import torch
 import numpy as np
 import whisper
 import traceback
 from whisper.audio import SAMPLE_RATE, N_FRAMES, HOP_LENGTH
-from typing import Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from src.utils.error_handling import handle_exceptions, logger
-from src.config import DEFAULT_INCOGNITO_MODE
+from src.config import DEFAULT_INCOGNITO_MODE, DEFAULT_MODEL_PRECISION
+from src.backend.quantization import load_int8_model, cpu_supports_bf16
 
 class Transcriber:
     @handle_exceptions
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, precision: str = DEFAULT_MODEL_PRECISION):
         """
         Initialisiert den Transcriber.
 
@@ -35,15 +39,20 @@ class Transcriber:
 
         Args:
             model_name (str): Name des zu ladenden Whisper-Modells (z.B. "tiny", "base", "small", "medium", "large", "large-v3")
+            precision (str): Rechengenauigkeit auf der CPU ("fp32", "int8" oder "bf16")
 
         Attributes:
             model: Das geladene Whisper-Modell
             model_name (str): Name des ausgewählten Modells
+            precision (str): Gewählte Rechengenauigkeit
             device (str): Verwendete Hardware ("cuda" für GPU, "cpu" für CPU)
             settings_manager: Referenz zum SettingsManager (wird später von der GUI gesetzt)
         """
         self.model = None
         self.model_name = model_name
+        self.precision = precision
+        self._autocast_bf16 = False  # Wird beim Laden gesetzt, wenn bf16 gewählt ist und die CPU es unterstützt
+        self.decode_overrides: Dict[str, Any] = {}  # Abweichende Transkriptionsoptionen, z.B. aus der Kalibrierung
         
         # Versuche CUDA zu nutzen, falle auf CPU zurück wenn Probleme auftreten
         try:
@@ -56,6 +65,9 @@ class Transcriber:
             self.device = "cpu"
             
         self.settings_manager = None  # Wird später von der GUI gesetzt
+        self._jobs = 0  # Laufende Transkriptionen (siehe acquire/release)
+        self._release_pending = False
+        self._jobs_lock = threading.Lock()
         logger.debug(f"Transcriber initialisiert mit Modell {model_name} auf Gerät {self.device}")
 
     @handle_exceptions
@@ -69,9 +81,17 @@ class Transcriber:
         Raises:
             Exception: Wenn das Laden des Modells fehlschlägt, z.B. wegen Speichermangel oder ungültigem Modellnamen
         """
-        logger.info(f"Lade Spracherkennungsmodell: {self.model_name}")
+        logger.info(f"Lade Spracherkennungsmodell: {self.model_name} ({self.precision})")
         try:
-            self.model = whisper.load_model(self.model_name).to(self.device)
+            if self.precision != "fp32" and self.device != "cpu":
+                logger.warning(f"Genauigkeit {self.precision} gilt nur für die CPU; auf {self.device} wird das Standardmodell verwendet")
+            if self.precision == "int8" and self.device == "cpu":
+                self.model = load_int8_model(self.model_name)
+            else:
+                self.model = whisper.load_model(self.model_name).to(self.device)
+            self._autocast_bf16 = self.precision == "bf16" and self.device == "cpu" and cpu_supports_bf16()
+            if self.precision == "bf16" and self.device == "cpu" and not self._autocast_bf16:
+                logger.warning("Die CPU unterstützt kein bf16; es wird mit fp32 gerechnet")
             logger.info(f"Spracherkennungsmodell {self.model_name} geladen auf {self.device}.")
         except Exception as e:
             logger.error(f"Fehler beim Laden des Modells: {e}")
@@ -90,7 +110,7 @@ class Transcriber:
         4. Einfachere Wartung
 
         Die Transkriptionsparameter sind für optimale Qualität und Geschwindigkeit eingestellt:
-        - beam_size=5: Anzahl der parallel betrachteten Transkriptionshypothesen
+        - beam_size=5: Anzahl der parallel betrachteten Transkriptionshypothesen (per Kalibrierung anpassbar)
         - best_of=5/1: Anzahl der generierten Kandidaten (5 für GPU, 1 für CPU)
         - temperature=0.0: Deterministische Ausgabe
         - compression_ratio_threshold=2.4: Verhindert zu lange Ausgaben
@@ -114,18 +134,8 @@ class Transcriber:
             raise RuntimeError("Modell nicht geladen.")
 
         try:
-            # Transkriptionsoptionen
-            result = self.model.transcribe(
-                audio,
-                language=language,
-                task="transcribe",
-                beam_size=5,
-                best_of=5 if self.device == "cuda" else 1,
-                temperature=0.0,
-                compression_ratio_threshold=2.4,
-                logprob_threshold=-1.0,
-                no_speech_threshold=0.6
-            )
+            with self._inference_context():
+                result = self.model.transcribe(audio, **self._decode_options(language))
             
             # Extrahiere den transkribierten Text
             transcribed_text = result["text"].strip()
@@ -148,6 +158,133 @@ class Transcriber:
             logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
 
+    def _inference_context(self):
+        """
+        Liefert den Kontext für Modellaufrufe: bf16-Autocast, sofern aktiv, sonst keinen.
+
+        Returns:
+            Ein Kontextmanager für den with-Block um model.transcribe
+        """
+        if self._autocast_bf16:
+            return torch.autocast("cpu", dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    def _decode_options(self, language: str) -> Dict[str, Any]:
+        """
+        Liefert die Transkriptionsoptionen, die für alle Aufrufe von model.transcribe gelten.
+
+        Einträge aus decode_overrides (z.B. die kalibrierte Beam-Größe) ersetzen die Standardwerte.
+
+        Args:
+            language (str): Sprache der Audiodaten
+
+        Returns:
+            Dict[str, Any]: Schlüsselwortargumente für model.transcribe
+        """
+        options = {
+            "language": language,
+            "task": "transcribe",
+            "beam_size": 5,
+            "best_of": 5 if self.device == "cuda" else 1,
+            "temperature": 0.0,
+            "compression_ratio_threshold": 2.4,
+            "logprob_threshold": -1.0,
+            "no_speech_threshold": 0.6,
+        }
+        options.update(self.decode_overrides)
+        return options
+
+    @handle_exceptions
+    def transcribe_words(self, audio: np.ndarray, language: str, prompt: Optional[str] = None) -> List[Tuple[float, float, str]]:
+        """
+        Transkribiert Audiodaten mit Zeitstempeln je Wort für die Live-Transkription.
+
+        Der bereits bestätigte Text wird als initial_prompt übergeben, damit Whisper nach dem
+        Kürzen des Audiofensters im Kontext bleibt. Die Zwischenergebnisse werden nur auf
+        Debug-Ebene und nur außerhalb des Incognito-Modus protokolliert.
+
+        Args:
+            audio (np.ndarray): Audiodaten (16 kHz, float32)
+            language (str): Sprache der Audiodaten
+            prompt (Optional[str]): Vorangehender Text als Kontext
+
+        Returns:
+            List[Tuple[float, float, str]]: (Beginn, Ende, Wort) mit Zeiten in Sekunden relativ zum Audioanfang;
+            die Wörter enthalten das führende Leerzeichen von Whisper
+        """
+        if self.model is None:
+            raise RuntimeError("Modell nicht geladen.")
+        with self._inference_context():
+            result = self.model.transcribe(audio, word_timestamps=True, initial_prompt=prompt,
+                                           condition_on_previous_text=False, **self._decode_options(language))
+        words = [(float(w["start"]), float(w["end"]), w["word"])
+                 for segment in result["segments"] for w in segment.get("words", [])]
+        incognito_mode = self.settings_manager.get_setting("incognito_mode", DEFAULT_INCOGNITO_MODE) if self.settings_manager else DEFAULT_INCOGNITO_MODE
+        if not incognito_mode:
+            logger.debug(f"Zwischenergebnis: {''.join(w[2] for w in words)}")
+        return words
+
+    def memory_bytes(self) -> int:
+        """
+        Ermittelt den Speicherbedarf des geladenen Modells.
+
+        Gezählt werden alle Einträge des state_dict, damit auch gepackte int8-Gewichte erfasst werden,
+        die nicht unter parameters() erscheinen.
+
+        Returns:
+            int: Größe aller Gewichte und Puffer in Bytes (0, wenn kein Modell geladen ist)
+        """
+        if self.model is None:
+            return 0
+        total = 0
+        for value in self.model.state_dict().values():
+            for tensor in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+    @handle_exceptions
+    def warm_up(self, language: str) -> None:
+        """
+        Führt eine kurze Transkription von Stille aus, damit die erste echte Transkription nicht
+        die Initialisierung des Modells (Speicherzuteilung, Kernel-Auswahl) bezahlt.
+
+        Args:
+            language (str): Sprache, mit der später transkribiert wird
+        """
+        if self.model is None:
+            raise RuntimeError("Modell nicht geladen.")
+        start_time = time.time()
+        with self._inference_context():
+            self.model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), **self._decode_options(language))
+        logger.info(f"Modell {self.model_name} aufgewärmt in {time.time() - start_time:.2f} s")
+
+    def acquire(self) -> bool:
+        """
+        Meldet eine Transkription an, damit das Modell bis zu ihrem Ende nicht freigegeben wird.
+
+        Returns:
+            bool: False, wenn kein Modell geladen ist oder seine Freigabe bereits angefordert wurde
+        """
+        with self._jobs_lock:
+            if self.model is None or self._release_pending:
+                return False
+            self._jobs += 1
+            return True
+
+    def release(self) -> None:
+        """Meldet eine mit acquire angemeldete Transkription ab und führt eine zurückgestellte Freigabe aus."""
+        with self._jobs_lock:
+            self._jobs -= 1
+            release_now = self._jobs == 0 and self._release_pending
+        if release_now:
+            self._free_model()
+
+    @property
+    def active_jobs(self) -> int:
+        """Anzahl der laufenden Transkriptionen."""
+        return self._jobs
+
     @handle_exceptions
     def release_resources(self) -> None:
         """
@@ -158,7 +295,21 @@ class Transcriber:
         1. Das Modell aus dem Speicher entfernt wird
         2. Bei GPU-Nutzung der CUDA-Speicher explizit freigegeben wird
         3. Alle anderen assoziierten Ressourcen freigegeben werden
+
+        Laufen noch mit acquire angemeldete Transkriptionen, wird die Freigabe bis zum Ende der
+        letzten zurückgestellt; neue Anmeldungen werden ab sofort abgelehnt.
         """
+        with self._jobs_lock:
+            if self._jobs > 0:
+                self._release_pending = True
+                logger.info(f"Freigabe von Modell {self.model_name} nach {self._jobs} laufenden Transkriptionen")
+                return
+        self._free_model()
+
+    def _free_model(self) -> None:
+        """Entfernt das Modell aus dem Speicher."""
+        with self._jobs_lock:
+            self._release_pending = False
         if self.model:
             del self.model
             self.model = None
@@ -202,6 +353,22 @@ class Transcriber:
 #    - Effiziente Speichernutzung
 #    - Robuste Fehlerbehandlung
 
+# 6. Wort-Zeitstempel:
+#    transcribe_words verwendet dieselben Optionen wie transcribe (siehe _decode_options) und zusätzlich
+#    word_timestamps=True. Die Live-Transkription braucht die Zeitstempel, um bestätigte Wörter dem Audio
+#    zuzuordnen und das Fenster hinter ihnen abzuschneiden.
+
+# 7. Laufende Transkriptionen und Freigabe:
+#    Wer transkribiert, meldet sich mit acquire an und mit release wieder ab. release_resources gibt das Modell
+#    erst frei, wenn keine Transkription mehr läuft. So kann der Modell-Pool ein Modell verdrängen oder das
+#    Backend zu einem anderen Modell wechseln, ohne eine laufende Transkription abzubrechen.
+
+# 8. Rechengenauigkeit:
+#    Mit precision="int8" lädt der Transcriber auf der CPU ein Modell mit dynamisch quantisierten
+#    Linear-Schichten (siehe src/backend/quantization.py, Gewichte im Cache unter models/). Mit "bf16" laufen
+#    die Modellaufrufe in torch.autocast, sofern die CPU bf16 in Hardware unterstützt; sonst bleibt es bei
+#    fp32. Auf der GPU haben beide Einstellungen keine Wirkung, dort rechnet Whisper bereits in fp16.
+
 # Diese Implementierung bietet eine ausgewogene Balance zwischen
 # Transkriptionsqualität, Geschwindigkeit und Ressourceneffizienz.
 # Sie ist sowohl für Entwickler als auch für Endbenutzer optimiert
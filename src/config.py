@@ -53,16 +53,124 @@ DELAYED_SAVE_SETTINGS = ['window_geometry', 'plugin_window_geometry', 'options_w
 
 # Audio-Einstellungen
 AUDIO_FORMAT = pyaudio.paInt16  # 16-bit int Sampling
-AUDIO_CHANNELS = 1  # Mono-Aufnahme
-AUDIO_RATE = 44100  # Sampling-Rate in Hz
+AUDIO_CHANNELS = 1  # Kanäle der weiterverarbeiteten Aufnahme (Mono); das Gerät kann mehr Kanäle liefern
+CHANNEL_MODES = ["mono", "mix", "select", "delay_and_sum"]  # Umgang mit den Eingangskanälen des Geräts
+DEFAULT_CHANNEL_MODE = "mono"  # Einkanalig öffnen; bietet das Gerät kein Mono an, werden alle Kanäle gemischt
+DEFAULT_CAPTURE_CHANNEL = 0  # Verwendeter Kanal im Modus "select" (0 = erster Kanal)
+CAPTURE_MAX_CHANNELS = 8  # Höchstzahl gleichzeitig geöffneter Eingangskanäle
+DAS_MAX_DELAY_MS = 1.0  # Größter Laufzeitunterschied zwischen den Mikrofonen (1 ms entspricht ca. 34 cm)
+DAS_ANALYSIS_FRAMES = 4096  # Frames je Schätzung der Laufzeitunterschiede
+DAS_MIN_LEVEL_DB = -45.0  # Nur Abschnitte über diesem RMS-Pegel werden für die Schätzung verwendet
+AUDIO_RATE = 44100  # Rückfall-Sampling-Rate in Hz, falls keine günstigere Rate unterstützt wird
+CAPTURE_RATE_CANDIDATES = [16000, 48000, 32000, 96000, 44100]  # Beim Gerät abgefragte Aufnahmeraten
+DEFAULT_NEGOTIATE_CAPTURE_RATE = True  # Aufnahmerate mit dem geringsten Resampling-Aufwand wählen
 TARGET_RATE = 16000  # Ziel-Sampling-Rate für Whisper
+RESAMPLER_ENGINES = ["polyphase", "linear", "fft"]  # Verfügbare Resampling-Verfahren
+DEFAULT_RESAMPLER_ENGINE = "polyphase"  # Chunkweises Polyphasen-Resampling während der Aufnahme
 AUDIO_CHUNK = 4096  # Größe der Audio-Chunks für die Aufnahme
 DEVICE_INDEX = 6  # Index des zu verwendenden Audiogeräts
 DEFAULT_AUDIO_DEVICE_INDEX = 6  # Standard-Audiogeräteindex
+CAPTURE_MODES = ["callback", "blocking", "process"]  # Verfügbare Aufnahmemodi
+DEFAULT_CAPTURE_MODE = "callback"  # PyAudio-Callback mit Ringpuffer statt blockierender Reads
+AUDIO_RING_BUFFER_SECONDS = 5.0  # Kapazität des Aufnahme-Ringpuffers in Sekunden
+VIRTUAL_DEVICE_NAME = "Virtuelles Mikrofon"  # Gerätename der VirtualAudioSource für Tests und Benchmarks
+CAPTURE_PROCESS_START_TIMEOUT = 10.0  # Maximale Wartezeit in Sekunden, bis der Aufnahmeprozess das Gerät geöffnet hat
+RECORDER_JOIN_TIMEOUT = 2.0  # Maximale Wartezeit in Sekunden auf das Ende des Aufnahme-Threads
+LEVEL_CLIP_THRESHOLD = 0.99  # Betrag, ab dem ein Sample als übersteuert gilt (Vollaussteuerung = 1.0)
+LEVEL_SILENCE_DB = -60.0  # Spitzenpegel in dBFS, unter dem eine Aufnahme als stumm gilt und nicht transkribiert wird
+LEVEL_SILENCE_WARN_SECONDS = 1.5  # Nach dieser Aufnahmedauer ohne Signal wird in der Statusleiste gewarnt
+LEVEL_METER_UI_INTERVAL_MS = 100  # Aktualisierungsintervall der Pegelanzeige in Millisekunden
+CAPTURE_LATE_READ_FACTOR = 4.0  # Ein Read gilt als verspätet, wenn seit dem vorherigen mehr als so viele Chunk-Dauern vergangen sind
+TEST_RECORDING_PATH = "tests/test_data/speech_sample.wav"  # Ziel der Testaufnahme bei aktivem "save_test_recording"
+DEFAULT_RECORDING_SPILL_MB = 32  # Ab dieser Größe je Aufnahmepuffer wird auf eine temporäre Datei ausgelagert (0 = nie)
+RECORDING_SPILL_DIR = None  # Verzeichnis für ausgelagerte Aufnahmen (None = System-Temp-Verzeichnis)
+DEFAULT_WARM_STREAM = False  # Audiostream dauerhaft offen halten, damit die Aufnahme ohne Geräteöffnung startet
+DEFAULT_PREROLL_MS = 400  # Im offenen Stream vorgehaltene Audiodauer vor dem Tastendruck in Millisekunden
+PREROLL_TRIM_INTERVAL = 0.1  # Intervall in Sekunden, in dem der Vorlauf auf DEFAULT_PREROLL_MS gekürzt wird
+DEFAULT_DEVICE_MONITORING = True  # Hinzugefügte und entfernte Audiogeräte im Hintergrund erkennen
+DEVICE_MONITOR_INTERVAL = 2.0  # Abfrageintervall der Geräteüberwachung in Sekunden
+ASOUND_CARDS_PATH = "/proc/asound/cards"  # Kernel-Liste der Soundkarten (Linux), Grundlage der Geräteüberwachung
 
 # Aufnahme-Einstellungen
 MIN_RECORD_SECONDS = 0.5  # Mindestaufnahmedauer in Sekunden
 
+# Sprachaktivitätserkennung (VAD)
+DEFAULT_VAD_ENABLED = True  # Stille vor der Transkription entfernen und Aufnahmen ohne Sprache überspringen
+VAD_FRAME_MS = 30  # Länge eines Analyse-Frames in Millisekunden
+DEFAULT_VAD_PADDING_MS = 200  # Beibehaltene Stille vor und nach der Sprache in Millisekunden
+DEFAULT_VAD_MIN_SPEECH_MS = 150  # Mindestdauer erkannter Sprache in Millisekunden
+VAD_ENERGY_THRESHOLD_DB = -50.0  # Absolute Energieschwelle in dBFS
+VAD_NOISE_MARGIN_DB = 10.0  # Abstand der adaptiven Schwelle zum Grundrauschen in dB
+VAD_FLATNESS_THRESHOLD = 0.5  # Maximale spektrale Flachheit eines Sprach-Frames
+VAD_BLOCK_FRAMES = 1000  # Frames je Verarbeitungsblock, begrenzt den Zwischenspeicher bei langen Aufnahmen
+
+# Rauschunterdrückung
+DEFAULT_NOISE_SUPPRESSION = False  # Spektrales Gating vor der Transkription
+DEFAULT_NOISE_REDUCTION_DB = 12.0  # Dämpfung der als Rauschen erkannten Anteile in dB
+NOISE_FFT_SIZE = 512  # Fensterlänge der STFT in Samples (32 ms bei 16 kHz)
+NOISE_HOP_SIZE = 128  # Vorschub der STFT in Samples (75 % Überlappung)
+NOISE_THRESHOLD_STD = 1.5  # Schwelle über dem Rauschmittel in Standardabweichungen je Frequenzband
+NOISE_MIN_PROFILE_MS = 100  # Mindestlänge der Stille vor dem ersten Wort für das Rauschprofil
+NOISE_PROFILE_SEARCH_SECONDS = 5.0  # Bereich am Anfang der Aufnahme, in dem nach Stille gesucht wird
+NOISE_BLOCK_FRAMES = 2048  # STFT-Frames je Verarbeitungsblock
+
+# Signalaufbereitung (läuft chunkweise während der Aufnahme, nach dem Resampling)
+DEFAULT_HIGHPASS_ENABLED = True  # Hochpass entfernt Gleichanteil und tieffrequentes Brummen/Trittschall
+HIGHPASS_CUTOFF_HZ = 80.0  # Grenzfrequenz des Hochpasses in Hz (unterhalb der Grundfrequenz von Sprache)
+HIGHPASS_ORDER = 2  # Ordnung des Butterworth-Hochpasses (2 = ein Biquad)
+DEFAULT_AGC_ENABLED = True  # Automatische Pegelanpassung leiser und lauter Mikrofone
+DEFAULT_AGC_TARGET_DB = -20.0  # Ziel-RMS-Pegel für Sprache in dBFS
+AGC_MAX_GAIN_DB = 30.0  # Höchste Verstärkung in dB
+AGC_MIN_GAIN_DB = -12.0  # Stärkste Absenkung in dB
+AGC_GATE_DB = -55.0  # Unter diesem RMS-Pegel gilt ein Block als Pause, die Verstärkung wird gehalten
+AGC_BLOCK_MS = 10  # Länge eines Regelblocks in Millisekunden
+AGC_ATTACK_SECONDS = 0.05  # Zeitkonstante beim Absenken der Verstärkung (laute Passagen)
+AGC_RELEASE_SECONDS = 1.0  # Zeitkonstante beim Anheben der Verstärkung (leise Passagen)
+AGC_PEAK_LIMIT = 0.95  # Spitzenwert, den die Verstärkung nicht überschreiten lässt
+
+# Audiodateien (Transkription vorhandener Aufnahmen)
+AUDIO_FILE_FORMATS = ["wav", "flac", "raw"]  # Unterstützte Formate von WordweberBackend.transcribe_file
+AUDIO_FILE_READ_FRAMES = 32768  # Frames je gelesenem Block; begrenzt den Speicherbedarf unabhängig von der Dateilänge
+RAW_SAMPLE_FORMATS = ["int16", "int32", "float32", "uint8"]  # Sampleformate für Roh-PCM (little-endian)
+FFMPEG_BINARY = "ffmpeg"  # Decoder für FLAC; wird auch von Whisper vorausgesetzt
+
+# Aufnahmearchiv (Qualitätssicherung)
+DEFAULT_ARCHIVE_RECORDINGS = False  # Jede transkribierte Äußerung komprimiert mit Index archivieren
+ARCHIVE_DIR = os.path.join(PROJECT_ROOT, "recordings")  # Verzeichnis des Archivs
+ARCHIVE_INDEX_FILE = "index.jsonl"  # Index mit einer JSON-Zeile je Aufnahme
+ARCHIVE_FORMATS = ["flac", "wav.gz"]  # Verlustfreie Formate; "flac" benötigt ffmpeg
+DEFAULT_ARCHIVE_FORMAT = "flac"  # Ohne ffmpeg wird auf "wav.gz" ausgewichen
+DEFAULT_ARCHIVE_MAX_MB = 500  # Größte Gesamtgröße des Archivs; die ältesten Aufnahmen werden zuerst gelöscht (0 = unbegrenzt)
+DEFAULT_ARCHIVE_MAX_DAYS = 30  # Aufnahmen, die älter sind, werden gelöscht (0 = unbegrenzt)
+
+# Dauerdiktat
+DEFAULT_CONTINUOUS_MODE = False  # Push-to-Talk-Taste schaltet eine fortlaufende Aufnahme ein und aus
+DEFAULT_SEGMENT_END_SILENCE_MS = 700  # Stille in Millisekunden, nach der eine Äußerung abgeschlossen wird
+SEGMENT_MAX_SECONDS = 25.0  # Maximale Segmentlänge in Sekunden (Whisper verarbeitet 30-Sekunden-Fenster)
+
+# Aktivierung per Schlüsselwort (Dauerdiktat)
+DEFAULT_KEYWORD_ACTIVATION = False  # Im Dauerdiktat erst nach erkanntem Schlüsselwort an Whisper übergeben
+KEYWORD_TEMPLATE_FILE = os.path.join(PROJECT_ROOT, "keyword_templates.npz")  # Eingelernte Schlüsselwort-Vorlagen (nur Merkmale, kein Audio)
+DEFAULT_KEYWORD_THRESHOLD = 0.2  # Größter mittlerer Kosinusabstand (DTW) zu einer Vorlage für eine Erkennung
+DEFAULT_KEYWORD_CPU_BUDGET = 0.05  # Höchster CPU-Anteil eines Kerns für den Keyword-Spotter (0.05 = 5 %)
+DEFAULT_KEYWORD_LISTEN_SECONDS = 5.0  # Stille in Sekunden, nach der wieder auf das Schlüsselwort gewartet wird
+KEYWORD_FRAME_MS = 25  # Fensterlänge der MFCC-Analyse in Millisekunden
+KEYWORD_HOP_MS = 10  # Vorschub der MFCC-Analyse in Millisekunden
+KEYWORD_MEL_BANDS = 26  # Anzahl der Mel-Filter
+KEYWORD_MFCC_COEFFS = 13  # Anzahl der Cepstralkoeffizienten (c0 wird für den Vergleich verworfen)
+KEYWORD_EVAL_INTERVAL_MS = 50  # Abstand der Vergleiche mit den Vorlagen in Millisekunden
+KEYWORD_CPU_BURST_SECONDS = 1.0  # Angesparte Rechenzeit in Sekunden Audio, die ein Vergleich auf einmal verbrauchen darf
+KEYWORD_TEMPLATE_MIN_MS = 200  # Mindestlänge einer Vorlage in Millisekunden
+KEYWORD_TEMPLATE_MAX_SECONDS = 2.0  # Höchstlänge einer Vorlage in Sekunden
+
+# Live-Transkription (Push-to-Talk)
+DEFAULT_LIVE_TRANSCRIPTION = False  # Während der Aufnahme Zwischenergebnisse anzeigen; beim Loslassen nur den Rest dekodieren
+DEFAULT_LIVE_INTERVAL_MS = 1000  # Abstand der erneuten Transkription des wachsenden Puffers in Millisekunden
+STREAMING_MIN_SECONDS = 1.0  # Kürzestes Audiofenster, das an Whisper geht (kürzere Fenster erzeugen Halluzinationen)
+STREAMING_TRIM_SECONDS = 15.0  # Ab dieser Fensterlänge wird das Audio bis zum letzten bestätigten Wort abgeschnitten
+STREAMING_PROMPT_CHARS = 200  # Länge des bestätigten Texts, der Whisper als Kontext übergeben wird
+LIVE_STATUS_CHARS = 80  # Angezeigte Zeichen des Zwischenstands in der Statusleiste
+
 # Eingabe-Einstellungen
 DEFAULT_PUSH_TO_TALK_KEY = "F12"  # Standard-Tastenkombination für Push-to-Talk-Funktion
 
@@ -87,6 +195,26 @@ WHISPER_MODELS = [
     "tiny", "base", "small", "medium", "large",  # Standard-Modelle
     "large-v3"  # Neuestes Modell
 ]  # Verfügbare Whisper-Modelle
+WHISPER_MODEL_SIZES_MB = {
+    "tiny": 150, "base": 290, "small": 970, "medium": 3060, "large": 6170, "large-v3": 6170
+}  # Ungefährer Speicherbedarf der Gewichte (fp32) zur Planung vor dem Laden
+DEFAULT_MODEL_POOL_MB = 4096  # Speicherbudget für gleichzeitig geladene Modelle in MB (0 = nur das aktive Modell)
+MODEL_PRECISIONS = ["fp32", "int8", "bf16"]  # Rechengenauigkeit des Modells auf der CPU
+DEFAULT_MODEL_PRECISION = "fp32"  # int8 = dynamisch quantisierte Linear-Schichten, bf16 = Autocast (nur mit CPU-Unterstützung)
+MODEL_PRECISION_SIZE_FACTORS = {"fp32": 1.0, "int8": 0.4, "bf16": 1.0}  # Geschätzter Speicherbedarf relativ zu fp32
+QUANTIZED_MODEL_DIR = os.path.join(PROJECT_ROOT, "models")  # Zwischenspeicher der quantisierten Gewichte
+
+# Kalibrierung (Modell, Threads und Beam-Größe für ein Latenzziel)
+CALIBRATION_PROFILE_FILE = os.path.join(PROJECT_ROOT, "calibration_profile.json")  # Gespeichertes Kalibrierungsprofil
+CALIBRATION_SAMPLE_FILE = os.path.join(PROJECT_ROOT, "tests", "test_data", "speech_sample.wav")  # Testaufnahme
+CALIBRATION_SAMPLE_TEXT = "Das ist ein Test"  # Gesprochener Text der Testaufnahme
+CALIBRATION_MODELS = ["medium", "small", "base", "tiny"]  # Geprüfte Modelle, vom genauesten zum schnellsten
+CALIBRATION_BEAM_SIZES = [5, 2, None]  # Geprüfte Beam-Größen (None = greedy), von der genauesten zur schnellsten
+CALIBRATION_RUNS = 3  # Gemessene Durchläufe je Kombination (Median)
+CALIBRATION_MAX_WER = 0.2  # Höchste zulässige Wortfehlerrate auf der Testaufnahme
+DEFAULT_APPLY_CALIBRATION = True  # Kalibrierungsprofil beim Start anwenden
+DEFAULT_LATENCY_TARGET_SECONDS = 1.0  # Latenzziel: höchstens so viele Sekunden Transkriptionszeit ...
+DEFAULT_LATENCY_TARGET_AUDIO_SECONDS = 3.0  # ... für so viele Sekunden Sprache
 
 # Unterstützte Sprachen
 SUPPORTED_LANGUAGES = {
@@ -124,8 +252,11 @@ PLUGIN_SPECIFIC_SETTINGS = {
 
 # Wichtige Hinweise
 RESAMPLING_NOTE = """
-WICHTIG: Resampling ist notwendig, da die Audiogeräte 16000 Hz nicht unterstützen.
-Ändern Sie AUDIO_RATE nicht und entfernen Sie das Resampling nicht ohne Rücksprache mit dem Projektteam.
+WICHTIG: Viele Audiogeräte unterstützen 16000 Hz nicht direkt. Der AudioProcessor fragt daher die Raten aus
+CAPTURE_RATE_CANDIDATES beim Gerät ab und wählt die Rate mit der günstigsten Umrechnung auf TARGET_RATE
+(direkt > ganzzahlige Dezimierung > rationales Verhältnis). AUDIO_RATE bleibt der Rückfallwert, wenn die Abfrage
+fehlschlägt oder "negotiate_capture_rate" deaktiviert ist. Entfernen Sie das Resampling nicht ohne Rücksprache
+mit dem Projektteam.
 """
 
 SHORTCUT_NOTE = """
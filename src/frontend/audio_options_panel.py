@@ -18,9 +18,8 @@
 
 import tkinter as tk
 from tkinter import ttk
-import pyaudio
 from src.utils.error_handling import handle_exceptions, logger
-from src.config import DEFAULT_AUDIO_DEVICE_INDEX
+from src.config import DEFAULT_AUDIO_DEVICE_INDEX, CHANNEL_MODES, DEFAULT_CAPTURE_CHANNEL, CAPTURE_MAX_CHANNELS
 
 class AudioOptionsPanel(ttk.Frame):
     @handle_exceptions
@@ -32,6 +31,10 @@ class AudioOptionsPanel(ttk.Frame):
         self.audio_devices = self.get_audio_devices()
         self.initial_device = self.backend.audio_processor.current_device_index
         self.selected_device = tk.StringVar(value=str(self.initial_device))
+        self.initial_channel_mode = self.backend.audio_processor.get_channel_mode()
+        self.initial_capture_channel = int(self.settings_manager.get_setting("capture_channel", DEFAULT_CAPTURE_CHANNEL))
+        self.channel_mode = tk.StringVar(value=self.initial_channel_mode)
+        self.capture_channel = tk.StringVar(value=str(self.initial_capture_channel + 1))
         self.setup_ui()
 
     @handle_exceptions
@@ -56,20 +59,26 @@ class AudioOptionsPanel(ttk.Frame):
         self.current_device_label = ttk.Label(bottom_frame, text="", wraplength=300)
         self.current_device_label.pack(side=tk.LEFT)
 
+        channel_frame = ttk.Frame(self)
+        channel_frame.pack(fill=tk.X, padx=5, pady=(0, 10))
+        ttk.Label(channel_frame, text="Kanalmodus:").pack(side=tk.LEFT)
+        mode_combobox = ttk.Combobox(channel_frame, textvariable=self.channel_mode, values=CHANNEL_MODES,
+                                     state="readonly", width=14)
+        mode_combobox.pack(side=tk.LEFT, padx=(5, 20))
+        mode_combobox.bind("<<ComboboxSelected>>", lambda event: self.on_channel_mode_change())
+        ttk.Label(channel_frame, text="Kanal (für select):").pack(side=tk.LEFT)
+        channel_spinbox = ttk.Spinbox(channel_frame, from_=1, to=CAPTURE_MAX_CHANNELS, textvariable=self.capture_channel,
+                                      width=4, command=self.on_channel_mode_change)
+        channel_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        channel_spinbox.bind("<FocusOut>", lambda event: self.on_channel_mode_change())
+
         self.update_current_device_label()
 
     @handle_exceptions
     def get_audio_devices(self):
-        p = pyaudio.PyAudio()
-        devices = {}
-        try:
-            for i in range(p.get_device_count()):
-                device_info = p.get_device_info_by_index(i)
-                if device_info['maxInputChannels'] > 0:  # Nur Eingabegeräte
-                    devices[str(i)] = f"{device_info['name']} (Index: {i})"
-        finally:
-            p.terminate()
-        return devices
+        # Die Geräteliste stammt aus dem Zwischenspeicher des AudioProcessors, ohne PortAudio erneut zu öffnen
+        registry = self.backend.audio_processor.device_registry
+        return {str(i): f"{name} (Index: {i})" for i, name in registry.input_devices().items()}
 
     @handle_exceptions
     def on_device_change(self):
@@ -84,9 +93,22 @@ class AudioOptionsPanel(ttk.Frame):
         else:
             self.current_device_label.config(text="Fehler beim Aktualisieren des Audiogeräts")
 
+    @handle_exceptions
+    def on_channel_mode_change(self):
+        """Übernimmt Kanalmodus und Kanal; ein geöffnetes Mikrofon wird mit der neuen Kanalzahl neu geöffnet."""
+        mode = self.channel_mode.get()
+        try:
+            channel = min(max(int(self.capture_channel.get()), 1), CAPTURE_MAX_CHANNELS) - 1
+        except ValueError:
+            channel = DEFAULT_CAPTURE_CHANNEL
+        if self.backend.audio_processor.update_channel_mode(mode, channel):
+            self.settings_manager.set_setting("channel_mode", mode)
+            self.settings_manager.set_setting("capture_channel", channel)
+
     @handle_exceptions
     def refresh_devices(self):
-        """Aktualisiert die Liste der Audiogeräte."""
+        """Liest die Audiogeräte neu ein und aktualisiert die Liste."""
+        self.backend.audio_processor.refresh_devices()
         self.audio_devices = self.get_audio_devices()
         for widget in self.winfo_children():
             widget.destroy()
@@ -95,9 +117,12 @@ class AudioOptionsPanel(ttk.Frame):
 
     @handle_exceptions
     def undo_changes(self):
-        """Setzt die Audiogeräteauswahl auf den ursprünglichen Wert zurück."""
+        """Setzt die Audiogeräteauswahl und den Kanalmodus auf die ursprünglichen Werte zurück."""
         self.selected_device.set(str(self.initial_device))
         self.on_device_change()
+        self.channel_mode.set(self.initial_channel_mode)
+        self.capture_channel.set(str(self.initial_capture_channel + 1))
+        self.on_channel_mode_change()
         logger.info(f"Audiogeräteauswahl zurückgesetzt auf: {self.initial_device}")
 
     @handle_exceptions
@@ -124,10 +149,12 @@ class AudioOptionsPanel(ttk.Frame):
 
 # 3. UI-Aufbau:
 #    Die setup_ui Methode erstellt die Benutzeroberfläche mit Radiobuttons für jedes verfügbare Audiogerät
-#    und einem Button zum Aktualisieren der Geräteliste.
+#    und einem Button zum Aktualisieren der Geräteliste. Darunter werden Kanalmodus und Kanal gewählt;
+#    "mix", "select" und "delay_and_sum" öffnen das Gerät mit allen Eingangskanälen.
 
 # 4. Audiogeräte abrufen:
-#    Die get_audio_devices Methode verwendet PyAudio, um alle verfügbaren Eingabegeräte zu identifizieren.
+#    Die get_audio_devices Methode liest die Eingabegeräte aus dem Geräteverzeichnis des AudioProcessors.
+#    Der Aktualisieren-Button lässt PortAudio neu einlesen, damit auch neu angeschlossene Geräte erscheinen.
 
 # 5. Geräteänderung:
 #    Wenn der Benutzer ein anderes Gerät auswählt, wird die Änderung sofort gespeichert und das Callback aufgerufen.
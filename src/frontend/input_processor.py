@@ -27,7 +27,7 @@ from pynput.keyboard import Key, Controller as KeyboardController
 import pyperclip
 import time
 import threading
-from src.config import DEFAULT_PUSH_TO_TALK_KEY, DEFAULT_INCOGNITO_MODE, DEFAULT_CHAR_DELAY
+from src.config import DEFAULT_PUSH_TO_TALK_KEY, DEFAULT_INCOGNITO_MODE, DEFAULT_CHAR_DELAY, DEFAULT_CONTINUOUS_MODE, DEFAULT_KEYWORD_ACTIVATION
 from src.utils.error_handling import handle_exceptions, logger
 
 class InputProcessor:
@@ -50,6 +50,7 @@ class InputProcessor:
         self.currently_pressed_keys = set()
         self.recording_active = False
         self.pushtotalk_pressed = False
+        self.continuous_active = False
         logger.info("InputProcessor initialisiert")
 
     @handle_exceptions
@@ -76,6 +77,18 @@ class InputProcessor:
         normalized_key = self.normalize_key(key)
         self.currently_pressed_keys.add(normalized_key)
 
+        if key == Key.esc and self.recording_active and not self.continuous_active:
+            self.abort_recording()
+            return
+
+        if self.is_push_to_talk_key(key) and not self.pushtotalk_pressed and (
+                self.continuous_active or
+                (not self.recording_active and self.gui.settings_manager.get_setting("continuous_mode", DEFAULT_CONTINUOUS_MODE))):
+            # Im Dauerdiktat schaltet die Taste die Aufnahme um, statt gehalten zu werden
+            self.pushtotalk_pressed = True
+            self.toggle_continuous_recording()
+            return
+
         if self.is_push_to_talk_key(key) and not self.recording_active and not self.pushtotalk_pressed:
             logger.debug(f"Push-to-Talk-Taste gedrückt: {normalized_key}")
             self.pushtotalk_pressed = True
@@ -91,10 +104,12 @@ class InputProcessor:
         normalized_key = self.normalize_key(key)
         self.currently_pressed_keys.discard(normalized_key)
 
-        if self.recording_active and self.is_push_to_talk_key(key):
+        if self.recording_active and not self.continuous_active and self.is_push_to_talk_key(key):
             logger.debug(f"Push-to-Talk-Taste losgelassen: {normalized_key}")
             self.pushtotalk_pressed = False
             self.stop_recording()
+        elif self.is_push_to_talk_key(key):
+            self.pushtotalk_pressed = False
 
     @handle_exceptions
     def is_push_to_talk_key(self, key):
@@ -161,8 +176,8 @@ class InputProcessor:
             self.gui.main_window.update_status_bar(status="Modell wird noch geladen. Aufnahme startet trotzdem.", status_color="yellow")
             logger.warning("Aufnahme gestartet, obwohl Modell noch nicht geladen ist")
         try:
-            if self.gui.backend.check_audio_device():
-                self.gui.backend.start_recording()
+            # Die Geräteprüfung erfolgt in backend.start_recording (bei offenem Stream entfällt sie)
+            if self.gui.backend.start_recording(self.gui.options_panel.language_var.get()):
                 self.gui.main_window.update_status_bar(status="Aufnahme läuft...", status_color="red")
                 self.gui.start_timer()
                 self.recording_active = True
@@ -188,6 +203,41 @@ class InputProcessor:
             logger.info("Aufnahme gespeichert. Warten auf Modell-Bereitschaft.")
             threading.Thread(target=self.wait_and_transcribe, daemon=True).start()
 
+    @handle_exceptions
+    def abort_recording(self):
+        """Bricht die laufende Aufnahme ohne Transkription ab (z.B. bei fehlendem oder übersteuertem Signal)."""
+        self.gui.backend.abort_recording()
+        self.recording_active = False
+        self.gui.stop_timer()
+        self.gui.main_window.update_status_bar(status="Aufnahme abgebrochen", status_color="orange")
+        logger.info("Audioaufnahme abgebrochen")
+
+    @handle_exceptions
+    def toggle_continuous_recording(self):
+        """Startet oder beendet das Dauerdiktat."""
+        if self.continuous_active:
+            self.gui.backend.stop_continuous()
+            self.continuous_active = False
+            self.recording_active = False
+            self.gui.stop_timer()
+            self.gui.main_window.update_status_bar(status="Dauerdiktat beendet", status_color="green")
+            return
+
+        if not self.gui.backend.model_loaded.is_set():
+            self.gui.main_window.update_status_bar(status="Modell wird noch geladen. Dauerdiktat startet trotzdem.", status_color="yellow")
+        if self.gui.backend.start_continuous(self.gui.options_panel.language_var.get()):
+            self.continuous_active = True
+            self.recording_active = True
+            self.gui.start_timer()
+            if self.gui.settings_manager.get_setting("keyword_activation", DEFAULT_KEYWORD_ACTIVATION):
+                self.gui.main_window.update_status_bar(status="Warte auf Schlüsselwort...", status_color="yellow")
+            else:
+                self.gui.main_window.update_status_bar(status="Dauerdiktat läuft...", status_color="red")
+        elif self.gui.settings_manager.get_setting("keyword_activation", DEFAULT_KEYWORD_ACTIVATION) and not self.gui.backend.keyword_spotter.templates:
+            self.gui.main_window.update_status_bar(status="Kein Schlüsselwort eingelernt", status_color="red")
+        else:
+            self.gui.main_window.update_status_bar(status="Audiogerät nicht verfügbar", status_color="red")
+
     @handle_exceptions
     def update_record_time(self):
         """Aktualisiert die angezeigte Aufnahmezeit."""
@@ -277,7 +327,9 @@ class InputProcessor:
         logger.info(f"Push-to-Talk-Shortcut aktualisiert auf: {new_shortcut}")
 
         # Sicherstellen, dass keine Aufnahme aktiv ist
-        if self.recording_active:
+        if self.continuous_active:
+            self.toggle_continuous_recording()
+        elif self.recording_active:
             self.stop_recording()
 
         # Tastenstatus zurücksetzen
@@ -316,6 +368,14 @@ class InputProcessor:
 #    Die parse_shortcut Methode wurde verbessert, um verschiedene Shortcut-Formate
 #    zu unterstützen und korrekt zu interpretieren.
 
+# 6. Dauerdiktat:
+#    Ist "continuous_mode" aktiviert, schaltet die Push-to-Talk-Taste über toggle_continuous_recording
+#    eine fortlaufende Aufnahme ein und aus. Das Loslassen der Taste beendet die Aufnahme dann nicht.
+
+# 7. Abbruch:
+#    Escape bricht eine laufende Push-to-Talk-Aufnahme ab, etwa wenn die Pegelanzeige kein Signal oder
+#    Übersteuerung meldet. Die Aufnahme wird verworfen, das Loslassen der Taste startet keine Transkription.
+
 # Diese Implementierung bietet eine robuste und flexible Lösung für die Handhabung
 # von Push-to-Talk-Shortcuts, einschließlich einzelner Tasten und komplexer
 # Tastenkombinationen, und integriert sich nahtlos in die bestehende Struktur
@@ -22,6 +22,7 @@ from tkinter import ttk
 from src.frontend.transcription_panel import TranscriptionPanel
 from src.frontend.options_panel import OptionsPanel
 from src.utils.error_handling import handle_exceptions, logger
+from src.config import LEVEL_SILENCE_DB
 
 class MainWindow:
     """
@@ -97,6 +98,11 @@ class MainWindow:
         right_frame = tk.Frame(self.status_bar, bg="black")
         right_frame.grid(row=0, column=2, sticky="e")
 
+        self.level_label = tk.Label(right_frame, text="Pegel: ", bg="black", fg="white", anchor="e")
+        self.level_label.pack(side=tk.LEFT)
+        self.level = tk.Label(right_frame, text="- dB", bg="black", fg="white", anchor="e", width=8)
+        self.level.pack(side=tk.LEFT)
+
         self.record_time_label = tk.Label(right_frame, text="Aufnahmezeit: ", bg="black", fg="white", anchor="e")
         self.record_time_label.pack(side=tk.LEFT)
         self.record_time = tk.Label(right_frame, text="0.0 s", bg="black", fg="white", anchor="e")
@@ -158,6 +164,24 @@ class MainWindow:
         # Explizite Aktualisierung des Fensters, um sicherzustellen, dass Änderungen sofort sichtbar sind
         self.root.update_idletasks()
 
+    @handle_exceptions
+    def update_level(self, reading=None):
+        """
+        Aktualisiert die Pegelanzeige.
+
+        :param reading: Der aktuelle LevelReading oder None, um die Anzeige zurückzusetzen
+        """
+        if reading is None or reading.samples == 0:
+            self.level.config(text="- dB", fg="white")
+            return
+        if reading.clipped:
+            color = "red"
+        elif reading.peak_db < LEVEL_SILENCE_DB:
+            color = "gray"
+        else:
+            color = "green"
+        self.level.config(text=f"{reading.rms_db:.0f} dB", fg=color)
+
     @handle_exceptions
     def on_auto_copy_change(self):
         """Behandelt Änderungen der Auto-Kopieren-Einstellung."""
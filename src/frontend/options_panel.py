@@ -22,8 +22,10 @@ from tkinter import ttk
 from src.config import (
     SUPPORTED_LANGUAGES,
     WHISPER_MODELS,
+    MODEL_PRECISIONS,
     DEFAULT_LANGUAGE,
     DEFAULT_WHISPER_MODEL,
+    DEFAULT_MODEL_PRECISION,
     DEFAULT_CHAR_DELAY,
     DEFAULT_PUSH_TO_TALK_KEY
 )
@@ -82,6 +84,10 @@ class OptionsPanel(ttk.Frame):
         self.model_dropdown = ttk.Combobox(model_frame, textvariable=self.model_var, values=WHISPER_MODELS, state="readonly", width=10)
         self.model_dropdown.pack(side=tk.LEFT)
         self.model_dropdown.bind("<<ComboboxSelected>>", self.on_model_change)
+        self.precision_var = tk.StringVar()
+        self.precision_dropdown = ttk.Combobox(model_frame, textvariable=self.precision_var, values=MODEL_PRECISIONS, state="readonly", width=5)
+        self.precision_dropdown.pack(side=tk.LEFT, padx=(5, 0))
+        self.precision_dropdown.bind("<<ComboboxSelected>>", self.on_precision_change)
 
         # Ausgabemodus
         output_frame = ttk.Frame(main_frame)
@@ -108,6 +114,7 @@ class OptionsPanel(ttk.Frame):
         """Lädt die gespeicherten Einstellungen und aktualisiert die UI-Elemente."""
         self.language_var.set(self.settings_manager.get_setting("language", DEFAULT_LANGUAGE))
         self.model_var.set(self.settings_manager.get_setting("model", DEFAULT_WHISPER_MODEL))
+        self.precision_var.set(self.settings_manager.get_setting("model_precision", DEFAULT_MODEL_PRECISION))
         self.output_mode_var.set(self.settings_manager.get_setting("output_mode", "textfenster"))
         self.update_shortcut_display(self.settings_manager.get_setting("push_to_talk_key", DEFAULT_PUSH_TO_TALK_KEY))
         logger.info("OptionsPanel Einstellungen geladen")
@@ -139,6 +146,21 @@ class OptionsPanel(ttk.Frame):
         self.gui.load_model_async(new_model)
         logger.info(f"Whisper-Modell geändert auf: {new_model}")
 
+    @handle_exceptions
+    def on_precision_change(self, event):
+        """
+        Behandelt Änderungen der Rechengenauigkeit (fp32, int8, bf16).
+
+        Das aktuelle Modell wird in der neuen Genauigkeit im Hintergrund geladen.
+
+        :param event: Das Ereignis, das die Änderung ausgelöst hat (wird nicht verwendet)
+        """
+        new_precision = self.precision_var.get()
+        self.settings_manager.set_setting_instant("model_precision", new_precision)
+        self.gui.backend.settings_manager.set_setting_instant("model_precision", new_precision)
+        self.gui.load_model_async(self.model_var.get())
+        logger.info(f"Rechengenauigkeit geändert auf: {new_precision}")
+
     @handle_exceptions
     def on_output_mode_change(self):
         """
@@ -229,3 +251,7 @@ class OptionsPanel(ttk.Frame):
 #    update_shortcut_display und update_delay_settings verwenden nun set_setting_instant
 #    anstelle von set_setting, um die Änderungen sofort zu speichern und die Reaktionszeit
 #    der Anwendung zu verbessern.
+
+# 10. Rechengenauigkeit:
+#    Die Auswahl neben dem Whisper-Modell legt fest, ob das Modell auf der CPU in fp32, mit int8-Gewichten
+#    oder mit bf16-Autocast rechnet. Eine Änderung lädt das aktuelle Modell im Hintergrund neu.
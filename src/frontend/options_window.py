@@ -14,11 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import threading
 import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkFont
 from tkcolorpicker import askcolor
-from src.config import DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE, DEFAULT_INCOGNITO_MODE, DEFAULT_CHAR_DELAY, DEFAULT_PUSH_TO_TALK_KEY
+from src.config import (DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE, DEFAULT_INCOGNITO_MODE, DEFAULT_CHAR_DELAY, DEFAULT_PUSH_TO_TALK_KEY, DEFAULT_CONTINUOUS_MODE, DEFAULT_WARM_STREAM,
+                        DEFAULT_NOISE_SUPPRESSION, DEFAULT_NOISE_REDUCTION_DB, DEFAULT_HIGHPASS_ENABLED, DEFAULT_AGC_ENABLED,
+                        DEFAULT_ARCHIVE_RECORDINGS, DEFAULT_KEYWORD_ACTIVATION, DEFAULT_LIVE_TRANSCRIPTION,
+                        DEFAULT_LATENCY_TARGET_SECONDS, DEFAULT_LATENCY_TARGET_AUDIO_SECONDS, DEFAULT_MODEL_POOL_MB)
 from src.utils.error_handling import handle_exceptions, logger
 from src.frontend.audio_options_panel import AudioOptionsPanel
 from src.frontend.shortcut_panel import ShortcutPanel
@@ -105,6 +109,7 @@ class OptionsWindow(tk.Toplevel):
             self.gui.backend
         )
         self.audio_options_panel.pack(fill=tk.BOTH, expand=True)
+        self.setup_dictation_options(audio_options_frame)
 
         # Theme-Einstellungen
         theme_frame = ttk.Frame(notebook)
@@ -200,13 +205,106 @@ class OptionsWindow(tk.Toplevel):
                         variable=self.save_test_recording_var,
                         command=self.on_save_test_recording_change).pack(pady=10)
 
+        self.archive_recordings_var = tk.BooleanVar(value=self.settings_manager.get_setting("archive_recordings", DEFAULT_ARCHIVE_RECORDINGS))
+        ttk.Checkbutton(parent, text="Alle Aufnahmen komprimiert archivieren (mit Index und automatischer Bereinigung)",
+                        variable=self.archive_recordings_var,
+                        command=self.on_archive_recordings_change).pack(pady=10)
+
         self.incognito_var = tk.BooleanVar(value=self.settings_manager.get_setting("incognito_mode", DEFAULT_INCOGNITO_MODE))
         ttk.Checkbutton(parent, text="Incognito-Modus (keine Transkriptionsprotokollierung)",
                         variable=self.incognito_var,
                         command=self.on_incognito_change).pack(pady=10)
 
+        calibration_frame = ttk.Frame(parent)
+        calibration_frame.pack(pady=10)
+        ttk.Label(calibration_frame, text="Latenzziel: höchstens").pack(side=tk.LEFT)
+        self.latency_target_var = tk.StringVar(value=str(self.settings_manager.get_setting("latency_target_seconds", DEFAULT_LATENCY_TARGET_SECONDS)))
+        ttk.Spinbox(calibration_frame, from_=0.2, to=30, increment=0.1, textvariable=self.latency_target_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Label(calibration_frame, text="s für").pack(side=tk.LEFT)
+        self.latency_audio_var = tk.StringVar(value=str(self.settings_manager.get_setting("latency_target_audio_seconds", DEFAULT_LATENCY_TARGET_AUDIO_SECONDS)))
+        ttk.Spinbox(calibration_frame, from_=1, to=30, increment=1, textvariable=self.latency_audio_var, width=5).pack(side=tk.LEFT, padx=5)
+        ttk.Label(calibration_frame, text="s Sprache").pack(side=tk.LEFT)
+        self.calibrate_button = ttk.Button(calibration_frame, text="Kalibrieren", command=self.on_calibrate)
+        self.calibrate_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.calibration_label = ttk.Label(parent)
+        self.calibration_label.pack()
+        self.update_calibration_label()
+
+        pool_frame = ttk.Frame(parent)
+        pool_frame.pack(pady=10)
+        ttk.Label(pool_frame, text="Speicher für gleichzeitig geladene Modelle (MB, 0 = nur das aktive):").pack(side=tk.LEFT)
+        self.model_pool_var = tk.StringVar(value=str(int(self.settings_manager.get_setting("model_pool_mb", DEFAULT_MODEL_POOL_MB))))
+        pool_spinbox = ttk.Spinbox(pool_frame, from_=0, to=65536, increment=512, textvariable=self.model_pool_var, width=7,
+                                   command=self.on_model_pool_change)
+        pool_spinbox.pack(side=tk.LEFT, padx=5)
+        pool_spinbox.bind("<FocusOut>", lambda event: self.on_model_pool_change())
+
         logger.debug("Testaufnahmeoptionen eingerichtet")
 
+    @handle_exceptions
+    def setup_dictation_options(self, parent):
+        """
+        Richtet die Optionen für das Dauerdiktat ein.
+
+        :param parent: Das übergeordnete Frame für die Diktatoptionen
+        """
+        self.continuous_mode_var = tk.BooleanVar(value=self.settings_manager.get_setting("continuous_mode", DEFAULT_CONTINUOUS_MODE))
+        ttk.Checkbutton(parent, text="Dauerdiktat (Push-to-Talk-Taste schaltet die Aufnahme ein und aus)",
+                        variable=self.continuous_mode_var,
+                        command=self.on_continuous_mode_change).pack(anchor="w", padx=5, pady=10)
+
+        keyword_frame = ttk.Frame(parent)
+        keyword_frame.pack(anchor="w", padx=5, pady=(0, 10))
+        self.keyword_activation_var = tk.BooleanVar(value=self.settings_manager.get_setting("keyword_activation", DEFAULT_KEYWORD_ACTIVATION))
+        ttk.Checkbutton(keyword_frame, text="Dauerdiktat erst nach Schlüsselwort an Whisper übergeben",
+                        variable=self.keyword_activation_var,
+                        command=self.on_keyword_activation_change).pack(anchor="w")
+        keyword_buttons = ttk.Frame(keyword_frame)
+        keyword_buttons.pack(anchor="w", pady=(5, 0))
+        ttk.Button(keyword_buttons, text="Letzte Aufnahme als Schlüsselwort einlernen",
+                   command=self.on_enroll_keyword).pack(side=tk.LEFT)
+        ttk.Button(keyword_buttons, text="Vorlagen löschen",
+                   command=self.on_clear_keyword_templates).pack(side=tk.LEFT, padx=(5, 0))
+        self.keyword_templates_label = ttk.Label(keyword_buttons)
+        self.keyword_templates_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.update_keyword_templates_label()
+
+        self.live_transcription_var = tk.BooleanVar(value=self.settings_manager.get_setting("live_transcription", DEFAULT_LIVE_TRANSCRIPTION))
+        ttk.Checkbutton(parent, text="Live-Transkription während der Aufnahme (Zwischenstand in der Statusleiste)",
+                        variable=self.live_transcription_var,
+                        command=self.on_live_transcription_change).pack(anchor="w", padx=5, pady=(0, 10))
+
+        self.warm_stream_var = tk.BooleanVar(value=self.settings_manager.get_setting("warm_stream", DEFAULT_WARM_STREAM))
+        warm_stream_text = "Mikrofon geöffnet halten (sofortiger Aufnahmestart mit Vorlauf)"
+        if self.gui.backend.audio_processor.get_capture_mode() == "process":
+            warm_stream_text += " - im Aufnahmemodus 'process' immer aktiv"
+        ttk.Checkbutton(parent, text=warm_stream_text,
+                        variable=self.warm_stream_var,
+                        command=self.on_warm_stream_change).pack(anchor="w", padx=5, pady=(0, 10))
+
+        noise_frame = ttk.Frame(parent)
+        noise_frame.pack(anchor="w", padx=5, pady=(0, 10))
+        self.noise_suppression_var = tk.BooleanVar(value=self.settings_manager.get_setting("noise_suppression", DEFAULT_NOISE_SUPPRESSION))
+        ttk.Checkbutton(noise_frame, text="Rauschunterdrückung vor der Transkription, Dämpfung (dB):",
+                        variable=self.noise_suppression_var,
+                        command=self.on_noise_suppression_change).pack(side=tk.LEFT)
+        self.noise_reduction_var = tk.StringVar(value=str(int(self.settings_manager.get_setting("noise_reduction_db", DEFAULT_NOISE_REDUCTION_DB))))
+        noise_spinbox = ttk.Spinbox(noise_frame, from_=3, to=30, textvariable=self.noise_reduction_var, width=5,
+                                    command=self.on_noise_suppression_change)
+        noise_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        noise_spinbox.bind("<FocusOut>", lambda event: self.on_noise_suppression_change())
+
+        self.highpass_var = tk.BooleanVar(value=self.settings_manager.get_setting("highpass_enabled", DEFAULT_HIGHPASS_ENABLED))
+        ttk.Checkbutton(parent, text="Hochpass (entfernt Gleichanteil und Brummen)",
+                        variable=self.highpass_var,
+                        command=self.on_conditioning_change).pack(anchor="w", padx=5, pady=(0, 10))
+        self.agc_var = tk.BooleanVar(value=self.settings_manager.get_setting("agc_enabled", DEFAULT_AGC_ENABLED))
+        ttk.Checkbutton(parent, text="Automatische Pegelanpassung (gleicht leise und laute Mikrofone aus)",
+                        variable=self.agc_var,
+                        command=self.on_conditioning_change).pack(anchor="w", padx=5, pady=(0, 10))
+
+        logger.debug("Diktatoptionen eingerichtet")
+
     @handle_exceptions
     def setup_output_mode_options(self, parent):
         """Richtet die Optionen für den Ausgabemodus ein."""
@@ -272,12 +370,190 @@ class OptionsWindow(tk.Toplevel):
     def on_save_test_recording_change(self):
         """
         Behandelt Änderungen der Testaufnahme-Einstellung.
-        Speichert die neue Einstellung und aktualisiert die Konfiguration.
+        Speichert die neue Einstellung und gibt sie an das Backend weiter, das ab der nächsten Aufnahme mitschreibt.
         """
         new_value = self.save_test_recording_var.get()
         self.settings_manager.set_setting("save_test_recording", new_value)
+        self.gui.backend.settings_manager.set_setting("save_test_recording", new_value)
         logger.info(f"Testaufnahme-Einstellung geändert: {new_value}")
 
+    @handle_exceptions
+    def on_archive_recordings_change(self):
+        """
+        Behandelt Änderungen des Aufnahmearchivs.
+        Das Backend öffnet bzw. schließt das Archiv sofort, sofern sich die Einstellung geändert hat.
+        """
+        new_value = self.archive_recordings_var.get()
+        backend_settings = self.gui.backend.settings_manager
+        if new_value == backend_settings.get_setting("archive_recordings", DEFAULT_ARCHIVE_RECORDINGS):
+            return
+        self.settings_manager.set_setting("archive_recordings", new_value)
+        backend_settings.set_setting("archive_recordings", new_value)
+        self.gui.backend.configure_recording_archive()
+        logger.info(f"Aufnahmearchiv geändert: {new_value}")
+
+    @handle_exceptions
+    def on_continuous_mode_change(self):
+        """
+        Behandelt Änderungen der Dauerdiktat-Einstellung.
+        Ein laufendes Dauerdiktat wird beim Deaktivieren beendet.
+        """
+        new_value = self.continuous_mode_var.get()
+        self.settings_manager.set_setting("continuous_mode", new_value)
+        if not new_value and self.gui.input_processor.continuous_active:
+            self.gui.input_processor.toggle_continuous_recording()
+        logger.info(f"Dauerdiktat-Einstellung geändert: {new_value}")
+
+    @handle_exceptions
+    def on_live_transcription_change(self):
+        """
+        Behandelt Änderungen der Live-Transkription.
+        Die Einstellung gilt ab der nächsten Aufnahme.
+        """
+        new_value = self.live_transcription_var.get()
+        for settings_manager in (self.settings_manager, self.gui.backend.settings_manager):
+            settings_manager.set_setting("live_transcription", new_value)
+        logger.info(f"Live-Transkription geändert: {new_value}")
+
+    @handle_exceptions
+    def on_keyword_activation_change(self):
+        """
+        Behandelt Änderungen der Aktivierung per Schlüsselwort.
+        Die Einstellung gilt ab dem nächsten Start des Dauerdiktats.
+        """
+        new_value = self.keyword_activation_var.get()
+        for settings_manager in (self.settings_manager, self.gui.backend.settings_manager):
+            settings_manager.set_setting("keyword_activation", new_value)
+        logger.info(f"Aktivierung per Schlüsselwort geändert: {new_value}")
+
+    @handle_exceptions
+    def on_enroll_keyword(self):
+        """Lernt die letzte Aufnahme als Vorlage für das Schlüsselwort ein."""
+        if self.gui.backend.enroll_keyword_from_last_recording():
+            self.gui.main_window.update_status_bar(status="Schlüsselwort eingelernt", status_color="green")
+        else:
+            self.gui.main_window.update_status_bar(status="Keine passende Aufnahme zum Einlernen (nur das Schlüsselwort sprechen)", status_color="orange")
+        self.update_keyword_templates_label()
+
+    @handle_exceptions
+    def on_clear_keyword_templates(self):
+        """Löscht alle eingelernten Vorlagen des Schlüsselworts."""
+        self.gui.backend.clear_keyword_templates()
+        self.update_keyword_templates_label()
+
+    @handle_exceptions
+    def update_keyword_templates_label(self):
+        """Zeigt die Anzahl der eingelernten Vorlagen an."""
+        count = len(self.gui.backend.keyword_spotter.templates)
+        self.keyword_templates_label.config(text=f"{count} Vorlage(n) eingelernt")
+
+    @handle_exceptions
+    def on_warm_stream_change(self):
+        """
+        Behandelt Änderungen der Einstellung für den dauerhaft geöffneten Audiostream.
+        Der Stream wird sofort geöffnet bzw. geschlossen.
+        """
+        new_value = self.warm_stream_var.get()
+        self.settings_manager.set_setting("warm_stream", new_value)
+        self.gui.backend.audio_processor.set_warm_stream(new_value)
+        logger.info(f"Offener Audiostream geändert: {new_value}")
+
+    @handle_exceptions
+    def on_noise_suppression_change(self):
+        """
+        Behandelt Änderungen der Rauschunterdrückung.
+        Die Einstellungen werden an das Backend weitergegeben und gelten ab der nächsten Aufnahme.
+        """
+        enabled = self.noise_suppression_var.get()
+        try:
+            reduction_db = float(self.noise_reduction_var.get())
+        except ValueError:
+            reduction_db = DEFAULT_NOISE_REDUCTION_DB
+        for settings_manager in (self.settings_manager, self.gui.backend.settings_manager):
+            settings_manager.set_setting("noise_suppression", enabled)
+            settings_manager.set_setting("noise_reduction_db", reduction_db)
+        logger.info(f"Rauschunterdrückung geändert: {enabled}, Dämpfung {reduction_db} dB")
+
+    @handle_exceptions
+    def on_conditioning_change(self):
+        """
+        Behandelt Änderungen der Signalaufbereitung (Hochpass und automatische Pegelanpassung).
+        Die Einstellungen werden an das Backend weitergegeben und gelten ab der nächsten Aufnahme.
+        """
+        highpass = self.highpass_var.get()
+        agc = self.agc_var.get()
+        for settings_manager in (self.settings_manager, self.gui.backend.settings_manager):
+            settings_manager.set_setting("highpass_enabled", highpass)
+            settings_manager.set_setting("agc_enabled", agc)
+        logger.info(f"Signalaufbereitung geändert: Hochpass {highpass}, Pegelanpassung {agc}")
+
+    @handle_exceptions
+    def on_model_pool_change(self):
+        """
+        Behandelt Änderungen des Speicherbudgets für den Modell-Pool.
+        Das Backend gibt bei einem kleineren Budget sofort die am längsten nicht verwendeten Modelle frei.
+        """
+        try:
+            budget_mb = max(0, int(float(self.model_pool_var.get())))
+        except ValueError:
+            budget_mb = DEFAULT_MODEL_POOL_MB
+        for settings_manager in (self.settings_manager, self.gui.backend.settings_manager):
+            settings_manager.set_setting("model_pool_mb", budget_mb)
+        self.gui.backend.configure_model_pool()
+        logger.info(f"Speicherbudget des Modell-Pools geändert: {budget_mb} MB")
+
+    @handle_exceptions
+    def on_calibrate(self):
+        """Startet die Kalibrierung im Hintergrund und lädt anschließend das gewählte Modell."""
+        try:
+            target_latency = float(self.latency_target_var.get())
+            audio_seconds = float(self.latency_audio_var.get())
+        except ValueError:
+            self.gui.main_window.update_status_bar(status="Ungültiges Latenzziel", status_color="red")
+            return
+        self.settings_manager.set_setting("latency_target_seconds", target_latency)
+        self.settings_manager.set_setting("latency_target_audio_seconds", audio_seconds)
+        self.calibrate_button.config(state="disabled")
+        root = self.gui.root
+
+        def progress(message):
+            root.after(0, lambda: self.gui.main_window.update_status_bar(status=message, status_color="yellow"))
+
+        def run():
+            try:
+                profile = self.gui.backend.run_calibration(target_latency, audio_seconds, progress)
+                root.after(0, lambda: self.on_calibration_finished(profile))
+            except Exception as e:
+                message = f"Kalibrierung fehlgeschlagen: {e}"
+                root.after(0, lambda: self.on_calibration_finished(None, message))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    @handle_exceptions
+    def on_calibration_finished(self, profile, error_message=None):
+        """Zeigt das Ergebnis der Kalibrierung an und lädt das gewählte Modell."""
+        if self.winfo_exists():
+            self.calibrate_button.config(state="normal")
+            self.update_calibration_label()
+        if profile is None or not profile.get("selected"):
+            self.gui.main_window.update_status_bar(status=error_message or "Kalibrierung ohne Ergebnis", status_color="red")
+            return
+        self.gui.apply_calibration_selection()
+        self.gui.load_model_async(self.settings_manager.get_setting("model"))
+
+    @handle_exceptions
+    def update_calibration_label(self):
+        """Zeigt das aktuelle Kalibrierungsprofil an."""
+        profile = self.gui.backend.calibration_profile
+        if not profile or not profile.get("selected"):
+            self.calibration_label.config(text="Nicht kalibriert")
+            return
+        entry = profile["models"][profile["selected"]]
+        status = "Ziel erreicht" if entry["meets_target"] else "Ziel nicht erreicht"
+        self.calibration_label.config(
+            text=f"Kalibriert am {profile['created']}: {profile['selected']}, {entry['threads']} Threads, "
+                 f"Beam {entry['beam_size'] or 'greedy'}, {entry['latency']:.2f} s ({status})")
+
     @handle_exceptions
     def on_incognito_change(self):
         """
@@ -301,7 +577,25 @@ class OptionsWindow(tk.Toplevel):
 
         # Testaufnahme- und Incognito-Einstellungen zurücksetzen
         self.save_test_recording_var.set(self.initial_settings["save_test_recording"])
+        self.gui.backend.settings_manager.set_setting("save_test_recording", self.save_test_recording_var.get())
         self.incognito_var.set(self.initial_settings["incognito_mode"])
+        self.archive_recordings_var.set(self.initial_settings.get("archive_recordings", DEFAULT_ARCHIVE_RECORDINGS))
+        self.on_archive_recordings_change()
+        self.continuous_mode_var.set(self.initial_settings.get("continuous_mode", DEFAULT_CONTINUOUS_MODE))
+        self.keyword_activation_var.set(self.initial_settings.get("keyword_activation", DEFAULT_KEYWORD_ACTIVATION))
+        self.on_keyword_activation_change()
+        self.live_transcription_var.set(self.initial_settings.get("live_transcription", DEFAULT_LIVE_TRANSCRIPTION))
+        self.on_live_transcription_change()
+        self.warm_stream_var.set(self.initial_settings.get("warm_stream", DEFAULT_WARM_STREAM))
+        self.gui.backend.audio_processor.set_warm_stream(self.warm_stream_var.get())
+        self.noise_suppression_var.set(self.initial_settings.get("noise_suppression", DEFAULT_NOISE_SUPPRESSION))
+        self.noise_reduction_var.set(str(int(self.initial_settings.get("noise_reduction_db", DEFAULT_NOISE_REDUCTION_DB))))
+        self.on_noise_suppression_change()
+        self.highpass_var.set(self.initial_settings.get("highpass_enabled", DEFAULT_HIGHPASS_ENABLED))
+        self.agc_var.set(self.initial_settings.get("agc_enabled", DEFAULT_AGC_ENABLED))
+        self.on_conditioning_change()
+        self.model_pool_var.set(str(int(self.initial_settings.get("model_pool_mb", DEFAULT_MODEL_POOL_MB))))
+        self.on_model_pool_change()
 
         # Audiogeräteeinstellungen zurücksetzen
         self.audio_options_panel.undo_changes()
@@ -393,6 +687,11 @@ class OptionsWindow(tk.Toplevel):
 #    Alle Methoden verwenden weiterhin den @handle_exceptions Decorator
 #    für konsistente Fehlerbehandlung und Logging.
 
+# 5. Kalibrierung:
+#    Im Tab "Testaufnahme" wird das Latenzziel eingestellt (z.B. höchstens 1 s für 3 s Sprache). "Kalibrieren"
+#    misst im Hintergrund Modelle, Threads und Beam-Größen auf der Testaufnahme (WordweberBackend.run_calibration)
+#    und lädt danach das gewählte Modell; der Fortschritt erscheint in der Statusleiste.
+
 # Diese Implementierung integriert die neue Shortcut-Funktionalität nahtlos
 # in das bestehende Optionsfenster und behält dabei die Struktur und
 # den Stil der vorhandenen Komponenten bei.
@@ -257,6 +257,42 @@ class SettingsManager:
             "save_test_recording": False,
             "incognito_mode": DEFAULT_INCOGNITO_MODE,
             "audio_device_index": DEFAULT_AUDIO_DEVICE_INDEX,
+            "audio_device_name": "",
+            "device_monitoring": DEFAULT_DEVICE_MONITORING,
+            "capture_mode": DEFAULT_CAPTURE_MODE,
+            "resampler_engine": DEFAULT_RESAMPLER_ENGINE,
+            "negotiate_capture_rate": DEFAULT_NEGOTIATE_CAPTURE_RATE,
+            "warm_stream": DEFAULT_WARM_STREAM,
+            "preroll_ms": DEFAULT_PREROLL_MS,
+            "vad_enabled": DEFAULT_VAD_ENABLED,
+            "vad_padding_ms": DEFAULT_VAD_PADDING_MS,
+            "vad_min_speech_ms": DEFAULT_VAD_MIN_SPEECH_MS,
+            "continuous_mode": DEFAULT_CONTINUOUS_MODE,
+            "segment_end_silence_ms": DEFAULT_SEGMENT_END_SILENCE_MS,
+            "keyword_activation": DEFAULT_KEYWORD_ACTIVATION,
+            "keyword_threshold": DEFAULT_KEYWORD_THRESHOLD,
+            "keyword_cpu_budget": DEFAULT_KEYWORD_CPU_BUDGET,
+            "keyword_listen_seconds": DEFAULT_KEYWORD_LISTEN_SECONDS,
+            "live_transcription": DEFAULT_LIVE_TRANSCRIPTION,
+            "live_interval_ms": DEFAULT_LIVE_INTERVAL_MS,
+            "model_pool_mb": DEFAULT_MODEL_POOL_MB,
+            "model_precision": DEFAULT_MODEL_PRECISION,
+            "apply_calibration": DEFAULT_APPLY_CALIBRATION,
+            "calibration_applied": None,
+            "latency_target_seconds": DEFAULT_LATENCY_TARGET_SECONDS,
+            "latency_target_audio_seconds": DEFAULT_LATENCY_TARGET_AUDIO_SECONDS,
+            "recording_spill_mb": DEFAULT_RECORDING_SPILL_MB,
+            "noise_suppression": DEFAULT_NOISE_SUPPRESSION,
+            "noise_reduction_db": DEFAULT_NOISE_REDUCTION_DB,
+            "highpass_enabled": DEFAULT_HIGHPASS_ENABLED,
+            "agc_enabled": DEFAULT_AGC_ENABLED,
+            "agc_target_db": DEFAULT_AGC_TARGET_DB,
+            "archive_recordings": DEFAULT_ARCHIVE_RECORDINGS,
+            "archive_format": DEFAULT_ARCHIVE_FORMAT,
+            "archive_max_mb": DEFAULT_ARCHIVE_MAX_MB,
+            "archive_max_days": DEFAULT_ARCHIVE_MAX_DAYS,
+            "channel_mode": DEFAULT_CHANNEL_MODE,
+            "capture_channel": DEFAULT_CAPTURE_CHANNEL,
             "text_fg": DEFAULT_TEXT_FG,
             "text_bg": DEFAULT_TEXT_BG,
             "select_fg": DEFAULT_SELECT_FG,
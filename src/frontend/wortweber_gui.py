@@ -40,7 +40,10 @@ from src.frontend.options_window import OptionsWindow
 from src.frontend.theme_manager import ThemeManager
 from src.frontend.input_processor import InputProcessor
 from src.frontend.settings_manager import SettingsManager
-from src.config import DEFAULT_WINDOW_SIZE, DEFAULT_CHAR_DELAY, DEFAULT_PUSH_TO_TALK_KEY, DEFAULT_WHISPER_MODEL, DEBUG_LOGGING
+from src.config import (
+    DEFAULT_WINDOW_SIZE, DEFAULT_CHAR_DELAY, DEFAULT_PUSH_TO_TALK_KEY, DEFAULT_WHISPER_MODEL, DEBUG_LOGGING,
+    LEVEL_METER_UI_INTERVAL_MS, LEVEL_SILENCE_WARN_SECONDS, LIVE_STATUS_CHARS, DEFAULT_MODEL_PRECISION
+)
 from src.utils.error_handling import handle_exceptions, logger
 from src.plugin_system.plugin_manager import PluginManager
 from src.frontend.context_menu import create_context_menu
@@ -93,6 +96,10 @@ class WordweberGUI:
         self.options_panel = self.main_window.options_panel
 
         self.theme_manager.set_gui(self)
+        self.backend.on_segment_transcribed = self.on_segment_transcribed
+        self.backend.on_keyword_detected = self.on_keyword_detected
+        self.backend.on_partial_transcription = self.on_partial_transcription
+        self.backend.audio_processor.on_devices_changed = self.on_audio_devices_changed
 
         self.setup_logging()
         self.load_saved_settings()
@@ -164,10 +171,33 @@ class WordweberGUI:
 
     @handle_exceptions
     def load_initial_model(self) -> None:
-        """Lädt das initial konfigurierte Whisper-Modell."""
+        """Lädt das initial konfigurierte Whisper-Modell (nach einer neuen Kalibrierung das dort gewählte)."""
+        self.apply_calibration_selection()
         model_name = self.settings_manager.get_setting("model", DEFAULT_WHISPER_MODEL)
         self.load_model_async(model_name)
 
+    @handle_exceptions
+    def apply_calibration_selection(self) -> bool:
+        """
+        Übernimmt Modell und Rechengenauigkeit eines neuen Kalibrierungsprofils in die Einstellungen.
+
+        Geschrieben wird in die Einstellungen der GUI und des Backends, damit das anschließende Laden
+        und das spätere Speichern dieselbe Auswahl sehen.
+
+        :return: True, wenn die Einstellungen geändert wurden
+        """
+        selection = self.backend.calibration_selection()
+        if selection is None:
+            return False
+        model_name, precision, created = selection
+        for settings_manager in (self.settings_manager, self.backend.settings_manager):
+            settings_manager.set_setting("model", model_name)
+            settings_manager.set_setting("model_precision", precision)
+            settings_manager.set_setting("calibration_applied", created)
+        self.options_panel.load_settings()
+        logger.info(f"Modell aus der Kalibrierung übernommen: {model_name} ({precision})")
+        return True
+
     @handle_exceptions
     def load_model_async(self, model_name: str) -> None:
         """
@@ -181,12 +211,15 @@ class WordweberGUI:
     @handle_exceptions
     def _load_model_thread(self, model_name: str) -> None:
         """
-        Thread-Funktion zum Laden des Whisper-Modells.
+        Thread-Funktion zum Laden des Whisper-Modells in der eingestellten Rechengenauigkeit.
 
         :param model_name: Name des zu ladenden Modells
         """
         try:
-            self.backend.load_transcriber_model(model_name)
+            precision = self.settings_manager.get_setting("model_precision", DEFAULT_MODEL_PRECISION)
+            self.backend.load_transcriber_model(model_name, precision)
+            if self.backend.transcriber.model_name != model_name:
+                return  # Inzwischen wurde ein anderes Modell gewählt
             self.root.after(0, lambda: self.main_window.update_status_bar(model=f"{model_name} - Geladen", status="Modell geladen", status_color="green"))
             if self.backend.pending_audio:
                 self.root.after(0, self.transcribe_and_update)
@@ -219,9 +252,12 @@ class WordweberGUI:
         current_text = self.transcription_panel.text_widget.get("1.0", tk.END).strip()
         self.settings_manager.set_setting_instant("text_content", current_text)
 
-        # Aufräumen des Transkriptionsmodells
-        if self.backend.transcriber.model is not None:
-            del self.backend.transcriber.model
+        # Wartende Aufnahmen des Archivs fertig schreiben
+        if self.backend.recording_archive is not None:
+            self.backend.recording_archive.wait_closed()
+
+        # Aufräumen der geladenen Transkriptionsmodelle
+        self.backend.model_pool.clear()
 
         # Speichern der aktuellen Fenstergeometrie
         self.save_current_geometry()
@@ -261,35 +297,6 @@ class WordweberGUI:
         Diese Methode orchestriert den gesamten Prozess der Transkription und GUI-Aktualisierung,
         wobei sie geschickt asynchrone Ausführung und Kapselung kombiniert.
         """
-        def update_gui(text: str, transcription_time: float) -> None:
-            """
-            Innere Funktion zur Aktualisierung der GUI nach der Transkription.
-
-            Diese Struktur kapselt die GUI-Update-Logik und verhindert unbeabsichtigte
-            externe Aufrufe, was die Integrität des Update-Prozesses gewährleistet.
-
-            :param text: Der transkribierte Text
-            :param transcription_time: Die für die Transkription benötigte Zeit
-            """
-            # Verarbeite den Text mit aktiven Plugins
-            processed_text = self.plugin_manager.process_text_with_plugins(text)
-
-            # Aktualisiere die Statusleiste mit dem Transkriptionsergebnis
-            self.main_window.update_status_bar(status="Transkription abgeschlossen", status_color="green", transcription_time=transcription_time)
-
-            # Verarbeite den Text entsprechend den aktuellen Einstellungen
-            self.input_processor.process_text(processed_text)
-
-            # Aktualisiere den Ausgabemodus in der Statusleiste
-            output_mode = self.options_panel.output_mode_var.get()
-            self.main_window.update_status_bar(output_mode=output_mode)
-
-            # Informiere den Benutzer über den Abschluss der Transkription und ggf. das Kopieren in die Zwischenablage
-            if self.main_window.auto_copy_var.get():
-                self.main_window.update_status_bar(status="Text transkribiert und in Zwischenablage kopiert", status_color="green")
-            else:
-                self.main_window.update_status_bar(status="Text transkribiert", status_color="green")
-
         # Informiere den Benutzer über den Beginn der Transkription
         self.main_window.update_status_bar(status="Transkribiere...", status_color="orange")
         logger.info("Starte Transkription")
@@ -301,7 +308,89 @@ class WordweberGUI:
 
         # Plane die GUI-Aktualisierung asynchron
         # Dies verhindert Blockieren der Hauptthread und gewährleistet eine reaktionsschnelle Benutzeroberfläche
-        self.root.after(0, lambda: update_gui(text, transcription_time))
+        self.root.after(0, lambda: self.output_transcription(text, transcription_time))
+
+    @handle_exceptions
+    def on_segment_transcribed(self, text: str, transcription_time: float) -> None:
+        """
+        Wird vom Transkriptions-Thread des Dauerdiktats für jedes Segment aufgerufen.
+
+        Die Ausgabe wird in den Tk-Hauptthread verlagert; die Reihenfolge der Segmente bleibt erhalten,
+        da root.after-Aufrufe in der Reihenfolge ihrer Einplanung ausgeführt werden.
+
+        :param text: Der transkribierte Text des Segments
+        :param transcription_time: Die für die Transkription benötigte Zeit
+        """
+        if text.strip():
+            self.root.after(0, lambda: self.output_transcription(text, transcription_time))
+
+    @handle_exceptions
+    def on_partial_transcription(self, committed: str, tentative: str) -> None:
+        """
+        Wird vom Thread der Live-Transkription mit jedem Zwischenstand aufgerufen.
+
+        Der Zwischenstand erscheint in der Statusleiste; in das Textfeld bzw. an den Cursor wird wie bisher
+        erst der vollständige Text nach dem Loslassen der Taste ausgegeben.
+
+        :param committed: Der bestätigte Text
+        :param tentative: Der vorläufige Text nach dem bestätigten Teil
+        """
+        text = f"{committed} {tentative}".strip()
+        if len(text) > LIVE_STATUS_CHARS:
+            text = "…" + text[-LIVE_STATUS_CHARS:]
+        self.root.after(0, lambda: self.main_window.update_status_bar(status=f"Live: {text}", status_color="red"))
+
+    @handle_exceptions
+    def on_keyword_detected(self, score: float) -> None:
+        """
+        Wird vom Aufnahme-Thread aufgerufen, sobald im Dauerdiktat das Schlüsselwort erkannt wurde.
+
+        :param score: Der Abstand zur ähnlichsten Vorlage
+        """
+        self.root.after(0, lambda: self.main_window.update_status_bar(status="Schlüsselwort erkannt, Diktat läuft...", status_color="red"))
+
+    @handle_exceptions
+    def on_audio_devices_changed(self, message: str) -> None:
+        """
+        Wird von der Geräteüberwachung aufgerufen, nachdem sich die Audiogeräte geändert haben.
+
+        :param message: Die Statusmeldung des AudioProcessors
+        """
+        self.root.after(0, lambda: self.main_window.update_status_bar(status=message, status_color="yellow"))
+
+    @handle_exceptions
+    def output_transcription(self, text: str, transcription_time: float) -> None:
+        """
+        Gibt einen transkribierten Text aus und aktualisiert die GUI.
+
+        Gemeinsamer Ausgabeweg für Push-to-Talk und Dauerdiktat; muss im Tk-Hauptthread laufen.
+
+        :param text: Der transkribierte Text
+        :param transcription_time: Die für die Transkription benötigte Zeit
+        """
+        if not text:
+            # Aufnahmen ohne erkannte Sprache werden nicht ausgegeben, die Zwischenablage bleibt unverändert
+            self.main_window.update_status_bar(status="Keine Sprache erkannt", status_color="yellow", transcription_time=transcription_time)
+            return
+
+        # Verarbeite den Text mit aktiven Plugins
+        processed_text = self.plugin_manager.process_text_with_plugins(text)
+
+        # Aktualisiere die Statusleiste mit dem Transkriptionsergebnis
+        self.main_window.update_status_bar(status="Transkription abgeschlossen", status_color="green", transcription_time=transcription_time)
+
+        # Verarbeite den Text entsprechend den aktuellen Einstellungen
+        self.input_processor.process_text(processed_text)
+
+        # Aktualisiere den Ausgabemodus in der Statusleiste
+        output_mode = self.options_panel.output_mode_var.get()
+        self.main_window.update_status_bar(output_mode=output_mode)
+
+        # Informiere den Benutzer über den Abschluss der Transkription und ggf. das Kopieren in die Zwischenablage
+        if self.main_window.auto_copy_var.get():
+            self.main_window.update_status_bar(status="Text transkribiert und in Zwischenablage kopiert", status_color="green")
+        else:
+            self.main_window.update_status_bar(status="Text transkribiert", status_color="green")
 
     @handle_exceptions
     def start_timer(self) -> None:
@@ -311,16 +400,24 @@ class WordweberGUI:
 
     @handle_exceptions
     def update_timer(self) -> None:
-        """Aktualisiert die Anzeige der Aufnahmedauer."""
+        """Aktualisiert die Anzeige der Aufnahmedauer und des Eingangspegels."""
         if self.backend.state.recording:
             elapsed_time = time.time() - self.input_processor.start_time
             self.main_window.update_status_bar(record_time=elapsed_time)
-            self.root.after(100, self.update_timer)
+            level_meter = self.backend.audio_processor.level_meter
+            reading = level_meter.latest()
+            self.main_window.update_level(reading)
+            if elapsed_time > LEVEL_SILENCE_WARN_SECONDS and level_meter.is_silent():
+                self.main_window.update_status_bar(status="Kein Eingangssignal - Esc bricht ab", status_color="yellow")
+            elif reading.clipped:
+                self.main_window.update_status_bar(status="Eingang übersteuert - Esc bricht ab", status_color="orange")
+            self.root.after(LEVEL_METER_UI_INTERVAL_MS, self.update_timer)
 
     @handle_exceptions
     def stop_timer(self) -> None:
         """Stoppt den Timer für die Aufnahmedauer."""
         self.main_window.update_status_bar(record_time=0.0)
+        self.main_window.update_level(None)
 
     @handle_exceptions
     def update_colors(self) -> None:
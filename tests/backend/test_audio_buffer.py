@@ -0,0 +1,169 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import threading
+import numpy as np
+from src.backend.audio_buffer import AudioRingBuffer, RecordingBuffer, spill_copy
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """
+    Testklasse für den AudioRingBuffer.
+    Überprüft Schreib-/Leseverhalten, Umbruch am Pufferende und Überlaufzählung.
+    """
+
+    def test_write_and_read(self):
+        """Testet, ob geschriebene Samples unverändert gelesen werden."""
+        ring = AudioRingBuffer(16)
+        data = np.arange(10, dtype=np.int16)
+        self.assertEqual(ring.write(data), 10)
+        self.assertEqual(ring.available(), 10)
+        np.testing.assert_array_equal(ring.read(), data)
+        self.assertEqual(ring.available(), 0)
+
+    def test_wraparound(self):
+        """Testet das Schreiben und Lesen über das Pufferende hinweg."""
+        ring = AudioRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        ring.read(4)
+        ring.write(np.arange(6, 12, dtype=np.int16))
+        np.testing.assert_array_equal(ring.read(), np.arange(4, 12, dtype=np.int16))
+
+    def test_overflow_drops_and_counts(self):
+        """Testet, ob bei vollem Puffer überzählige Samples verworfen und gezählt werden."""
+        ring = AudioRingBuffer(8)
+        self.assertEqual(ring.write(np.arange(12, dtype=np.int16)), 8)
+        self.assertEqual(ring.dropped_samples, 4)
+        np.testing.assert_array_equal(ring.read(), np.arange(8, dtype=np.int16))
+
+    def test_discard_to_keeps_newest(self):
+        """Testet, ob discard_to nur die neuesten Samples als Vorlauf behält."""
+        ring = AudioRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        self.assertEqual(ring.discard_to(2), 4)
+        self.assertEqual(ring.discard_to(5), 0)
+        np.testing.assert_array_equal(ring.read(), np.array([4, 5], dtype=np.int16))
+
+    def test_concurrent_producer_consumer(self):
+        """Testet die Übergabe zwischen einem Produzenten- und einem Konsumenten-Thread."""
+        ring = AudioRingBuffer(1024)
+        total = 50000
+        source = (np.arange(total) % 30000).astype(np.int16)
+        received = []
+
+        def producer():
+            pos = 0
+            while pos < total:
+                pos += ring.write(source[pos:pos + 100])
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        count = 0
+        while count < total:
+            chunk = ring.read()
+            received.append(chunk)
+            count += len(chunk)
+        thread.join()
+
+        np.testing.assert_array_equal(np.concatenate(received), source)
+        print("\nRingpuffer-Übergabe zwischen zwei Threads erfolgreich überprüft.")
+
+class TestRecordingBuffer(unittest.TestCase):
+    """
+    Testklasse für den RecordingBuffer.
+    Überprüft Wachstum, Wiederverwendung und die float32-Konvertierung.
+    """
+
+    def test_growth_keeps_data(self):
+        """Testet, ob beim Wachsen des Puffers alle Samples erhalten bleiben."""
+        buffer = RecordingBuffer(initial_capacity=4)
+        chunks = [np.arange(i * 3, i * 3 + 3, dtype=np.int16) for i in range(10)]
+        for chunk in chunks:
+            buffer.append(chunk.tobytes())
+        self.assertEqual(len(buffer), 30)
+        self.assertGreaterEqual(buffer.capacity, 30)
+        np.testing.assert_array_equal(buffer.view(), np.concatenate(chunks))
+
+    def test_reset_reuses_allocation(self):
+        """Testet, ob reset() den reservierten Speicher beibehält."""
+        buffer = RecordingBuffer(initial_capacity=8)
+        buffer.append(np.ones(100, dtype=np.int16))
+        capacity = buffer.capacity
+        buffer.reset()
+        self.assertEqual(len(buffer), 0)
+        buffer.append(np.ones(50, dtype=np.int16))
+        self.assertEqual(buffer.capacity, capacity)
+
+    def test_as_float32_matches_reference(self):
+        """Testet die float32-Konvertierung gegen die bisherige Umrechnung."""
+        samples = np.array([-32768, -1, 0, 1, 16384, 32767], dtype=np.int16)
+        buffer = RecordingBuffer()
+        buffer.append(samples)
+        expected = samples.astype(np.float32) / 32768.0
+        result = buffer.as_float32()
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_ring_buffer_drain_into(self):
+        """Testet die direkte Übergabe vom Ringpuffer in den Aufnahmepuffer."""
+        ring = AudioRingBuffer(8)
+        buffer = RecordingBuffer(initial_capacity=2)
+        ring.write(np.arange(6, dtype=np.int16))
+        ring.read(5)
+        ring.write(np.arange(6, 12, dtype=np.int16))
+        self.assertEqual(ring.drain_into(buffer), 7)
+        np.testing.assert_array_equal(buffer.view(), np.arange(5, 12, dtype=np.int16))
+
+    def test_spill_to_memmap(self):
+        """Testet, ob der Puffer über der Auslagerungsgrenze als memmap weitergeführt wird und nach reset() zurückkehrt."""
+        buf = RecordingBuffer(initial_capacity=256, spill_bytes=1024)
+        chunks = [np.arange(i * 300, (i + 1) * 300, dtype=np.int16) for i in range(10)]
+        for chunk in chunks:
+            buf.append(chunk)
+        self.assertTrue(buf.spilled)
+        self.assertIsInstance(buf.view(), np.memmap)
+        np.testing.assert_array_equal(buf.view(), np.concatenate(chunks))
+        np.testing.assert_allclose(buf.as_float32(), np.concatenate(chunks) / 32768.0, rtol=1e-6)
+
+        buf.reset()
+        self.assertFalse(buf.spilled)
+        buf.append(chunks[0])
+        self.assertNotIsInstance(buf.view(), np.memmap)
+        np.testing.assert_array_equal(buf.view(), chunks[0])
+
+    def test_spill_copy(self):
+        """Testet, ob spill_copy nur oberhalb der Grenze auslagert und eine eigenständige Kopie liefert."""
+        data = np.linspace(-1, 1, 1000, dtype=np.float32)
+        small = spill_copy(data, spill_bytes=data.nbytes)
+        large = spill_copy(data, spill_bytes=100)
+        self.assertNotIsInstance(small, np.memmap)
+        self.assertIsInstance(large, np.memmap)
+        data[:] = 0
+        np.testing.assert_array_equal(large, small)
+        self.assertEqual(float(large[-1]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# Zusätzliche Erklärungen:
+
+# 1. Überlauf:
+#    test_overflow_drops_and_counts stellt sicher, dass der Produzent bei vollem Puffer
+#    nicht blockiert, sondern verworfene Samples protokolliert.
+
+# 2. Nebenläufigkeit:
+#    Im Nebenläufigkeitstest wartet der Produzent nur, indem er erneut schreibt; es wird
+#    überprüft, dass trotz fehlender Sperren keine Samples verloren gehen oder vertauscht werden.
@@ -0,0 +1,166 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+import numpy as np
+from src.backend.audio_file import AudioFileReader, read_audio, _parse_flac_streaminfo
+from src.backend.resampler import resample
+
+
+def _wav_bytes(samples, sample_rate, format_tag, bits):
+    """Erzeugt eine WAV-Datei mit beliebigem Format (das wave-Modul schreibt nur Ganzzahl-PCM)."""
+    channels = samples.shape[1] if samples.ndim > 1 else 1
+    data = samples.tobytes()
+    if bits == 24:
+        as_int = samples.astype('<i4').reshape(-1, 1).view(np.uint8).reshape(-1, 4)
+        data = as_int[:, :3].tobytes()
+    block_align = channels * bits // 8
+    fmt = struct.pack('<HHIIHH', format_tag, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    body = b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    body += b'LIST' + struct.pack('<I', 3) + b'abc\x00'  # Unbekannter Block mit ungerader Länge
+    body += b'data' + struct.pack('<I', len(data)) + data
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+class _NonSeekable(io.RawIOBase):
+    """Dateiobjekt ohne Spulen, das wie eine Pipe nur kleine Teile liefert."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._data.read(min(size, 1000) if size and size > 0 else 1000)
+
+
+class TestAudioFile(unittest.TestCase):
+    """
+    Testklasse für das Einlesen von Audiodateien.
+    Überprüft WAV-Varianten, Roh-PCM, Dateiobjekte, memmap und das Resampling.
+    """
+
+    def setUp(self):
+        """Erzeugt ein Stereo-Testsignal mit 48 kHz."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.rate = 48000
+        t = np.arange(self.rate) / self.rate
+        left = 0.5 * np.sin(2 * np.pi * 440 * t)
+        right = 0.25 * np.sin(2 * np.pi * 660 * t)
+        self.stereo = np.stack([left, right], axis=1).astype(np.float32)
+        self.stereo_int16 = np.round(self.stereo * 32767).astype(np.int16)
+        self.mono = self.stereo_int16.astype(np.float32).mean(axis=1) / 32768.0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write_wav(self, name):
+        path = os.path.join(self.tmpdir, name)
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(self.rate)
+            wf.writeframes(self.stereo_int16.tobytes())
+        return path
+
+    def test_wav_path_is_memory_mapped_and_downmixed(self):
+        """Testet, ob eine WAV-Datei per memmap gelesen und korrekt auf Mono gemischt wird."""
+        path = self._write_wav('stereo.wav')
+        with AudioFileReader(path) as reader:
+            self.assertIsNotNone(reader._memmap)
+            self.assertEqual(reader.info.frames, self.rate)
+            self.assertEqual(reader.info.channels, 2)
+            samples = np.concatenate(list(reader.blocks(frames_per_block=4096)))
+        np.testing.assert_allclose(samples, self.mono, atol=1e-6)
+
+    def test_read_audio_matches_resampler(self):
+        """Testet, ob read_audio dasselbe Ergebnis wie das Resampling der gesamten Aufnahme liefert."""
+        path = self._write_wav('stereo.wav')
+        audio = read_audio(path, 16000)
+        reference = resample(self.mono, self.rate, 16000)
+        self.assertEqual(len(audio), 16000)
+        np.testing.assert_allclose(audio, reference, atol=1e-5)
+
+    def test_file_objects(self):
+        """Testet spulbare und nicht spulbare Dateiobjekte."""
+        path = self._write_wav('stereo.wav')
+        with open(path, 'rb') as f:
+            data = f.read()
+        from_path = read_audio(path, 16000)
+        np.testing.assert_allclose(read_audio(io.BytesIO(data), 16000), from_path, atol=1e-6)
+        np.testing.assert_allclose(read_audio(_NonSeekable(data), 16000, file_format='wav'), from_path, atol=1e-6)
+        with self.assertRaises(ValueError):
+            AudioFileReader(_NonSeekable(data))
+
+    def test_wav_sample_formats(self):
+        """Testet 24-Bit-PCM und 32-Bit-Gleitkomma-WAV."""
+        int24 = np.round(self.stereo * (2 ** 23 - 1)).astype(np.int32)
+        with AudioFileReader(io.BytesIO(_wav_bytes(int24, self.rate, 1, 24))) as reader:
+            self.assertEqual(reader.info.sample_format, 'int24')
+            samples = np.concatenate(list(reader.blocks()))
+        np.testing.assert_allclose(samples, self.stereo.mean(axis=1), atol=1e-6)
+
+        path = os.path.join(self.tmpdir, 'float.wav')
+        with open(path, 'wb') as f:
+            f.write(_wav_bytes(self.stereo, self.rate, 3, 32))
+        with AudioFileReader(path) as reader:
+            self.assertEqual(reader.info.sample_format, 'float32')
+            self.assertIsNotNone(reader._memmap)
+            samples = np.concatenate(list(reader.blocks()))
+        np.testing.assert_allclose(samples, self.stereo.mean(axis=1), atol=1e-6)
+
+    def test_raw_pcm(self):
+        """Testet Roh-PCM aus Datei und Dateiobjekt."""
+        path = os.path.join(self.tmpdir, 'stereo.raw')
+        self.stereo_int16.tofile(path)
+        with self.assertRaises(ValueError):
+            AudioFileReader(path)  # Ohne Abtastrate nicht lesbar
+        from_path = read_audio(path, 16000, sample_rate=self.rate, channels=2)
+        from_stream = read_audio(io.BytesIO(self.stereo_int16.tobytes()), 16000, sample_rate=self.rate, channels=2)
+        np.testing.assert_allclose(from_path, from_stream, atol=1e-6)
+        np.testing.assert_allclose(from_path, resample(self.mono, self.rate, 16000), atol=1e-5)
+
+    def test_flac_streaminfo(self):
+        """Testet das Auslesen des STREAMINFO-Blocks einer FLAC-Datei."""
+        packed = (44100 << 44) | ((2 - 1) << 41) | ((16 - 1) << 36) | 123456
+        streaminfo = bytes(10) + packed.to_bytes(8, 'big') + bytes(16)
+        header = b'fLaC' + bytes([0x80, 0, 0, 34]) + streaminfo
+        self.assertEqual(_parse_flac_streaminfo(header), (44100, 2, 123456))
+        with self.assertRaises(ValueError):
+            _parse_flac_streaminfo(b'RIFF' + bytes(38))
+
+    @unittest.skipUnless(shutil.which('ffmpeg'), "ffmpeg nicht installiert")
+    def test_flac_roundtrip(self):
+        """Testet das Dekodieren einer mit ffmpeg erzeugten FLAC-Datei."""
+        import subprocess
+        wav_path = self._write_wav('stereo.wav')
+        flac_path = os.path.join(self.tmpdir, 'stereo.flac')
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-i', wav_path, flac_path], check=True)
+        audio = read_audio(flac_path, 16000)
+        np.testing.assert_allclose(audio, read_audio(wav_path, 16000), atol=1e-3)
+        with open(flac_path, 'rb') as f:
+            from_stream = read_audio(io.BytesIO(f.read()), 16000)
+        np.testing.assert_allclose(from_stream, audio, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
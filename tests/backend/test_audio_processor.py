@@ -16,7 +16,10 @@
 
 import unittest
 from src.backend.audio_processor import AudioProcessor
+import pyaudio
 from unittest.mock import MagicMock
+from types import SimpleNamespace
+from src.backend.audio_buffer import RecordingBuffer
 import io
 import sys
 import numpy as np
@@ -46,11 +49,13 @@ class TestAudioProcessor(unittest.TestCase):
         """Testet die Methode zur Auflistung von Audiogeräten."""
         # Mocking PyAudio, da wir nicht auf echte Hardware zugreifen wollen in Tests
         self.processor.p = MagicMock()
-        self.processor.p.get_host_api_info_by_index.return_value = {'deviceCount': 2}
-        self.processor.p.get_device_info_by_host_api_device_index.side_effect = [
+        self.processor.p.get_device_count.return_value = 2
+        self.processor.p.get_device_info_by_index.side_effect = [
             {'maxInputChannels': 2, 'name': 'Test Device 1'},
             {'maxInputChannels': 0, 'name': 'Test Device 2'}
         ]
+        self.processor.p.get_default_input_device_info.return_value = {'index': 0}
+        self.processor.device_registry.refresh(self.processor.p)
 
         # Umleiten der Standardausgabe zum Testen
         captured_output = io.StringIO()
@@ -120,7 +125,7 @@ class TestAudioProcessor(unittest.TestCase):
         audio_normalized = audio_array.astype(np.float32) / 32768.0
 
         # Führe das Resampling durch
-        resampled_audio = self.processor.resample_audio(audio_normalized)
+        resampled_audio = self.processor.resample_audio(audio_normalized, sample_rate)
 
         # Überprüfe die grundlegenden Eigenschaften des resampled Audios
         self.assertIsInstance(resampled_audio, np.ndarray)
@@ -141,6 +146,142 @@ class TestAudioProcessor(unittest.TestCase):
                                delta=50)  # Erlaubt eine größere Abweichung für reale Audiodaten
         print("\nVerarbeitung des realen Audiosamples wurde erfolgreich durchgeführt und überprüft.")
 
+    def test_select_capture_rate_prefers_cheapest_conversion(self):
+        """Testet, ob die Aufnahmerate mit der günstigsten Umrechnung auf 16 kHz gewählt wird."""
+        self.mock_settings_manager.get_setting.return_value = True
+        self.processor.p = MagicMock()
+        cases = [
+            ({44100, 48000}, 48000),
+            ({44100, 48000, 96000}, 48000),
+            ({32000, 48000}, 32000),
+            ({16000, 44100, 48000}, 16000),
+            ({44100}, 44100),
+            (set(), 44100),
+        ]
+        for supported, expected in cases:
+            def is_format_supported(rate, **kwargs):
+                if rate in supported:
+                    return True
+                raise ValueError("Invalid sample rate")
+            self.processor.p.is_format_supported.side_effect = is_format_supported
+            self.processor._supported_rates.clear()
+            self.assertEqual(self.processor.select_capture_rate(), expected, supported)
+        print("\nAufnahmerate wurde korrekt ausgehandelt.")
+
+    def test_supported_rates_are_cached_per_device(self):
+        """Testet, ob die Geräteabfrage je Gerät nur einmal durchgeführt wird."""
+        self.processor.p = MagicMock()
+        self.processor.p.is_format_supported.return_value = True
+        self.processor._supported_rates.clear()
+        self.processor.get_supported_rates(0)
+        calls = self.processor.p.is_format_supported.call_count
+        self.processor.get_supported_rates(0)
+        self.assertEqual(self.processor.p.is_format_supported.call_count, calls)
+        self.processor.get_supported_rates(1)
+        self.assertGreater(self.processor.p.is_format_supported.call_count, calls)
+
+    def test_warm_stream_recording_includes_preroll(self):
+        """Testet, ob eine Aufnahme aus dem offenen Stream mit dem Vorlauf beginnt, ohne das Gerät neu zu öffnen."""
+        self.mock_settings_manager.get_setting.side_effect = lambda key, default=None: (
+            "callback" if key == "capture_mode" else default)
+        self.processor.open_audio_stream = MagicMock(return_value=MagicMock())
+        self.assertTrue(self.processor.start_warm_stream())
+
+        samples = np.arange(self.processor.RATE, dtype=np.int32).astype(np.int16)
+        self.processor._audio_callback(samples.tobytes(), len(samples), {}, 0)
+        state = SimpleNamespace(recording=False, audio_data=RecordingBuffer(),
+                                resampled_audio=RecordingBuffer(dtype=np.float32), segmenter=None)
+        self.processor.record_audio(state)
+
+        preroll = self.processor._preroll_samples()
+        np.testing.assert_array_equal(state.audio_data.view(), samples[-preroll:])
+        self.assertEqual(state.capture_metrics["dropped_samples"], 0)
+        self.assertEqual(self.processor.open_audio_stream.call_count, 1)
+        self.processor.stop_warm_stream()
+        print(f"\nAufnahme aus offenem Stream mit {preroll} Samples Vorlauf überprüft.")
+
+    def _fake_devices(self, names):
+        """Ersetzt PyAudio durch ein Mock mit den gegebenen Eingabegeräten und liest es ein."""
+        self.processor.p = MagicMock()
+        self.processor.p.get_device_count.return_value = len(names)
+        self.processor.p.get_device_info_by_index.side_effect = lambda i: {'name': names[i], 'maxInputChannels': 1}
+        self.processor.p.get_default_input_device_info.return_value = {'index': 0}
+        self.processor.device_registry.refresh(self.processor.p)
+
+    def test_device_found_by_name_after_index_change(self):
+        """Testet, ob das gewählte Gerät nach einer Verschiebung der Indizes anhand des Namens wiedergefunden wird."""
+        settings = {"audio_device_name": "USB-Mikrofon", "audio_device_index": 1}
+        self.mock_settings_manager.get_setting.side_effect = lambda key, default=None: settings.get(key, default)
+        self._fake_devices(["Intern", "Webcam", "USB-Mikrofon"])
+        self.assertEqual(self.processor.get_device_index(), 2)
+
+        # Gerät entfernt: Rückfall auf das Standardgerät, der gespeicherte Name bleibt erhalten
+        self._fake_devices(["Intern", "Webcam"])
+        self.assertEqual(self.processor.get_device_index(), 0)
+        self.mock_settings_manager.set_setting.assert_any_call("audio_device_index", 0)
+        self.assertNotIn("audio_device_name", [c.args[0] for c in self.mock_settings_manager.set_setting.call_args_list])
+        print("\nGerätezuordnung über den Namen überprüft.")
+
+    def test_hardware_change_is_deferred_during_recording(self):
+        """Testet, ob eine Geräteänderung während einer Aufnahme erst nach deren Ende verarbeitet wird."""
+        self.processor.reinitialize = MagicMock()
+        self.processor._recording = True
+        self.processor._on_hardware_change()
+        self.processor.reinitialize.assert_not_called()
+        self.assertTrue(self.processor._devices_changed_pending)
+
+        self.processor._recording = False
+        self.processor._on_hardware_change()
+        self.processor.reinitialize.assert_called_once()
+        self.assertFalse(self.processor._devices_changed_pending)
+
+    def test_process_mode_keeps_stream_open(self):
+        """Testet, ob der Aufnahmeprozess im Modus "process" auch ohne "warm_stream" geöffnet bleibt."""
+        settings = {"capture_mode": "process", "warm_stream": False}
+        self.mock_settings_manager.get_setting.side_effect = lambda key, default=None: settings.get(key, default)
+        self.processor.start_warm_stream = MagicMock(return_value=True)
+        self.processor.stop_warm_stream = MagicMock()
+        self.assertTrue(self.processor.keeps_stream_open())
+        self.processor.set_warm_stream(False)
+        self.processor.start_warm_stream.assert_called_once()
+        self.processor.stop_warm_stream.assert_not_called()
+
+        settings["capture_mode"] = "callback"
+        self.assertFalse(self.processor.keeps_stream_open())
+        self.processor.set_warm_stream(False)
+        self.processor.stop_warm_stream.assert_called_once()
+
+    def test_callback_counts_overflows(self):
+        """Testet, ob vom Gerät gemeldete Überläufe in den Aufnahme-Metriken gezählt werden."""
+        chunk = np.zeros(1024, dtype=np.int16).tobytes()
+        self.processor._audio_callback(chunk, 1024, {}, 0)
+        self.processor._audio_callback(chunk, 1024, {}, pyaudio.paInputOverflow)
+        metrics = self.processor.get_capture_metrics()
+        self.assertEqual(metrics["chunks"], 2)
+        self.assertEqual(metrics["overflows"], 1)
+        self.assertFalse(metrics["healthy"])
+
+    def test_stereo_only_device_is_downmixed(self):
+        """Testet, ob ein Gerät ohne Mono-Unterstützung mit allen Kanälen geöffnet und im Callback gemischt wird."""
+        self._fake_devices(["Stereo-Interface"])
+        self.processor.p.get_device_info_by_index.side_effect = lambda i: {'name': 'Stereo-Interface', 'maxInputChannels': 2}
+        self.processor.device_registry.refresh(self.processor.p)
+        self.processor.current_device_index = 0
+
+        def open_stream(channels, **kwargs):
+            if channels == 1:
+                raise IOError(-9998, "Invalid number of channels")
+            return MagicMock()
+        self.processor.p.open.side_effect = open_stream
+        self.processor.open_audio_stream(stream_callback=self.processor._audio_callback)
+        self.assertEqual(self.processor.p.open.call_args.kwargs["channels"], 2)
+
+        self.processor.ring_buffer.reset()
+        stereo = np.array([[1000, 3000], [-2000, 0], [500, 501]], dtype=np.int16)
+        self.processor._audio_callback(stereo.tobytes(), len(stereo), {}, 0)
+        np.testing.assert_array_equal(self.processor.ring_buffer.read(), [2000, -1000, 500])
+        print("\nStereo-Gerät wird mit zwei Kanälen geöffnet und gemischt.")
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -24,6 +24,7 @@ import wave
 import os
 import numpy as np
 from src.config import AUDIO_CHUNK, AUDIO_FORMAT, AUDIO_CHANNELS, AUDIO_RATE, DEVICE_INDEX
+from src.backend.audio_source import VirtualAudioSource
 
 class TestAudioRecording(unittest.TestCase):
     """
@@ -86,6 +87,32 @@ class TestAudioRecording(unittest.TestCase):
 
         print("\nAudioaufnahme wurde erfolgreich durchgeführt, gespeichert und überprüft.")
 
+    def test_audio_recording_virtual(self):
+        """
+        Testet denselben Ablauf mit einem virtuellen Mikrofon, das auch ohne Audiohardware läuft.
+        Das Signal wird beschleunigt geliefert und muss unverändert in der WAV-Datei ankommen.
+        """
+        source = VirtualAudioSource.sine(seconds=self.RECORD_SECONDS, sample_rate=AUDIO_RATE, speed=50)
+        stream = source.open(format=AUDIO_FORMAT, channels=AUDIO_CHANNELS, rate=AUDIO_RATE, input=True,
+                             input_device_index=0, frames_per_buffer=AUDIO_CHUNK)
+        frames = [stream.read(AUDIO_CHUNK, exception_on_overflow=False)
+                  for _ in range(0, int(AUDIO_RATE / AUDIO_CHUNK * self.RECORD_SECONDS))]
+        stream.stop_stream()
+        stream.close()
+        source.terminate()
+
+        with wave.open(self.WAVE_OUTPUT_FILENAME, 'wb') as wf:
+            wf.setnchannels(AUDIO_CHANNELS)
+            wf.setsampwidth(source.get_sample_size(AUDIO_FORMAT))
+            wf.setframerate(AUDIO_RATE)
+            wf.writeframes(b''.join(frames))
+
+        with wave.open(self.WAVE_OUTPUT_FILENAME, 'rb') as wf:
+            self.assertEqual(wf.getframerate(), AUDIO_RATE)
+            audio_data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        np.testing.assert_array_equal(audio_data, source.samples[:len(audio_data), 0])
+        print("\nVirtuelle Audioaufnahme wurde erfolgreich durchgeführt, gespeichert und überprüft.")
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -93,7 +120,8 @@ if __name__ == '__main__':
 
 # 1. PyAudio Setup:
 #    Wir verwenden PyAudio, um auf die Audiogeräte des Systems zuzugreifen und Audiostreams zu öffnen.
-#    Dies ermöglicht realistische Tests der Audioaufnahmefunktionalität.
+#    Dies ermöglicht realistische Tests der Audioaufnahmefunktionalität. test_audio_recording_virtual
+#    prüft denselben Ablauf mit einer VirtualAudioSource und läuft damit auch ohne Audiohardware.
 
 # 2. Temporäre Datei:
 #    Der Test erstellt eine temporäre WAV-Datei, um die aufgenommenen Audiodaten zu speichern.
@@ -0,0 +1,134 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+import numpy as np
+import pyaudio
+from src.backend.audio_processor import AudioProcessor
+from src.backend.audio_buffer import RecordingBuffer
+from src.backend.audio_source import VirtualAudioSource
+from src.backend.resampler import resample
+from src.config import AUDIO_CHUNK, AUDIO_FORMAT
+
+
+class _Settings:
+    """Einfacher SettingsManager mit festen Werten."""
+
+    def __init__(self, **values):
+        self.values = {"device_monitoring": False, "warm_stream": False, "negotiate_capture_rate": True,
+                       "highpass_enabled": False, "agc_enabled": False, "audio_device_index": 0}
+        self.values.update(values)
+
+    def get_setting(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set_setting(self, key, value):
+        self.values[key] = value
+
+    def save_settings(self):
+        pass
+
+
+class TestVirtualAudioSource(unittest.TestCase):
+    """
+    Testklasse für die VirtualAudioSource.
+    Überprüft Aufnahmen über den AudioProcessor ohne Hardware, Tempo, Jitter und injizierte Überläufe.
+    """
+
+    def setUp(self):
+        """Erzeugt eine Sekunde Testsignal mit 48 kHz."""
+        self.rate = 48000
+        t = np.arange(self.rate) / self.rate
+        self.signal = (0.4 * np.sin(2 * np.pi * 440 * t) + 0.1 * np.sin(2 * np.pi * 3000 * t)).astype(np.float32)
+
+    def _record(self, source, **settings):
+        """Nimmt über einen AudioProcessor auf, bis die Quelle das Signal vollständig geliefert hat."""
+        processor = AudioProcessor(_Settings(**settings), audio_source_factory=lambda: source)
+        self.assertEqual(processor.RATE, self.rate)  # Die Rate wird mit dem virtuellen Gerät ausgehandelt
+        state = SimpleNamespace(recording=True, audio_data=RecordingBuffer(),
+                                resampled_audio=RecordingBuffer(dtype=np.float32), segmenter=None)
+        recorder = threading.Thread(target=processor.record_audio, args=(state,))
+        recorder.start()
+        self.assertTrue(source.wait_played(timeout=10))
+        state.recording = False
+        recorder.join()
+        processor.cleanup()
+        return state
+
+    def test_callback_recording_at_accelerated_pace(self):
+        """Testet eine Callback-Aufnahme mit zehnfachem Tempo: Samples, Resampling und Metriken."""
+        source = VirtualAudioSource(self.signal, sample_rate=self.rate, speed=10)
+        state = self._record(source, capture_mode="callback")
+
+        expected = np.round(self.signal * 32767).astype(np.int16)
+        recorded = state.audio_data.view()
+        np.testing.assert_array_equal(recorded[:len(expected)], expected)
+        self.assertTrue(np.all(recorded[len(expected):] == 0))  # Nach dem Signal folgt Stille
+        reference = resample(recorded.astype(np.float32) / 32768, self.rate, 16000)
+        np.testing.assert_allclose(state.resampled_audio.view(), reference, atol=1e-4)
+        self.assertEqual(state.capture_metrics["overflows"], 0)
+        self.assertEqual(state.capture_metrics["dropped_samples"], 0)
+        self.assertLess(state.capture_metrics["duration_s"], 0.5)
+        print(f"\nVirtuelle Aufnahme: {len(recorded)} Samples in {state.capture_metrics['duration_s']} s")
+
+    def test_blocking_recording_with_injected_overflows(self):
+        """Testet, ob injizierte Überläufe im blockierenden Modus wie bei einem Gerät Audio verlieren."""
+        source = VirtualAudioSource(self.signal, sample_rate=self.rate, speed=20, overflow_every=3)
+        state = self._record(source, capture_mode="blocking")
+
+        recorded = state.audio_data.view()
+        expected = np.round(self.signal * 32767).astype(np.int16)
+        np.testing.assert_array_equal(recorded[:2 * AUDIO_CHUNK], expected[:2 * AUDIO_CHUNK])
+        # Der dritte Chunk ging verloren, der vierte folgt unmittelbar auf den zweiten
+        np.testing.assert_array_equal(recorded[2 * AUDIO_CHUNK:3 * AUDIO_CHUNK], expected[3 * AUDIO_CHUNK:4 * AUDIO_CHUNK])
+        self.assertGreater(state.capture_metrics["chunks"], 0)
+
+    def test_jitter_and_overflow_flags_reach_callback(self):
+        """Testet Jitter und Überlaufkennzeichen direkt am Callback des Streams."""
+        source = VirtualAudioSource.sine(seconds=0.5, sample_rate=self.rate, jitter_ms=8, overflow_every=4)
+        arrivals, flags, times = [], [], []
+        done = threading.Event()
+
+        def callback(in_data, frame_count, time_info, status_flags):
+            arrivals.append(len(in_data) // 2)
+            flags.append(status_flags)
+            times.append(time.perf_counter())
+            if len(flags) == 8:
+                done.set()
+            return (None, pyaudio.paContinue)
+
+        stream = source.open(format=AUDIO_FORMAT, channels=1, rate=self.rate, input=True,
+                             frames_per_buffer=1024, stream_callback=callback)
+        self.assertTrue(done.wait(timeout=5))
+        stream.stop_stream()
+        self.assertEqual(arrivals[:8], [1024] * 8)
+        self.assertEqual([bool(f & pyaudio.paInputOverflow) for f in flags[:8]], [False, False, False, True] * 2)
+        # Ohne Jitter wären die Abstände konstant (bei Überläufen doppelt so lang)
+        gaps = np.diff(times[:8]) - np.array([1, 1, 2, 1, 1, 1, 2]) * 1024 / self.rate
+        self.assertGreater(np.max(np.abs(gaps)), 0.001)
+
+        with self.assertRaises(IOError) as context:
+            source.open(format=AUDIO_FORMAT, channels=1, rate=44100, input=True, frames_per_buffer=1024)
+        self.assertEqual(context.exception.errno, -9997)
+        with self.assertRaises(IOError) as context:
+            source.open(format=AUDIO_FORMAT, channels=2, rate=self.rate, input=True, frames_per_buffer=1024)
+        self.assertEqual(context.exception.errno, -9998)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import torch
+from src.backend.calibration import (Calibrator, calibration_audio, thread_candidates, load_profile, save_profile,
+                                     profile_entry)
+
+RATE = 16000
+REFERENCE = "Das ist ein Test"
+# Simulierte Latenz für 3 s Sprache mit einem Thread und Beam 5 in Sekunden
+BASE_LATENCY = {"medium": 9.0, "small": 3.0, "base": 1.2, "tiny": 0.6}
+PRECISION_FACTOR = {"fp32": 1.0, "int8": 0.45}
+BEAM_FACTOR = {5: 1.0, 2: 0.7, None: 0.5}
+
+
+class _Clock:
+    """Zeitquelle, die nur durch die simulierten Transkriptionen fortschreitet."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeTranscriber:
+    """Simuliert die Laufzeit: schneller mit bis zu vier Threads, danach wieder langsamer; tiny erkennt schlecht."""
+
+    def __init__(self, model_name, precision, clock, threads):
+        self.model_name = model_name
+        self.precision = precision
+        self.clock = clock
+        self.threads = threads
+        self.decode_overrides = {}
+        self.released = False
+
+    def transcribe(self, audio, language):
+        threads = self.threads[0]
+        speedup = min(threads, 4) ** 0.8 * (0.9 if threads > 4 else 1.0)
+        beam = self.decode_overrides.get("beam_size", 5)
+        latency = BASE_LATENCY[self.model_name] * PRECISION_FACTOR[self.precision] * BEAM_FACTOR[beam] / speedup
+        self.clock.now += latency * len(audio) / (3 * RATE)
+        return "Das ist Fest" if self.model_name == "tiny" else "Das ist ein Test."
+
+    def release_resources(self):
+        self.released = True
+
+
+class TestCalibration(unittest.TestCase):
+    """
+    Testklasse für die Kalibrierung.
+    Überprüft die Auswahl von Modell, Genauigkeit, Threads und Beam-Größe sowie das gespeicherte Profil.
+    """
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.threads = [1]
+        self.loaded = []
+
+        def factory(model_name, precision):
+            transcriber = _FakeTranscriber(model_name, precision, self.clock, self.threads)
+            self.loaded.append(transcriber)
+            return transcriber
+
+        def set_threads(count):
+            self.threads[0] = count
+
+        self.calibrator = Calibrator(factory, set_threads, self.clock)
+        self.sample = np.ones(int(1.5 * RATE), dtype=np.float32)
+
+    def test_selects_most_accurate_model_meeting_target(self):
+        """Testet, ob das genaueste Modell mit der schnellsten Thread-Zahl und der größten ausreichenden Beam-Größe gewählt wird."""
+        original_threads = torch.get_num_threads()
+        profile = self.calibrator.run(self.sample, REFERENCE, target_latency=1.0, audio_seconds=3.0,
+                                      threads=[1, 2, 4, 8], runs=2)
+        # medium/int8: 9 * 0,45 / 4^0,8 = 1,37 s mit Beam 5, 0,96 s mit Beam 2
+        self.assertEqual(profile["selected"], "medium/int8")
+        entry = profile_entry(profile, "medium/int8")
+        self.assertEqual(entry["threads"], 4)
+        self.assertEqual(entry["beam_size"], 2)
+        self.assertTrue(entry["meets_target"])
+        self.assertLessEqual(entry["latency"], 1.0)
+        self.assertFalse(profile["models"]["medium"]["meets_target"])
+        self.assertEqual(profile["threads"], 4)
+        self.assertEqual(self.threads[0], original_threads)  # Ursprüngliche Thread-Zahl wiederhergestellt
+        self.assertTrue(all(transcriber.released for transcriber in self.loaded))
+        self.assertNotIn("small", profile["models"])  # Nach dem Treffer werden keine kleineren Modelle gemessen
+        print(f"\nKalibrierung: {profile['selected']} mit {entry['threads']} Threads, Beam {entry['beam_size']}, "
+              f"{entry['latency']:.2f} s, {len(profile['measurements'])} Messungen")
+
+    def test_unreachable_target_picks_fastest_accurate_model(self):
+        """Testet, ob ohne erreichbares Ziel das schnellste ausreichend genaue Modell gewählt wird."""
+        profile = self.calibrator.run(self.sample, REFERENCE, target_latency=0.01, audio_seconds=3.0,
+                                      threads=[1, 4], runs=1)
+        self.assertEqual(profile["selected"], "base/int8")  # tiny ist schneller, aber zu ungenau
+        self.assertNotIn("tiny", profile["models"])
+        self.assertFalse(profile_entry(profile, "base/int8")["meets_target"])
+
+    def test_helpers_and_profile_roundtrip(self):
+        """Testet Thread-Kandidaten, die Länge der Messaufnahme und Speichern/Laden des Profils."""
+        self.assertEqual(thread_candidates(8), [1, 2, 4, 8])
+        self.assertEqual(thread_candidates(6), [1, 2, 3, 4, 6])
+        self.assertEqual(thread_candidates(1), [1])
+        self.assertEqual(len(calibration_audio(self.sample, 3.0)), 3 * RATE)
+
+        profile = self.calibrator.run(self.sample, REFERENCE, target_latency=5.0, audio_seconds=3.0,
+                                      models=["small"], precisions=["fp32"], threads=[2], runs=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "calibration_profile.json")
+            self.assertIsNone(load_profile(path))
+            save_profile(profile, path)
+            loaded = load_profile(path)
+        self.assertEqual(loaded["selected"], "small")
+        self.assertEqual(loaded["models"]["small"]["beam_size"], 5)
+        self.assertIsNone(profile_entry(loaded, "medium"))
+        self.assertIsNone(profile_entry(None, "small"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+from src.backend.capture_metrics import CaptureMetrics
+
+class TestCaptureMetrics(unittest.TestCase):
+    """
+    Testklasse für die CaptureMetrics.
+    Überprüft die Zählung von Überläufen, kurzen Chunks, verspäteten Reads und Jitter mit vorgegebenen Zeitpunkten.
+    """
+
+    def setUp(self):
+        """Erzeugt Metriken für 1000 Samples je Chunk bei 10 kHz (100 ms je Chunk)."""
+        self.metrics = CaptureMetrics(sample_rate=10000, chunk_size=1000)
+
+    def test_chunk_accounting(self):
+        """Testet Überläufe, kurze Chunks und Jitter der Chunk-Ankunft."""
+        self.metrics.record_chunk(1000, now=0.0)
+        self.metrics.record_chunk(1000, now=0.1)
+        self.metrics.record_chunk(1000, overflow=True, now=0.25)  # 50 ms zu spät
+        self.metrics.record_chunk(500, now=0.35)
+        m = self.metrics.as_dict()
+        self.assertEqual(m["chunks"], 4)
+        self.assertEqual(m["overflows"], 1)
+        self.assertEqual(m["short_chunks"], 1)
+        self.assertAlmostEqual(m["jitter_max_ms"], 50.0, places=3)
+        self.assertAlmostEqual(m["jitter_mean_ms"], 50.0 / 3, places=1)
+        self.assertFalse(m["healthy"])
+
+    def test_read_accounting(self):
+        """Testet verspätete Reads, Rückstand und verworfene Samples."""
+        for t in (0.0, 0.05, 0.1, 0.9, 0.95):
+            self.metrics.record_read(backlog=int(t * 1000), now=t)
+        self.metrics.finish(dropped_samples=2000)
+        m = self.metrics.as_dict()
+        self.assertEqual(m["reads"], 5)
+        self.assertEqual(m["late_reads"], 1)
+        self.assertAlmostEqual(m["max_read_gap_ms"], 800.0)
+        self.assertEqual(m["dropped_ms"], 200.0)
+        self.assertIn("verspätete Reads", self.metrics.summary())
+        print("\n" + self.metrics.summary())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+from multiprocessing import shared_memory
+import numpy as np
+from src.backend.audio_buffer import RecordingBuffer
+from src.backend.capture_metrics import CaptureMetrics
+from src.backend.capture_process import CaptureProcess, SharedAudioRingBuffer
+from src.config import PROJECT_ROOT
+
+# Produzent in einem eigenen Interpreter: schreibt eine fortlaufende Zahlenfolge in 100 Chunks
+_PRODUCER = """
+import sys, time
+import numpy as np
+from src.backend.capture_process import SharedAudioRingBuffer
+ring = SharedAudioRingBuffer(int(sys.argv[2]), name=sys.argv[1])
+for i in range(100):
+    chunk = (np.arange(i * 512, (i + 1) * 512) % 32768).astype(np.int16)
+    while ring.free_space() < len(chunk):
+        time.sleep(0.001)
+    ring.write(chunk)
+ring.close()
+"""
+
+
+class TestCaptureProcess(unittest.TestCase):
+    """
+    Testklasse für die Aufnahme in einem eigenen Prozess.
+    Überprüft den Ringpuffer im gemeinsamen Speicher über Prozessgrenzen, die Metriken und Startfehler.
+    """
+
+    def test_ring_buffer_across_processes(self):
+        """Testet, ob ein anderer Prozess lückenlos in den gemeinsamen Ringpuffer schreibt."""
+        ring = SharedAudioRingBuffer(2048)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+        producer = subprocess.Popen([sys.executable, "-c", _PRODUCER, ring.name, str(ring.capacity)], env=env)
+        target = RecordingBuffer()
+        while producer.poll() is None:
+            ring.drain_into(target)
+            time.sleep(0.002)
+        ring.drain_into(target)
+        self.assertEqual(producer.returncode, 0)
+        np.testing.assert_array_equal(target.view(), np.arange(51200) % 32768)
+        self.assertEqual(ring.dropped_samples, 0)
+
+        name = ring.name
+        ring.close()
+        self.assertIsNone(ring.name)
+        self.assertEqual(ring.available(), 0)  # Nach close() bleibt der Puffer lokal lesbar
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_metrics_generation(self):
+        """Testet, ob der Produzent seine Chunk-Zähler erst nach einer Anforderung zurücksetzt."""
+        ring = SharedAudioRingBuffer(1024)
+        producer_view = SharedAudioRingBuffer(1024, name=ring.name)
+        try:
+            produced = CaptureMetrics(48000, 512)
+            produced.record_chunk(512, overflow=True)
+            producer_view.publish_metrics(produced)
+
+            ring.reset_metrics()
+            self.assertTrue(producer_view.metrics_requested())
+            collected = CaptureMetrics(48000, 512)
+            ring.collect_metrics(collected)
+            self.assertEqual(collected.chunks, 0)  # Zähler der vorherigen Aufnahme werden nicht übernommen
+
+            produced = CaptureMetrics(48000, 512)
+            produced.record_chunk(256)
+            producer_view.publish_metrics(produced)
+            ring.collect_metrics(collected)
+            self.assertEqual((collected.chunks, collected.overflows, collected.short_chunks), (1, 0, 1))
+        finally:
+            producer_view.close()
+            ring.close()
+
+    def test_open_failure_raises_ioerror(self):
+        """Testet, ob ein nicht zu öffnendes Gerät als IOError gemeldet und alles aufgeräumt wird."""
+        with self.assertRaises(IOError):
+            CaptureProcess(device_index=9999, rate=48000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.backend.channel_mixer import ChannelMixer, estimate_offsets
+
+RATE = 48000
+
+
+def _process_in_chunks(mixer, interleaved, channels, chunk_size):
+    """Verarbeitet verschachtelte Samples chunkweise und kopiert jedes Ergebnis wie der Ringpuffer."""
+    step = chunk_size * channels
+    return np.concatenate([mixer.process(interleaved[i:i + step].tobytes()).copy()
+                           for i in range(0, len(interleaved), step)])
+
+
+class TestChannelMixer(unittest.TestCase):
+    """
+    Testklasse für den ChannelMixer.
+    Überprüft Mischen, Kanalauswahl und Delay-and-Sum für Mikrofonarrays.
+    """
+
+    def setUp(self):
+        """Erzeugt ein Sprachsignal, das vier Mikrofone mit unterschiedlicher Verzögerung erreicht."""
+        rng = np.random.default_rng(1)
+        n = RATE * 2
+        self.speech = rng.standard_normal(n + 100) * 3000  # breitbandig wie Sprache
+        self.delays = [0, 7, 19, 31]
+        channels = []
+        for delay in self.delays:
+            delayed = self.speech[100 - delay:100 - delay + n]  # Kanal c hört das Signal delay Samples später
+            channels.append(delayed + rng.standard_normal(n) * 3000)  # unkorreliertes Rauschen je Mikrofon
+        self.array = np.clip(np.stack(channels, axis=1), -32768, 32767).astype(np.int16)
+        self.clean = self.speech[100:100 + n]
+
+    def test_mix_and_select(self):
+        """Testet Mittelwert aller Kanäle und die Auswahl eines Kanals ohne Kopie."""
+        frames = np.array([[100, 300, -200, 0], [1, 2, 3, 4]], dtype=np.int16)
+        mixed = ChannelMixer(4, "mix").process(frames.tobytes())
+        np.testing.assert_array_equal(mixed, [50, 2])
+
+        data = frames.reshape(-1)
+        selected = ChannelMixer(4, "select", channel=2).process(data)
+        np.testing.assert_array_equal(selected, [-200, 3])
+        self.assertTrue(np.shares_memory(selected, data))
+
+        mono = np.arange(5, dtype=np.int16)
+        self.assertIs(ChannelMixer(1).process(mono), mono)
+
+    def test_offsets_are_estimated(self):
+        """Testet, ob GCC-PHAT die Verzögerungen der Mikrofone findet."""
+        block = self.array[:4096].astype(np.float32) / 32768
+        offsets = estimate_offsets(block, max_delay=48)
+        np.testing.assert_array_equal(offsets, self.delays)
+
+    def test_delay_and_sum_improves_snr(self):
+        """Testet, ob Delay-and-Sum gegenüber einfachem Mischen den Signal-Rausch-Abstand verbessert."""
+        interleaved = self.array.reshape(-1)
+
+        def snr_db(output, latency):
+            reference = self.clean[:len(output) - latency]
+            aligned = output[latency:].astype(np.float64)
+            gain = np.dot(aligned, reference) / np.dot(reference, reference)
+            noise = aligned - gain * reference
+            return 10 * np.log10(np.sum((gain * reference) ** 2) / np.sum(noise ** 2))
+
+        mixer = ChannelMixer(4, "delay_and_sum", sample_rate=RATE, chunk_size=1024)
+        das = _process_in_chunks(mixer, interleaved, 4, 1024)
+        np.testing.assert_array_equal(mixer.offsets, self.delays)
+        das_snr = snr_db(das, max(self.delays))  # Die Ausgabe folgt dem spätesten Kanal
+        mix_snr = snr_db(_process_in_chunks(ChannelMixer(4, "mix"), interleaved, 4, 1024), 0)
+        single_snr = snr_db(self.array[:, 0].copy(), 0)
+        self.assertGreater(das_snr, single_snr + 4.5)  # Ideal: 10*log10(4) = 6 dB
+        self.assertGreater(das_snr, mix_snr + 3.0)
+        print(f"\nSNR: ein Mikrofon {single_snr:.1f} dB, gemischt {mix_snr:.1f} dB, Delay-and-Sum {das_snr:.1f} dB")
+
+    def test_chunk_size_does_not_change_output(self):
+        """Testet, ob die Ausgabe unabhängig von der Chunk-Aufteilung ist, auch bei größeren Chunks."""
+        interleaved = self.array[:20000].reshape(-1)
+        a = _process_in_chunks(ChannelMixer(4, "delay_and_sum", sample_rate=RATE, chunk_size=1024), interleaved, 4, 512)
+        b = _process_in_chunks(ChannelMixer(4, "delay_and_sum", sample_rate=RATE, chunk_size=1024), interleaved, 4, 4096)
+        # Die Verzögerungen werden an derselben Stelle geschätzt, greifen aber erst ab dem nächsten Chunk
+        np.testing.assert_array_equal(a[:4096], b[:4096])
+        np.testing.assert_array_equal(a[-2000:], b[-2000:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from scipy import signal
+from src.backend.conditioning import AudioConditioner
+from src.config import AGC_MAX_GAIN_DB, AGC_PEAK_LIMIT
+
+RATE = 16000
+
+
+def _rms_db(samples):
+    return 20 * np.log10(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+def _process_in_chunks(conditioner, audio, chunk_size):
+    return np.concatenate([conditioner.process(audio[i:i + chunk_size]) for i in range(0, len(audio), chunk_size)])
+
+
+class TestAudioConditioner(unittest.TestCase):
+    """
+    Testklasse für den AudioConditioner.
+    Überprüft Hochpass, Zustandsübertragung zwischen Chunks und die automatische Pegelanpassung.
+    """
+
+    def setUp(self):
+        """Erzeugt ein Testsignal aus Sprachton, Gleichanteil und Brummen."""
+        t = np.arange(2 * RATE) / RATE
+        self.tone = (0.1 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        self.audio = (self.tone + 0.2 + 0.05 * np.sin(2 * np.pi * 20 * t)).astype(np.float32)
+
+    def test_highpass_removes_dc_and_hum(self):
+        """Testet, ob Gleichanteil und 20-Hz-Brummen entfernt werden, der Sprachton aber erhalten bleibt."""
+        conditioner = AudioConditioner(RATE, highpass=True, agc=False)
+        output = conditioner.process(self.audio)
+        settled = slice(RATE // 2, None)
+        self.assertLess(abs(float(np.mean(output[settled]))), 1e-3)
+        t = np.arange(len(output))[settled] / RATE
+
+        def amplitude(freq):
+            # Projektion auf Sinus und Kosinus, unabhängig von der Phasenverschiebung des Filters
+            return 2 * np.hypot(np.mean(output[settled] * np.sin(2 * np.pi * freq * t)),
+                                np.mean(output[settled] * np.cos(2 * np.pi * freq * t)))
+
+        self.assertAlmostEqual(amplitude(440), 0.1, delta=0.005)
+        self.assertLess(amplitude(20), 0.05 * 10 ** (-20 / 20))
+        print(f"\nNach dem Hochpass: 440 Hz {amplitude(440):.4f}, 20 Hz {amplitude(20):.5f}")
+
+    def test_highpass_state_is_carried_between_chunks(self):
+        """Testet, ob die chunkweise Filterung der Filterung am Stück entspricht."""
+        whole = AudioConditioner(RATE, highpass=True, agc=False).process(self.audio)
+        chunked = _process_in_chunks(AudioConditioner(RATE, highpass=True, agc=False), self.audio, 371)
+        np.testing.assert_allclose(chunked, whole, atol=1e-6)
+
+        # Referenz: scipy mit demselben eingeschwungenen Anfangszustand
+        conditioner = AudioConditioner(RATE, highpass=True, agc=False)
+        reference, _ = signal.sosfilt(conditioner._sos, self.audio, zi=conditioner._zi_step * self.audio[0])
+        np.testing.assert_allclose(whole, reference, atol=1e-5)
+
+    def test_agc_raises_quiet_input(self):
+        """Testet, ob ein leiser Sprachton auf den Zielpegel angehoben wird."""
+        quiet = (self.tone * 10 ** (-25 / 20)).astype(np.float32)  # etwa -48 dBFS RMS
+        conditioner = AudioConditioner(RATE, highpass=False, agc=True, target_db=-20.0)
+        output = _process_in_chunks(conditioner, np.tile(quiet, 4), 320)
+        level = _rms_db(output[-RATE:])
+        self.assertAlmostEqual(level, -20.0, delta=2.0)
+        self.assertLessEqual(conditioner.gain_db, AGC_MAX_GAIN_DB)
+        print(f"\nLeiser Eingang {_rms_db(quiet):.1f} dBFS -> {level:.1f} dBFS (Verstärkung {conditioner.gain_db:.1f} dB)")
+
+    def test_agc_limits_peaks_and_holds_gain_in_silence(self):
+        """Testet den Spitzenbegrenzer und ob Stille nicht angehoben wird."""
+        conditioner = AudioConditioner(RATE, highpass=False, agc=True, target_db=-3.0)
+        loud = (0.9 * np.sign(self.tone)).astype(np.float32)
+        output = _process_in_chunks(conditioner, loud, 320)
+        self.assertLessEqual(float(np.max(np.abs(output))), 1.0)
+        self.assertLessEqual(float(np.max(np.abs(output[RATE // 10:]))), AGC_PEAK_LIMIT + 1e-3)
+
+        gain_before = conditioner.gain_db
+        silence = np.full(RATE, 1e-5, dtype=np.float32)
+        output = _process_in_chunks(conditioner, silence, 320)
+        self.assertAlmostEqual(conditioner.gain_db, gain_before, places=3)
+        self.assertLess(float(np.max(np.abs(output))), 1e-4)
+
+    def test_disabled_is_passthrough(self):
+        """Testet, ob ohne aktive Stufen die Samples unverändert bleiben."""
+        conditioner = AudioConditioner(RATE, highpass=False, agc=False)
+        np.testing.assert_array_equal(conditioner.process(self.audio), self.audio)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.backend.device_registry import AudioDeviceRegistry
+
+DEVICES = [
+    {'name': 'Ausgang', 'maxInputChannels': 0},
+    {'name': 'Intern', 'maxInputChannels': 2},
+    {'name': 'USB-Mikrofon', 'maxInputChannels': 1},
+]
+
+class TestAudioDeviceRegistry(unittest.TestCase):
+    """
+    Testklasse für das AudioDeviceRegistry.
+    Überprüft den Zwischenspeicher der Geräteinformationen und die Erkennung von Hardwareänderungen.
+    """
+
+    def setUp(self):
+        """Erzeugt ein Verzeichnis aus einer gemockten PyAudio-Instanz."""
+        self.pa = MagicMock()
+        self.pa.get_device_count.return_value = len(DEVICES)
+        self.pa.get_device_info_by_index.side_effect = lambda i: DEVICES[i]
+        self.pa.get_default_input_device_info.return_value = {'index': 1}
+        self.registry = AudioDeviceRegistry()
+        self.registry.refresh(self.pa)
+
+    def test_queries_use_cache(self):
+        """Testet, ob Abfragen nach dem Einlesen PortAudio nicht mehr aufrufen."""
+        calls = self.pa.get_device_info_by_index.call_count
+        self.assertEqual(self.registry.input_devices(), {1: 'Intern', 2: 'USB-Mikrofon'})
+        self.assertTrue(self.registry.is_input_available(2))
+        self.assertFalse(self.registry.is_input_available(0))
+        self.assertFalse(self.registry.is_input_available(7))
+        self.assertEqual(self.registry.default_input_index(), 1)
+        self.assertEqual(self.registry.find_input_by_name('USB-Mikrofon'), 2)
+        self.assertIsNone(self.registry.find_input_by_name('Headset'))
+        self.assertEqual(self.pa.get_device_info_by_index.call_count, calls)
+
+    def test_monitor_reports_hardware_change(self):
+        """Testet, ob die Überwachung eine geänderte Kernel-Geräteliste meldet und eine unveränderte nicht."""
+        signature = ["0 [PCH ]: HDA-Intel"]
+        changed = threading.Event()
+        with patch.object(AudioDeviceRegistry, 'hardware_signature', side_effect=lambda: signature[0]):
+            self.registry.refresh(self.pa)
+            self.assertTrue(self.registry.start_monitoring(changed.set, interval=0.01))
+            self.assertFalse(changed.wait(0.1))
+            signature[0] += "\n1 [Mic ]: USB-Audio"
+            self.assertTrue(changed.wait(1.0))
+            self.registry.stop_monitoring()
+        print("\nHardwareänderung wurde erkannt.")
+
+    def test_deferred_change_is_reported_once(self):
+        """Testet, ob eine nicht eingelesene Änderung (z.B. während einer Aufnahme) nur einmal gemeldet wird."""
+        signature = ["0 [PCH ]: HDA-Intel"]
+        calls = []
+        with patch.object(AudioDeviceRegistry, 'hardware_signature', side_effect=lambda: signature[0]):
+            self.registry.refresh(self.pa)
+            self.registry.start_monitoring(lambda: calls.append(signature[0]), interval=0.01)
+            signature[0] += "\n1 [Mic ]: USB-Audio"
+            threading.Event().wait(0.2)
+            self.assertEqual(len(calls), 1)  # Ohne refresh bleibt es bei einer Meldung
+            self.registry.refresh(self.pa)
+            signature[0] = "0 [PCH ]: HDA-Intel"
+            threading.Event().wait(0.2)
+            self.registry.stop_monitoring()
+        self.assertEqual(len(calls), 2)
+
+    def test_monitoring_unavailable_without_signature(self):
+        """Testet, ob die Überwachung ohne lesbare Kernel-Geräteliste nicht gestartet wird."""
+        with patch.object(AudioDeviceRegistry, 'hardware_signature', return_value=None):
+            self.assertFalse(self.registry.start_monitoring(lambda: None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.backend.keyword_spotter import KeywordSpotter, KeywordGate, benchmark
+from src.backend.vad import StreamingSegmenter
+
+RATE = 16000
+CHUNK = 341  # Resampelter 1024er-Chunk von 48 kHz
+# Künstliche "Wörter": Folgen von Lauten aus je zwei bis drei Teiltönen (Dauer in Sekunden, Frequenzen)
+KEYWORD = [(0.12, [500, 1500]), (0.15, [800, 1200, 2400]), (0.2, [300, 2500]), (0.1, [1000, 3000])]
+OTHER = [(0.15, [300, 2500]), (0.1, [1000, 3000]), (0.2, [500, 1500]), (0.12, [700, 1800])]
+
+
+def _word(sounds, stretch=1.0, amplitude=0.3, seed=0):
+    """Erzeugt ein Wort aus Lauten mit zufälliger Phase; stretch ändert das Sprechtempo."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for duration, freqs in sounds:
+        t = np.arange(int(duration * stretch * RATE)) / RATE
+        sound = sum(np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi)) for f in freqs) / len(freqs)
+        parts.append(sound * np.hanning(len(t)) ** 0.3)
+    return (amplitude * np.concatenate(parts)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def _with_noise(audio, seed):
+    return audio + 0.003 * np.random.default_rng(seed).standard_normal(len(audio)).astype(np.float32)
+
+
+def _stream(target, audio):
+    """Übergibt das Signal chunkweise und sammelt die Zeitpunkte der Erkennungen."""
+    detections = []
+    for offset in range(0, len(audio), CHUNK):
+        result = target.process(audio[offset:offset + CHUNK])
+        if result is not None:
+            detections.append((offset + CHUNK, result))
+    return detections
+
+
+class TestKeywordSpotter(unittest.TestCase):
+    """
+    Testklasse für den KeywordSpotter und das KeywordGate.
+    Überprüft Erkennung, Weitergabe an den Segmenter, CPU-Budget und das Speichern der Vorlagen.
+    """
+
+    def setUp(self):
+        """Lernt drei Aufnahmen des Schlüsselworts mit unterschiedlichem Tempo ein."""
+        self.spotter = KeywordSpotter()
+        for i, stretch in enumerate([0.9, 1.0, 1.1]):
+            example = np.concatenate((_silence(0.3), _word(KEYWORD, stretch, seed=i), _silence(0.3)))
+            self.assertTrue(self.spotter.add_template(_with_noise(example, i)))
+
+    def test_detects_keyword_and_ignores_other_word(self):
+        """Testet, ob nur das Schlüsselwort (leiser und langsamer gesprochen) erkannt wird, und zwar an seinem Ende."""
+        keyword = _word(KEYWORD, 1.2, amplitude=0.15, seed=5)
+        prefix = np.concatenate((_silence(1.0), _word(OTHER, seed=9), _silence(0.5)))
+        audio = _with_noise(np.concatenate((prefix, keyword, _word(OTHER, 0.95, seed=7), _silence(1.0))), 3)
+
+        detections = _stream(self.spotter, audio)
+        self.assertEqual(len(detections), 1)
+        position, detection = detections[0]
+        self.assertLess(detection.score, self.spotter.threshold)
+        keyword_end = len(prefix) + len(keyword)
+        detected_end = position - len(detection.tail)
+        self.assertLess(abs(detected_end - keyword_end), 0.06 * RATE)
+        print(f"\nSchlüsselwort erkannt: Abstand {detection.score:.3f}, "
+              f"Ende {1000 * (detected_end - keyword_end) / RATE:+.0f} ms, {self.spotter.stats()}")
+
+    def test_gate_passes_only_audio_after_keyword(self):
+        """Testet, ob der Segmenter nur die Äußerung nach dem Schlüsselwort erhält und das Gate danach schließt."""
+        segments, activations = [], []
+        segmenter = StreamingSegmenter(segments.append, end_silence_ms=300)
+        gate = KeywordGate(self.spotter, segmenter, listen_seconds=1.0, on_activation=activations.append)
+        command = _word(OTHER, seed=7)
+        audio = _with_noise(np.concatenate((
+            _silence(0.5), _word(OTHER, seed=1), _silence(0.5),  # Vor dem Schlüsselwort: wird verworfen
+            _word(KEYWORD, seed=4), _silence(0.3), command,    # Schlüsselwort und Äußerung
+            _silence(2.0), _word(OTHER, seed=2), _silence(1.0)  # Gate wieder geschlossen: wird verworfen
+        )), 6)
+
+        _stream(gate, audio)
+        gate.flush()
+        self.assertEqual(len(activations), 1)
+        self.assertFalse(gate.active)
+        self.assertEqual(len(segments), 1)
+        # Das Segment enthält die Äußerung samt Padding, aber nicht das Schlüsselwort
+        self.assertGreaterEqual(len(segments[0]), len(command))
+        self.assertLess(len(segments[0]), len(command) + 0.5 * RATE)
+
+    def test_cpu_budget_bounds_load(self):
+        """Testet, ob das CPU-Budget bei ununterbrochener Sprache eingehalten wird."""
+        unbounded = benchmark(seconds=20, cpu_budget=1.0)
+        self.assertEqual(unbounded["skipped_evaluations"], 0)
+
+        budget = 0.01
+        bounded = benchmark(seconds=20, cpu_budget=budget)
+        self.assertGreater(bounded["skipped_evaluations"], 0)
+        # Die Merkmalsberechnung ist die Grundlast, die das Budget nicht unterschreiten kann
+        self.assertLess(bounded["load"], 1.3 * max(budget, bounded["feature_load"]))
+        print(f"\nKeyword-Spotter: unbegrenzt {unbounded['load']:.2%}, mit Budget {budget:.0%}: {bounded['load']:.2%}")
+
+    def test_templates_roundtrip(self):
+        """Testet Speichern, Laden und Löschen der Vorlagen."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "keyword_templates.npz")
+            self.spotter.save(path)
+            loaded = KeywordSpotter()
+            self.assertTrue(loaded.load(path))
+            self.assertEqual(len(loaded.templates), 3)
+            for original, restored in zip(self.spotter.templates, loaded.templates):
+                np.testing.assert_array_equal(original, restored)
+
+            loaded.clear_templates()
+            loaded.save(path)
+            self.assertFalse(KeywordSpotter().load(path))
+        self.assertFalse(self.spotter.add_template(_silence(1.0)))  # Ohne Sprache keine Vorlage
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.backend.level_meter import LevelMeter
+
+class TestLevelMeter(unittest.TestCase):
+    """
+    Testklasse für den LevelMeter.
+    Überprüft Pegelberechnung, Übersteuerungszählung und Stilleerkennung.
+    """
+
+    def setUp(self):
+        """Erzeugt einen LevelMeter."""
+        self.meter = LevelMeter()
+
+    def test_sine_levels(self):
+        """Testet RMS und Spitzenwert eines Sinus mit halber Vollaussteuerung."""
+        t = np.arange(4800, dtype=np.float32) / 48000
+        reading = self.meter.update((0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32))
+        self.assertAlmostEqual(reading.peak_db, -6.02, delta=0.1)
+        self.assertAlmostEqual(reading.rms_db, -9.03, delta=0.1)
+        self.assertFalse(reading.clipped)
+        self.assertFalse(self.meter.is_silent())
+        print(f"\nSinus: RMS {reading.rms_db:.1f} dBFS, Spitze {reading.peak_db:.1f} dBFS")
+
+    def test_clipping_is_counted(self):
+        """Testet, ob übersteuerte Samples über mehrere Chunks gezählt werden."""
+        chunk = np.zeros(1000, dtype=np.float32)
+        chunk[::100] = 1.0
+        chunk[50::100] = -1.0
+        self.meter.update(chunk)
+        reading = self.meter.update(chunk)
+        self.assertTrue(reading.clipped)
+        self.assertEqual(reading.clipped_samples, 40)
+
+    def test_silence_detection(self):
+        """Testet, ob nur eine Aufnahme ohne verwertbares Signal als stumm gilt."""
+        self.assertFalse(self.meter.is_silent())  # Ohne Messung keine Aussage
+        self.meter.update(np.full(1000, 1e-5, dtype=np.float32))
+        self.assertTrue(self.meter.is_silent())
+        self.meter.update(np.full(1000, 0.1, dtype=np.float32))
+        self.assertFalse(self.meter.is_silent())
+        self.meter.reset()
+        self.assertEqual(self.meter.latest().samples, 0)
+
+if __name__ == '__main__':
+    unittest.main()
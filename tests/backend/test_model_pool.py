@@ -0,0 +1,160 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+import unittest
+from src.backend.model_pool import ModelPool, model_key, split_model_key
+from src.backend.wortweber_transcriber import Transcriber
+
+MB = 1024 * 1024
+SIZES_MB = {"tiny": 150, "base": 290, "small": 970}
+
+
+class _FakeTranscriber:
+    """Ersetzt den Transcriber: belegt die Größe aus SIZES_MB und merkt sich die Freigabe."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.released = False
+
+    def memory_bytes(self):
+        return 0 if self.released else SIZES_MB[self.model_name] * MB
+
+    def release_resources(self):
+        self.released = True
+
+
+class _FakeLoader:
+    """Zählt Ladevorgänge pro Modell; delay simuliert die Ladezeit."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.loaded = []
+
+    def __call__(self, model_name):
+        time.sleep(self.delay)
+        self.loaded.append(model_name)
+        return _FakeTranscriber(model_name)
+
+
+class TestModelPool(unittest.TestCase):
+    """
+    Testklasse für den ModelPool.
+    Überprüft Wiederverwendung geladener Modelle, LRU-Verdrängung, Budgetänderungen und paralleles Laden.
+    """
+
+    def test_resident_model_is_not_reloaded(self):
+        """Testet, ob der Wechsel zu einem geladenen Modell ohne erneutes Laden erfolgt."""
+        loader = _FakeLoader()
+        pool = ModelPool(loader, budget_mb=2000)
+        tiny = pool.get("tiny")
+        pool.get("base")
+        self.assertIs(pool.get("tiny"), tiny)
+        self.assertEqual(loader.loaded, ["tiny", "base"])
+        self.assertEqual(pool.resident_models(), ["base", "tiny"])
+        self.assertEqual(pool.memory_bytes(), (150 + 290) * MB)
+
+    def test_least_recently_used_model_is_evicted(self):
+        """Testet, ob bei knappem Budget das am längsten nicht verwendete Modell freigegeben wird."""
+        loader = _FakeLoader()
+        pool = ModelPool(loader, budget_mb=1300)
+        tiny = pool.get("tiny")
+        base = pool.get("base")
+        pool.get("tiny")  # tiny ist jetzt das zuletzt verwendete Modell
+        pool.get("small")  # 150 + 290 + 970 > 1300: base muss weichen
+        self.assertEqual(pool.resident_models(), ["tiny", "small"])
+        self.assertTrue(base.released)
+        self.assertFalse(tiny.released)
+        self.assertLessEqual(pool.memory_bytes(), 1300 * MB)
+        self.assertEqual(pool.evictions, 1)
+
+    def test_budget_change_and_oversized_model(self):
+        """Testet das Verkleinern des Budgets und ein Modell, das allein größer als das Budget ist."""
+        loader = _FakeLoader()
+        pool = ModelPool(loader, budget_mb=2000)
+        for name in ("tiny", "base", "small"):
+            pool.get(name)
+        pool.set_budget(1000)
+        self.assertEqual(pool.resident_models(), ["small"])
+        pool.set_budget(0)  # Das zuletzt verwendete Modell bleibt geladen
+        self.assertEqual(pool.resident_models(), ["small"])
+        pool.get("tiny")
+        self.assertEqual(pool.resident_models(), ["tiny"])
+        pool.clear()
+        self.assertEqual(pool.resident_models(), [])
+        self.assertEqual(pool.memory_bytes(), 0)
+
+    def test_concurrent_requests_load_once(self):
+        """Testet, ob gleichzeitige Anfragen dasselbe Modell nur einmal laden und ein fehlgeschlagenes Laden gemeldet wird."""
+        loader = _FakeLoader(delay=0.2)
+        pool = ModelPool(loader, budget_mb=2000)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.get("base"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(loader.loaded, ["base"])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        with self.assertRaises(KeyError):
+            pool.get("unbekannt")
+        self.assertEqual(pool.resident_models(), ["base"])
+
+    def test_active_model_survives_background_load(self):
+        """Testet, ob das aktive Modell während des Ladens erhalten bleibt und erst trim() es verdrängt."""
+        loader = _FakeLoader()
+        pool = ModelPool(loader, budget_mb=1000)
+        base = pool.get("base")
+        pool.get("small", keep="base", trim=False)  # Kurzzeitig über dem Budget
+        self.assertEqual(pool.resident_models(), ["base", "small"])
+        self.assertFalse(base.released)
+        pool.trim(keep="small")
+        self.assertEqual(pool.resident_models(), ["small"])
+        self.assertTrue(base.released)
+
+    def test_release_waits_for_running_transcription(self):
+        """Testet, ob ein Modell erst nach der letzten laufenden Transkription freigegeben wird."""
+        transcriber = Transcriber("tiny")
+        transcriber.model = object()  # Platzhalter für ein geladenes Modell
+        self.assertTrue(transcriber.acquire())
+        self.assertTrue(transcriber.acquire())
+        transcriber.release_resources()
+        self.assertIsNotNone(transcriber.model)  # Zwei Transkriptionen laufen noch
+        self.assertFalse(transcriber.acquire())  # Neue Transkriptionen nutzen bereits das neue Modell
+        transcriber.release()
+        self.assertIsNotNone(transcriber.model)
+        transcriber.release()
+        self.assertIsNone(transcriber.model)
+        self.assertEqual(transcriber.active_jobs, 0)
+
+    def test_precision_is_part_of_key(self):
+        """Testet, ob dasselbe Modell in verschiedenen Genauigkeiten getrennte Pool-Einträge sind."""
+        self.assertEqual(model_key("medium"), "medium")
+        self.assertEqual(model_key("medium", "int8"), "medium/int8")
+        self.assertEqual(split_model_key("medium/int8"), ("medium", "int8"))
+        self.assertEqual(split_model_key("medium"), ("medium", "fp32"))
+
+        loaded = []
+        pool = ModelPool(lambda key: loaded.append(key) or _FakeTranscriber(split_model_key(key)[0]), budget_mb=2000)
+        pool.get(model_key("base"))
+        pool.get(model_key("base", "int8"))
+        self.assertEqual(loaded, ["base", "base/int8"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.config import TARGET_RATE
+from src.backend.noise_suppression import SpectralGate, benchmark
+
+class TestSpectralGate(unittest.TestCase):
+    """
+    Testklasse für das SpectralGate.
+    Überprüft Rekonstruktion, Rauschminderung, Erhalt des Nutzsignals und die Schätzung des Rauschprofils.
+    """
+
+    def setUp(self):
+        """Erzeugt Rauschen mit einem Ton, der nach einer Sekunde Stille einsetzt."""
+        rng = np.random.default_rng(0)
+        n = 3 * TARGET_RATE
+        t = np.arange(n) / TARGET_RATE
+        self.noise = (0.02 * rng.standard_normal(n)).astype(np.float32)
+        self.tone = (0.3 * np.sin(2 * np.pi * 440 * t) * (t >= 1.0)).astype(np.float32)
+        self.audio = self.noise + self.tone
+        self.gate = SpectralGate(TARGET_RATE)
+
+    def test_zero_reduction_reconstructs_input(self):
+        """Testet, ob die STFT ohne Dämpfung die Aufnahme unverändert rekonstruiert."""
+        profile = self.gate.estimate_profile(self.noise[:TARGET_RATE])
+        np.testing.assert_allclose(self.gate.process(self.audio, profile, reduction_db=0), self.audio, atol=1e-5)
+
+    def test_noise_is_reduced_and_tone_kept(self):
+        """Testet, ob das Rauschen gedämpft wird, der Ton aber erhalten bleibt."""
+        profile = self.gate.estimate_leading_profile(self.audio)
+        self.assertIsNotNone(profile)
+        cleaned = self.gate.process(self.audio, profile)
+        self.assertEqual(len(cleaned), len(self.audio))
+
+        lead = slice(0, int(0.9 * TARGET_RATE))
+        noise_reduction_db = 10 * np.log10(np.mean(self.audio[lead] ** 2) / np.mean(cleaned[lead] ** 2))
+        self.assertGreater(noise_reduction_db, 8)
+
+        speech = slice(int(1.5 * TARGET_RATE), None)
+        tone_error = np.mean((cleaned[speech] - self.tone[speech]) ** 2) / np.mean(self.tone[speech] ** 2)
+        self.assertLess(tone_error, 0.01)
+        print(f"\nRauschminderung: {noise_reduction_db:.1f} dB, relativer Fehler im Ton: {tone_error:.4f}")
+
+    def test_short_audio_has_no_profile(self):
+        """Testet, ob zu kurze Abschnitte kein Rauschprofil liefern."""
+        self.assertIsNone(self.gate.estimate_profile(self.noise[:100]))
+
+    def test_benchmark(self):
+        """Testet, ob der Benchmark die Kosten je Sekunde Audio liefert."""
+        result = benchmark(seconds=2.0)
+        self.assertGreater(result["ms_per_second"], 0)
+        print(f"\nRauschunterdrückung: {result['ms_per_second']:.2f} ms je Sekunde Audio")
+
+if __name__ == '__main__':
+    unittest.main()
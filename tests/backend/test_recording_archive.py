@@ -0,0 +1,106 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.backend.recording_archive import RecordingArchive
+from src.backend.audio_file import read_audio
+from src.config import ARCHIVE_INDEX_FILE
+
+
+class TestRecordingArchive(unittest.TestCase):
+    """
+    Testklasse für das RecordingArchive.
+    Überprüft Schreiben, Index, verlustfreie Wiederherstellung und die Aufbewahrungsregeln.
+    """
+
+    def setUp(self):
+        """Erzeugt ein temporäres Archivverzeichnis und eine Testäußerung."""
+        self.directory = tempfile.mkdtemp()
+        t = np.arange(16000) / 16000
+        self.audio = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_add_writes_file_and_index(self):
+        """Testet, ob Äußerungen verlustfrei komprimiert und mit Metadaten indiziert werden."""
+        archive = RecordingArchive(self.directory, file_format="wav.gz")
+        archive.add(self.audio, {"model": "small", "language": "de", "transcript": "Hallo"})
+        archive.add(np.zeros(8000, dtype=np.float32), {"model": "small", "language": "de"})
+        self.assertTrue(archive.wait_closed())
+
+        entries = archive.entries()
+        self.assertEqual(len(entries), 2)
+        first = entries[0]
+        self.assertEqual(first["transcript"], "Hallo")
+        self.assertEqual(first["duration_s"], 1.0)
+        self.assertNotIn("transcript", entries[1])
+        path = os.path.join(self.directory, first["file"])
+        self.assertEqual(os.path.getsize(path), first["bytes"])
+        self.assertLess(first["bytes"], 2 * len(self.audio))  # Kleiner als unkomprimiertes 16-Bit-WAV
+
+        with open(os.path.join(self.directory, ARCHIVE_INDEX_FILE), encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["id"] for line in f], [e["id"] for e in entries])
+        with gzip.open(path) as f:
+            restored = read_audio(f, 16000)
+        expected = np.round(self.audio * 32767) / 32768
+        np.testing.assert_allclose(restored, expected, atol=1e-4)
+        print(f"\nArchiviert: {first['bytes']} Bytes für {first['duration_s']} s")
+
+    def test_size_retention_removes_oldest(self):
+        """Testet, ob bei Überschreiten der Größengrenze die ältesten Aufnahmen gelöscht werden."""
+        noise = np.random.default_rng(0).uniform(-0.5, 0.5, 16000).astype(np.float32)  # kaum komprimierbar
+        archive = RecordingArchive(self.directory, max_mb=0.05, max_days=0, file_format="wav.gz")
+        for i in range(4):
+            archive.add(noise, {"transcript": str(i)})
+        archive.wait_closed()
+
+        entries = archive.entries()
+        self.assertLess(len(entries), 4)
+        self.assertLessEqual(archive.total_bytes(), 0.05 * 1024 * 1024)
+        self.assertEqual(entries[-1]["transcript"], "3")
+        files = sorted(name for name in os.listdir(self.directory) if name != ARCHIVE_INDEX_FILE)
+        self.assertEqual(files, sorted(entry["file"] for entry in entries))
+
+    def test_age_retention_on_open(self):
+        """Testet, ob beim Öffnen Einträge früherer Sitzungen gelöscht werden, die zu alt sind."""
+        archive = RecordingArchive(self.directory, max_days=0, file_format="wav.gz")
+        archive.add(self.audio, {"transcript": "alt"})
+        archive.add(self.audio, {"transcript": "neu"})
+        archive.wait_closed()
+
+        # Den ersten Eintrag um 10 Tage zurückdatieren
+        index_path = os.path.join(self.directory, ARCHIVE_INDEX_FILE)
+        entries = archive.entries()
+        entries[0]["timestamp"] = time.time() - 10 * 86400
+        with open(index_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            f.write('{"abgeschnitten": ')  # Nach einem Absturz unvollständige Zeile
+
+        reopened = RecordingArchive(self.directory, max_days=7, file_format="wav.gz")
+        reopened.wait_closed()
+        self.assertEqual([entry["transcript"] for entry in reopened.entries()], ["neu"])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, entries[0]["file"])))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+import wave
+import numpy as np
+from src.backend.recording_sink import WavRecordingSink
+
+class TestWavRecordingSink(unittest.TestCase):
+    """
+    Testklasse für die WavRecordingSink.
+    Überprüft, ob fortlaufend geschriebene Chunks eine vollständige WAV-Datei mit korrektem Kopf ergeben.
+    """
+
+    def test_incremental_write(self):
+        """Testet, ob alle Chunks in Reihenfolge geschrieben und die Länge im Dateikopf eingetragen wird."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "aufnahme", "test.wav")
+            sink = WavRecordingSink(filename, 48000)
+            chunks = [np.full(1024, i, dtype=np.int16) for i in range(20)]
+            for chunk in chunks:
+                sink.write(chunk)
+                chunk[:] = -1  # Der Puffer darf nach write() wiederverwendet werden
+            self.assertTrue(sink.wait_closed())
+
+            with wave.open(filename, 'rb') as wf:
+                self.assertEqual(wf.getframerate(), 48000)
+                self.assertEqual(wf.getnframes(), 20 * 1024)
+                data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            np.testing.assert_array_equal(data, np.repeat(np.arange(20, dtype=np.int16), 1024))
+            self.assertEqual(sink.frames_written, 20 * 1024)
+        print("\nAufnahme wurde fortlaufend als WAV-Datei geschrieben.")
+
+    def test_write_after_close_is_ignored(self):
+        """Testet, ob nach dem Schließen übergebene Samples verworfen werden."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.wav")
+            sink = WavRecordingSink(filename, 16000)
+            sink.write(np.ones(100, dtype=np.int16))
+            sink.close()
+            sink.write(np.ones(100, dtype=np.int16))
+            self.assertTrue(sink.wait_closed())
+            with wave.open(filename, 'rb') as wf:
+                self.assertEqual(wf.getnframes(), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.config import AUDIO_RATE, TARGET_RATE, RESAMPLER_ENGINES
+from src.backend.resampler import StreamingResampler, resample, benchmark_engines
+
+class TestStreamingResampler(unittest.TestCase):
+    """
+    Testklasse für den StreamingResampler.
+    Überprüft Ausgabelänge, Unabhängigkeit von der Chunk-Aufteilung und die Nähe zur FFT-Ausgabe.
+    """
+
+    def setUp(self):
+        """Erzeugt ein bandbegrenztes Testsignal mit 44,1 kHz."""
+        t = np.arange(2 * AUDIO_RATE) / AUDIO_RATE
+        self.audio = (0.5 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 2500 * t)).astype(np.float32)
+
+    def _stream(self, engine, chunk_size):
+        resampler = StreamingResampler(AUDIO_RATE, TARGET_RATE, engine)
+        parts = [resampler.process(self.audio[i:i + chunk_size]) for i in range(0, len(self.audio), chunk_size)]
+        parts.append(resampler.flush())
+        return np.concatenate(parts)
+
+    def test_output_length_matches_previous_calculation(self):
+        """Testet, ob alle Verfahren die bisherige Ausgabelänge liefern."""
+        expected = int(len(self.audio) * TARGET_RATE / AUDIO_RATE)
+        for engine in RESAMPLER_ENGINES:
+            self.assertEqual(len(self._stream(engine, 4096)), expected, engine)
+
+    def test_chunking_does_not_change_output(self):
+        """Testet, ob die chunkweise Verarbeitung dasselbe Ergebnis wie ein einzelner Aufruf liefert."""
+        for engine in RESAMPLER_ENGINES:
+            reference = resample(self.audio, AUDIO_RATE, TARGET_RATE, engine)
+            for chunk_size in (1000, 4096):
+                np.testing.assert_allclose(self._stream(engine, chunk_size), reference, atol=1e-5,
+                                           err_msg=f"{engine}, Chunkgröße {chunk_size}")
+
+    def test_polyphase_close_to_fft(self):
+        """Testet, ob das Polyphasen-Verfahren die bisherige FFT-Ausgabe annähert."""
+        results = benchmark_engines(self.audio, AUDIO_RATE, TARGET_RATE)
+        self.assertGreater(results["polyphase"]["snr_db"], 50)
+        self.assertGreater(results["linear"]["snr_db"], 20)
+        print(f"\nSNR gegenüber FFT: Polyphase {results['polyphase']['snr_db']:.1f} dB, "
+              f"Linear {results['linear']['snr_db']:.1f} dB")
+
+    def test_polyphase_flush_is_small(self):
+        """Testet, ob nach dem letzten Chunk nur noch wenige Samples berechnet werden müssen."""
+        resampler = StreamingResampler(AUDIO_RATE, TARGET_RATE, "polyphase")
+        resampler.process(self.audio)
+        self.assertLess(len(resampler.flush()), 100)
+
+    def test_equal_rates_pass_through(self):
+        """Testet, ob bei gleicher Abtastrate die Samples unverändert bleiben."""
+        np.testing.assert_array_equal(resample(self.audio, TARGET_RATE, TARGET_RATE), self.audio)
+
+    def test_unknown_engine_raises(self):
+        """Testet, ob ein unbekanntes Verfahren abgelehnt wird."""
+        with self.assertRaises(ValueError):
+            StreamingResampler(AUDIO_RATE, TARGET_RATE, "cubic")
+
+if __name__ == '__main__':
+    unittest.main()
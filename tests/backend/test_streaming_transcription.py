@@ -0,0 +1,120 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.backend.streaming_transcription import LocalAgreement, StreamingTranscriber
+
+RATE = 16000
+SCRIPT = ("Heute diktiere ich einen langen Absatz und möchte schon während der Aufnahme "
+          "sehen was erkannt wurde damit ich nicht warten muss").split()
+
+
+def _word_times(index):
+    """Wort i wird von 0,5 * i + 0,05 bis 0,5 * i + 0,4 Sekunden gesprochen."""
+    return 0.5 * index + 0.05, 0.5 * index + 0.4
+
+
+class _FakeWhisper:
+    """
+    Simuliert transcribe_words: die Samples der Testaufnahme enthalten ihre eigene Zeit in Sekunden.
+
+    Vollständig gehörte Wörter werden korrekt erkannt; folgen danach weniger als 0,5 s Audio,
+    wird das Wort in jedem zweiten Aufruf falsch erkannt. Ein angeschnittenes Wort am
+    Fensterende wird als Bruchstück geliefert.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, audio, prompt):
+        start = float(audio[0])
+        end = start + len(audio) / RATE
+        self.calls.append((start, end, prompt))
+        words = []
+        for i, text in enumerate(SCRIPT):
+            word_start, word_end = _word_times(i)
+            if word_start < start - 0.01 or word_start >= end:
+                continue
+            if word_end > end:
+                words.append((word_start - start, end - start, " " + text[:2]))
+            elif end - word_end < 0.5 and len(self.calls) % 2:
+                words.append((word_start - start, word_end - start, " " + text + "en"))
+            else:
+                words.append((word_start - start, word_end - start, " " + text))
+        return words
+
+
+def _recording(seconds):
+    return (np.arange(int(seconds * RATE)) / RATE).astype(np.float32)
+
+
+class TestStreamingTranscription(unittest.TestCase):
+    """
+    Testklasse für die Live-Transkription.
+    Überprüft LocalAgreement-2, das Kürzen des Fensters samt Prompt und die Dekodierung des Rests.
+    """
+
+    def test_committed_text_only_grows_and_final_is_complete(self):
+        """Testet, ob bestätigter Text nie zurückgenommen wird und der Abschluss nur den Rest dekodiert."""
+        whisper = _FakeWhisper()
+        streamer = StreamingTranscriber(whisper)
+        total = _word_times(len(SCRIPT) - 1)[1] + 0.6
+        committed_history = []
+        for seconds in np.arange(1.0, total, 0.5):
+            self.assertTrue(streamer.update(_recording(seconds)))
+            committed = streamer.committed_text
+            if committed_history:
+                self.assertTrue(committed.startswith(committed_history[-1]))
+            self.assertTrue(" ".join(SCRIPT).startswith(committed))  # Weder Bruchstücke noch schwankende Wörter
+            committed_history.append(committed)
+
+        self.assertGreater(len(committed_history[-1].split()), len(SCRIPT) - 4)
+        self.assertTrue(streamer.tentative_text)
+        final = streamer.finish(_recording(total))
+        self.assertEqual(final, " ".join(SCRIPT))
+        self.assertLess(streamer.final_seconds, 2.0)  # Nur der unbestätigte Rest wurde dekodiert
+        print(f"\nLive-Transkription: {streamer.updates} Durchläufe, Rest {streamer.final_seconds:.2f} s von {total:.2f} s")
+
+    def test_window_is_trimmed_with_prompt(self):
+        """Testet, ob lange Fenster hinter dem letzten bestätigten Wort beginnen und den Text davor als Prompt erhalten."""
+        whisper = _FakeWhisper()
+        streamer = StreamingTranscriber(whisper, trim_seconds=3.0)
+        total = _word_times(len(SCRIPT) - 1)[1] + 0.6
+        for seconds in np.arange(1.0, total, 0.5):
+            streamer.update(_recording(seconds))
+        self.assertGreater(streamer.window_start, 0)
+        longest = max(end - start for start, end, _ in whisper.calls)
+        self.assertLess(longest, 3.0 + 0.5 + 0.6)  # Kürzen spätestens einen Durchlauf nach Überschreiten
+        start, _, prompt = whisper.calls[-1]
+        self.assertGreater(start, 0)
+        self.assertIsNotNone(prompt)
+        self.assertIn(prompt.strip(), " ".join(SCRIPT))
+        self.assertLessEqual(len(prompt), 200)
+        self.assertEqual(streamer.finish(_recording(total)), " ".join(SCRIPT))
+
+    def test_local_agreement_drops_repeated_words(self):
+        """Testet, ob am Fensteranfang wiederholte bestätigte Wörter nicht doppelt übernommen werden."""
+        agreement = LocalAgreement()
+        agreement.insert([(0.0, 0.4, " Guten"), (0.5, 0.9, " Morgen")], 0.0)
+        agreement.insert([(0.0, 0.4, " Guten"), (0.5, 0.9, " Morgen,"), (1.0, 1.4, " alle")], 0.0)
+        self.assertEqual([w.text for w in agreement.committed], [" Guten", " Morgen,"])
+        # Neues Fenster ab 0,8 s: Whisper beginnt mit dem schon bestätigten "Morgen"
+        words = agreement.new_words([(0.15, 0.25, " morgen"), (0.3, 0.6, " alle")], 0.8)
+        self.assertEqual([w.text for w in words], [" alle"])
+
+if __name__ == '__main__':
+    unittest.main()
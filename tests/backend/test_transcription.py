@@ -95,8 +95,11 @@ class TestModelLoading(unittest.TestCase):
         backend = WordweberBackend()
 
         # Simuliere eine Audioaufnahme vor dem Laden des Modells
-        dummy_audio = np.random.rand(16000).astype(np.float32)
-        backend.state.audio_data = [dummy_audio.tobytes()]
+        # Stimmhaftes Signal (Grundton mit Obertönen), damit die Sprachaktivitätserkennung die Aufnahme nicht verwirft
+        t = np.arange(16000) / 16000
+        dummy_audio = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 10)) * 0.2
+        backend.state.audio_data.append((dummy_audio * 32767).astype(np.int16))
+        backend.state.audio_consumed = False
 
         # Stoppe die "Aufnahme", was die Daten in pending_audio speichern sollte
         backend.stop_recording()
@@ -0,0 +1,121 @@
+# Wortweber - Echtzeit-Sprachtranskription mit KI
+# Copyright (C) 2024 fukuro-kun
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+import numpy as np
+from src.config import TARGET_RATE
+from src.backend.vad import VoiceActivityDetector, StreamingSegmenter
+
+def voiced_signal(seconds, f0=150, amplitude=0.1):
+    """Erzeugt ein stimmhaftes Testsignal aus Grundton und Obertönen mit Silbenmodulation."""
+    t = np.arange(int(seconds * TARGET_RATE)) / TARGET_RATE
+    harmonics = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 15))
+    envelope = (1 + np.sin(2 * np.pi * 4 * t)) / 2
+    return (amplitude * harmonics * envelope).astype(np.float32)
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    """
+    Testklasse für den VoiceActivityDetector.
+    Überprüft das Entfernen von Stille und das Erkennen von Aufnahmen ohne Sprache.
+    """
+
+    def setUp(self):
+        """Initialisiert den Detektor und einen Zufallsgenerator für Hintergrundrauschen."""
+        self.vad = VoiceActivityDetector(padding_ms=90)
+        self.rng = np.random.default_rng(0)
+
+    def noise(self, seconds, level=0.003):
+        return (self.rng.standard_normal(int(seconds * TARGET_RATE)) * level).astype(np.float32)
+
+    def test_trims_leading_and_trailing_silence(self):
+        """Testet, ob Stille vor und nach der Sprache bis auf das Padding entfernt wird."""
+        clip = np.concatenate([self.noise(1.0), voiced_signal(1.0) + self.noise(1.0), self.noise(1.0)])
+        start, end = self.vad.detect(clip)
+        self.assertAlmostEqual(start / TARGET_RATE, 1.0, delta=0.15)
+        self.assertAlmostEqual(end / TARGET_RATE, 2.0, delta=0.15)
+        self.assertEqual(len(self.vad.trim(clip)), end - start)
+        print(f"\nSprachbereich erkannt: {start / TARGET_RATE:.2f}s bis {end / TARGET_RATE:.2f}s")
+
+    def test_silence_and_noise_are_skipped(self):
+        """Testet, ob Stille, Rauschen und ein kurzer Tastenklick nicht als Sprache gelten."""
+        self.assertIsNone(self.vad.trim(np.zeros(TARGET_RATE, dtype=np.float32)))
+        self.assertIsNone(self.vad.trim(self.noise(1.0)))
+        self.assertIsNone(self.vad.trim(self.noise(1.0, level=0.2)))
+        click = self.noise(1.0)
+        click[8000:8080] += 0.8
+        self.assertIsNone(self.vad.trim(click))
+
+    def test_continuous_speech_is_kept(self):
+        """Testet, ob eine durchgehend gesprochene Aufnahme vollständig erhalten bleibt."""
+        clip = voiced_signal(1.5)
+        self.assertEqual(self.vad.detect(clip), (0, len(clip)))
+
+    def test_pluggable_model(self):
+        """Testet, ob ein eingebundenes Modell die Frame-Entscheidung übernimmt."""
+        calls = []
+
+        def model(frames, sample_rate):
+            calls.append(frames.shape)
+            decisions = np.zeros(len(frames))
+            decisions[10:20] = 1.0
+            return decisions
+
+        vad = VoiceActivityDetector(padding_ms=0, model=model)
+        start, end = vad.detect(self.noise(1.0))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((start, end), (10 * vad.frame_length, 20 * vad.frame_length))
+
+class TestStreamingSegmenter(unittest.TestCase):
+    """
+    Testklasse für den StreamingSegmenter des Dauerdiktats.
+    Überprüft, ob ein fortlaufender Stream in geordnete Äußerungen zerlegt wird.
+    """
+
+    def setUp(self):
+        """Erzeugt einen Stream aus drei Äußerungen, getrennt durch Pausen."""
+        rng = np.random.default_rng(1)
+        noise = lambda seconds: (rng.standard_normal(int(seconds * TARGET_RATE)) * 0.003).astype(np.float32)
+        self.stream = np.concatenate([
+            noise(0.5), voiced_signal(0.8, f0=120), noise(1.0),
+            voiced_signal(1.2, f0=180), noise(1.0),
+            voiced_signal(0.6, f0=240), noise(0.2),
+        ])
+
+    def test_segments_in_order(self):
+        """Testet, ob die Äußerungen in Aufnahmereihenfolge und unabhängig von der Blockgröße erkannt werden."""
+        for block_size in (160, 1486, 4096):
+            segments = []
+            segmenter = StreamingSegmenter(segments.append, VoiceActivityDetector(padding_ms=90), end_silence_ms=500)
+            for i in range(0, len(self.stream), block_size):
+                segmenter.process(self.stream[i:i + block_size])
+            segmenter.flush()
+            durations = [len(segment) / TARGET_RATE for segment in segments]
+            self.assertEqual(len(segments), 3, f"Blockgröße {block_size}: {durations}")
+            for duration, expected in zip(durations, (0.8, 1.2, 0.6)):
+                self.assertAlmostEqual(duration, expected, delta=0.35)
+        print(f"\nSegmente erkannt: {[round(d, 2) for d in durations]} Sekunden")
+
+    def test_max_segment_length(self):
+        """Testet, ob durchgehende Sprache nach der maximalen Segmentlänge geteilt wird."""
+        segments = []
+        segmenter = StreamingSegmenter(segments.append, max_segment_seconds=1.0)
+        segmenter.process(voiced_signal(3.0))
+        segmenter.flush()
+        self.assertGreaterEqual(len(segments), 3)
+        self.assertTrue(all(len(segment) <= TARGET_RATE for segment in segments))
+
+if __name__ == '__main__':
+    unittest.main()
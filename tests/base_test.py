@@ -22,11 +22,11 @@ Es stellt gemeinsam genutzte Funktionen und Konfigurationen für die Transkripti
 import unittest
 import os
 import numpy as np
-import wave
-from scipy import signal
 from numpy.typing import NDArray
 from typing import List
 from src.backend.wortweber_utils import check_gpu_resources
+from src.backend.audio_file import read_audio
+from src.config import TARGET_RATE
 from tests.test_config import MIN_GPU_MEMORY, MODELS_TO_TEST, TEST_DATA_DIR, TEST_AUDIO_FILE
 
 class BaseTranscriptionTest(unittest.TestCase):
@@ -62,21 +62,8 @@ class BaseTranscriptionTest(unittest.TestCase):
             if not os.path.exists(audio_path):
                 raise FileNotFoundError(f"Audiodatei nicht gefunden: {audio_path}")
 
-            with wave.open(audio_path, "rb") as wf:
-                sample_rate = wf.getframerate()
-                audio_data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
-
-            # Normalisiere die Audiodaten auf den Bereich [-1, 1]
-            audio_normalized: NDArray[np.float32] = audio_data.astype(np.float32) / 32768.0
-
-            # Resampling auf 16000 Hz (Whisper's erwartete Sampling-Rate)
-            if sample_rate != 16000:
-                resampled = signal.resample(audio_normalized, int(len(audio_normalized) * 16000 / sample_rate))
-                audio_resampled: NDArray[np.float32] = np.asarray(resampled, dtype=np.float32)
-            else:
-                audio_resampled: NDArray[np.float32] = audio_normalized
-
-            return audio_resampled
+            # Blockweises Lesen und Resampling auf 16000 Hz (Whisper's erwartete Sampling-Rate)
+            return np.asarray(read_audio(audio_path, TARGET_RATE), dtype=np.float32)
 
 
 
@@ -99,5 +86,6 @@ class BaseTranscriptionTest(unittest.TestCase):
 # Zusätzliche Erklärungen:
 # 1. Die Klasse erbt von unittest.TestCase und bietet Grundfunktionalitäten für Transkriptionstests.
 # 2. setUpClass überprüft die GPU-Verfügbarkeit und den Speicher vor der Ausführung der Tests.
-# 3. load_and_prepare_audio bereitet Audiodaten für die Transkription vor, einschließlich Normalisierung und Resampling.
+# 3. load_and_prepare_audio liest die Audiodatei über src.backend.audio_file (wie WordweberBackend.transcribe_file)
+#    blockweise ein, normalisiert sie und resampelt sie auf 16000 Hz.
 # 4. get_expected_words liefert erwartete Wörter für verschiedene Sprachen zur Überprüfung der Transkriptionsgenauigkeit.
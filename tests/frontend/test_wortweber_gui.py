@@ -71,6 +71,7 @@ class TestWordweberGUIFunctionality(unittest.TestCase):
         """Initialisiert die Testumgebung vor jedem Testfall."""
         self.backend_mock = MagicMock(spec=WordweberBackend)
         self.backend_mock.pending_audio = False  # Setzen Sie dies explizit
+        self.backend_mock.calibration_selection.return_value = None  # Kein neues Kalibrierungsprofil
         self.gui = TestWordweberGUI(self.backend_mock)
 
     def tearDown(self):
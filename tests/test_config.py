@@ -52,6 +52,13 @@ TEST_AUDIO_CONFIG = {
 # Sprachen für Transkriptionstests
 TEST_LANGUAGES = ["de"]  # Nur Deutsch, da das Testfile auf Deutsch ist
 
+# Modelle und Genauigkeitsstufen für den Vergleich der Rechengenauigkeit (fp32 ist die Referenz)
+PRECISION_MODELS_TO_TEST = ["small", "medium"]
+PRECISIONS_TO_TEST = ["fp32", "int8", "bf16"]
+
+# Gemessene Durchläufe je Modell und Genauigkeit (Median nach einem Aufwärmdurchlauf)
+PRECISION_BENCHMARK_RUNS = 3
+
 # Zusätzliche Erklärungen:
 
 # 1. Der Pfad zum Testdatenverzeichnis wird dynamisch erstellt, um